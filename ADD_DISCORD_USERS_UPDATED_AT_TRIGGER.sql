@@ -0,0 +1,24 @@
+-- Server-side updated_at for discord_users
+-- Run this in Supabase SQL Editor (once, on an existing database)
+-- The incremental users sync (users_permissions_json_manager.py) fetches rows with
+-- updated_at >= last watermark; the watermark must come from one clock - the server's -
+-- or a device with a late clock writes changes that other devices never download.
+
+CREATE OR REPLACE FUNCTION set_discord_users_updated_at()
+RETURNS TRIGGER AS $$
+BEGIN
+    NEW.updated_at = now();
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS discord_users_set_updated_at ON discord_users;
+CREATE TRIGGER discord_users_set_updated_at
+BEFORE INSERT OR UPDATE ON discord_users
+FOR EACH ROW EXECUTE FUNCTION set_discord_users_updated_at();
+
+-- Index used by ?updated_at=gte.<watermark>&order=updated_at.asc
+CREATE INDEX IF NOT EXISTS idx_discord_users_updated_at ON discord_users (updated_at);
+
+-- Verify: a touched row gets the server time
+-- UPDATE discord_users SET username = username WHERE discord_id = <id> RETURNING updated_at;
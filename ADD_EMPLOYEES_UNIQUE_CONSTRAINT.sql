@@ -0,0 +1,29 @@
+-- Unique employee per institution: (institution_id, discord_username)
+-- Run this in Supabase SQL Editor (once, on an existing database)
+-- Afterwards the app writes employees with upserts:
+--   POST /rest/v1/employees?on_conflict=institution_id,discord_username
+--   Prefer: resolution=merge-duplicates
+
+-- 1. Empty Discord -> NULL (NULLs never collide on the unique key)
+UPDATE employees SET discord_username = NULL WHERE btrim(discord_username) = '';
+UPDATE employees SET discord_username = btrim(discord_username) WHERE discord_username <> btrim(discord_username);
+
+-- 2. Remove existing duplicates: keep the newest row (highest id) per key
+--    (same rule as clean_supabase_duplicates.py / employee_dedup.py)
+DELETE FROM employees e
+USING employees newer
+WHERE e.institution_id = newer.institution_id
+  AND e.discord_username = newer.discord_username
+  AND e.id < newer.id;
+
+-- 3. The constraint (PostgREST on_conflict needs a non-partial unique constraint / index)
+ALTER TABLE employees DROP CONSTRAINT IF EXISTS uq_employees_institution_discord;
+ALTER TABLE employees
+ADD CONSTRAINT uq_employees_institution_discord UNIQUE (institution_id, discord_username);
+
+-- Verify: must return no rows
+SELECT institution_id, discord_username, COUNT(*)
+FROM employees
+WHERE discord_username IS NOT NULL
+GROUP BY institution_id, discord_username
+HAVING COUNT(*) > 1;
@@ -6,10 +6,12 @@ Logs all user actions to Supabase table and local JSON files with encryption
 
 import requests
 import json
+import logging
 import os
 import time
+import threading
 from datetime import datetime
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Union
 
 # Import encryption module
 try:
@@ -19,6 +21,8 @@ except ImportError:
     ENCRYPTION_ENABLED = False
     print("⚠️  JSON encryption module not available - logs will be saved unencrypted")
 
+logger = logging.getLogger(__name__)
+
 class ActionLogger:
     """Logs user actions to Supabase for audit trail and saves locally"""
     
@@ -41,6 +45,10 @@ class ActionLogger:
             or "default"
         )
         
+        # Local log files and the summary are read-modify-write, shared by the UI thread
+        # and the cloud upload queue - one writer at a time
+        self._local_lock = threading.RLock()
+        
         # Create logs directory if it doesn't exist
         os.makedirs(self.logs_dir, exist_ok=True)
     
@@ -54,52 +62,65 @@ class ActionLogger:
     
     def _save_local_log(self, log_entry: Dict[str, Any]) -> bool:
         """Save log entry to local JSON file organized by server/city/institution (encrypted)"""
+        return self._save_local_logs([log_entry])
+    
+    def _save_local_logs(self, log_entries: List[Dict[str, Any]]) -> bool:
+        """Save several log entries - one read/write per institution file, one summary update"""
+        with self._local_lock:
+            return self._write_local_logs(log_entries)
+    
+    def _write_local_logs(self, log_entries: List[Dict[str, Any]]) -> bool:
+        """Load, append and save the institution logs (caller holds _local_lock)"""
         try:
-            server_key = log_entry.get("server_key", self.server_key) or "default"
-            city = log_entry.get("city", "unknown")
-            institution = log_entry.get("institution", "unknown")
-            
-            # Create directory structure: logs/{server_key}/{city}/{institution}.json
-            city_dir = os.path.join(self.logs_dir, server_key, city)
-            os.makedirs(city_dir, exist_ok=True)
-            
-            institution_file = os.path.join(city_dir, f"{institution}.json")
+            by_file: Dict[str, List[Dict[str, Any]]] = {}
+            for log_entry in log_entries:
+                server_key = log_entry.get("server_key", self.server_key) or "default"
+                city = log_entry.get("city", "unknown")
+                institution = log_entry.get("institution", "unknown")
+                
+                # Create directory structure: logs/{server_key}/{city}/{institution}.json
+                city_dir = os.path.join(self.logs_dir, server_key, city)
+                institution_file = os.path.join(city_dir, f"{institution}.json")
+                by_file.setdefault(institution_file, []).append(log_entry)
             
-            # Load existing logs or create new array
-            if ENCRYPTION_ENABLED:
-                # Load encrypted if available, otherwise plain JSON
-                logs = load_protected_json(institution_file, decrypt=True)
-                if not isinstance(logs, list):
-                    logs = []
-            else:
-                if os.path.exists(institution_file):
-                    try:
-                        with open(institution_file, 'r', encoding='utf-8') as f:
-                            logs = json.load(f)
-                    except:
+            for institution_file, entries in by_file.items():
+                os.makedirs(os.path.dirname(institution_file), exist_ok=True)
+                
+                # Load existing logs or create new array
+                if ENCRYPTION_ENABLED:
+                    # Load encrypted if available, otherwise plain JSON
+                    logs = load_protected_json(institution_file, decrypt=True)
+                    if not isinstance(logs, list):
                         logs = []
                 else:
-                    logs = []
-            
-            # Append new log entry
-            logs.append(log_entry)
-            
-            # Save updated logs (encrypted if enabled)
-            if ENCRYPTION_ENABLED:
-                save_protected_json(institution_file, logs, encrypt=True)
-            else:
-                with open(institution_file, 'w', encoding='utf-8') as f:
-                    json.dump(logs, f, ensure_ascii=False, indent=2)
-            
-            enc_status = " (encrypted)" if ENCRYPTION_ENABLED else ""
-            print(f"💾 Log saved locally{enc_status}: {institution_file}")
+                    if os.path.exists(institution_file):
+                        try:
+                            with open(institution_file, 'r', encoding='utf-8') as f:
+                                logs = json.load(f)
+                        except:
+                            logs = []
+                    else:
+                        logs = []
+                
+                # Append new log entries
+                logs.extend(entries)
+                
+                # Save updated logs (encrypted if enabled)
+                if ENCRYPTION_ENABLED:
+                    save_protected_json(institution_file, logs, encrypt=True)
+                else:
+                    with open(institution_file, 'w', encoding='utf-8') as f:
+                        json.dump(logs, f, ensure_ascii=False, indent=2)
+                
+                enc_status = " (encrypted)" if ENCRYPTION_ENABLED else ""
+                logger.debug("💾 Log saved locally%s: %s (+%s)", enc_status, institution_file, len(entries))
             
             # Update global summary
-            self._update_global_summary(log_entry)
+            self._update_global_summary_many(log_entries)
             
             return True
         except Exception as e:
-            print(f"⚠️ Error saving local log: {e}")
+            logger.warning("⚠️ Error saving local log: %s", e)
             return False
 
     def _append_pending_log(self, log_entry: Dict[str, Any]) -> None:
@@ -109,7 +130,7 @@ class ActionLogger:
             with open(self.pending_queue_file, 'a', encoding='utf-8') as f:
                 f.write(json.dumps(log_entry, ensure_ascii=False) + "\n")
         except Exception as e:
-            print(f"⚠️ Error queueing pending log: {e}")
+            logger.warning("⚠️ Error queueing pending log: %s", e)
 
     def _read_pending_logs(self) -> list:
         """Read pending queue entries (JSONL)."""
@@ -130,7 +151,7 @@ class ActionLogger:
                     except Exception:
                         continue
         except Exception as e:
-            print(f"⚠️ Error reading pending queue: {e}")
+            logger.warning("⚠️ Error reading pending queue: %s", e)
         return pending
 
     def _write_pending_logs(self, pending: list) -> None:
@@ -145,10 +166,10 @@ class ActionLogger:
                 for item in pending:
                     f.write(json.dumps(item, ensure_ascii=False) + "\n")
         except Exception as e:
-            print(f"⚠️ Error writing pending queue: {e}")
+            logger.warning("⚠️ Error writing pending queue: %s", e)
 
-    def _send_to_supabase(self, log_entry: Dict[str, Any], retries: int = 3) -> bool:
-        """Send one log entry to Supabase with lightweight retry."""
+    def _send_to_supabase(self, log_entry: Union[Dict[str, Any], List[Dict[str, Any]]], retries: int = 3) -> bool:
+        """Send one log entry (or a list of entries - one bulk insert) to Supabase with lightweight retry."""
         url = f"{self.supabase_url}/rest/v1/{self.table_logs}"
 
         for attempt in range(1, retries + 1):
@@ -163,9 +184,9 @@ class ActionLogger:
                 if response.status_code in [201, 200]:
                     return True
 
-                print(f"⚠️ Supabase insert failed (attempt {attempt}/{retries}) - HTTP {response.status_code}: {response.text}")
+                logger.warning("⚠️ Supabase insert failed (attempt %s/%s) - HTTP %s: %s", attempt, retries, response.status_code, response.text)
             except requests.exceptions.RequestException as req_err:
-                print(f"⚠️ Supabase network error (attempt {attempt}/{retries}): {req_err}")
+                logger.warning("⚠️ Supabase network error (attempt %s/%s): %s", attempt, retries, req_err)
 
             if attempt < retries:
                 time.sleep(0.4 * attempt)
@@ -181,19 +202,34 @@ class ActionLogger:
         uploaded = 0
         remaining = []
 
-        for idx, entry in enumerate(pending):
-            if idx < max_items and self._send_to_supabase(entry, retries=2):
-                uploaded += 1
-            else:
-                remaining.append(entry)
+        batch = pending[:max_items]
+        if self._send_to_supabase(batch, retries=2):
+            uploaded = len(batch)
+            remaining = pending[max_items:]
+        else:
+            # Bulk insert rejected (e.g. one bad row): fall back to one entry at a time
+            for idx, entry in enumerate(pending):
+                if idx < max_items and self._send_to_supabase(entry, retries=1):
+                    uploaded += 1
+                else:
+                    remaining.append(entry)
 
         self._write_pending_logs(remaining)
         if uploaded:
-            print(f"✅ Flushed pending audit logs: {uploaded}")
+            logger.info("✅ Flushed pending audit logs: %s", uploaded)
         return uploaded
     
     def _update_global_summary(self, log_entry: Dict[str, Any]) -> bool:
         """Update global summary JSON with the action (encrypted)"""
+        return self._update_global_summary_many([log_entry])
+    
+    def _update_global_summary_many(self, log_entries: List[Dict[str, Any]]) -> bool:
+        """Update global summary JSON with several actions - one read, one write (encrypted)"""
+        with self._local_lock:
+            return self._write_global_summary(log_entries)
+    
+    def _write_global_summary(self, log_entries: List[Dict[str, Any]]) -> bool:
+        """Load, update and save SUMMARY_global (caller holds _local_lock)"""
         try:
             global_summary_file = f"{self.logs_dir}/SUMMARY_global.json"
             
@@ -224,54 +260,9 @@ class ActionLogger:
             if "total_actions" not in summary:
                 summary["total_actions"] = 0
             
-            # Add user if not already there
-            discord_id = log_entry.get("discord_id", "unknown")
-            discord_username = log_entry.get("discord_username", discord_id)
-            if discord_username not in summary.get("users_connected", []):
-                summary["users_connected"].append(discord_username)
-            
-            # Add city modification (safe check)
-            city = log_entry.get("city", "unknown")
-            if city and city != "unknown":
-                if city not in summary["cities_modified"]:
-                    summary["cities_modified"][city] = {
-                        "added": [],
-                        "deleted": [],
-                        "edited": []
-                    }
+            for log_entry in log_entries:
+                self._apply_to_summary(summary, log_entry)
             
-            # Add institution modification (safe check)
-            server_key = log_entry.get("server_key", self.server_key) or "default"
-            institution = log_entry.get("institution", "unknown")
-            if city and city != "unknown" and institution and institution != "unknown":
-                inst_key = f"{server_key}/{city}/{institution}"
-                if inst_key not in summary["institutions_modified"]:
-                    summary["institutions_modified"][inst_key] = {
-                        "server_key": server_key,
-                        "city": city,
-                        "institution": institution,
-                        "actions": []
-                    }
-                
-                # Track action with Discord username for display
-                action_type = log_entry.get("action_type", "unknown")
-                details = log_entry.get("details", "")
-                changes = log_entry.get("changes", "")
-                timestamp = log_entry.get("timestamp", "")
-                
-                action_entry = {
-                    "timestamp": timestamp,
-                    "discord_id": discord_id,
-                    "discord_username": discord_username,
-                    "server_key": server_key,
-                    "action": action_type,
-                    "details": details,
-                    "changes": changes
-                }
-                
-                summary["institutions_modified"][inst_key]["actions"].append(action_entry)
-            
-            summary["total_actions"] = summary.get("total_actions", 0) + 1
             summary["updated_at"] = datetime.now().isoformat()
             
             # Save updated summary (encrypted if enabled)
@@ -281,14 +272,63 @@ class ActionLogger:
                 with open(global_summary_file, 'w', encoding='utf-8') as f:
                     json.dump(summary, f, ensure_ascii=False, indent=2)
             
-            print(f"📊 Global summary updated: {global_summary_file}")
+            logger.debug("📊 Global summary updated: %s", global_summary_file)
             return True
         except Exception as e:
-            print(f"⚠️ Error updating global summary: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("⚠️ Error updating global summary: %s", e)
             return False
     
+    def _apply_to_summary(self, summary: Dict[str, Any], log_entry: Dict[str, Any]):
+        """Add one action to the in-memory summary"""
+        # Add user if not already there
+        discord_id = log_entry.get("discord_id", "unknown")
+        discord_username = log_entry.get("discord_username", discord_id)
+        if discord_username not in summary.get("users_connected", []):
+            summary["users_connected"].append(discord_username)
+        
+        # Add city modification (safe check)
+        city = log_entry.get("city", "unknown")
+        if city and city != "unknown":
+            if city not in summary["cities_modified"]:
+                summary["cities_modified"][city] = {
+                    "added": [],
+                    "deleted": [],
+                    "edited": []
+                }
+        
+        # Add institution modification (safe check)
+        server_key = log_entry.get("server_key", self.server_key) or "default"
+        institution = log_entry.get("institution", "unknown")
+        if city and city != "unknown" and institution and institution != "unknown":
+            inst_key = f"{server_key}/{city}/{institution}"
+            if inst_key not in summary["institutions_modified"]:
+                summary["institutions_modified"][inst_key] = {
+                    "server_key": server_key,
+                    "city": city,
+                    "institution": institution,
+                    "actions": []
+                }
+            
+            # Track action with Discord username for display
+            action_type = log_entry.get("action_type", "unknown")
+            details = log_entry.get("details", "")
+            changes = log_entry.get("changes", "")
+            timestamp = log_entry.get("timestamp", "")
+            
+            action_entry = {
+                "timestamp": timestamp,
+                "discord_id": discord_id,
+                "discord_username": discord_username,
+                "server_key": server_key,
+                "action": action_type,
+                "details": details,
+                "changes": changes
+            }
+            
+            summary["institutions_modified"][inst_key]["actions"].append(action_entry)
+        
+        summary["total_actions"] = summary.get("total_actions", 0) + 1
+    
     def _log_action(self, 
                    discord_id: str,
                    action_type: str,
@@ -316,49 +356,67 @@ class ActionLogger:
         Returns:
             bool: True if logged successfully
         """
+        log_entry = self._build_log_entry(
+            discord_id, action_type, city, institution_name, details,
+            discord_username=discord_username, entity_name=entity_name,
+            entity_id=entity_id, changes=changes
+        )
+        return self._log_entries([log_entry])
+    
+    def _build_log_entry(self, discord_id: str, action_type: str, city: str,
+                         institution_name: str, details: str, discord_username: str = "",
+                         entity_name: str = "", entity_id: str = "", changes: str = "") -> Dict[str, Any]:
+        """Create log entry with detailed information"""
+        current_server_key = (
+            os.getenv("PUNCTAJ_SERVER_KEY", "").strip()
+            or self.server_key
+            or "default"
+        )
+        self.server_key = current_server_key
+        
+        return {
+            "discord_id": discord_id,
+            "discord_username": discord_username or discord_id,  # Fallback to ID if no username
+            "server_key": current_server_key,
+            "action_type": action_type,
+            "city": city,
+            "institution": institution_name,
+            "entity_name": entity_name,  # Name of what was modified
+            "entity_id": entity_id,      # ID of what was modified (e.g., NUME_IC)
+            "details": details,
+            "changes": changes,          # Detailed change description
+            "timestamp": datetime.now().isoformat()
+        }
+    
+    def _log_entries(self, log_entries: List[Dict[str, Any]]) -> bool:
+        """Save entries locally (one write) and send them to Supabase (one bulk insert)"""
+        if not log_entries:
+            return True
         try:
-            current_server_key = (
-                os.getenv("PUNCTAJ_SERVER_KEY", "").strip()
-                or self.server_key
-                or "default"
-            )
-            self.server_key = current_server_key
-            
-            # Create log entry with detailed information
-            log_entry = {
-                "discord_id": discord_id,
-                "discord_username": discord_username or discord_id,  # Fallback to ID if no username
-                "server_key": current_server_key,
-                "action_type": action_type,
-                "city": city,
-                "institution": institution_name,
-                "entity_name": entity_name,  # Name of what was modified
-                "entity_id": entity_id,      # ID of what was modified (e.g., NUME_IC)
-                "details": details,
-                "changes": changes,          # Detailed change description
-                "timestamp": datetime.now().isoformat()
-            }
-            
-            print(f"📝 Logging: {action_type} | User: {discord_username or discord_id} | Entity: {entity_name} | Table: {self.table_logs}")
+            for log_entry in log_entries:
+                logger.debug("📝 Logging: %s | User: %s | Entity: %s | Table: %s",
+                             log_entry['action_type'], log_entry['discord_username'], log_entry['entity_name'], self.table_logs)
             
             # Save locally first
-            local_ok = self._save_local_log(log_entry)
+            local_ok = self._save_local_logs(log_entries)
 
-            # Try to flush older pending logs first, then this new entry
+            # Try to flush older pending logs first, then the new entries
             self.flush_pending_logs(max_items=50)
 
-            if self._send_to_supabase(log_entry, retries=3):
-                print(f"✅ Log SUCCESS: {action_type} in {city}/{institution_name}")
+            payload = log_entries[0] if len(log_entries) == 1 else log_entries
+            if self._send_to_supabase(payload, retries=3):
+                first = log_entries[0]
+                logger.info("✅ Log SUCCESS: %s in %s/%s (%s entries)",
+                            first['action_type'], first['city'], first['institution'], len(log_entries))
                 return True
 
             # Keep eventual-consistency queue if cloud insert fails now
-            self._append_pending_log(log_entry)
-            print("⚠️ Log queued for retry (_pending_audit_logs.jsonl)")
+            for log_entry in log_entries:
+                self._append_pending_log(log_entry)
+            logger.warning("⚠️ Log queued for retry (_pending_audit_logs.jsonl)")
             return local_ok
         except Exception as e:
-            print(f"❌ Error logging action: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("❌ Error logging action: %s", e)
             return False
     
     def log_add_employee(self, discord_id: str, city: str, institution_name: str, 
@@ -397,6 +455,32 @@ class ActionLogger:
             changes=changes_desc
         )
     
+    def log_edit_points_bulk(self, discord_id: str, city: str, institution_name: str,
+                             changes: List[Dict[str, Any]], action: str = "",
+                             discord_username: str = "") -> bool:
+        """
+        Log one points edit applied to several employees as a single batch
+        
+        Args:
+            changes: [{"employee_name", "old_points", "new_points", "entity_id"}, ...]
+        """
+        suffix = f" ({action})" if action else ""
+        log_entries = [
+            self._build_log_entry(
+                discord_id,
+                "edit_points",
+                city,
+                institution_name,
+                f"{change.get('employee_name', '')}: {change.get('old_points')} → {change.get('new_points')}{suffix}",
+                discord_username=discord_username,
+                entity_name=change.get("employee_name", ""),
+                entity_id=change.get("entity_id", ""),
+                changes=f"Points: {change.get('old_points')} → {change.get('new_points')}{suffix}"
+            )
+            for change in changes
+        ]
+        return self._log_entries(log_entries)
+    
     def log_delete_employee(self, discord_id: str, city: str, institution_name: str,
                           employee_name: str, employee_data: Dict[str, Any],
                           discord_username: str = "") -> bool:
@@ -478,13 +562,13 @@ class ActionLogger:
             
             response = requests.post(url, json=permission_entry, headers=headers, timeout=10)
             if response.status_code in [200, 201]:
-                print(f"✅ Permission change saved to permission_changes table: {target_user}")
+                logger.info("✅ Permission change saved to permission_changes table: %s", target_user)
                 return True
             else:
-                print(f"⚠️ Failed to save to permission_changes table: {response.status_code} - {response.text}")
+                logger.warning("⚠️ Failed to save to permission_changes table: %s - %s", response.status_code, response.text)
                 return False
         except Exception as e:
-            print(f"⚠️ Error saving to permission_changes table: {e}")
+            logger.warning("⚠️ Error saving to permission_changes table: %s", e)
             return False
     
     def log_edit_employee_safe(self, discord_id: str, city: str, institution_name: str,
@@ -576,11 +660,8 @@ class ActionLogger:
         Returns:
             bool: True if logged successfully
         """
-        print(f"\n🔔 LOG_ACTION CALLED:")
-        print(f"   File: {file_path}")
-        print(f"   User: {discord_username} ({discord_id})")
-        print(f"   Action: {action_type}")
-        print(f"   Details: {details}")
+        logger.debug("🔔 LOG_ACTION CALLED: file=%s user=%s (%s) action=%s details=%s",
+                     file_path, discord_username, discord_id, action_type, details)
         
         return self._log_action(
             discord_id=discord_id,
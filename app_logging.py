@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+App Logging - structured, level-gated logging for the hot paths
+Replaces per-row print() calls (supabase_upload, SupabaseSync.sync_data,
+reset_punctaj, deduplicate_rows, ActionLogger, table refresh)
+
+    levels    -> per-module verbosity from logging_config.ini ([loggers] section)
+    lazy      -> callers use logger.debug("... %s", value): nothing is formatted
+                 when the level is off (production default: per-row = DEBUG, off)
+    queue     -> QueueHandler on the root logger; the caller never blocks on I/O
+    listener  -> one background thread writes to a rotating file (+ optional console)
+
+logging_config.ini:
+    [logging]
+    level = WARNING              ; root level
+    file = logs/punctaj_app.log  ; relative to the base dir
+    max_bytes = 2097152
+    backup_count = 3
+    console = auto               ; auto = only when not frozen and stdout exists
+    console_level = INFO
+
+    [loggers]
+    punctaj = INFO
+    supabase_sync = WARNING
+"""
+
+import os
+import sys
+import queue
+import atexit
+import logging
+import threading
+import configparser
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Optional
+
+DEFAULT_CONFIG_NAME = "logging_config.ini"
+LOG_FORMAT = "%(asctime)s %(levelname)-7s %(name)s [%(threadName)s] %(message)s"
+
+_LISTENER: Optional[QueueListener] = None
+_QUEUE_HANDLER: Optional[QueueHandler] = None
+_LOCK = threading.Lock()
+
+
+def get_logger(name: str) -> logging.Logger:
+    """Module logger - same as logging.getLogger, kept for one import point"""
+    return logging.getLogger(name)
+
+
+def _level(value: str, default: int) -> int:
+    value = (value or "").strip().upper()
+    if value.isdigit():
+        return int(value)
+    level = logging.getLevelName(value)
+    return level if isinstance(level, int) else default
+
+
+def _console_wanted(setting: str) -> bool:
+    setting = (setting or "auto").strip().lower()
+    if setting in ("1", "true", "yes", "on"):
+        return True
+    if setting in ("0", "false", "no", "off"):
+        return False
+    # auto: windowed / frozen builds have no usable console
+    return not getattr(sys, "frozen", False) and sys.stdout is not None
+
+
+def load_logging_config(config_path: Optional[str] = None, base_dir: Optional[str] = None) -> configparser.ConfigParser:
+    config = configparser.ConfigParser(inline_comment_prefixes=(";", "#"))
+    config.read_dict({"logging": {
+        "level": "WARNING",
+        "file": os.path.join("logs", "punctaj_app.log"),
+        "max_bytes": str(2 * 1024 * 1024),
+        "backup_count": "3",
+        "console": "auto",
+        "console_level": "INFO",
+    }, "loggers": {}})
+    base_dir = base_dir or os.path.dirname(os.path.abspath(__file__))
+    candidates = [config_path] if config_path else [
+        os.path.join(getattr(sys, "_MEIPASS", base_dir), DEFAULT_CONFIG_NAME),
+        os.path.join(base_dir, DEFAULT_CONFIG_NAME),
+    ]
+    for path in candidates:
+        if path and os.path.exists(path):
+            config.read(path, encoding="utf-8")
+    return config
+
+
+def setup_logging(config_path: Optional[str] = None, base_dir: Optional[str] = None,
+                  env_level: str = "PUNCTAJ_LOG_LEVEL") -> Optional[QueueListener]:
+    """
+    Install the queue handler + background listener (idempotent)
+    $PUNCTAJ_LOG_LEVEL overrides the root level (e.g. DEBUG while debugging)
+    """
+    global _LISTENER, _QUEUE_HANDLER
+    with _LOCK:
+        if _LISTENER is not None:
+            return _LISTENER
+
+        base_dir = base_dir or os.path.dirname(os.path.abspath(__file__))
+        config = load_logging_config(config_path, base_dir)
+        section = config["logging"]
+
+        handlers = []
+        formatter = logging.Formatter(LOG_FORMAT)
+        log_file = section.get("file", "").strip()
+        if log_file:
+            if not os.path.isabs(log_file):
+                log_file = os.path.join(base_dir, log_file)
+            try:
+                os.makedirs(os.path.dirname(log_file), exist_ok=True)
+                file_handler = RotatingFileHandler(
+                    log_file,
+                    maxBytes=section.getint("max_bytes", 2 * 1024 * 1024),
+                    backupCount=section.getint("backup_count", 3),
+                    encoding="utf-8",
+                    delay=True,
+                )
+                file_handler.setFormatter(formatter)
+                handlers.append(file_handler)
+            except OSError as e:
+                print(f"⚠️ Log file unavailable ({log_file}): {e}")
+
+        if _console_wanted(section.get("console", "auto")):
+            console = logging.StreamHandler(sys.stdout)
+            console.setLevel(_level(section.get("console_level", "INFO"), logging.INFO))
+            console.setFormatter(logging.Formatter("%(message)s"))
+            handlers.append(console)
+
+        root_logger = logging.getLogger()
+        root_level = os.getenv(env_level, "").strip() or section.get("level", "WARNING")
+        root_logger.setLevel(_level(root_level, logging.WARNING))
+        for name, value in config["loggers"].items():
+            logging.getLogger(name).setLevel(_level(value, logging.WARNING))
+
+        _QUEUE_HANDLER = QueueHandler(queue.SimpleQueue())
+        root_logger.addHandler(_QUEUE_HANDLER)
+        _LISTENER = QueueListener(_QUEUE_HANDLER.queue, *handlers, respect_handler_level=True)
+        _LISTENER.start()
+        atexit.register(shutdown_logging)
+        return _LISTENER
+
+
+def shutdown_logging():
+    """Flush queued records and stop the listener thread"""
+    global _LISTENER, _QUEUE_HANDLER
+    with _LOCK:
+        if _LISTENER is None:
+            return
+        _LISTENER.stop()
+        for handler in _LISTENER.handlers:
+            try:
+                handler.close()
+            except Exception:
+                pass
+        logging.getLogger().removeHandler(_QUEUE_HANDLER)
+        _LISTENER = None
+        _QUEUE_HANDLER = None
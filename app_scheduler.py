@@ -0,0 +1,427 @@
+#!/usr/bin/env python3
+"""
+App Scheduler - one shared timer thread for all periodic jobs
+Replaces the per-module sleep loops (backup, multi-device sync, permission
+monitoring, git sync, weekly report, monthly reset check)
+
+- heap of next-fire times: the thread sleeps until the next job is due
+- interval / weekly / monthly triggers with next-fire-time computation
+- optional jitter per job
+- catch-up policy for calendar jobs missed while the app was closed
+  ("run_once": run one coalesced catch-up at startup, "skip": wait for next)
+- catch-up grace window: a fire missed longer ago than `catch_up_grace`
+  seconds is not run; it is logged and handed to `on_missed` once instead
+- last_run of a calendar job is persisted only after a successful run, so a
+  failed run is retried at the next start
+- per-job run statistics (runs, failures, missed, durations, last error)
+"""
+
+import os
+import json
+import heapq
+import random
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Any, Optional
+
+from atomic_io import atomic_write_json
+
+try:
+    from zoneinfo import ZoneInfo
+except ImportError:
+    ZoneInfo = None
+
+# Upper bound for a single wait: keeps wall-clock drift / system suspend in check
+MAX_WAIT_SECONDS = 3600
+
+
+def _zone(tz: Optional[str]):
+    if not tz or ZoneInfo is None:
+        return None
+    try:
+        return ZoneInfo(tz)
+    except Exception:
+        return None
+
+
+# ==================== TRIGGERS ====================
+
+class IntervalTrigger:
+    """Every N seconds"""
+
+    calendar = False
+
+    def __init__(self, seconds: float):
+        self.seconds = float(seconds)
+
+    def next_fire(self, after: datetime) -> datetime:
+        return after + timedelta(seconds=self.seconds)
+
+    def previous_fire(self, before: datetime) -> Optional[datetime]:
+        return None
+
+    def __repr__(self):
+        return f"every {self.seconds:g}s"
+
+
+class OnceTrigger:
+    """Single run; the job is dropped after it fires"""
+
+    calendar = False
+    once = True
+
+    def next_fire(self, after: datetime) -> datetime:
+        return after
+
+    def previous_fire(self, before: datetime) -> Optional[datetime]:
+        return None
+
+    def __repr__(self):
+        return "once"
+
+
+class _CalendarTrigger:
+    """Wall-clock trigger, evaluated in `tz` (IANA name) or local time"""
+
+    calendar = True
+
+    def __init__(self, hour: int = 0, minute: int = 0, tz: Optional[str] = None):
+        self.hour = hour
+        self.minute = minute
+        self.tz = _zone(tz)
+
+    def _local(self, moment: datetime) -> datetime:
+        if self.tz is None:
+            return moment.astimezone().replace(tzinfo=None) if moment.tzinfo else moment
+        return moment.astimezone(self.tz) if moment.tzinfo else moment.astimezone().astimezone(self.tz)
+
+
+class WeeklyTrigger(_CalendarTrigger):
+    """Every week on `weekday` (0 = Monday) at hour:minute"""
+
+    def __init__(self, weekday: int = 0, hour: int = 0, minute: int = 0, tz: Optional[str] = None):
+        super().__init__(hour, minute, tz)
+        self.weekday = weekday
+
+    def _candidate(self, moment: datetime) -> datetime:
+        day = moment - timedelta(days=(moment.weekday() - self.weekday) % 7)
+        return day.replace(hour=self.hour, minute=self.minute, second=0, microsecond=0)
+
+    def next_fire(self, after: datetime) -> datetime:
+        local = self._local(after)
+        candidate = self._candidate(local)
+        if candidate <= local:
+            candidate += timedelta(days=7)
+        return candidate
+
+    def previous_fire(self, before: datetime) -> Optional[datetime]:
+        local = self._local(before)
+        candidate = self._candidate(local)
+        if candidate > local:
+            candidate -= timedelta(days=7)
+        return candidate
+
+    def __repr__(self):
+        return f"weekly day={self.weekday} {self.hour:02d}:{self.minute:02d}"
+
+
+class MonthlyTrigger(_CalendarTrigger):
+    """Every month on `day` (1-28) at hour:minute"""
+
+    def __init__(self, day: int = 1, hour: int = 0, minute: int = 0, tz: Optional[str] = None):
+        super().__init__(hour, minute, tz)
+        self.day = day
+
+    def _in_month(self, year: int, month: int, like: datetime) -> datetime:
+        return like.replace(year=year, month=month, day=self.day, hour=self.hour,
+                            minute=self.minute, second=0, microsecond=0)
+
+    def next_fire(self, after: datetime) -> datetime:
+        local = self._local(after)
+        candidate = self._in_month(local.year, local.month, local)
+        if candidate <= local:
+            year, month = (local.year + 1, 1) if local.month == 12 else (local.year, local.month + 1)
+            candidate = self._in_month(year, month, local)
+        return candidate
+
+    def previous_fire(self, before: datetime) -> Optional[datetime]:
+        local = self._local(before)
+        candidate = self._in_month(local.year, local.month, local)
+        if candidate > local:
+            year, month = (local.year - 1, 12) if local.month == 1 else (local.year, local.month - 1)
+            candidate = self._in_month(year, month, local)
+        return candidate
+
+    def __repr__(self):
+        return f"monthly day={self.day} {self.hour:02d}:{self.minute:02d}"
+
+
+# ==================== JOBS ====================
+
+class ScheduledJob:
+    """A registered job plus its run statistics"""
+
+    def __init__(self, name: str, func: Callable[[], Any], trigger, jitter: float = 0.0,
+                 catch_up: str = "run_once", catch_up_grace: Optional[float] = None,
+                 on_missed: Optional[Callable[[datetime], Any]] = None):
+        self.name = name
+        self.func = func
+        self.trigger = trigger
+        self.jitter = max(0.0, float(jitter))
+        self.catch_up = catch_up
+        self.catch_up_grace = catch_up_grace
+        self.on_missed = on_missed
+        self.next_run: Optional[float] = None
+        self.cancelled = False
+        self.stats = {
+            "runs": 0,
+            "failures": 0,
+            "missed": 0,
+            "last_run": None,
+            "last_duration_ms": None,
+            "total_duration_ms": 0.0,
+            "last_error": None,
+        }
+
+    def schedule_from(self, moment: datetime) -> float:
+        fire = self.trigger.next_fire(moment)
+        delay = random.uniform(0, self.jitter) if self.jitter else 0.0
+        return fire.timestamp() + delay
+
+    def __lt__(self, other):
+        return self.name < other.name
+
+
+class AppScheduler:
+    """
+    Single-thread scheduler
+
+    Usage:
+        scheduler = get_default_scheduler()
+        scheduler.add_job("backup", backup.create_backup, IntervalTrigger(300), run_immediately=True)
+        scheduler.add_job("monthly_reset", reset_all, MonthlyTrigger(day=1), catch_up="run_once",
+                          catch_up_grace=24 * 3600, on_missed=ask_user)
+    """
+
+    def __init__(self, state_file: Optional[str] = None):
+        self.state_file = state_file
+        self._jobs: Dict[str, ScheduledJob] = {}
+        self._heap = []
+        self._seq = 0
+        self._cond = threading.Condition()
+        self._thread = None
+        self._running = False
+        self._state = self._load_state()
+        self.wakeups = 0
+
+    # ==================== STATE (catch-up) ====================
+
+    def _load_state(self) -> Dict[str, Any]:
+        if self.state_file and os.path.exists(self.state_file):
+            try:
+                with open(self.state_file, "r", encoding="utf-8") as f:
+                    return json.load(f)
+            except Exception:
+                pass
+        return {}
+
+    def _save_state(self):
+        if not self.state_file:
+            return
+        try:
+            atomic_write_json(self.state_file, self._state, indent=2, verify=False)
+        except Exception as e:
+            print(f"⚠️ Scheduler state not saved: {e}")
+
+    def set_state_file(self, state_file: str):
+        """Attach persistent last-run state (needed for catch-up of calendar jobs)"""
+        with self._cond:
+            self.state_file = state_file
+            self._state.update(self._load_state())
+
+    # ==================== JOB API ====================
+
+    def add_job(self, name: str, func: Callable[[], Any], trigger, jitter: float = 0.0,
+                catch_up: str = "run_once", run_immediately: bool = False,
+                catch_up_grace: Optional[float] = None,
+                on_missed: Optional[Callable[[datetime], Any]] = None) -> ScheduledJob:
+        """
+        Register (or replace) a job by name
+
+        catch_up_grace: max seconds after a missed calendar fire in which the
+                        catch-up still runs (None = no limit)
+        on_missed:      called once with the missed fire time when it is too old
+                        to catch up (on the caller's thread)
+        """
+        job = ScheduledJob(name, func, trigger, jitter=jitter, catch_up=catch_up,
+                           catch_up_grace=catch_up_grace, on_missed=on_missed)
+        now = datetime.now().astimezone()
+        report_missed = None
+
+        with self._cond:
+            old = self._jobs.get(name)
+            if old:
+                old.cancelled = True
+            self._jobs[name] = job
+
+            due_now = run_immediately
+            if trigger.calendar:
+                last_run = self._state.get(name, {}).get("last_run")
+                previous = trigger.previous_fire(now)
+                if last_run is None:
+                    # First registration: baseline, nothing to catch up
+                    self._state.setdefault(name, {})["last_run"] = now.timestamp()
+                    self._save_state()
+                elif previous is not None and last_run < previous.timestamp():
+                    job.stats["missed"] += 1
+                    late = now.timestamp() - previous.timestamp()
+                    if catch_up_grace is not None and late > catch_up_grace:
+                        report_missed = self._record_missed(job, previous)
+                    elif catch_up == "run_once":
+                        due_now = True
+
+            job.next_run = time.time() if due_now else job.schedule_from(now)
+            self._push(job)
+            self._cond.notify()
+
+        if report_missed is not None and on_missed:
+            try:
+                on_missed(report_missed)
+            except Exception as e:
+                print(f"⚠️ on_missed for '{name}' failed: {e}")
+        return job
+
+    def _record_missed(self, job: ScheduledJob, fire: datetime) -> Optional[datetime]:
+        """Log a fire that is too old to catch up; returns it if not reported before"""
+        print(f"⏭️ Scheduled job '{job.name}' missed its run at {fire.isoformat()} "
+              f"(outside the catch-up window) - not run")
+        entry = self._state.setdefault(job.name, {})
+        if entry.get("missed_fire") == fire.timestamp():
+            return None
+        entry["missed_fire"] = fire.timestamp()
+        self._save_state()
+        return fire
+
+    def run_soon(self, name: str, func: Callable[[], Any], delay: float = 0.0) -> ScheduledJob:
+        """One-off job on the scheduler thread (keeps slow startup work off the UI thread)"""
+        job = ScheduledJob(name, func, OnceTrigger())
+        with self._cond:
+            old = self._jobs.get(name)
+            if old:
+                old.cancelled = True
+            self._jobs[name] = job
+            job.next_run = time.time() + max(0.0, delay)
+            self._push(job)
+            self._cond.notify()
+        return job
+
+    def cancel_job(self, name: str):
+        with self._cond:
+            job = self._jobs.pop(name, None)
+            if job:
+                job.cancelled = True
+                self._cond.notify()
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        with self._cond:
+            return {
+                name: dict(job.stats, trigger=repr(job.trigger),
+                           next_run=datetime.fromtimestamp(job.next_run).isoformat() if job.next_run else None)
+                for name, job in self._jobs.items()
+            }
+
+    def _push(self, job: ScheduledJob):
+        self._seq += 1
+        heapq.heappush(self._heap, (job.next_run, self._seq, job))
+
+    # ==================== LOOP ====================
+
+    def start(self):
+        with self._cond:
+            if self._running:
+                return
+            self._running = True
+            self._thread = threading.Thread(target=self._loop, daemon=True, name="AppScheduler")
+            self._thread.start()
+
+    def stop(self, timeout: float = 5):
+        with self._cond:
+            self._running = False
+            self._cond.notify()
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout=timeout)
+
+    def _next_due(self) -> Optional[ScheduledJob]:
+        """Wait until the earliest job is due; returns it (or None when stopping)"""
+        with self._cond:
+            while self._running:
+                while self._heap and self._heap[0][2].cancelled:
+                    heapq.heappop(self._heap)
+                if not self._heap:
+                    self._cond.wait()
+                    self.wakeups += 1
+                    continue
+                fire_at, _, job = self._heap[0]
+                delay = fire_at - time.time()
+                if delay <= 0:
+                    heapq.heappop(self._heap)
+                    return job
+                self._cond.wait(timeout=min(delay, MAX_WAIT_SECONDS))
+                self.wakeups += 1
+            return None
+
+    def _run(self, job: ScheduledJob):
+        started = time.perf_counter()
+        ok = True
+        try:
+            job.func()
+        except Exception as e:
+            ok = False
+            job.stats["failures"] += 1
+            job.stats["last_error"] = str(e)
+            print(f"⚠️ Scheduled job '{job.name}' failed: {e}")
+        duration_ms = (time.perf_counter() - started) * 1000
+        now = datetime.now().astimezone()
+
+        with self._cond:
+            job.stats["runs"] += 1
+            job.stats["last_run"] = now.isoformat()
+            job.stats["last_duration_ms"] = round(duration_ms, 2)
+            job.stats["total_duration_ms"] = round(job.stats["total_duration_ms"] + duration_ms, 2)
+            if job.trigger.calendar:
+                # A failed run keeps the old last_run: the next start catches it up again
+                entry = self._state.setdefault(job.name, {})
+                if ok:
+                    entry["last_run"] = now.timestamp()
+                    entry.pop("last_failure", None)
+                else:
+                    entry["last_failure"] = now.timestamp()
+                self._save_state()
+            if getattr(job.trigger, "once", False):
+                if self._jobs.get(job.name) is job:
+                    del self._jobs[job.name]
+            elif not job.cancelled:
+                job.next_run = job.schedule_from(now)
+                self._push(job)
+
+    def _loop(self):
+        while True:
+            job = self._next_due()
+            if job is None:
+                return
+            self._run(job)
+
+
+_DEFAULT_SCHEDULER: Optional[AppScheduler] = None
+_DEFAULT_LOCK = threading.Lock()
+
+
+def get_default_scheduler() -> AppScheduler:
+    """Process-wide scheduler, started on first use"""
+    global _DEFAULT_SCHEDULER
+    with _DEFAULT_LOCK:
+        if _DEFAULT_SCHEDULER is None:
+            _DEFAULT_SCHEDULER = AppScheduler()
+            _DEFAULT_SCHEDULER.start()
+        return _DEFAULT_SCHEDULER
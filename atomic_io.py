@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Atomic file writes for local JSON data
+Temp file in the same folder + fsync + os.replace, so readers never see a torn file
+Temp names are unique (mkstemp): two threads writing the same path never share a temp file
+"""
+
+import os
+import json
+import stat
+import hashlib
+import tempfile
+from contextlib import contextmanager
+from typing import Any, BinaryIO, Iterator, Optional
+
+
+def sha256_bytes(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def _open_temp(path: str):
+    """Unique temp file next to path -> (binary file object, temp path)"""
+    folder = os.path.dirname(os.path.abspath(path))
+    os.makedirs(folder, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(prefix=f".{os.path.basename(path)}.", suffix=".tmp", dir=folder)
+    # mkstemp creates 0600 - keep the target's mode (or the usual 0644) after os.replace
+    try:
+        mode = stat.S_IMODE(os.stat(path).st_mode) if os.path.exists(path) else 0o644
+        os.chmod(tmp_path, mode)
+    except OSError:
+        pass
+    return os.fdopen(fd, "wb"), tmp_path
+
+
+def atomic_write_bytes(path: str, payload: bytes, verify: bool = True) -> str:
+    """
+    Write bytes atomically and return their SHA-256
+    With verify=True the temp file is re-hashed before it replaces the target
+    """
+    checksum = sha256_bytes(payload)
+    f, tmp_path = _open_temp(path)
+
+    try:
+        with f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+
+        if verify:
+            with open(tmp_path, "rb") as f:
+                if sha256_bytes(f.read()) != checksum:
+                    raise IOError(f"Checksum mismatch while writing {path}")
+
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+    return checksum
+
+
+def atomic_write_json(path: str, data: Any, indent: Optional[int] = 4, verify: bool = True) -> str:
+    """
+    Serialize and write JSON atomically, returns the SHA-256 of the written bytes
+    indent=None writes compact JSON
+    """
+    if indent is None:
+        text = json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+    else:
+        text = json.dumps(data, ensure_ascii=False, indent=indent)
+    return atomic_write_bytes(path, text.encode("utf-8"), verify=verify)
+
+
+@contextmanager
+def atomic_writer(path: str) -> Iterator[BinaryIO]:
+    """
+    Streaming variant of atomic_write_bytes for payloads built chunk by chunk
+    The target is replaced only when the with-block finishes without an exception
+    """
+    f, tmp_path = _open_temp(path)
+    try:
+        with f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
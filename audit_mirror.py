@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Audit log mirror - local, incremental copy of the Supabase audit_logs table
+
+    sync      -> only rows with id > last mirrored id, page by page (id.asc)
+    store     -> SQLite (WAL) with time / server / city+institution indexes
+    retention -> rows older than retention_days are dropped after each sync
+    query     -> filters of the Activity Logs viewer, works offline
+
+Replaces data/audit_logs.json (the last 1000 rows, rewritten on every sync)
+"""
+
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List, Optional
+
+import requests
+
+AUDIT_MIRROR_FILE = "audit_logs.db"
+DEFAULT_RETENTION_DAYS = 90
+DEFAULT_PAGE_SIZE = 1000
+
+# Columns fetched from audit_logs (initialize_supabase_tables.py) - no select=*
+COLUMNS = ["id", "timestamp", "server_key", "city", "institution", "action_type",
+           "discord_id", "discord_username", "entity_name", "details", "created_at"]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS audit_logs (
+    id INTEGER PRIMARY KEY,
+    timestamp TEXT,
+    server_key TEXT,
+    city TEXT,
+    institution TEXT,
+    action_type TEXT,
+    discord_id TEXT,
+    discord_username TEXT,
+    entity_name TEXT,
+    details TEXT,
+    created_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_audit_time ON audit_logs(timestamp);
+CREATE INDEX IF NOT EXISTS idx_audit_server_time ON audit_logs(server_key, timestamp);
+CREATE INDEX IF NOT EXISTS idx_audit_institution_time ON audit_logs(city, institution, timestamp);
+CREATE TABLE IF NOT EXISTS mirror_state (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+class AuditLogMirror:
+    """Append-only audit log copy with a last-id watermark"""
+
+    def __init__(self, db_path: str, retention_days: Optional[int] = DEFAULT_RETENTION_DAYS):
+        self.db_path = str(db_path)
+        self.retention_days = retention_days
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+    # ==================== STATE ====================
+
+    def _state(self, key: str) -> Optional[str]:
+        row = self.conn.execute("SELECT value FROM mirror_state WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_state(self, key: str, value):
+        self.conn.execute("INSERT INTO mirror_state (key, value) VALUES (?, ?) "
+                          "ON CONFLICT(key) DO UPDATE SET value = excluded.value", (key, str(value)))
+
+    def last_id(self) -> int:
+        """Highest id ever mirrored (kept after retention drops the row)"""
+        with self._lock:
+            return int(self._state("last_id") or 0)
+
+    def count(self) -> int:
+        with self._lock:
+            return self.conn.execute("SELECT COUNT(*) FROM audit_logs").fetchone()[0]
+
+    def cutoff(self) -> Optional[str]:
+        if not self.retention_days:
+            return None
+        moment = datetime.now(timezone.utc) - timedelta(days=self.retention_days)
+        return moment.strftime("%Y-%m-%dT%H:%M:%S")
+
+    # ==================== WRITE ====================
+
+    def append(self, rows: List[Dict]) -> int:
+        """Insert rows (ids already mirrored are ignored) and advance the watermark"""
+        values = [tuple(self._text(row.get(c)) if c != "id" else int(row["id"]) for c in COLUMNS)
+                  for row in rows if row.get("id") is not None]
+        if not values:
+            return 0
+        with self._lock, self.conn:
+            before = self.conn.total_changes
+            self.conn.executemany(
+                f"INSERT OR IGNORE INTO audit_logs ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))})",
+                values)
+            inserted = self.conn.total_changes - before
+            last = max(int(self._state("last_id") or 0), max(v[0] for v in values))
+            self._set_state("last_id", last)
+        return inserted
+
+    @staticmethod
+    def _text(value):
+        if value is None or isinstance(value, str):
+            return value
+        return json.dumps(value, ensure_ascii=False) if isinstance(value, (dict, list)) else str(value)
+
+    def prune(self) -> int:
+        """Drop rows older than the retention window"""
+        cutoff = self.cutoff()
+        if cutoff is None:
+            return 0
+        with self._lock, self.conn:
+            return self.conn.execute("DELETE FROM audit_logs WHERE timestamp < ?", (cutoff,)).rowcount
+
+    def sync(self, fetch_page: Callable[[int, int, Optional[str]], List[Dict]],
+             page_size: int = DEFAULT_PAGE_SIZE) -> Dict[str, int]:
+        """
+        Pull new rows: fetch_page(after_id, page_size, cutoff) -> rows with id > after_id (id.asc)
+        Errors from fetch_page propagate; pages already stored stay stored
+        """
+        fetched = inserted = pages = 0
+        after_id = self.last_id()
+        # First sync: nothing older than the retention window is downloaded at all
+        cutoff = self.cutoff() if after_id == 0 else None
+        while True:
+            page = fetch_page(after_id, page_size, cutoff)
+            pages += 1
+            fetched += len(page)
+            inserted += self.append(page)
+            if len(page) < page_size:
+                break
+            after_id = max(int(row["id"]) for row in page)
+        pruned = self.prune()
+        return {"fetched": fetched, "inserted": inserted, "pruned": pruned, "pages": pages, "total": self.count()}
+
+    def sync_from_supabase(self, url: str, headers: Dict[str, str], table: str = "audit_logs",
+                           page_size: int = DEFAULT_PAGE_SIZE, timeout: int = 30) -> Dict[str, int]:
+        endpoint = f"{url}/rest/v1/{table}"
+
+        def fetch_page(after_id, limit, cutoff):
+            params = {"select": ",".join(COLUMNS), "id": f"gt.{after_id}", "order": "id.asc", "limit": limit}
+            if cutoff:
+                params["timestamp"] = f"gte.{cutoff}"
+            response = requests.get(endpoint, params=params, headers=headers, timeout=timeout)
+            response.raise_for_status()
+            return response.json()
+
+        return self.sync(fetch_page, page_size)
+
+    def import_legacy_json(self, path: str) -> int:
+        """One-time import of the old audit_logs.json snapshot ({"logs": [...]})"""
+        with self._lock:
+            if self._state("legacy_imported"):
+                return 0
+        inserted = 0
+        if os.path.exists(path):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    inserted = self.append(json.load(f).get("logs", []))
+            except (OSError, ValueError, AttributeError) as e:
+                print(f"⚠️ Could not import {path}: {e}")
+        with self._lock, self.conn:
+            self._set_state("legacy_imported", datetime.now().isoformat())
+        return inserted
+
+    # ==================== QUERY ====================
+
+    def query(self, server_key: Optional[str] = None, city: Optional[str] = None,
+              institution: Optional[str] = None, since: Optional[str] = None, until: Optional[str] = None,
+              action_type: Optional[str] = None, limit: int = 100, offset: int = 0) -> List[Dict]:
+        """Newest first, same row shape as the audit_logs REST rows"""
+        where, params = [], []
+        for column, value in (("server_key", server_key), ("city", city), ("institution", institution),
+                              ("action_type", action_type)):
+            if value is not None:
+                where.append(f"{column} = ?")
+                params.append(value)
+        if since:
+            where.append("timestamp >= ?")
+            params.append(since)
+        if until:
+            where.append("timestamp <= ?")
+            params.append(until)
+        sql = f"SELECT {', '.join(COLUMNS)} FROM audit_logs"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY timestamp DESC, id DESC LIMIT ? OFFSET ?"
+        with self._lock:
+            rows = self.conn.execute(sql, params + [limit, offset]).fetchall()
+        return [dict(zip(COLUMNS, row)) for row in rows]
@@ -7,49 +7,47 @@ Optional module for data protection
 import os
 import json
 import shutil
-import threading
-import time
 from datetime import datetime
 from pathlib import Path
 
+from app_scheduler import get_default_scheduler, IntervalTrigger
+
 
 class BackupManager:
     """Manages periodic backups of local data"""
     
-    def __init__(self, data_dir, archive_dir, backup_interval=300):
+    JOB_NAME = "backup"
+    
+    def __init__(self, data_dir, archive_dir, backup_interval=300, scheduler=None):
         self.data_dir = data_dir
         self.archive_dir = archive_dir
         self.backup_interval = backup_interval
         self.running = False
-        self.backup_thread = None
+        self.scheduler = scheduler
     
     def start(self):
-        """Start backup manager"""
+        """Start backup manager (job on the shared app scheduler)"""
         if self.running:
             return
         
         self.running = True
-        self.backup_thread = threading.Thread(target=self._backup_loop, daemon=True)
-        self.backup_thread.start()
+        self.scheduler = self.scheduler or get_default_scheduler()
+        self.scheduler.add_job(
+            self.JOB_NAME,
+            self.create_backup,
+            IntervalTrigger(self.backup_interval),
+            jitter=min(30, self.backup_interval / 10),
+            run_immediately=True
+        )
         print(f"✅ Backup Manager started (interval: {self.backup_interval}s)")
     
     def stop(self):
         """Stop backup manager"""
         self.running = False
-        if self.backup_thread:
-            self.backup_thread.join(timeout=5)
+        if self.scheduler:
+            self.scheduler.cancel_job(self.JOB_NAME)
         print("🛑 Backup Manager stopped")
     
-    def _backup_loop(self):
-        """Periodic backup loop"""
-        while self.running:
-            try:
-                self.create_backup()
-                time.sleep(self.backup_interval)
-            except Exception as e:
-                print(f"⚠️ Backup error: {e}")
-                time.sleep(self.backup_interval)
-    
     def create_backup(self):
         """Create a backup of data directory"""
         if not os.path.exists(self.data_dir):
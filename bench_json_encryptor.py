@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Benchmark: encrypted log size and throughput - legacy Fernet blob vs container v2
+
+    legacy  -> json indent=2 + one Fernet token (base64) + plain open().write
+    v2      -> compact JSON + zlib (zstd too when installed) + 1 MB AES-GCM frames, atomic write
+
+Sizes are for a synthetic audit log of --mb megabytes of indented JSON (what the
+legacy writer produced); throughput is in MB of that JSON per second.
+Usage: python bench_json_encryptor.py [--mb 50]
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from json_encryptor import JSONEncryptor, CODEC_ZLIB, CODEC_ZSTD, zstandard
+
+ACTIONS = ["edit_points", "add_employee", "delete_employee", "edit_institution", "reset_points"]
+
+
+def _make_log(target_mb):
+    entries, size, i = [], 0, 0
+    while size < target_mb * 1024 * 1024:
+        entry = {"timestamp": f"2026-10-{i % 28 + 1:02d}T{i % 24:02d}:{i % 60:02d}:{i % 59:02d}",
+                 "action_type": ACTIONS[i % len(ACTIONS)], "discord_id": str(10 ** 17 + i * 7919 % 10 ** 6),
+                 "discord_username": f"user{i % 500}", "city": f"City{i % 12}", "institution": f"Inst{i % 40}",
+                 "employee_name": f"Employee {i % 3000}", "old_value": str(i % 300), "new_value": str(i % 300 + 5),
+                 "details": f"Adăugare {i % 9 + 1} puncte pentru Employee {i % 3000}"}
+        entries.append(entry)
+        size += len(json.dumps(entry, ensure_ascii=False, indent=2)) + 6
+        i += 1
+    return entries
+
+
+def legacy_save(encryptor, path, data):
+    with open(path, "wb") as f:
+        f.write(encryptor.cipher.encrypt(json.dumps(data, ensure_ascii=False, indent=2).encode("utf-8")))
+
+
+def legacy_load(encryptor, path):
+    with open(path, "rb") as f:
+        return json.loads(encryptor.cipher.decrypt(f.read()).decode("utf-8"))
+
+
+def _timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--mb", type=int, default=50)
+    args = parser.parse_args()
+
+    data = _make_log(args.mb)
+    plain_mb = len(json.dumps(data, ensure_ascii=False, indent=2).encode("utf-8")) / 1024 / 1024
+    print(f"📊 {len(data)} log entries, {plain_mb:.1f} MB as indented JSON")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        encryptor = JSONEncryptor(os.path.join(tmp, ".secure_key"))
+        rows = []
+
+        path = os.path.join(tmp, "legacy.enc")
+        _, write_s = _timed(lambda: legacy_save(encryptor, path, data))
+        loaded, read_s = _timed(lambda: legacy_load(encryptor, path))
+        assert loaded == data
+        rows.append(("legacy Fernet", os.path.getsize(path), write_s, read_s))
+
+        codecs = [("v2 zlib", CODEC_ZLIB)] + ([("v2 zstd", CODEC_ZSTD)] if zstandard else [])
+        for name, codec in codecs:
+            path = os.path.join(tmp, f"{name.replace(' ', '_')}.enc")
+            _, write_s = _timed(lambda: encryptor.save_json_encrypted(path, data, codec=codec))
+            loaded, read_s = _timed(lambda: encryptor.load_json_encrypted(path))
+            assert loaded == data
+            rows.append((name, os.path.getsize(path), write_s, read_s))
+
+        print(f"  {'format':<16} {'on disk':>10} {'vs JSON':>8} {'write':>11} {'read':>11}")
+        for name, size, write_s, read_s in rows:
+            print(f"  {name:<16} {size / 1024 / 1024:>7.2f} MB {size / 1024 / 1024 / plain_mb:>7.0%} "
+                  f"{plain_mb / write_s:>7.1f} MB/s {plain_mb / read_s:>7.1f} MB/s")
+        if not zstandard:
+            print("  (zstandard not installed - zstd codec skipped)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Benchmark: JSON files vs SQLite (WAL) local store
+
+    full save   -> save_institution (whole institution rewritten)
+    points edit -> bulk_points_edit on a few rows (JSON rewrites the file, SQLite UPDATEs the rows)
+    queries     -> cross-city lookups: one Discord id, a name fragment, everyone with a rank
+
+Usage: python bench_local_store.py [--cities 10] [--institutions 12] [--employees 150] [--rounds 20]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from local_store import JsonInstitutionStore, SqliteInstitutionStore, SQLITE_FILE_NAME
+from points_edit import apply_points_changes, apply_points_changes_to_store
+
+COLUMNS = ["DISCORD", "NUME IC", "SERIE DE BULETIN", "RANK", "ROLE", "PUNCTAJ", "ULTIMA_MOD"]
+
+
+def _institution(c, i, employees):
+    rows = [{"DISCORD": str(10 ** 17 + c * 10 ** 6 + i * 10 ** 3 + n), "NUME IC": f"Employee {c}-{i}-{n}",
+             "SERIE DE BULETIN": f"AB{n:06d}", "RANK": str(n % 7 + 1), "ROLE": "Agent",
+             "PUNCTAJ": n * 3, "ULTIMA_MOD": "2026-10-18 12:00:00"} for n in range(employees)]
+    return {"columns": COLUMNS, "ranks": {str(r): f"Rank {r}" for r in range(1, 8)},
+            "last_punctaj_update": "", "version": 2, "rows": rows}
+
+
+def _timed(fn, rounds):
+    start = time.perf_counter()
+    for n in range(rounds):
+        fn(n)
+    return (time.perf_counter() - start) * 1000 / rounds
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--cities", type=int, default=10)
+    parser.add_argument("--institutions", type=int, default=12)
+    parser.add_argument("--employees", type=int, default=150)
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        json_store = JsonInstitutionStore(os.path.join(tmp, "data"))
+        for c in range(args.cities):
+            os.makedirs(os.path.join(json_store.data_dir, f"City{c}"))
+            for i in range(args.institutions):
+                json_store.save(f"City{c}", f"Inst{i}", _institution(c, i, args.employees))
+        sqlite_store = SqliteInstitutionStore(os.path.join(tmp, SQLITE_FILE_NAME))
+        start = time.perf_counter()
+        imported = sqlite_store.import_json_tree(json_store)
+        import_ms = (time.perf_counter() - start) * 1000
+        print(f"📊 {imported} institutions x {args.employees} employees "
+              f"(import JSON -> SQLite: {import_ms:.0f} ms)")
+
+        data = _institution(0, 0, args.employees)
+        target = data["rows"][args.employees // 2]
+        needle = target["DISCORD"]
+        changes = lambda n: [{"row": row, "new": n} for row in data["rows"][:3]]
+
+        results = []
+        for store in (json_store, sqlite_store):
+            path = json_store.path("City0", "Inst0")
+            save_ms = _timed(lambda n: store.save("City0", "Inst0", data), args.rounds)
+            if store is json_store:
+                edit_ms = _timed(lambda n: apply_points_changes(path, changes(n)), args.rounds)
+            else:
+                edit_ms = _timed(lambda n: apply_points_changes_to_store(store, "City0", "Inst0", changes(n)),
+                                 args.rounds)
+            queries = [("discord", lambda n: store.search(needle, exact=True)),
+                       ("name fragment", lambda n: store.search("Employee 7-3-1")),
+                       ("rank", lambda n: store.search(rank="7", limit=100000))]
+            query_ms = {name: _timed(fn, max(1, args.rounds // 4)) for name, fn in queries}
+            assert store.search(needle, exact=True)[0][2]["NUME IC"] == target["NUME IC"]
+            results.append((store.backend, save_ms, edit_ms, query_ms))
+
+        print(f"  {'backend':<8} {'full save':>11} {'points edit':>12} "
+              + " ".join(f"{name:>14}" for name in results[0][3]))
+        for backend, save_ms, edit_ms, query_ms in results:
+            print(f"  {backend:<8} {save_ms:>8.2f} ms {edit_ms:>9.2f} ms "
+                  + " ".join(f"{ms:>11.2f} ms" for ms in query_ms.values()))
+        sqlite_store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Benchmark: organization view at 10k employees - virtual_org_view vs a widget per employee
+
+    layout  -> OrgLayout build + a full scroll sweep (visible range every 25 px)
+    tk      -> VirtualOrgView build, canvas item count, render time per scroll step
+    legacy  -> the old layout (Frame + Labels per employee in one scrolling Canvas) for
+               comparison; --legacy, it takes long at 10k
+
+The Tk part needs a display; without one only the layout is measured.
+
+Usage: python bench_org_view.py [--cities 10] [--institutions 10] [--employees 100] [--legacy] [--check]
+       --check exits with 1 when a render step is over RENDER_BUDGET_MS
+"""
+
+import argparse
+import random
+import sys
+import time
+import tkinter as tk
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from organization_view import create_employee_row
+from virtual_org_view import OrgLayout, VirtualOrgView
+
+RENDER_BUDGET_MS = 16.0     # one frame at 60 Hz
+VIEWPORT = (900, 700)
+
+
+def _structure(cities, institutions, employees):
+    rng = random.Random(7)
+    return {f"City{c}": {f"Inst{i}": [{"NUME IC": f"Angajat {c}-{i}-{n}", "DISCORD": f"user{c}_{i}_{n}",
+                                       "RANK": str(rng.randint(1, 7)), "ROLE": "Agent",
+                                       "PUNCTAJ": rng.randint(0, 300)} for n in range(employees)]
+                         for i in range(institutions)}
+            for c in range(cities)}
+
+
+def _legacy_view(parent, structure):
+    """Previous create_city_institution_view body: widgets for every employee"""
+    canvas = tk.Canvas(parent)
+    frame = tk.Frame(canvas)
+    canvas.create_window((0, 0), window=frame, anchor="nw")
+    canvas.pack(fill="both", expand=True)
+    for city, institutions in sorted(structure.items()):
+        tk.Label(frame, text=city).pack(fill="x")
+        for institution, employees in sorted(institutions.items()):
+            tk.Label(frame, text=institution).pack(fill="x")
+            emp_frame = tk.Frame(frame)
+            emp_frame.pack(fill="x")
+            for i, emp in enumerate(employees):
+                create_employee_row(emp_frame, emp, i % 2 == 0)
+    return canvas
+
+
+def _count_widgets(widget):
+    return 1 + sum(_count_widgets(child) for child in widget.winfo_children())
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--cities", type=int, default=10)
+    parser.add_argument("--institutions", type=int, default=10)
+    parser.add_argument("--employees", type=int, default=100)
+    parser.add_argument("--legacy", action="store_true")
+    parser.add_argument("--check", action="store_true")
+    args = parser.parse_args()
+
+    structure = _structure(args.cities, args.institutions, args.employees)
+    total = args.cities * args.institutions * args.employees
+
+    start = time.perf_counter()
+    layout = OrgLayout(structure)
+    build_ms = (time.perf_counter() - start) * 1000
+    start = time.perf_counter()
+    steps = 0
+    for top in range(0, layout.total_height, 25):
+        layout.visible(top, top + VIEWPORT[1])
+        steps += 1
+    sweep_ms = (time.perf_counter() - start) * 1000
+    print(f"📊 {total} employees: layout {build_ms:.2f} ms ({len(layout._segments)} segments, "
+          f"{layout.total_height} px), visible range {sweep_ms / steps * 1000:.1f} µs/step over {steps} steps")
+
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        print(f"⚠️ No display - Tk part skipped ({e})")
+        return
+    root.geometry(f"{VIEWPORT[0]}x{VIEWPORT[1]}")
+
+    start = time.perf_counter()
+    view = VirtualOrgView(root, structure)
+    view.pack(fill="both", expand=True)
+    root.update()
+    virtual_build_ms = (time.perf_counter() - start) * 1000
+    items = len(view.canvas.find_all())
+
+    renders = []
+    for fraction in [n / 200 for n in range(200)]:
+        view.canvas.yview_moveto(fraction)
+        start = time.perf_counter()
+        view.render()
+        renders.append((time.perf_counter() - start) * 1000)
+    render_ms = sorted(renders)[len(renders) // 2]
+    worst_ms = max(renders)
+    print(f"  virtual: build {virtual_build_ms:.0f} ms, {items} canvas items, {_count_widgets(view)} widgets, "
+          f"render {render_ms:.2f} ms median / {worst_ms:.2f} ms max")
+    view.destroy()
+
+    if args.legacy:
+        start = time.perf_counter()
+        legacy = _legacy_view(root, structure)
+        root.update()
+        legacy_ms = (time.perf_counter() - start) * 1000
+        print(f"  legacy:  build {legacy_ms:.0f} ms, {_count_widgets(legacy)} widgets")
+    root.destroy()
+
+    if worst_ms > RENDER_BUDGET_MS:
+        print(f"❌ Render step over {RENDER_BUDGET_MS} ms")
+        if args.check:
+            sys.exit(1)
+    else:
+        print(f"✅ Every render step under {RENDER_BUDGET_MS} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Benchmark: global employee search (search_index.EmployeeSearchIndex) vs the linear scan
+
+    build   -> full index of N institutions, then one institution re-indexed (a save)
+    queries -> Discord id, name prefix, two-word name, SERIE prefix, broad ROLE / RANK terms
+    linear  -> what finding an employee costs without the index: lower()+contains over every row
+
+Usage: python bench_search_index.py [--cities 20] [--institutions 25] [--employees 100] [--check]
+       --check exits with 1 when a query is over SEARCH_BUDGET_MS
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from search_index import EmployeeSearchIndex, INDEXED_FIELDS
+
+SEARCH_BUDGET_MS = 10.0
+
+FIRST = ["Ion", "Andrei", "Maria", "Elena", "Mihai", "Alexandru", "Dan", "Radu", "Vlad", "Cristian", "Ștefan"]
+LAST = ["Popescu", "Ionescu", "Georgescu", "Stan", "Dumitru", "Stoica", "Matei", "Constantin", "Marin", "Tudor"]
+ROLES = ["Agent", "Offiter", "Caporal", "Sergent", "Sherif"]
+
+
+def _rows(rng, employees):
+    rows = []
+    for n in range(employees):
+        first, last = rng.choice(FIRST), rng.choice(LAST)
+        rows.append({"DISCORD": f"{first.lower()}{rng.randint(0, 99999)}", "NUME IC": f"{first} {last}",
+                     "SERIE DE BULETIN": f"AB{rng.randint(0, 999999):06d}", "RANK": str(n % 7 + 1),
+                     "ROLE": rng.choice(ROLES), "PUNCTAJ": rng.randint(0, 500)})
+    return rows
+
+
+def _linear(data, query):
+    needle = query.lower()
+    return [(key, row) for key, rows in data.items() for row in rows
+            if any(needle in str(row.get(col, "")).lower() for col in INDEXED_FIELDS)]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--cities", type=int, default=20)
+    parser.add_argument("--institutions", type=int, default=25)
+    parser.add_argument("--employees", type=int, default=100)
+    parser.add_argument("--check", action="store_true")
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    data = {(f"City{c}", f"Inst{i}"): _rows(rng, args.employees)
+            for c in range(args.cities) for i in range(args.institutions)}
+    index = EmployeeSearchIndex()
+    start = time.perf_counter()
+    for (city, institution), rows in data.items():
+        index.index_institution(city, institution, rows)
+    build_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    index.index_institution("City0", "Inst0", data[("City0", "Inst0")])
+    reindex_ms = (time.perf_counter() - start) * 1000
+    print(f"📊 {len(index)} employees in {len(data)} institutions: full build {build_ms:.0f} ms, "
+          f"one institution re-indexed {reindex_ms:.2f} ms")
+
+    sample = data[("City7", "Inst3")][5]
+    queries = [sample["DISCORD"], "ion", "io", "maria stan", "stefan ionescu", sample["SERIE DE BULETIN"][:5],
+               "sherif", "7", "zzz"]
+    over_budget = []
+    print(f"  {'query':<18} {'hits':>5} {'index':>10} {'linear scan':>13}")
+    for query in queries:
+        runs = []
+        for _ in range(5):
+            start = time.perf_counter()
+            hits = index.search(query, limit=50)
+            runs.append((time.perf_counter() - start) * 1000)
+        index_ms = sorted(runs)[len(runs) // 2]
+        start = time.perf_counter()
+        _linear(data, query)
+        linear_ms = (time.perf_counter() - start) * 1000
+        print(f"  {query:<18} {len(hits):>5} {index_ms:>7.2f} ms {linear_ms:>10.1f} ms")
+        if index_ms > SEARCH_BUDGET_MS:
+            over_budget.append(query)
+
+    if over_budget:
+        print(f"❌ Over {SEARCH_BUDGET_MS} ms: {', '.join(over_budget)}")
+        if args.check:
+            sys.exit(1)
+    else:
+        print(f"✅ Every query under {SEARCH_BUDGET_MS} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Benchmark: import-time profile of punctaj.py startup (python -X importtime)
+
+Imports exactly what punctaj.py imports at module load (top-level imports, including
+the optional ones inside top-level try blocks) in a fresh interpreter and reports the
+slowest modules. --eager adds the subsystems that punctaj.py now loads with lazy()
+to show what the previous startup paid for.
+
+Usage: python bench_startup_imports.py [--eager] [--top 15] [--check]
+       --check exits with 1 when the total is over STARTUP_IMPORT_BUDGET_MS
+"""
+
+import argparse
+import ast
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).parent
+TARGET = ROOT / "punctaj.py"
+
+# Startup budget: import time of everything punctaj.py loads before the first window
+STARTUP_IMPORT_BUDGET_MS = 450
+
+
+def _module_names(node):
+    if isinstance(node, ast.Import):
+        return [alias.name for alias in node.names]
+    if isinstance(node, ast.ImportFrom) and node.level == 0 and node.module:
+        return [node.module]
+    return []
+
+
+def startup_imports(path=TARGET):
+    """Modules imported at module load: top level + top-level try / if blocks"""
+    tree = ast.parse(path.read_text(encoding="utf-8"))
+    modules = []
+    pending = list(tree.body)
+    while pending:
+        node = pending.pop(0)
+        modules.extend(_module_names(node))
+        if isinstance(node, ast.Try):
+            pending[:0] = node.body
+        elif isinstance(node, ast.If):
+            pending[:0] = node.body + node.orelse
+    return list(dict.fromkeys(modules))
+
+
+def lazy_imports_in(path=TARGET):
+    """Modules registered with lazy("module", ...) in punctaj.py"""
+    tree = ast.parse(path.read_text(encoding="utf-8"))
+    modules = []
+    for node in ast.walk(tree):
+        if (isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id == "lazy"
+                and node.args and isinstance(node.args[0], ast.Constant)):
+            modules.append(node.args[0].value)
+    return list(dict.fromkeys(modules))
+
+
+def profile_imports(modules):
+    """Run -X importtime in a fresh interpreter -> [(name, self_us, cumulative_us, depth)]"""
+    code = "\n".join(f"try:\n    import {name}\nexcept Exception:\n    pass" for name in modules)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=str(ROOT), stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True,
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return rows
+
+
+def report(label, rows, top):
+    total_ms = sum(row[1] for row in rows) / 1000
+    print(f"\n{label}: {len(rows)} modules, {total_ms:.1f} ms")
+    top_level = sorted((row for row in rows if row[3] <= 1), key=lambda row: row[2], reverse=True)
+    for name, _, cumulative_us, _ in top_level[:top]:
+        print(f"  {name:<40} {cumulative_us / 1000:>8.1f} ms")
+    return total_ms
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--eager", action="store_true", help="also profile the lazy subsystems loaded eagerly")
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--check", action="store_true")
+    args = parser.parse_args()
+
+    modules = startup_imports()
+    print(f"📊 punctaj.py startup imports: {len(modules)} modules (budget {STARTUP_IMPORT_BUDGET_MS} ms)")
+    total_ms = report("Startup (lazy subsystems deferred)", profile_imports(modules), args.top)
+
+    if args.eager:
+        deferred = lazy_imports_in()
+        eager_ms = report("Startup with every subsystem eager", profile_imports(modules + deferred), args.top)
+        print(f"\n⚡ Deferred to first use: {', '.join(deferred)} -> {eager_ms - total_ms:.1f} ms saved")
+
+    within = total_ms <= STARTUP_IMPORT_BUDGET_MS
+    print(f"\n{'✅' if within else '❌'} {total_ms:.1f} ms / budget {STARTUP_IMPORT_BUDGET_MS} ms")
+    if args.check and not within:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
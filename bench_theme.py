@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Benchmark: theming time vs widget count - recursive apply_theme_to_children vs theme_registry
+
+    recursive -> the previous pass: recursion over the whole tree, configure per widget
+    subtree   -> ThemeRegistry.theme_subtree, first pass and a repeat pass (nothing new)
+    new tab   -> one tab added to the themed tree: repeat pass on root vs the new subtree only
+    create    -> building the tree with the option database installed (themed at creation)
+
+Trees: tabs of frames with labels / buttons / entries, like the city / institution tabs.
+Needs a display (Tk).
+
+Usage: python bench_theme.py [--sizes 500 2000 8000]
+"""
+
+import argparse
+import sys
+import time
+import tkinter as tk
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from theme_registry import ThemeRegistry, RDR_THEME_COLORS
+
+
+def _recursive_theme(registry, widget):
+    """Previous apply_theme_to_children: whole tree on every call"""
+    try:
+        if widget.__class__.__name__ in ("Button", "Label", "Entry", "Frame", "Canvas", "Text"):
+            widget.configure(**registry.options[widget.__class__.__name__])
+        for child in widget.winfo_children():
+            _recursive_theme(registry, child)
+    except Exception:
+        pass
+
+
+def _build_tab(parent, rows):
+    tab = tk.Frame(parent)
+    tab.pack()
+    for n in range(rows):
+        row = tk.Frame(tab)
+        row.pack()
+        tk.Label(row, text=f"Angajat {n}").pack(side="left")
+        tk.Entry(row).pack(side="left")
+        tk.Button(row, text="+").pack(side="left")
+    return tab
+
+
+def _build(parent, widgets):
+    """Tabs of 50 rows (4 widgets per row) until about `widgets` widgets exist"""
+    tabs = []
+    for _ in range(max(1, widgets // 200)):
+        tabs.append(_build_tab(parent, 50))
+    return tabs
+
+
+def _ms(fn):
+    start = time.perf_counter()
+    result = fn()
+    return (time.perf_counter() - start) * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[500, 2000, 8000])
+    args = parser.parse_args()
+
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        print(f"⚠️ No display - benchmark needs Tk ({e})")
+        return
+    root.withdraw()
+    registry = ThemeRegistry(RDR_THEME_COLORS)
+
+    print(f"  {'widgets':>8} {'recursive':>10} {'subtree 1st':>12} {'subtree 2nd':>12} "
+          f"{'+tab root':>10} {'+tab only':>10} {'create':>8} {'create+db':>10}")
+    for size in args.sizes:
+        plain = tk.Frame(root)
+        create_ms, _ = _ms(lambda: _build(plain, size))
+        recursive_ms, _ = _ms(lambda: _recursive_theme(registry, plain))
+        first_ms, stats = _ms(lambda: registry.theme_subtree(plain))
+        second_ms, _ = _ms(lambda: registry.theme_subtree(plain))
+        tab = _build_tab(plain, 50)
+        root_pass_ms, _ = _ms(lambda: registry.theme_subtree(plain))
+        tab2 = _build_tab(plain, 50)
+        tab_only_ms, _ = _ms(lambda: registry.theme_subtree(tab2))
+        plain.destroy()
+
+        themed_root = tk.Toplevel(root)
+        themed_root.withdraw()
+        registry.install(themed_root)
+        create_db_ms, _ = _ms(lambda: _build(themed_root, size))
+        themed_root.destroy()
+        root.option_clear()
+
+        print(f"  {stats['visited']:>8} {recursive_ms:>7.0f} ms {first_ms:>9.0f} ms {second_ms:>9.1f} ms "
+              f"{root_pass_ms:>7.1f} ms {tab_only_ms:>7.1f} ms {create_ms:>5.0f} ms {create_db_ms:>7.0f} ms")
+    root.destroy()
+
+
+if __name__ == "__main__":
+    main()
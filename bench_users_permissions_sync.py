@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Benchmark: users_permissions.json sync with 5k users against the local Supabase stub
+
+Compares the old per-user PATCH upload with the diff-based bulk sync.
+Usage: python bench_users_permissions_sync.py [--users 5000] [--skip-legacy]
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+import requests
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from supabase_stub import SupabaseStub
+from users_permissions_json_manager import UsersPermissionsJsonManager
+
+
+def _timed(stub, label, func):
+    stub.reset_counters()
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<42} {elapsed * 1000:>9.1f} ms  {stub.request_count():>6} requests")
+    return elapsed
+
+
+def legacy_upload(manager):
+    """The previous upload_to_cloud: one PATCH per user, sequentially"""
+    for discord_id_str in manager._read_json().get("users", {}):
+        requests.patch(
+            f"{manager.supabase_url}/rest/v1/discord_users",
+            headers=manager.headers,
+            params={"discord_id": f"eq.{discord_id_str}"},
+            json={"updated_at": datetime.now().isoformat()},
+            timeout=10,
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=5000)
+    parser.add_argument("--dirty", type=int, default=50)
+    parser.add_argument("--skip-legacy", action="store_true")
+    args = parser.parse_args()
+
+    with SupabaseStub(unique={"discord_users": ["discord_id"]}) as stub, tempfile.TemporaryDirectory() as tmp:
+        stub.seed("discord_users", [
+            {
+                "discord_id": 100000 + i,
+                "username": f"user{i}",
+                "is_superuser": False,
+                "is_admin": False,
+                "created_at": "2026-01-01T00:00:00",
+                "updated_at": "2026-01-01T00:00:00",
+            }
+            for i in range(args.users)
+        ])
+        manager = UsersPermissionsJsonManager(stub.url, "bench-key", tmp)
+
+        print(f"\n📊 users_permissions sync benchmark ({args.users} users, {args.dirty} dirty)\n")
+        _timed(stub, "initial full sync", manager.sync_bidirectional)
+        _timed(stub, "steady-state sync (no changes)", manager.sync_bidirectional)
+
+        json_data = manager._read_json()
+        for key in list(json_data["users"])[:args.dirty]:
+            json_data["users"][key]["permissions"] = {"cloud": {"upload": True}}
+        manager._write_json(json_data)
+        _timed(stub, f"sync with {args.dirty} dirty users", manager.sync_bidirectional)
+
+        for key in list(json_data["users"]):
+            json_data["users"][key]["permissions"] = {"cloud": {"download": True}}
+        manager._write_json(json_data)
+        _timed(stub, f"sync with all {args.users} users dirty", manager.sync_bidirectional)
+
+        if not args.skip_legacy:
+            _timed(stub, "legacy per-user PATCH upload", lambda: legacy_upload(manager))
+
+
+if __name__ == "__main__":
+    main()
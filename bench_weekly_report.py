@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Benchmark: weekly report generation for hundreds of institutions against the local Supabase stub
+
+Compares the old serial loop (CSV + one blocking POST per institution)
+with the parallel CSV stage + columnar export + one bulk upload.
+Usage: python bench_weekly_report.py [--cities 10] [--institutions 30] [--employees 40]
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from types import SimpleNamespace
+
+import requests
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from monthly_report_scheduler import WeeklyReportScheduler
+from supabase_stub import SupabaseStub
+
+
+def _make_tree(data_dir, cities, institutions, employees):
+    columns = ["DISCORD", "NUME IC", "RANK", "ROLE", "PUNCTAJ", "SERIE DE BULETIN", "ULTIMA_MOD"]
+    for c in range(cities):
+        city_dir = os.path.join(data_dir, f"City{c}")
+        os.makedirs(city_dir)
+        for i in range(institutions):
+            rows = [{"DISCORD": str(10 ** 17 + n), "NUME IC": f"Employee {n}", "RANK": str(n % 5 + 1),
+                     "ROLE": "Agent", "PUNCTAJ": n * 3, "SERIE DE BULETIN": f"AB{n:06d}",
+                     "ULTIMA_MOD": "2026-10-18 12:00:00"} for n in range(employees)]
+            with open(os.path.join(city_dir, f"Inst{i}.json"), "w", encoding="utf-8") as f:
+                json.dump({"columns": columns, "rows": rows}, f, indent=4, ensure_ascii=False)
+
+
+def legacy_generate(scheduler, sync, now):
+    """The previous generate_weekly_report: serial CSV + one POST per institution"""
+    weekly_dir = os.path.join(scheduler.archive_dir, "legacy")
+    monday = now - timedelta(days=now.weekday())
+    headers = {"apikey": sync.key, "Authorization": f"Bearer {sync.key}", "Content-Type": "application/json"}
+    for city in scheduler._get_cities():
+        city_archive = os.path.join(weekly_dir, city)
+        os.makedirs(city_archive, exist_ok=True)
+        for institution in scheduler._get_institutions(city):
+            inst_data = scheduler._load_institution(city, institution)
+            scheduler._save_as_csv(os.path.join(city_archive, f"{institution}.csv"), inst_data)
+            report = scheduler._report_json(city, institution, monday, now, inst_data.get("rows", []))
+            requests.post(f"{sync.url}/rest/v1/weekly_reports", json=report, headers=headers, timeout=10)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--cities", type=int, default=10)
+    parser.add_argument("--institutions", type=int, default=30)
+    parser.add_argument("--employees", type=int, default=40)
+    parser.add_argument("--workers", type=int, default=8)
+    args = parser.parse_args()
+
+    with SupabaseStub() as stub, tempfile.TemporaryDirectory() as tmp:
+        data_dir = os.path.join(tmp, "data")
+        _make_tree(data_dir, args.cities, args.institutions, args.employees)
+        sync = SimpleNamespace(url=stub.url, key="key", enabled=True, table_weekly_reports="weekly_reports")
+        scheduler = WeeklyReportScheduler(data_dir, os.path.join(tmp, "arhiva"), supabase_sync=sync,
+                                          max_workers=args.workers)
+        now = datetime.now()
+        total = args.cities * args.institutions
+        print(f"📊 {total} institutions x {args.employees} employees")
+
+        stub.reset_counters()
+        start = time.perf_counter()
+        legacy_generate(scheduler, sync, now)
+        legacy_ms = (time.perf_counter() - start) * 1000
+        legacy_requests = stub.request_count()
+
+        stub.reset_counters()
+        start = time.perf_counter()
+        summary = scheduler.generate_weekly_report(now)
+        new_ms = (time.perf_counter() - start) * 1000
+
+        print(f"  {'legacy (serial, POST per institution)':<42} {legacy_ms:>9.1f} ms  {legacy_requests:>6} requests")
+        print(f"  {'pipeline (parallel CSV + bulk upload)':<42} {new_ms:>9.1f} ms  {stub.request_count():>6} requests")
+        for stage, ms in summary["timings_ms"].items():
+            print(f"    {stage:<40} {ms:>9.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
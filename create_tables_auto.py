@@ -52,7 +52,8 @@ CREATE TABLE employees (
   points INT DEFAULT 0,
   id_card_series TEXT,
   created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
-  updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+  updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+  CONSTRAINT uq_employees_institution_discord UNIQUE (institution_id, discord_username)
 );
 
 -- Create indexes
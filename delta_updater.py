@@ -0,0 +1,383 @@
+#!/usr/bin/env python3
+"""
+Delta Updater - content-addressed update channel (no git on the client)
+Used by punctaj_update.py / git_updater.py instead of `git pull`
+
+Release layout (any static HTTP server, or a local directory):
+    manifest.json.gz                 -> {version, files: {path: {sha256, size, packed}}}
+    objects/<sha[:2]>/<sha256>.gz    -> gzip of the file content (shared between releases)
+
+Client:
+    plan      -> compare the manifest with the installed files (hash cache by size + mtime)
+    download  -> only changed files, in parallel, sha256-verified after decompression
+    apply     -> journal + backup, os.replace per file, rollback on any error
+                 (a journal left by a crash is rolled back on the next run)
+
+A one-file fix downloads the manifest (a few KB) + one gzip object.
+
+Publish a release:
+    python delta_updater.py publish <source_dir> <release_dir> --version 2.6.1
+"""
+
+import os
+import sys
+import gzip
+import json
+import shutil
+import fnmatch
+import hashlib
+import argparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+import requests
+
+from atomic_io import atomic_write_bytes, atomic_write_json
+
+MANIFEST_NAME = "manifest.json.gz"
+OBJECTS_DIR = "objects"
+STATE_NAME = ".update_state.json"
+JOURNAL_NAME = ".update_journal.json"
+BACKUP_DIR = ".update_backup"
+STAGING_DIR = ".update_staging"
+UPDATE_CONFIG_NAME = "update_config.ini"
+
+# Never shipped / never overwritten: VCS, build output, user data, local secrets
+DEFAULT_EXCLUDES = (
+    ".git", ".github", "__pycache__", "*.pyc", ".pytest_cache",
+    "build", "build_*", "dist", "dist_*", "app_build",
+    "arhiva", "data", "logs", "logs_test",
+    ".update_*", "*.log", "*.enc", "*.backup.*",
+    "supabase_config.ini", "discord_config.ini", "users_permissions.json",
+    UPDATE_CONFIG_NAME, "requests.jsonl",
+)
+
+
+class UpdateError(Exception):
+    """Download / verification / apply failure (installed files are left unchanged)"""
+
+
+def file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def object_path(sha256: str) -> str:
+    return f"{OBJECTS_DIR}/{sha256[:2]}/{sha256}.gz"
+
+
+def is_excluded(rel_path: str, excludes=DEFAULT_EXCLUDES) -> bool:
+    parts = rel_path.split("/")
+    return any(fnmatch.fnmatch(part, pattern) for part in parts for pattern in excludes)
+
+
+def iter_release_files(root: str, excludes=DEFAULT_EXCLUDES):
+    """Relative (forward slash) paths of the files that belong to a release"""
+    for dirpath, dirnames, filenames in os.walk(root):
+        rel_dir = os.path.relpath(dirpath, root).replace(os.sep, "/")
+        rel_dir = "" if rel_dir == "." else rel_dir + "/"
+        dirnames[:] = sorted(d for d in dirnames if not is_excluded(rel_dir + d, excludes))
+        for name in sorted(filenames):
+            rel = rel_dir + name
+            if not is_excluded(rel, excludes):
+                yield rel
+
+
+def build_manifest(root: str, version: str, excludes=DEFAULT_EXCLUDES) -> Dict:
+    files = {}
+    for rel in iter_release_files(root, excludes):
+        path = os.path.join(root, *rel.split("/"))
+        files[rel] = {"sha256": file_sha256(path), "size": os.path.getsize(path)}
+    return {
+        "version": version,
+        "generated_at": datetime.now().isoformat(timespec="seconds"),
+        "files": files,
+    }
+
+
+def publish_release(source_root: str, release_dir: str, version: str, excludes=DEFAULT_EXCLUDES) -> Dict:
+    """
+    Write the objects that are not already in release_dir + the new manifest
+    Objects are content-addressed: unchanged files are shared with previous releases
+    """
+    manifest = build_manifest(source_root, version, excludes)
+    written = 0
+    for rel, info in manifest["files"].items():
+        target = os.path.join(release_dir, *object_path(info["sha256"]).split("/"))
+        if not os.path.exists(target):
+            with open(os.path.join(source_root, *rel.split("/")), "rb") as f:
+                atomic_write_bytes(target, gzip.compress(f.read(), mtime=0), verify=False)
+            written += 1
+        info["packed"] = os.path.getsize(target)
+    payload = gzip.compress(json.dumps(manifest, sort_keys=True).encode("utf-8"), mtime=0)
+    atomic_write_bytes(os.path.join(release_dir, MANIFEST_NAME), payload, verify=False)
+    print(f"📦 Release {version}: {len(manifest['files'])} files, {written} new objects -> {release_dir}")
+    return manifest
+
+
+def load_update_config(base_dir: str) -> Dict:
+    """[updates] url / workers / timeout from update_config.ini (url empty = channel off)"""
+    import configparser
+    config = configparser.ConfigParser()
+    config.read(os.path.join(base_dir, UPDATE_CONFIG_NAME), encoding="utf-8")
+    section = config["updates"] if config.has_section("updates") else {}
+    return {
+        "url": (section.get("url", "") or "").strip(),
+        "workers": int(section.get("workers", 6) or 6),
+        "timeout": int(section.get("timeout", 30) or 30),
+    }
+
+
+@dataclass
+class UpdatePlan:
+    version: str
+    current_version: Optional[str]
+    changed: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+    download_bytes: int = 0
+    manifest: Dict = field(default_factory=dict, repr=False)
+
+    @property
+    def up_to_date(self) -> bool:
+        return not self.changed and not self.removed
+
+
+@dataclass
+class UpdateResult:
+    version: str
+    changed: List[str]
+    removed: List[str]
+    downloaded_bytes: int
+
+
+class DeltaUpdater:
+    """Updates install_dir from a release channel (http(s) URL or local directory)"""
+
+    def __init__(self, source: str, install_dir: str, workers: int = 6, timeout: int = 30,
+                 session: Optional[requests.Session] = None,
+                 log: Optional[Callable[[str], None]] = None,
+                 excludes=DEFAULT_EXCLUDES):
+        self.source = source.rstrip("/")
+        self.install_dir = os.path.abspath(install_dir)
+        self.workers = max(1, workers)
+        self.timeout = timeout
+        self.session = session or requests.Session()
+        self.log = log or print
+        self.is_http = self.source.startswith(("http://", "https://"))
+        # Local files are never overwritten, even by a manifest published without the excludes
+        self.excludes = excludes
+
+    # ------------------------------------------------------------------ channel
+    def _fetch(self, rel: str) -> bytes:
+        if self.is_http:
+            try:
+                response = self.session.get(f"{self.source}/{rel}", timeout=self.timeout)
+            except requests.RequestException as e:
+                raise UpdateError(f"{rel}: {e}")
+            if response.status_code != 200:
+                raise UpdateError(f"{rel}: HTTP {response.status_code}")
+            return response.content
+        path = os.path.join(self.source, *rel.split("/"))
+        try:
+            with open(path, "rb") as f:
+                return f.read()
+        except OSError as e:
+            raise UpdateError(f"{rel}: {e}")
+
+    def fetch_manifest(self) -> Dict:
+        try:
+            manifest = json.loads(gzip.decompress(self._fetch(MANIFEST_NAME)).decode("utf-8"))
+        except (OSError, ValueError) as e:
+            raise UpdateError(f"Manifest invalid: {e}")
+        if not isinstance(manifest.get("files"), dict):
+            raise UpdateError("Manifest invalid: lipsește 'files'")
+        return manifest
+
+    # ------------------------------------------------------------------ local state
+    def _path(self, *parts) -> str:
+        return os.path.join(self.install_dir, *parts)
+
+    def _target(self, rel: str) -> str:
+        target = os.path.abspath(self._path(*rel.split("/")))
+        if os.path.commonpath([target, self.install_dir]) != self.install_dir:
+            raise UpdateError(f"Cale invalidă în manifest: {rel}")
+        return target
+
+    def load_state(self) -> Dict:
+        try:
+            with open(self._path(STATE_NAME), "r", encoding="utf-8") as f:
+                state = json.load(f)
+            if isinstance(state.get("files"), dict):
+                return state
+        except (OSError, ValueError):
+            pass
+        return {"version": None, "files": {}}
+
+    def local_sha256(self, rel: str, cached: Optional[Dict] = None) -> Optional[str]:
+        """Hash of an installed file; reuses the cached hash when size + mtime match"""
+        path = self._target(rel)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        if cached and cached.get("size") == stat.st_size and cached.get("mtime_ns") == stat.st_mtime_ns:
+            return cached.get("sha256")
+        return file_sha256(path)
+
+    def _state_entry(self, rel: str, sha256: str) -> Dict:
+        stat = os.stat(self._target(rel))
+        return {"sha256": sha256, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+    # ------------------------------------------------------------------ plan
+    def plan(self, manifest: Optional[Dict] = None) -> UpdatePlan:
+        manifest = manifest or self.fetch_manifest()
+        state = self.load_state()
+        plan = UpdatePlan(version=str(manifest.get("version", "")), current_version=state.get("version"),
+                          manifest=manifest)
+        for rel, info in sorted(manifest["files"].items()):
+            if is_excluded(rel, self.excludes):
+                continue
+            if self.local_sha256(rel, state["files"].get(rel)) != info["sha256"]:
+                plan.changed.append(rel)
+                plan.download_bytes += int(info.get("packed", info.get("size", 0)))
+        plan.removed = sorted(rel for rel in state["files"]
+                              if rel not in manifest["files"] and not is_excluded(rel, self.excludes)
+                              and os.path.exists(self._target(rel)))
+        return plan
+
+    # ------------------------------------------------------------------ download
+    def _download_one(self, rel: str, info: Dict, staging: str) -> int:
+        packed = self._fetch(object_path(info["sha256"]))
+        try:
+            content = gzip.decompress(packed)
+        except OSError as e:
+            raise UpdateError(f"{rel}: obiect corupt ({e})")
+        if hashlib.sha256(content).hexdigest() != info["sha256"]:
+            raise UpdateError(f"{rel}: sha256 diferit - descărcare coruptă")
+        staged = os.path.join(staging, *rel.split("/"))
+        atomic_write_bytes(staged, content, verify=False)
+        return len(packed)
+
+    def download(self, plan: UpdatePlan, progress: Optional[Callable[[int, int, str], None]] = None) -> int:
+        """Download + verify every changed file into the staging folder -> bytes downloaded"""
+        staging = self._path(STAGING_DIR)
+        shutil.rmtree(staging, ignore_errors=True)
+        files = plan.manifest["files"]
+        total = 0
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="DeltaDownload") as pool:
+            futures = {pool.submit(self._download_one, rel, files[rel], staging): rel for rel in plan.changed}
+            for done, future in enumerate(as_completed(futures), 1):
+                total += future.result()
+                if progress:
+                    progress(done, len(futures), futures[future])
+        return total
+
+    # ------------------------------------------------------------------ apply / rollback
+    def rollback(self) -> bool:
+        """Restore the files listed in a leftover journal (interrupted apply)"""
+        journal_path = self._path(JOURNAL_NAME)
+        if not os.path.exists(journal_path):
+            return False
+        with open(journal_path, "r", encoding="utf-8") as f:
+            journal = json.load(f)
+        backup = self._path(BACKUP_DIR)
+        for rel in journal.get("changed", []) + journal.get("removed", []):
+            target = self._target(rel)
+            saved = os.path.join(backup, *rel.split("/"))
+            if os.path.exists(saved):
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                os.replace(saved, target)
+            elif rel in journal.get("created", []) and os.path.exists(target):
+                os.remove(target)
+        os.remove(journal_path)
+        shutil.rmtree(backup, ignore_errors=True)
+        self.log(f"↩️ Rollback: {journal.get('version')} anulat, fișierele anterioare restaurate")
+        return True
+
+    def apply(self, plan: UpdatePlan):
+        staging = self._path(STAGING_DIR)
+        backup = self._path(BACKUP_DIR)
+        shutil.rmtree(backup, ignore_errors=True)
+        journal = {
+            "version": plan.version,
+            "changed": plan.changed,
+            "removed": plan.removed,
+            "created": [rel for rel in plan.changed if not os.path.exists(self._target(rel))],
+        }
+        atomic_write_json(self._path(JOURNAL_NAME), journal, verify=False)
+        try:
+            for rel in plan.changed + plan.removed:
+                target = self._target(rel)
+                if os.path.exists(target):
+                    saved = os.path.join(backup, *rel.split("/"))
+                    os.makedirs(os.path.dirname(saved), exist_ok=True)
+                    os.replace(target, saved)
+                if rel in plan.removed:
+                    continue
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                os.replace(os.path.join(staging, *rel.split("/")), target)
+        except OSError as e:
+            self.rollback()
+            raise UpdateError(f"Nu pot înlocui fișierele ({e}) - rollback efectuat")
+
+        self._record_state(plan)
+        os.remove(self._path(JOURNAL_NAME))
+        shutil.rmtree(backup, ignore_errors=True)
+        shutil.rmtree(staging, ignore_errors=True)
+
+    def _record_state(self, plan: UpdatePlan):
+        """Installed version + hash cache of every release file (next plan skips re-hashing)"""
+        files = {}
+        for rel, info in plan.manifest["files"].items():
+            if os.path.exists(self._target(rel)):
+                files[rel] = self._state_entry(rel, info["sha256"])
+        atomic_write_json(self._path(STATE_NAME), {"version": plan.version, "files": files}, verify=False)
+
+    def update(self, progress: Optional[Callable[[int, int, str], None]] = None) -> UpdateResult:
+        self.rollback()
+        plan = self.plan()
+        if plan.up_to_date:
+            if plan.current_version != plan.version:
+                self._record_state(plan)
+            return UpdateResult(plan.version, [], [], 0)
+        self.log(f"⬇️ {plan.version}: {len(plan.changed)} fișiere modificate, "
+                 f"{len(plan.removed)} șterse, ~{plan.download_bytes} bytes")
+        try:
+            downloaded = self.download(plan, progress)
+        except Exception:
+            shutil.rmtree(self._path(STAGING_DIR), ignore_errors=True)
+            raise
+        self.apply(plan)
+        self.log(f"✅ Actualizat la {plan.version} ({downloaded} bytes descărcați)")
+        return UpdateResult(plan.version, plan.changed, plan.removed, downloaded)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Punctaj delta update channel")
+    sub = parser.add_subparsers(dest="command", required=True)
+    publish = sub.add_parser("publish", help="build manifest + objects for a release")
+    publish.add_argument("source")
+    publish.add_argument("release_dir")
+    publish.add_argument("--version", required=True)
+    apply_cmd = sub.add_parser("update", help="update an install dir from a channel")
+    apply_cmd.add_argument("source")
+    apply_cmd.add_argument("install_dir")
+    args = parser.parse_args()
+
+    if args.command == "publish":
+        publish_release(args.source, args.release_dir, args.version)
+    else:
+        try:
+            DeltaUpdater(args.source, args.install_dir).update()
+        except UpdateError as e:
+            print(f"❌ {e}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
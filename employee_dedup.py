@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Employee Dedup Job - maintenance pass over the Supabase employees table
+Removes rows that break the (institution_id, discord_username) unique key
+(or, without Discord, repeat the same employee name in one institution)
+
+    stream  -> one institution at a time, keyset pages (id > last_id, order=id.asc)
+    group   -> key -> newest id seen so far; state is dropped after each institution,
+               so memory is bounded by the largest institution, not the table
+    delete  -> older ids are buffered and removed with id=in.(...) in batches
+
+Same rule as ADD_EMPLOYEES_UNIQUE_CONSTRAINT.sql: the newest row (highest id) is kept.
+Used by clean_supabase_duplicates.py.
+"""
+
+from typing import Dict, Iterator, List, Optional
+
+import requests
+
+EMPLOYEE_COLUMNS = "id,institution_id,discord_username,employee_name"
+
+
+class EmployeeDedupJob:
+    """Streaming duplicate removal for the employees table"""
+
+    def __init__(self, manager, page_size: int = 1000, delete_batch: int = 200,
+                 dry_run: bool = False, log=print):
+        self.manager = manager
+        self.page_size = page_size
+        self.delete_batch = delete_batch
+        self.dry_run = dry_run
+        self.log = log
+        self.pending: List[int] = []
+        self.stats = {"institutions": 0, "scanned": 0, "duplicates": 0, "deleted": 0,
+                      "requests": 0, "peak_keys": 0}
+
+    # ==================== STREAMING ====================
+
+    def _pages(self, table: str, select: str, filters: Optional[Dict[str, str]] = None) -> Iterator[List[Dict]]:
+        """Keyset pagination on id: deleting rows already read never shifts the next page"""
+        last_id = None
+        while True:
+            params = dict(filters or {}, select=select, order="id.asc", limit=str(self.page_size))
+            if last_id is not None:
+                params["id"] = f"gt.{last_id}"
+            resp = requests.get(f"{self.manager.url}/rest/v1/{table}", params=params,
+                                headers=self.manager.headers, timeout=30)
+            self.stats["requests"] += 1
+            if resp.status_code != 200:
+                raise RuntimeError(f"GET {table}: HTTP {resp.status_code}")
+            page = resp.json()
+            if not page:
+                return
+            yield page
+            if len(page) < self.page_size:
+                return
+            last_id = page[-1]["id"]
+
+    def iter_institution_ids(self) -> Iterator[int]:
+        for page in self._pages("institutions", "id"):
+            for inst in page:
+                yield inst["id"]
+
+    def iter_employees(self, institution_id: int) -> Iterator[Dict]:
+        for page in self._pages("employees", EMPLOYEE_COLUMNS, {"institution_id": f"eq.{institution_id}"}):
+            yield from page
+
+    # ==================== GROUPING ====================
+
+    @staticmethod
+    def dedup_key(emp: Dict) -> Optional[tuple]:
+        discord = str(emp.get("discord_username") or "").strip()
+        if discord:
+            return ("discord", discord)
+        name = str(emp.get("employee_name") or "").strip().lower()
+        return ("name", name) if name else None
+
+    def _queue_delete(self, employee_id: int):
+        self.stats["duplicates"] += 1
+        self.pending.append(employee_id)
+        if len(self.pending) >= self.delete_batch:
+            self.flush()
+
+    def flush(self):
+        if not self.pending:
+            return
+        if not self.dry_run:
+            self.stats["deleted"] += self.manager.delete_employees(self.pending, chunk_size=self.delete_batch)
+            self.stats["requests"] += (len(self.pending) + self.delete_batch - 1) // self.delete_batch
+        self.pending = []
+
+    def dedup_institution(self, institution_id: int):
+        newest: Dict[tuple, int] = {}
+        for emp in self.iter_employees(institution_id):
+            self.stats["scanned"] += 1
+            key = self.dedup_key(emp)
+            if key is None:
+                continue
+            previous = newest.get(key)
+            if previous is not None:
+                # Ascending ids: the row seen earlier is the older one
+                self._queue_delete(previous)
+            newest[key] = emp["id"]
+        self.stats["peak_keys"] = max(self.stats["peak_keys"], len(newest))
+
+    def run(self) -> Dict[str, int]:
+        for institution_id in self.iter_institution_ids():
+            self.stats["institutions"] += 1
+            self.dedup_institution(institution_id)
+        self.flush()
+        mode = "DRY RUN - " if self.dry_run else ""
+        self.log(f"🧹 {mode}{self.stats['scanned']} employees in {self.stats['institutions']} institutions: "
+                 f"{self.stats['duplicates']} duplicates, {self.stats['deleted']} deleted "
+                 f"({self.stats['requests']} requests)")
+        return dict(self.stats)
@@ -6,6 +6,8 @@ Enhanced employee display with visual grouping and organization
 import tkinter as tk
 from tkinter import ttk
 
+from virtual_org_view import VirtualOrgView
+
 class EmployeeGroupFrame(tk.Frame):
     """Display employees grouped by city and institution with clear visual hierarchy"""
     
@@ -71,93 +73,14 @@ class EmployeeGroupFrame(tk.Frame):
             )
             empty_label.pack(pady=20)
         else:
-            # Create scrollable frame
-            canvas = tk.Canvas(content, bg="#f5f5f5", highlightthickness=0)
-            scrollbar = tk.Scrollbar(content, orient="vertical", command=canvas.yview)
-            scrollable_frame = tk.Frame(canvas, bg="#f5f5f5")
-            
-            scrollable_frame.bind(
-                "<Configure>",
-                lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
-            )
-            
-            canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
-            canvas.configure(yscrollcommand=scrollbar.set)
-            
-            # Add employees
-            for i, emp in enumerate(self.employees):
-                self._create_employee_card(scrollable_frame, emp, i % 2 == 0)
-            
-            canvas.pack(side="left", fill="both", expand=True)
-            scrollbar.pack(side="right", fill="y")
-    
-    def _create_employee_card(self, parent, emp, alternate_color=False):
-        """Create a visual card for each employee"""
-        
-        bg_color = "#ffffff" if alternate_color else "#fafafa"
-        
-        card = tk.Frame(parent, bg=bg_color, relief="flat", height=60)
-        card.pack(fill="x", padx=10, pady=5)
-        card.pack_propagate(False)
-        
-        # Left: Name and Discord
-        left_frame = tk.Frame(card, bg=bg_color)
-        left_frame.pack(side="left", fill="both", expand=True, padx=10, pady=8)
-        
-        name = emp.get("NUME IC") or emp.get("employee_name", "Unknown")
-        discord = emp.get("DISCORD") or emp.get("discord_username", "")
-        
-        name_label = tk.Label(
-            left_frame,
-            text=f"👤 {name}",
-            font=("Segoe UI", 10, "bold"),
-            bg=bg_color,
-            fg="#1565c0"
-        )
-        name_label.pack(anchor="w")
-        
-        if discord:
-            discord_label = tk.Label(
-                left_frame,
-                text=f"Discord: {discord}",
-                font=("Segoe UI", 8),
-                bg=bg_color,
-                fg="#666"
+            # Virtualized list - only the rows in the viewport exist on the canvas
+            employee_list = VirtualOrgView(
+                content,
+                {self.city_name: {self.institution_name: self.employees}},
+                ranks_map=self.ranks_map,
+                show_headers=False
             )
-            discord_label.pack(anchor="w")
-        
-        # Right: Rank, Role, Points
-        right_frame = tk.Frame(card, bg=bg_color)
-        right_frame.pack(side="right", padx=10, pady=8)
-        
-        rank = emp.get("RANK") or emp.get("rank", "?")
-        role = emp.get("ROLE") or emp.get("role", "")
-        points = emp.get("PUNCTAJ") or emp.get("points", 0)
-        
-        # Rank with role
-        role_display = self.ranks_map.get(str(rank), role) if self.ranks_map else role
-        
-        rank_label = tk.Label(
-            right_frame,
-            text=f"Rank {rank}: {role_display}",
-            font=("Segoe UI", 9),
-            bg=bg_color,
-            fg="#f57c00"
-        )
-        rank_label.pack(anchor="e")
-        
-        # Points indicator
-        points_int = int(points) if isinstance(points, (int, str, float)) else 0
-        points_color = "#c62828" if points_int == 0 else "#2e7d32" if points_int > 0 else "#000"
-        
-        points_label = tk.Label(
-            right_frame,
-            text=f"⭐ {points_int} points",
-            font=("Segoe UI", 9, "bold"),
-            bg=bg_color,
-            fg=points_color
-        )
-        points_label.pack(anchor="e")
+            employee_list.pack(fill="both", expand=True)
 
 
 def create_organized_view(parent, data_structure, ranks_map=None):
@@ -170,44 +93,10 @@ def create_organized_view(parent, data_structure, ranks_map=None):
         ranks_map: Dict mapping rank numbers to role names
     """
     
-    main_frame = tk.Frame(parent)
+    # One virtualized Canvas for every city / institution (collapsible headers)
+    main_frame = VirtualOrgView(parent, data_structure, ranks_map=ranks_map, bg="#f0f0f0")
     main_frame.pack(fill="both", expand=True)
     
-    # Create canvas with scrollbar
-    canvas = tk.Canvas(main_frame, bg="#f0f0f0", highlightthickness=0)
-    scrollbar = tk.Scrollbar(main_frame, orient="vertical", command=canvas.yview)
-    scrollable_frame = tk.Frame(canvas, bg="#f0f0f0")
-    
-    scrollable_frame.bind(
-        "<Configure>",
-        lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
-    )
-    
-    canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
-    canvas.configure(yscrollcommand=scrollbar.set)
-    
-    # Add groups for each city/institution
-    for city in sorted(data_structure.keys()):
-        institutions = data_structure[city]
-        
-        for institution in sorted(institutions.keys()):
-            employees = institutions[institution]
-            
-            group = EmployeeGroupFrame(
-                scrollable_frame,
-                city,
-                institution,
-                employees,
-                ranks_map=ranks_map,
-                bg="#ffffff",
-                relief="solid",
-                borderwidth=1
-            )
-            group.pack(fill="x", padx=10, pady=10)
-    
-    canvas.pack(side="left", fill="both", expand=True)
-    scrollbar.pack(side="right", fill="y")
-    
     return main_frame
 
 
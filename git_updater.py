@@ -8,12 +8,15 @@ import os
 import sys
 import tkinter as tk
 from tkinter import ttk, messagebox, scrolledtext
+import shlex
 import subprocess
 import threading
 import time
 from datetime import datetime
 import configparser
 
+from delta_updater import DeltaUpdater, UpdateError, load_update_config
+
 # Versiune
 VERSION = "1.0.0"
 
@@ -38,6 +41,10 @@ class GitUpdater:
         self.is_updating = False
         self.repo_path = os.path.dirname(os.path.abspath(__file__))
         
+        # Canal delta (update_config.ini) - dacă e configurat, git nu mai e folosit
+        self.update_config = load_update_config(self.repo_path)
+        self.delta_url = self.update_config["url"]
+        
         # UI
         self.setup_ui()
         
@@ -200,8 +207,7 @@ class GitUpdater:
             self.log(f"Executând: {command}", "CMD")
             
             result = subprocess.run(
-                command,
-                shell=True,
+                shlex.split(command),
                 cwd=cwd,
                 capture_output=True,
                 text=True,
@@ -224,6 +230,11 @@ class GitUpdater:
     
     def check_git_status(self):
         """Verifică statusul git repository-ului"""
+        if self.delta_url:
+            self.status_label.config(text=f"✓ Canal actualizări: {self.delta_url}", fg="#27ae60")
+            self.log(f"Canal delta activ: {self.delta_url}")
+            return
+        
         self.log("Verificând statusul git repository...")
         
         # Verifică dacă este git repo
@@ -254,6 +265,15 @@ class GitUpdater:
                 fg="#27ae60"
             )
     
+    def make_delta_updater(self):
+        return DeltaUpdater(
+            self.delta_url,
+            self.repo_path,
+            workers=self.update_config["workers"],
+            timeout=self.update_config["timeout"],
+            log=self.log,
+        )
+    
     def check_updates(self):
         """Verifică dacă există actualizări disponibile"""
         if self.is_updating:
@@ -266,6 +286,25 @@ class GitUpdater:
             self.update_status("Verificând actualizări...")
             
             try:
+                if self.delta_url:
+                    try:
+                        plan = self.make_delta_updater().plan()
+                    except UpdateError as e:
+                        messagebox.showerror("Eroare", f"Nu pot verifica actualizările:\n{e}")
+                        return
+                    if plan.up_to_date:
+                        self.log(f"Aplicația este la zi ({plan.version})")
+                        messagebox.showinfo("La Zi", "✅ Aplicația este deja la ultima versiune!")
+                    else:
+                        self.log(f"Versiunea {plan.version}: {len(plan.changed)} fișiere modificate "
+                                 f"({plan.download_bytes / 1024:.1f} KB)")
+                        messagebox.showinfo(
+                            "Actualizări Disponibile",
+                            f"🔄 Versiunea {plan.version}: {len(plan.changed)} fișiere modificate!\n\n"
+                            f"Apasă 'Actualizează' pentru a le descărca."
+                        )
+                    return
+                
                 # Fetch remote changes
                 self.log("Verificând actualizări disponibile...")
                 success, output = self.run_git_command("git fetch origin")
@@ -331,6 +370,25 @@ class GitUpdater:
             self.update_status("Actualizare în progres...")
             
             try:
+                if self.delta_url:
+                    try:
+                        result = self.make_delta_updater().update()
+                    except UpdateError as e:
+                        self.log(f"Actualizare eșuată: {e}", "ERROR")
+                        messagebox.showerror("Eroare Actualizare", f"❌ {e}\n\nFișierele locale au rămas neschimbate.")
+                        return
+                    if result.changed or result.removed:
+                        self.restart_button.config(state=tk.NORMAL)
+                        messagebox.showinfo(
+                            "Actualizare Completă",
+                            f"✅ Actualizat la {result.version}: {len(result.changed)} fișiere, "
+                            f"{result.downloaded_bytes / 1024:.1f} KB descărcați.\n\n"
+                            "🔄 Poți restarța aplicația principală acum."
+                        )
+                    else:
+                        messagebox.showinfo("La Zi", "✅ Aplicația era deja la ultima versiune!")
+                    return
+                
                 # Backup config files înainte de pull
                 self.log("Făcând backup la fișierele de configurare...")
                 config_files = ["supabase_config.ini", "users_permissions.json"]
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Supabase id registry - city / institution name -> id for one Supabase server
+
+    cities        name -> id
+    institutions  (city_id, name) -> id
+    file          supabase_ids.json in the server's data dir (atomic write),
+                  ignored when it was written for another Supabase URL
+    refresh       replace_all() with the embedded cities+institutions read (one request)
+    realtime      apply_event() for cities / institutions INSERT / UPDATE / DELETE
+
+Every name -> id lookup of the write paths goes through here instead of a GET per lookup
+"""
+
+import json
+import os
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from atomic_io import atomic_write_json
+
+REGISTRY_FILE_NAME = "supabase_ids.json"
+
+
+class SupabaseIdRegistry:
+    """Thread-safe name -> id maps (realtime thread + Tkinter thread + upload workers)"""
+
+    def __init__(self, server: str = "", state_file: Optional[str] = None):
+        self.server = server
+        self.state_file = None
+        self.refreshed_at: Optional[str] = None
+        self._lock = threading.RLock()
+        self._city_ids: Dict[str, Any] = {}
+        self._city_names: Dict[str, str] = {}                       # str(id) -> name
+        self._institution_ids: Dict[Tuple[str, str], Any] = {}      # (str(city_id), name) -> id
+        self._institution_keys: Dict[str, Tuple[str, str]] = {}     # str(id) -> key
+        if state_file:
+            self.set_state_file(state_file)
+
+    # ==================== PERSISTENCE ====================
+
+    def set_state_file(self, state_file: str) -> bool:
+        """
+        Use (and load) a registry file - e.g. once the server data dir is known
+        Switching to another file (another server) drops the ids read from the previous one
+        """
+        with self._lock:
+            if self.state_file and os.path.abspath(self.state_file) != os.path.abspath(state_file):
+                self._clear()
+                self.refreshed_at = None
+            self.state_file = state_file
+            return self.load()
+
+    def load(self) -> bool:
+        if not self.state_file or not os.path.exists(self.state_file):
+            return False
+        try:
+            with open(self.state_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Id registry unreadable ({self.state_file}): {e}")
+            return False
+        if data.get("server") != self.server:
+            return False
+        with self._lock:
+            self._clear()
+            for name, city_id in data.get("cities", {}).items():
+                self._set_city(name, city_id)
+            for city_id, name, institution_id in data.get("institutions", []):
+                self._set_institution(city_id, name, institution_id)
+            self.refreshed_at = data.get("refreshed_at")
+        return True
+
+    def save(self) -> bool:
+        with self._lock:
+            if not self.state_file:
+                return False
+            data = {
+                "server": self.server,
+                "refreshed_at": self.refreshed_at,
+                "cities": dict(self._city_ids),
+                "institutions": [[city_id, name, inst_id]
+                                 for (city_id, name), inst_id in self._institution_ids.items()],
+            }
+            try:
+                atomic_write_json(self.state_file, data, indent=None)
+                return True
+            except OSError as e:
+                print(f"⚠️ Could not save id registry: {e}")
+                return False
+
+    # ==================== LOOKUPS ====================
+
+    def city_id(self, city_name: str):
+        with self._lock:
+            return self._city_ids.get(city_name)
+
+    def institution_id(self, city_id, institution_name: str):
+        with self._lock:
+            return self._institution_ids.get((str(city_id), institution_name))
+
+    def institutions(self, city_id) -> Dict[str, Any]:
+        """name -> id of one city's institutions"""
+        with self._lock:
+            return {name: inst_id for (cid, name), inst_id in self._institution_ids.items() if cid == str(city_id)}
+
+    def cities(self) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self._city_ids)
+
+    def __len__(self):
+        return len(self._institution_ids)
+
+    # ==================== UPDATES ====================
+
+    def _clear(self):
+        self._city_ids.clear()
+        self._city_names.clear()
+        self._institution_ids.clear()
+        self._institution_keys.clear()
+
+    def _set_city(self, name, city_id):
+        if not name or city_id is None:
+            return False
+        old_name = self._city_names.get(str(city_id))
+        if old_name == name:
+            return False
+        if old_name is not None:           # renamed
+            self._city_ids.pop(old_name, None)
+        self._city_ids[name] = city_id
+        self._city_names[str(city_id)] = name
+        return True
+
+    def _set_institution(self, city_id, name, institution_id):
+        if not name or city_id is None or institution_id is None:
+            return False
+        key = (str(city_id), name)
+        old_key = self._institution_keys.get(str(institution_id))
+        if old_key == key:
+            return False
+        if old_key is not None:            # renamed / moved to another city
+            self._institution_ids.pop(old_key, None)
+        self._institution_ids[key] = institution_id
+        self._institution_keys[str(institution_id)] = key
+        return True
+
+    def _forget_city(self, city_id):
+        name = self._city_names.pop(str(city_id), None)
+        if name is not None:
+            self._city_ids.pop(name, None)
+        for key in [k for k in self._institution_ids if k[0] == str(city_id)]:
+            self._institution_keys.pop(str(self._institution_ids.pop(key)), None)
+        return name is not None
+
+    def _forget_institution(self, institution_id):
+        key = self._institution_keys.pop(str(institution_id), None)
+        if key is not None:
+            self._institution_ids.pop(key, None)
+        return key is not None
+
+    def set_city(self, name: str, city_id):
+        with self._lock:
+            if self._set_city(name, city_id):
+                self.save()
+
+    def set_institution(self, city_id, name: str, institution_id):
+        with self._lock:
+            if self._set_institution(city_id, name, institution_id):
+                self.save()
+
+    def forget_city(self, city_id):
+        with self._lock:
+            if self._forget_city(city_id):
+                self.save()
+
+    def forget_institution(self, institution_id):
+        with self._lock:
+            if self._forget_institution(institution_id):
+                self.save()
+
+    def replace_all(self, cities: List[Dict]):
+        """Whole registry from cities?select=id,name,institutions(id,name) - drops deleted entries"""
+        with self._lock:
+            self._clear()
+            for city in cities:
+                self._set_city(city.get("name"), city.get("id"))
+                for institution in city.get("institutions") or []:
+                    self._set_institution(city.get("id"), institution.get("name"), institution.get("id"))
+            self.refreshed_at = datetime.now().isoformat()
+            self.save()
+
+    def apply_event(self, table: str, event_type: str, record: Dict):
+        """Realtime row of cities / institutions (event_type: insert / update / delete)"""
+        event_type = event_type.lower()
+        if table == "cities":
+            if event_type == "delete":
+                self.forget_city(record.get("id"))
+            else:
+                self.set_city(record.get("name"), record.get("id"))
+        elif table == "institutions":
+            if event_type == "delete":
+                self.forget_institution(record.get("id"))
+            else:
+                self.set_institution(record.get("city_id"), record.get("name"), record.get("id"))
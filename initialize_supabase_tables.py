@@ -75,7 +75,8 @@ CREATE TABLE IF NOT EXISTS employees (
   punctaj INT DEFAULT 0,
   id_card_series TEXT,
   created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
-  updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+  updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+  CONSTRAINT uq_employees_institution_discord UNIQUE (institution_id, discord_username)
 );
 
 -- ============================================================================
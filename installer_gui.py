@@ -278,11 +278,12 @@ institution_level = system
         appdata_config.write_text(config_content, encoding='utf-8')
     
     def copy_encryption_module(self):
-        """Copy JSON encryptor module"""
-        source = Path(self.bundle_dir) / "json_encryptor.py"
-        if source.exists():
-            dest = self.install_path / "json_encryptor.py"
-            shutil.copy2(source, dest)
+        """Copy JSON encryptor module (+ atomic_io, used for its temp-file writes)"""
+        for module in ("json_encryptor.py", "atomic_io.py"):
+            source = Path(self.bundle_dir) / module
+            if source.exists():
+                dest = self.install_path / module
+                shutil.copy2(source, dest)
     
     def create_initial_json_files(self):
         """Create initial JSON structure for Supabase data sync"""
@@ -3,15 +3,74 @@
 JSON File Encryptor Module
 Protects JSON files from unauthorized modification outside the application
 Provides transparent encryption/decryption for data files
+
+Container format v2 (written by save_json_encrypted):
+    header  -> b"PJENC" | version (1) | codec (1) | chunk size (4) | nonce prefix (8)
+    frames  -> last flag (1) | length (4) | AES-256-GCM(chunk of the compressed stream)
+               nonce = prefix + frame counter, AAD = header + counter + last flag,
+               so frames cannot be reordered, dropped or truncated unnoticed
+    payload -> compact JSON (no indent), zlib (or zstd when installed) before encryption
+
+Readers decrypt frame by frame (iter_decrypted); files from before v2 are a single
+Fernet token and are still read transparently. The AES key is derived (HKDF) from
+the existing .secure_key, so no new key has to be distributed.
 """
 
 import json
 import os
+import zlib
+import codecs
+import struct
+from typing import Iterable, Iterator
+
 from cryptography.fernet import Fernet
+from cryptography.exceptions import InvalidTag
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
 from pathlib import Path
 import base64
 import hashlib
 
+from atomic_io import atomic_writer
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+CONTAINER_MAGIC = b"PJENC"
+CONTAINER_VERSION = 2
+CODEC_NONE, CODEC_ZLIB, CODEC_ZSTD = 0, 1, 2
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+_HEADER = struct.Struct(">5sBBI8s")
+_FRAME = struct.Struct(">BI")
+_AAD = struct.Struct(">IB")
+
+
+class ContainerError(ValueError):
+    """Corrupt, truncated or tampered encrypted container"""
+
+
+def _compressor(codec: int):
+    if codec == CODEC_ZLIB:
+        return zlib.compressobj(6)
+    if codec == CODEC_ZSTD:
+        return zstandard.ZstdCompressor(level=3).compressobj()
+    return None
+
+
+def _decompressor(codec: int):
+    if codec == CODEC_ZLIB:
+        return zlib.decompressobj()
+    if codec == CODEC_ZSTD:
+        if zstandard is None:
+            raise ContainerError("file is zstd-compressed but the zstandard package is not installed")
+        return zstandard.ZstdDecompressor().decompressobj()
+    if codec == CODEC_NONE:
+        return None
+    raise ContainerError(f"unknown codec {codec}")
+
 class JSONEncryptor:
     """Encrypts and decrypts JSON files to prevent modification outside the app"""
     
@@ -24,6 +83,7 @@ class JSONEncryptor:
         """
         self.key_file = key_file
         self.cipher = self._load_or_create_key()
+        self.aead = AESGCM(self._derive_aead_key())
     
     def _load_or_create_key(self):
         """Load existing key or create new one"""
@@ -43,40 +103,148 @@ class JSONEncryptor:
             except:
                 pass  # Non-Windows system
         
+        self._fernet_key = key.strip()
         return Fernet(key)
     
-    def save_json_encrypted(self, file_path: str, data: dict) -> bool:
+    def _derive_aead_key(self) -> bytes:
+        """AES-256 key for the v2 container, derived from the Fernet key"""
+        return HKDF(algorithm=hashes.SHA256(), length=32, salt=None,
+                    info=b"punctaj json container v2").derive(base64.urlsafe_b64decode(self._fernet_key))
+    
+    @staticmethod
+    def _enc_path(file_path: str) -> str:
+        enc_path = file_path.replace('.json', '.enc')
+        if not enc_path.endswith('.enc'):
+            enc_path += '.enc'
+        return enc_path
+    
+    # ==================== CONTAINER V2 ====================
+    
+    def write_encrypted_stream(self, enc_path: str, chunks: Iterable[bytes], codec: int = None,
+                               chunk_size: int = DEFAULT_CHUNK_SIZE) -> int:
+        """
+        Compress + encrypt a byte stream into a v2 container (temp file + os.replace)
+        Returns the container size in bytes
+        """
+        if codec is None:
+            codec = CODEC_ZLIB
+        header = _HEADER.pack(CONTAINER_MAGIC, CONTAINER_VERSION, codec, chunk_size, os.urandom(8))
+        nonce_prefix = header[-8:]
+        compressor = _compressor(codec)
+        written = 0
+        
+        with atomic_writer(enc_path) as f:
+            f.write(header)
+            written += len(header)
+            counter = 0
+            pending = bytearray()
+            
+            def emit(block: bytes, last: bool):
+                nonlocal counter, written
+                flag = 1 if last else 0
+                sealed = self.aead.encrypt(nonce_prefix + struct.pack(">I", counter), block,
+                                           header + _AAD.pack(counter, flag))
+                f.write(_FRAME.pack(flag, len(sealed)))
+                f.write(sealed)
+                written += _FRAME.size + len(sealed)
+                counter += 1
+            
+            for chunk in chunks:
+                pending += compressor.compress(chunk) if compressor else chunk
+                while len(pending) >= chunk_size:
+                    emit(bytes(pending[:chunk_size]), False)
+                    del pending[:chunk_size]
+            if compressor:
+                pending += compressor.flush()
+            while len(pending) > chunk_size:
+                emit(bytes(pending[:chunk_size]), False)
+                del pending[:chunk_size]
+            emit(bytes(pending), True)
+        return written
+    
+    def iter_decrypted(self, enc_path: str) -> Iterator[bytes]:
+        """
+        Plaintext of an encrypted file, one frame at a time (v2)
+        Legacy Fernet files are decrypted in one piece
+        """
+        with open(enc_path, 'rb') as f:
+            header = f.read(_HEADER.size)
+            if not header.startswith(CONTAINER_MAGIC):
+                # Legacy: the whole file is one Fernet token
+                yield self.cipher.decrypt(header + f.read())
+                return
+            if len(header) < _HEADER.size:
+                raise ContainerError("truncated header")
+            _, version, codec, _, nonce_prefix = _HEADER.unpack(header)
+            if version != CONTAINER_VERSION:
+                raise ContainerError(f"unsupported container version {version}")
+            decompressor = _decompressor(codec)
+            counter = 0
+            while True:
+                frame = f.read(_FRAME.size)
+                if len(frame) < _FRAME.size:
+                    raise ContainerError("truncated file (no final frame)")
+                flag, length = _FRAME.unpack(frame)
+                sealed = f.read(length)
+                if len(sealed) < length:
+                    raise ContainerError("truncated frame")
+                try:
+                    block = self.aead.decrypt(nonce_prefix + struct.pack(">I", counter), sealed,
+                                              header + _AAD.pack(counter, flag))
+                except InvalidTag:
+                    raise ContainerError(f"frame {counter} failed authentication")
+                counter += 1
+                data = decompressor.decompress(block) if decompressor else block
+                if data:
+                    yield data
+                if flag:
+                    if decompressor is not None and codec == CODEC_ZLIB:
+                        tail = decompressor.flush()
+                        if tail:
+                            yield tail
+                    return
+    
+    def load_encrypted_file(self, enc_path: str):
+        """Decrypt + parse one .enc file (v2 or legacy); errors are raised"""
+        decoder = codecs.getincrementaldecoder('utf-8')()
+        parts = [decoder.decode(chunk) for chunk in self.iter_decrypted(enc_path)]
+        parts.append(decoder.decode(b"", final=True))
+        return json.loads("".join(parts))
+    
+    def save_json_encrypted(self, file_path: str, data: dict, codec: int = None) -> bool:
         """
         Save JSON data as encrypted file
         
         Args:
             file_path: Path to save (will add .enc extension)
             data: Dictionary to encrypt
+            codec: CODEC_ZLIB (default) / CODEC_ZSTD / CODEC_NONE
             
         Returns:
             True if successful
         """
         try:
-            # Convert to JSON string
-            json_str = json.dumps(data, ensure_ascii=False, indent=2)
-            json_bytes = json_str.encode('utf-8')
+            enc_path = self._enc_path(file_path)
             
-            # Encrypt
-            encrypted = self.cipher.encrypt(json_bytes)
+            # Compact JSON straight into the compressor; log lists go in batches of
+            # entries (C encoder per batch) so the whole text never sits in memory
+            dumps = json.JSONEncoder(ensure_ascii=False, separators=(',', ':')).encode
             
-            # Save as .enc file
-            enc_path = file_path.replace('.json', '.enc')
-            if not enc_path.endswith('.enc'):
-                enc_path += '.enc'
+            def chunks():
+                if not isinstance(data, list):
+                    yield dumps(data).encode('utf-8')
+                    return
+                yield b"["
+                for start in range(0, len(data), 1000):
+                    prefix = "," if start else ""
+                    yield (prefix + dumps(data[start:start + 1000])[1:-1]).encode('utf-8')
+                yield b"]"
             
-            # Create directory if needed
-            os.makedirs(os.path.dirname(enc_path), exist_ok=True)
-            
-            with open(enc_path, 'wb') as f:
-                f.write(encrypted)
+            # Atomic: the previous .enc stays intact if anything fails
+            self.write_encrypted_stream(enc_path, chunks(), codec=codec)
             
             # Delete original JSON if it exists
-            if os.path.exists(file_path):
+            if file_path != enc_path and os.path.exists(file_path):
                 os.remove(file_path)
             
             return True
@@ -96,9 +264,7 @@ class JSONEncryptor:
         """
         try:
             # Try .enc file first
-            enc_path = file_path.replace('.json', '.enc')
-            if not enc_path.endswith('.enc'):
-                enc_path += '.enc'
+            enc_path = self._enc_path(file_path)
             
             if not os.path.exists(enc_path):
                 # Fallback to regular JSON if .enc doesn't exist
@@ -107,16 +273,8 @@ class JSONEncryptor:
                         return json.load(f)
                 return {}
             
-            # Read encrypted file
-            with open(enc_path, 'rb') as f:
-                encrypted = f.read()
-            
-            # Decrypt
-            decrypted = self.cipher.decrypt(encrypted)
-            json_str = decrypted.decode('utf-8')
-            
-            # Parse JSON
-            return json.loads(json_str)
+            # Decrypt (v2 frame by frame, or legacy Fernet) + parse
+            return self.load_encrypted_file(enc_path)
         except Exception as e:
             print(f"❌ Decryption error: {e}")
             return {}
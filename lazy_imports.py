@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Lazy Imports - optional subsystems are imported on first use, not at startup
+Used by punctaj.py for modules that are not needed before the first window
+
+    module_available(name) -> find_spec only: the module code does not run
+    lazy(module, attr)     -> proxy (or None when the module is missing);
+                              the real import happens on the first call / attribute access
+
+    BackupManager = lazy("backup_manager", "BackupManager")
+    if BackupManager:
+        BACKUP_MANAGER = BackupManager(...)   # backup_manager imported here
+"""
+
+import importlib
+import importlib.util
+import threading
+from typing import Any, Optional
+
+_MISSING = object()
+
+
+def module_available(name: str) -> bool:
+    """True if `name` can be imported (works with the PyInstaller frozen importer)"""
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+class LazySymbol:
+    """Stands in for a module or a module attribute until it is first used"""
+
+    def __init__(self, module: str, attr: Optional[str] = None):
+        self._module = module
+        self._attr = attr
+        self._target = _MISSING
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        return self._target is not _MISSING
+
+    def load(self) -> Any:
+        if self._target is _MISSING:
+            with self._lock:
+                if self._target is _MISSING:
+                    module = importlib.import_module(self._module)
+                    self._target = getattr(module, self._attr) if self._attr else module
+        return self._target
+
+    def __call__(self, *args, **kwargs):
+        return self.load()(*args, **kwargs)
+
+    def __getattr__(self, name: str):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self.load(), name)
+
+    def __repr__(self):
+        target = f"{self._module}.{self._attr}" if self._attr else self._module
+        return f"<lazy {target}{' (loaded)' if self.loaded else ''}>"
+
+
+def lazy(module: str, attr: Optional[str] = None) -> Optional[LazySymbol]:
+    """Proxy for module[.attr], or None if the module is not installed / bundled"""
+    return LazySymbol(module, attr) if module_available(module) else None
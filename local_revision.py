@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Local Revision - recognise echoes of this app's own saves
+
+    revision -> next_revision(city, institution): "<session>:<n>", written into the JSON as
+                "local_revision"; the Treeview remembers the revision it shows, so a refresh
+                that finds the same revision in the file is our own write coming back
+    written  -> record(city, institution, rows): fingerprints of the rows a save uploaded
+    echo     -> is_echo(city, institution, row): a remote row (realtime / sync) equal to one
+                of our recent writes for that employee; dropped even when a newer local edit
+                already replaced it (applying it would bounce the old value back)
+    plan     -> plan_row_updates(current, columns, rows): update / insert / delete lists, so
+                a refresh touches only the rows that really changed
+
+The session part keeps revisions of two devices (or two runs) from ever comparing equal.
+"""
+
+import time
+import uuid
+import threading
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from local_store import row_key
+
+IGNORED_FIELDS = ("id", "ULTIMA_MOD")
+DEFAULT_TTL_S = 120.0
+MAX_WRITES_PER_ROW = 16
+
+
+def _fingerprint(row: Dict[str, Any]) -> Dict[str, str]:
+    return {str(k): "" if v is None else str(v) for k, v in row.items() if k not in IGNORED_FIELDS}
+
+
+class LocalRevisionLog:
+    """Revision counter per institution + recent rows written by this session"""
+
+    def __init__(self, ttl_s: float = DEFAULT_TTL_S, clock: Callable[[], float] = time.monotonic,
+                 session: Optional[str] = None):
+        self.session = session or uuid.uuid4().hex[:8]
+        self.ttl_s = ttl_s
+        self.clock = clock
+        self._counters: Dict[Tuple[str, str], int] = {}
+        self._written: Dict[Tuple[str, str, Tuple[str, str]], List[Tuple[float, Dict[str, str]]]] = {}
+        self._lock = threading.Lock()
+        self.stats = {"recorded": 0, "echoes": 0}
+
+    def next_revision(self, city: str, institution: str) -> str:
+        with self._lock:
+            n = self._counters.get((city, institution), 0) + 1
+            self._counters[(city, institution)] = n
+        return f"{self.session}:{n}"
+
+    def is_own(self, revision: Optional[str]) -> bool:
+        return bool(revision) and str(revision).startswith(f"{self.session}:")
+
+    def record(self, city: str, institution: str, rows: Sequence[Dict[str, Any]]):
+        """Remember rows the cloud accepted (called once the upload succeeded - a failed one has no echo)"""
+        now = self.clock()
+        with self._lock:
+            for row in rows:
+                writes = self._written.setdefault((city, institution, row_key(row)), [])
+                writes.append((now, _fingerprint(row)))
+                del writes[:-MAX_WRITES_PER_ROW]
+                self.stats["recorded"] += 1
+
+    def is_echo(self, city: str, institution: str, row: Dict[str, Any]) -> bool:
+        """
+        True if row matches (on the fields it carries) a write of ours for the same employee
+        The matching write and the older ones are consumed - echoes arrive in order
+        """
+        incoming = _fingerprint(row)
+        key = (city, institution, row_key(row))
+        with self._lock:
+            writes = self._written.get(key)
+            if not writes:
+                return False
+            cutoff = self.clock() - self.ttl_s
+            writes[:] = [w for w in writes if w[0] >= cutoff]
+            for index in range(len(writes) - 1, -1, -1):
+                written = writes[index][1]
+                shared = [field for field in incoming if field in written]
+                if shared and all(incoming[field] == written[field] for field in shared):
+                    del writes[:index + 1]
+                    if not writes:
+                        self._written.pop(key, None)
+                    self.stats["echoes"] += 1
+                    return True
+            if not writes:
+                self._written.pop(key, None)
+            return False
+
+
+def plan_row_updates(current: Sequence[Tuple[Any, Sequence[Any]]], columns: Sequence[str],
+                     rows: Sequence[Any]) -> Dict[str, list]:
+    """
+    What a refresh has to do to show rows instead of current [(item_id, values)]
+
+    Returns {"update": [(item_id, values, row)], "insert": [(values, row)], "delete": [item_id]};
+    rows are matched by row_key, values compare as text, so unchanged rows keep their item
+    (and with it the selection)
+    """
+    columns = list(columns)
+    by_key: Dict[Tuple[str, str], List[Tuple[Any, Tuple[str, ...]]]] = {}
+    for item, values in current:
+        text = tuple(str(v) for v in values)
+        by_key.setdefault(row_key(dict(zip(columns, text))), []).append((item, text))
+
+    plan = {"update": [], "insert": [], "delete": []}
+    for row in rows:
+        if isinstance(row, (list, tuple)):
+            row = dict(zip(columns, row))
+        elif not isinstance(row, dict):
+            continue
+        values = tuple(row.get(col, "") for col in columns)
+        text = tuple("" if v is None else str(v) for v in values)
+        matches = by_key.get(row_key(row))
+        if matches:
+            item, shown = matches.pop(0)
+            if shown != text:
+                plan["update"].append((item, values, row))
+        else:
+            plan["insert"].append((values, row))
+    plan["delete"] = [item for matches in by_key.values() for item, _ in matches]
+    return plan
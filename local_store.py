@@ -0,0 +1,473 @@
+#!/usr/bin/env python3
+"""
+Local Store - storage backends behind load_institution / save_institution
+
+    json    -> data/{city}/{institution}.json (default, the historical layout)
+    sqlite  -> data/punctaj_local.db (WAL): institutions + employees tables,
+               row-level updates, indexes on discord / name / rank,
+               cross-city queries without opening every file
+
+Both backends expose the same methods:
+    list_cities() / list_institutions(city) / exists(city, institution)
+    load(city, institution) -> dict | None     (same dict as the JSON file)
+    save(city, institution, data)              (whole institution)
+    meta(city, institution)                    (everything except rows)
+    update_rows(city, institution, rows, meta) (only the given rows -> merged rows)
+    delete_institution / delete_city
+    search(text=None, rank=None, limit=200, exact=False) -> [(city, institution, row)]
+
+Bridge: import_json_tree(json_store) / export_json_tree(json_store), and with
+json_dir set the SQLite store re-imports an institution whose JSON file was
+changed by another writer (reset, realtime apply) and can mirror saves back
+(under the store lock; a file newer than the DB row - mtime or version - is imported,
+never overwritten).
+
+Backend choice: $PUNCTAJ_STORAGE_BACKEND or [storage] backend = json|sqlite
+"""
+
+import os
+import json
+import time
+import shutil
+import sqlite3
+import threading
+import configparser
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from atomic_io import atomic_write_json
+
+SQLITE_FILE_NAME = "punctaj_local.db"
+BACKENDS = ("json", "sqlite")
+
+def row_key(row: Dict) -> Tuple[str, str]:
+    """Identity of an employee row: DISCORD when present, else NUME IC"""
+    discord = str(row.get("DISCORD") or "").strip()
+    if discord:
+        return ("discord", discord)
+    return ("name", str(row.get("NUME IC") or "").strip())
+
+
+def _points(value) -> Optional[int]:
+    try:
+        return int(float(value))
+    except (TypeError, ValueError):
+        return None
+
+
+def _normalize_rows(data: Dict) -> List[Dict]:
+    """Legacy list rows -> dicts keyed by the institution columns"""
+    columns = data.get("columns") or []
+    rows = []
+    for row in data.get("rows", []):
+        if isinstance(row, dict):
+            rows.append(row)
+        elif isinstance(row, (list, tuple)):
+            rows.append(dict(zip(columns, row)))
+    return rows
+
+
+def resolve_backend(config_paths: Iterable[str] = (), env: str = "PUNCTAJ_STORAGE_BACKEND") -> str:
+    backend = (os.getenv(env, "") or "").strip().lower()
+    if not backend:
+        for path in config_paths:
+            if path and os.path.exists(path):
+                config = configparser.ConfigParser()
+                config.read(path, encoding="utf-8")
+                backend = config.get("storage", "backend", fallback="").strip().lower()
+                if backend:
+                    break
+    return backend if backend in BACKENDS else "json"
+
+
+# ==================== JSON BACKEND ====================
+
+class JsonInstitutionStore:
+    """One pretty-printed JSON file per institution (historical layout)"""
+
+    backend = "json"
+
+    def __init__(self, data_dir: str, indent: int = 4):
+        self.data_dir = data_dir
+        self.indent = indent
+
+    def path(self, city: str, institution: str) -> str:
+        return os.path.join(self.data_dir, city, f"{institution}.json")
+
+    def list_cities(self) -> List[str]:
+        if not os.path.isdir(self.data_dir):
+            return []
+        return sorted(d for d in os.listdir(self.data_dir) if os.path.isdir(os.path.join(self.data_dir, d)))
+
+    def list_institutions(self, city: str) -> List[str]:
+        folder = os.path.join(self.data_dir, city)
+        if not os.path.isdir(folder):
+            return []
+        return sorted(f[:-5] for f in os.listdir(folder) if f.endswith(".json"))
+
+    def exists(self, city: str, institution: str) -> bool:
+        return os.path.exists(self.path(city, institution))
+
+    def load(self, city: str, institution: str) -> Optional[Dict]:
+        try:
+            with open(self.path(city, institution), "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if isinstance(data, list):
+            data = {"columns": ["DISCORD", "RANK", "PUNCTAJ"], "ranks": {}, "rows": data}
+        return data
+
+    def save(self, city: str, institution: str, data: Dict):
+        atomic_write_json(self.path(city, institution), data, indent=self.indent, verify=False)
+
+    def meta(self, city: str, institution: str) -> Optional[Dict]:
+        data = self.load(city, institution)
+        return {k: v for k, v in data.items() if k != "rows"} if data is not None else None
+
+    def update_rows(self, city: str, institution: str, rows: List[Dict], meta: Optional[Dict] = None) -> List[Dict]:
+        """Rewrites the whole file - the JSON layout has no row-level write"""
+        data = self.load(city, institution) or {"columns": [], "ranks": {}, "rows": []}
+        data["rows"] = _normalize_rows(data)
+        positions = {row_key(r): i for i, r in enumerate(data["rows"])}
+        merged = []
+        for row in rows:
+            i = positions.get(row_key(row))
+            if i is None:
+                i = positions[row_key(row)] = len(data["rows"])
+                data["rows"].append(dict(row))
+            else:
+                data["rows"][i].update(row)
+            merged.append(data["rows"][i])
+        data.update(meta or {})
+        self.save(city, institution, data)
+        return merged
+
+    def delete_institution(self, city: str, institution: str):
+        if self.exists(city, institution):
+            os.remove(self.path(city, institution))
+
+    def delete_city(self, city: str):
+        shutil.rmtree(os.path.join(self.data_dir, city), ignore_errors=True)
+
+    def iter_all(self):
+        for city in self.list_cities():
+            for institution in self.list_institutions(city):
+                data = self.load(city, institution)
+                if data is not None:
+                    yield city, institution, data
+
+    def search(self, text: Optional[str] = None, rank: Optional[str] = None, limit: int = 200,
+               exact: bool = False) -> List[Tuple[str, str, Dict]]:
+        """Opens every institution file"""
+        needle = (text or "").strip().lower()
+        match = (lambda value: needle == value) if exact else (lambda value: needle in value)
+        found = []
+        for city, institution, data in self.iter_all():
+            for row in _normalize_rows(data):
+                if rank is not None and str(row.get("RANK", "")) != str(rank):
+                    continue
+                if needle and not match(str(row.get("DISCORD", "")).lower()) \
+                        and not match(str(row.get("NUME IC", "")).lower()):
+                    continue
+                found.append((city, institution, row))
+                if len(found) >= limit:
+                    return found
+        return found
+
+
+# ==================== SQLITE BACKEND ====================
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS institutions (
+    id INTEGER PRIMARY KEY,
+    city TEXT NOT NULL,
+    name TEXT NOT NULL,
+    meta TEXT NOT NULL DEFAULT '{}',
+    json_mtime_ns INTEGER NOT NULL DEFAULT 0,
+    updated_ns INTEGER NOT NULL DEFAULT 0,
+    UNIQUE (city, name)
+);
+CREATE TABLE IF NOT EXISTS employees (
+    id INTEGER PRIMARY KEY,
+    institution_id INTEGER NOT NULL REFERENCES institutions(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    discord TEXT,
+    name TEXT,
+    rank TEXT,
+    punctaj INTEGER,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_employees_institution ON employees(institution_id, position);
+CREATE INDEX IF NOT EXISTS idx_employees_discord ON employees(discord);
+CREATE INDEX IF NOT EXISTS idx_employees_name ON employees(name COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS idx_employees_rank ON employees(rank);
+"""
+
+
+class SqliteInstitutionStore:
+    """Embedded SQLite (WAL) - one row per employee, institution metadata as JSON"""
+
+    backend = "sqlite"
+
+    def __init__(self, db_path: str, json_dir: Optional[str] = None):
+        self.db_path = db_path
+        self.json_store = JsonInstitutionStore(json_dir) if json_dir else None
+        self._lock = threading.RLock()
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self.conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA foreign_keys=ON")
+        self.conn.executescript(SCHEMA)
+        columns = {r[1] for r in self.conn.execute("PRAGMA table_info(institutions)")}
+        if "updated_ns" not in columns:
+            # Databases created before updated_ns: every row counts as older than its JSON file
+            self.conn.execute("ALTER TABLE institutions ADD COLUMN updated_ns INTEGER NOT NULL DEFAULT 0")
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+    # ---------------------------------------------------------------- helpers
+    def _institution_id(self, city: str, institution: str) -> Optional[int]:
+        row = self.conn.execute("SELECT id FROM institutions WHERE city = ? AND name = ?",
+                                (city, institution)).fetchone()
+        return row[0] if row else None
+
+    @staticmethod
+    def _employee_params(institution_id: int, position: int, row: Dict) -> tuple:
+        return (institution_id, position, str(row.get("DISCORD") or "").strip() or None,
+                str(row.get("NUME IC") or "").strip() or None, str(row.get("RANK", "")) or None,
+                _points(row.get("PUNCTAJ")), json.dumps(row, ensure_ascii=False))
+
+    def _json_mtime(self, city: str, institution: str) -> int:
+        if not self.json_store:
+            return 0
+        try:
+            return os.stat(self.json_store.path(city, institution)).st_mtime_ns
+        except OSError:
+            return 0
+
+    def _json_is_newer(self, city: str, institution: str) -> bool:
+        """
+        The JSON file changed outside this store (realtime apply, reset) after the DB row was
+        last synced with it or written: by mtime, or by a higher "version"
+        """
+        mtime = self._json_mtime(city, institution)
+        if not mtime:
+            return False
+        row = self.conn.execute("SELECT json_mtime_ns, updated_ns, meta FROM institutions "
+                                "WHERE city = ? AND name = ?", (city, institution)).fetchone()
+        if row is None:
+            return True
+        if mtime == row[0]:
+            return False
+        if mtime > max(row[0], row[1]):
+            return True
+        on_disk = _points((self.json_store.meta(city, institution) or {}).get("version"))
+        in_db = _points(json.loads(row[2]).get("version"))
+        return on_disk is not None and in_db is not None and on_disk > in_db
+
+    def _refresh_from_json(self, city: str, institution: str):
+        """Re-import an institution whose JSON file changed outside this store"""
+        if self._json_is_newer(city, institution):
+            mtime = self._json_mtime(city, institution)
+            data = self.json_store.load(city, institution)
+            if data is not None:
+                self.save(city, institution, data, json_mtime_ns=mtime)
+
+    # ---------------------------------------------------------------- discovery
+    def list_cities(self) -> List[str]:
+        with self._lock:
+            return [r[0] for r in self.conn.execute("SELECT DISTINCT city FROM institutions ORDER BY city")]
+
+    def list_institutions(self, city: str) -> List[str]:
+        with self._lock:
+            return [r[0] for r in self.conn.execute(
+                "SELECT name FROM institutions WHERE city = ? ORDER BY name", (city,))]
+
+    def exists(self, city: str, institution: str) -> bool:
+        with self._lock:
+            return self._institution_id(city, institution) is not None
+
+    # ---------------------------------------------------------------- read / write
+    def load(self, city: str, institution: str) -> Optional[Dict]:
+        with self._lock:
+            if self.json_store:
+                self._refresh_from_json(city, institution)
+            return self._read(city, institution)
+
+    def _read(self, city: str, institution: str) -> Optional[Dict]:
+        """The institution as stored in the DB (caller holds the lock, no JSON refresh)"""
+        row = self.conn.execute("SELECT id, meta FROM institutions WHERE city = ? AND name = ?",
+                                (city, institution)).fetchone()
+        if row is None:
+            return None
+        data = json.loads(row[1])
+        data["rows"] = [json.loads(r[0]) for r in self.conn.execute(
+            "SELECT data FROM employees WHERE institution_id = ? ORDER BY position", (row[0],))]
+        return data
+
+    def save(self, city: str, institution: str, data: Dict, json_mtime_ns: Optional[int] = None):
+        """Replace the whole institution in one transaction"""
+        meta = {k: v for k, v in data.items() if k != "rows"}
+        rows = _normalize_rows(data)
+        with self._lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                self.conn.execute(
+                    "INSERT INTO institutions (city, name, meta) VALUES (?, ?, ?) "
+                    "ON CONFLICT (city, name) DO UPDATE SET meta = excluded.meta",
+                    (city, institution, json.dumps(meta, ensure_ascii=False)))
+                # Imported from JSON: as old as the file; a local write: now
+                self.conn.execute("UPDATE institutions SET json_mtime_ns = COALESCE(?, json_mtime_ns), "
+                                  "updated_ns = ? WHERE city = ? AND name = ?",
+                                  (json_mtime_ns, json_mtime_ns or time.time_ns(), city, institution))
+                inst_id = self._institution_id(city, institution)
+                self.conn.execute("DELETE FROM employees WHERE institution_id = ?", (inst_id,))
+                self.conn.executemany(
+                    "INSERT INTO employees (institution_id, position, discord, name, rank, punctaj, data) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    [self._employee_params(inst_id, i, row) for i, row in enumerate(rows)])
+                self.conn.execute("COMMIT")
+            except Exception:
+                self.conn.execute("ROLLBACK")
+                raise
+
+    def meta(self, city: str, institution: str) -> Optional[Dict]:
+        with self._lock:
+            if self.json_store:
+                self._refresh_from_json(city, institution)
+            row = self.conn.execute("SELECT meta FROM institutions WHERE city = ? AND name = ?",
+                                    (city, institution)).fetchone()
+            return json.loads(row[0]) if row else None
+
+    def update_rows(self, city: str, institution: str, rows: List[Dict], meta: Optional[Dict] = None) -> List[Dict]:
+        """UPDATE only the given employees (matched by DISCORD, else NUME IC); unknown rows are appended"""
+        with self._lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                inst_id = self._institution_id(city, institution)
+                if inst_id is None:
+                    self.conn.execute("INSERT INTO institutions (city, name, meta) VALUES (?, ?, '{}')",
+                                      (city, institution))
+                    inst_id = self._institution_id(city, institution)
+                if meta:
+                    current = json.loads(self.conn.execute(
+                        "SELECT meta FROM institutions WHERE id = ?", (inst_id,)).fetchone()[0])
+                    current.update(meta)
+                    self.conn.execute("UPDATE institutions SET meta = ? WHERE id = ?",
+                                      (json.dumps(current, ensure_ascii=False), inst_id))
+                merged = []
+                for row in rows:
+                    kind, value = row_key(row)
+                    column = "discord" if kind == "discord" else "name"
+                    existing = self.conn.execute(
+                        f"SELECT id, data FROM employees WHERE institution_id = ? AND {column} = ?",
+                        (inst_id, value)).fetchone()
+                    if existing:
+                        row = dict(json.loads(existing[1]), **row)
+                        params = self._employee_params(inst_id, 0, row)
+                        self.conn.execute(
+                            "UPDATE employees SET discord = ?, name = ?, rank = ?, punctaj = ?, data = ? WHERE id = ?",
+                            params[2:] + (existing[0],))
+                    else:
+                        position = self.conn.execute(
+                            "SELECT COALESCE(MAX(position), -1) + 1 FROM employees WHERE institution_id = ?",
+                            (inst_id,)).fetchone()[0]
+                        self.conn.execute(
+                            "INSERT INTO employees (institution_id, position, discord, name, rank, punctaj, data) "
+                            "VALUES (?, ?, ?, ?, ?, ?, ?)", self._employee_params(inst_id, position, row))
+                    merged.append(row)
+                self.conn.execute("UPDATE institutions SET updated_ns = ? WHERE id = ?", (time.time_ns(), inst_id))
+                self.conn.execute("COMMIT")
+                return merged
+            except Exception:
+                self.conn.execute("ROLLBACK")
+                raise
+
+    def delete_institution(self, city: str, institution: str):
+        with self._lock:
+            self.conn.execute("DELETE FROM institutions WHERE city = ? AND name = ?", (city, institution))
+
+    def delete_city(self, city: str):
+        with self._lock:
+            self.conn.execute("DELETE FROM institutions WHERE city = ?", (city,))
+
+    # ---------------------------------------------------------------- queries
+    def search(self, text: Optional[str] = None, rank: Optional[str] = None, limit: int = 200,
+               exact: bool = False) -> List[Tuple[str, str, Dict]]:
+        """Across every city; exact=True and rank use the indexes, fragments scan the two columns"""
+        clauses, params = [], []
+        needle = (text or "").strip()
+        if needle and exact:
+            clauses.append("(e.discord = ? OR e.name = ? COLLATE NOCASE)")
+            params += [needle, needle]
+        elif needle:
+            clauses.append("(e.discord LIKE ? OR e.name LIKE ?)")
+            params += [f"%{needle}%", f"%{needle}%"]
+        if rank is not None:
+            clauses.append("e.rank = ?")
+            params.append(str(rank))
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        query = (f"SELECT i.city, i.name, e.data FROM employees e JOIN institutions i ON i.id = e.institution_id "
+                 f"{where} ORDER BY i.city, i.name, e.position LIMIT ?")
+        with self._lock:
+            return [(city, inst, json.loads(data)) for city, inst, data in self.conn.execute(query, params + [limit])]
+
+    # ---------------------------------------------------------------- JSON bridge
+    def import_json_tree(self, json_store: JsonInstitutionStore) -> int:
+        count = 0
+        for city, institution, data in json_store.iter_all():
+            mtime = os.stat(json_store.path(city, institution)).st_mtime_ns
+            self.save(city, institution, data, json_mtime_ns=mtime)
+            count += 1
+        return count
+
+    def export_institution(self, city: str, institution: str, json_store: Optional[JsonInstitutionStore] = None) -> bool:
+        """
+        Write the JSON mirror of one institution (for modules that still read the files)
+        A mirror file newer than the DB row is imported instead of overwritten; returns True if written
+        """
+        json_store = json_store or self.json_store
+        if json_store is None:
+            return False
+        with self._lock:
+            data = self._read(city, institution)
+            if data is None:
+                return False
+            if json_store is not self.json_store:
+                json_store.save(city, institution, data)
+                return True
+            if self._json_is_newer(city, institution):
+                # Written by realtime apply / the reset job after our last write: keep it, import it
+                self._refresh_from_json(city, institution)
+                return False
+            json_store.save(city, institution, data)
+            self.conn.execute("UPDATE institutions SET json_mtime_ns = ? WHERE city = ? AND name = ?",
+                              (self._json_mtime(city, institution), city, institution))
+            return True
+
+    def export_json_tree(self, json_store: JsonInstitutionStore) -> int:
+        count = 0
+        for city in self.list_cities():
+            for institution in self.list_institutions(city):
+                self.export_institution(city, institution, json_store)
+                count += 1
+        return count
+
+
+def open_store(data_dir: str, backend: str = "json"):
+    """
+    Store for the active data dir; the SQLite store imports the JSON tree on first use
+    and keeps following JSON files changed by other writers
+    """
+    if backend != "sqlite":
+        return JsonInstitutionStore(data_dir)
+    db_path = os.path.join(data_dir, SQLITE_FILE_NAME)
+    fresh = not os.path.exists(db_path)
+    store = SqliteInstitutionStore(db_path, json_dir=data_dir)
+    if fresh:
+        imported = store.import_json_tree(JsonInstitutionStore(data_dir))
+        print(f"🗄️ SQLite store created: {imported} institutions imported from JSON")
+    return store
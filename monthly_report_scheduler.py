@@ -7,67 +7,111 @@ Salvează automat raportele săptămânal în folderul arhiva luni la 00:00 (ora
 import os
 import json
 import csv
+import gzip
+import time
 import requests
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
 from pathlib import Path
-from apscheduler.schedulers.background import BackgroundScheduler
-from apscheduler.triggers.cron import CronTrigger
-import pytz
 import logging
 
+from app_scheduler import get_default_scheduler, WeeklyTrigger
+
+# Optional: Parquet export for analytics (pip install pyarrow)
+try:
+    import pyarrow
+    import pyarrow.parquet
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+# Columns of the per-week columnar export (one row per employee, all institutions)
+COLUMNAR_FIELDS = ["city", "institution", "DISCORD", "NUME IC", "RANK", "ROLE", "PUNCTAJ", "SERIE DE BULETIN", "ULTIMA_MOD"]
+
 class WeeklyReportScheduler:
     """Scheduler pentru salvarea rapoartelor săptămânale în folderul arhiva"""
     
-    def __init__(self, data_dir: str, archive_dir: str):
+    JOB_NAME = "weekly_report"
+    
+    UPLOAD_BATCH_SIZE = 500
+    
+    def __init__(self, data_dir, archive_dir, scheduler=None, supabase_sync=None,
+                 max_workers: int = 8, columnar_export: bool = True):
         """
         Initialize scheduler
         
         Args:
-            data_dir: Path to data folder (d:\\punctaj\\data)
-            archive_dir: Path to archive folder (d:\\punctaj\\arhiva)
+            data_dir: Path to data folder (d:\\punctaj\\data), or a callable returning it
+                      (the active server can change while the app runs)
+            archive_dir: Path to archive folder (d:\\punctaj\\arhiva), or a callable returning it
+            scheduler: AppScheduler (default: shared app scheduler)
+            supabase_sync: SupabaseSync used for the weekly_reports upload
+            max_workers: Threads for the local read/render stage
+            columnar_export: Also write one columnar file per week (Parquet if pyarrow is installed)
         """
-        self.data_dir = data_dir
-        self.archive_dir = archive_dir
-        self.scheduler = BackgroundScheduler()
-        self.scheduler.configure(timezone=pytz.timezone('Europe/Bucharest'))
+        self._data_dir = data_dir
+        self._archive_dir = archive_dir
+        self.scheduler = scheduler
+        self.supabase_sync = supabase_sync
+        self.max_workers = max(1, max_workers)
+        self.columnar_export = columnar_export
+        self.running = False
         
         # Create archive directory if it doesn't exist
-        os.makedirs(archive_dir, exist_ok=True)
+        os.makedirs(self.archive_dir, exist_ok=True)
         
         logger.info(f"✅ WeeklyReportScheduler initialized")
-        logger.info(f"   Data dir: {data_dir}")
-        logger.info(f"   Archive dir: {archive_dir}")
+        logger.info(f"   Data dir: {self.data_dir}")
+        logger.info(f"   Archive dir: {self.archive_dir}")
+    
+    @property
+    def data_dir(self) -> str:
+        return self._data_dir() if callable(self._data_dir) else self._data_dir
+    
+    @property
+    def archive_dir(self) -> str:
+        return self._archive_dir() if callable(self._archive_dir) else self._archive_dir
     
     def start(self):
         """Start the scheduler"""
-        if self.scheduler.running:
+        if self.running:
             logger.warning("Scheduler already running!")
             return
         
         # Schedule job to run at 00:00 every Monday (Romania time)
-        # day_of_week=0 means Monday
+        # weekday=0 means Monday; a Monday missed while the app was closed runs once at startup
+        self.scheduler = self.scheduler or get_default_scheduler()
         self.scheduler.add_job(
+            self.JOB_NAME,
             self.generate_weekly_report,
-            trigger=CronTrigger(hour=0, minute=0, day_of_week=0, timezone='Europe/Bucharest'),
-            id='weekly_report',
-            name='Weekly Report Generation',
-            replace_existing=True
+            WeeklyTrigger(weekday=0, hour=0, minute=0, tz='Europe/Bucharest'),
+            catch_up="run_once"
         )
+        self.running = True
         
-        self.scheduler.start()
         logger.info("✅ Weekly report scheduler started")
         logger.info("   Will run at 00:00 every Monday (Romania time)")
     
     def stop(self):
         """Stop the scheduler"""
-        if self.scheduler.running:
-            self.scheduler.shutdown()
+        if self.running:
+            self.scheduler.cancel_job(self.JOB_NAME)
+            self.running = False
             logger.info("✅ Weekly report scheduler stopped")
     
-    def generate_weekly_report(self):
-        """Generate and save weekly report to archive folder and Supabase"""
+    def generate_weekly_report(self, now: datetime = None) -> dict:
+        """
+        Generate and save weekly report to archive folder and Supabase
+        
+        Stage 1 (parallel, local): read each institution JSON, write its CSV
+        Stage 2 (local): one columnar file with all employees of the week
+        Stage 3 (network): all weekly_reports rows in one bulk insert
+        
+        Returns a summary with per-stage timings (ms)
+        """
+        timings = {}
         try:
             print("\n" + "="*60)
             print("🔄 WEEKLY REPORT GENERATION STARTED")
@@ -75,47 +119,38 @@ class WeeklyReportScheduler:
             print("="*60)
             
             # Get current date for folder name
-            now = datetime.now()
+            now = now or datetime.now()
             week_str = now.strftime("%Y-W%W")  # Format: 2026-W05
-            monday = now - __import__('datetime').timedelta(days=now.weekday())
+            monday = now - timedelta(days=now.weekday())
             week_range = f"{monday.strftime('%Y-%m-%d')} to {now.strftime('%Y-%m-%d')}"
             
             # Create weekly folder in archive
             weekly_dir = os.path.join(self.archive_dir, week_str)
             os.makedirs(weekly_dir, exist_ok=True)
             
-            # Get list of all cities
-            cities = self._get_cities()
+            stage_start = time.perf_counter()
+            targets = [(city, institution) for city in self._get_cities() for institution in self._get_institutions(city)]
+            timings["discover"] = (time.perf_counter() - stage_start) * 1000
             
-            total_files = 0
-            total_rows = 0
+            # Stage 1: local read + CSV render, in parallel
+            stage_start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="WeeklyReport") as pool:
+                rendered = list(pool.map(lambda t: self._render_institution(weekly_dir, t[0], t[1]), targets))
+            rendered = [r for r in rendered if r is not None]
+            timings["render_csv"] = (time.perf_counter() - stage_start) * 1000
             
-            for city in cities:
-                # Get institutions for this city
-                institutions = self._get_institutions(city)
-                
-                for institution in institutions:
-                    # Load institution data
-                    inst_data = self._load_institution(city, institution)
-                    if not inst_data:
-                        continue
-                    
-                    # Create city folder in weekly archive
-                    city_archive = os.path.join(weekly_dir, city)
-                    os.makedirs(city_archive, exist_ok=True)
-                    
-                    # Save as CSV
-                    csv_path = os.path.join(city_archive, f"{institution}.csv")
-                    self._save_as_csv(csv_path, inst_data)
-                    
-                    rows = inst_data.get("rows", [])
-                    total_files += 1
-                    total_rows += len(rows)
-                    
-                    # Save to Supabase weekly_reports table
-                    self._save_to_supabase(city, institution, monday, now, rows)
-                    
-                    print(f"   ✅ Saved: {city}/{institution}.csv ({len(rows)} employees)")
+            # Stage 2: columnar export for analytics
+            stage_start = time.perf_counter()
+            columnar_path = self._save_columnar(weekly_dir, rendered) if self.columnar_export else None
+            timings["columnar"] = (time.perf_counter() - stage_start) * 1000
+            
+            # Stage 3: one bulk insert into weekly_reports
+            stage_start = time.perf_counter()
+            uploaded = self._save_to_supabase_bulk(rendered, monday, now)
+            timings["upload"] = (time.perf_counter() - stage_start) * 1000
+            
+            total_files = len(rendered)
+            total_rows = sum(len(r["rows"]) for r in rendered)
             
             print("="*60)
             print("📊 WEEKLY REPORT GENERATION COMPLETED")
@@ -123,16 +158,84 @@ class WeeklyReportScheduler:
             print(f"   Week: {week_range}")
             print(f"   Total files: {total_files}")
             print(f"   Total employees: {total_rows}")
+            print(f"   Uploaded reports: {uploaded}")
+            print("   Timings: " + ", ".join(f"{stage} {ms:.0f} ms" for stage, ms in timings.items()))
             print("="*60 + "\n")
             
             logger.info(f"✅ Weekly report generated for week {week_str}")
             logger.info(f"   Location: {weekly_dir}")
             logger.info(f"   Files: {total_files}, Rows: {total_rows}")
             
+            return {
+                "week": week_str,
+                "weekly_dir": weekly_dir,
+                "files": total_files,
+                "rows": total_rows,
+                "uploaded": uploaded,
+                "columnar_path": columnar_path,
+                "timings_ms": {stage: round(ms, 2) for stage, ms in timings.items()},
+            }
+            
         except Exception as e:
             logger.error(f"❌ Error generating weekly report: {e}")
             import traceback
             traceback.print_exc()
+            return {"error": str(e), "timings_ms": timings}
+    
+    def _render_institution(self, weekly_dir: str, city: str, institution: str):
+        """Stage 1 worker: load one institution and write its CSV"""
+        inst_data = self._load_institution(city, institution)
+        if not inst_data:
+            return None
+        
+        city_archive = os.path.join(weekly_dir, city)
+        os.makedirs(city_archive, exist_ok=True)
+        self._save_as_csv(os.path.join(city_archive, f"{institution}.csv"), inst_data)
+        
+        return {
+            "city": city,
+            "institution": institution,
+            "columns": inst_data.get("columns", []),
+            "rows": inst_data.get("rows", []),
+        }
+    
+    def _save_columnar(self, weekly_dir: str, rendered: list):
+        """
+        Write all employees of the week column by column
+        Parquet (employees.parquet) if pyarrow is installed,
+        otherwise gzip JSON of {column: [values]} (employees.columnar.json.gz)
+        """
+        columns = {field: [] for field in COLUMNAR_FIELDS}
+        for report in rendered:
+            inst_columns = report["columns"]
+            for row in report["rows"]:
+                if not isinstance(row, dict):
+                    row = dict(zip(inst_columns, row))
+                columns["city"].append(report["city"])
+                columns["institution"].append(report["institution"])
+                for field in COLUMNAR_FIELDS[2:]:
+                    value = row.get(field, "")
+                    if field == "PUNCTAJ":
+                        try:
+                            value = int(value or 0)
+                        except (TypeError, ValueError):
+                            value = 0
+                    else:
+                        value = "" if value is None else str(value)
+                    columns[field].append(value)
+        
+        try:
+            if PARQUET_AVAILABLE:
+                path = os.path.join(weekly_dir, "employees.parquet")
+                pyarrow.parquet.write_table(pyarrow.table(columns), path, compression="zstd")
+            else:
+                path = os.path.join(weekly_dir, "employees.columnar.json.gz")
+                with gzip.open(path, "wt", encoding="utf-8") as f:
+                    json.dump({"fields": COLUMNAR_FIELDS, "columns": columns}, f, ensure_ascii=False, separators=(",", ":"))
+            return path
+        except Exception as e:
+            logger.warning(f"⚠️ Columnar export failed: {e}")
+            return None
     
     def _get_cities(self) -> list:
         """Get list of all cities from data directory"""
@@ -209,69 +312,68 @@ class WeeklyReportScheduler:
             logger.error(f"Error saving CSV {csv_path}: {e}")
             return False
     
-    def _save_to_supabase(self, city: str, institution: str, week_start, week_end, employees: list) -> bool:
-        """Save weekly report to Supabase weekly_reports table using REST API"""
-        try:
-            import requests
-            
-            # Import SUPABASE_SYNC to get credentials
-            import sys
-            import os
-            
-            # Get the parent directory and add it to path if needed
-            parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-            if parent_dir not in sys.path:
-                sys.path.insert(0, parent_dir)
-            
-            from supabase_sync import SUPABASE_SYNC
-            
-            if not SUPABASE_SYNC or not SUPABASE_SYNC.enabled:
-                logger.warning(f"⚠️ Supabase not configured, skipping Supabase save for {city}/{institution}")
-                return False
-            
-            # Prepare data for weekly_reports table
-            report_data = {
+    def _get_supabase_sync(self):
+        """SupabaseSync passed to the constructor, or the app-wide one if punctaj is loaded"""
+        if self.supabase_sync is not None:
+            return self.supabase_sync
+        import sys
+        app = sys.modules.get("punctaj") or sys.modules.get("__main__")
+        return getattr(app, "SUPABASE_SYNC", None)
+    
+    def _report_json(self, city: str, institution: str, week_start, week_end, employees: list) -> dict:
+        """One weekly_reports row"""
+        return {
+            "week_start": week_start.strftime('%Y-%m-%d'),
+            "week_end": week_end.strftime('%Y-%m-%d'),
+            "city": city,
+            "institution": institution,
+            "employee_count": len(employees),
+            "reset_by": "System",
+            "discord_id": "",
+            "report_data": {
                 "columns": ["DISCORD", "NUME IC", "RANK", "ROLE", "PUNCTAJ", "SERIE DE BULETIN", "ULTIMA_MOD"],
                 "rows": employees,
                 "employee_count": len(employees)
-            }
-            
-            report_json = {
-                "week_start": week_start.strftime('%Y-%m-%d'),
-                "week_end": week_end.strftime('%Y-%m-%d'),
-                "city": city,
-                "institution": institution,
-                "employee_count": len(employees),
-                "reset_by": "System",
-                "discord_id": "",
-                "report_data": report_data,
-                "archived_at": datetime.now().isoformat()
-            }
-            
-            # Use REST API to insert into configured weekly reports table
-            headers = {
-                "apikey": SUPABASE_SYNC.key,
-                "Authorization": f"Bearer {SUPABASE_SYNC.key}",
-                "Content-Type": "application/json"
-            }
-            
-            weekly_table = getattr(SUPABASE_SYNC, "table_weekly_reports", "weekly_reports")
-            url = f"{SUPABASE_SYNC.url}/rest/v1/{weekly_table}"
-            response = requests.post(url, json=report_json, headers=headers)
-            
-            if response.status_code == 201:
-                logger.info(f"✅ Saved to Supabase: {city}/{institution} ({len(employees)} employees)")
-                print(f"   ✅ Saved to {weekly_table}: {city}/{institution}")
-                return True
-            else:
-                logger.warning(f"⚠️ Failed to save to Supabase: {city}/{institution} - Status: {response.status_code}")
-                logger.warning(f"   Response: {response.text}")
-                return False
-                
-        except Exception as e:
-            logger.warning(f"⚠️ Could not save to Supabase {city}/{institution}: {e}")
-            # Don't crash if Supabase is unavailable - just log and continue
-            return False
+            },
+            "archived_at": datetime.now().isoformat()
+        }
+    
+    def _save_to_supabase_bulk(self, rendered: list, week_start, week_end) -> int:
+        """Insert all institutions' weekly_reports rows in bulk (UPLOAD_BATCH_SIZE rows per request)"""
+        supabase_sync = self._get_supabase_sync()
+        if not supabase_sync or not getattr(supabase_sync, "enabled", False):
+            logger.warning("⚠️ Supabase not configured, skipping Supabase save for weekly report")
+            return 0
+        
+        payload = [self._report_json(r["city"], r["institution"], week_start, week_end, r["rows"]) for r in rendered]
+        if not payload:
+            return 0
+        
+        headers = {
+            "apikey": supabase_sync.key,
+            "Authorization": f"Bearer {supabase_sync.key}",
+            "Content-Type": "application/json",
+            "Prefer": "return=minimal"
+        }
+        weekly_table = getattr(supabase_sync, "table_weekly_reports", "weekly_reports")
+        url = f"{supabase_sync.url}/rest/v1/{weekly_table}"
+        
+        uploaded = 0
+        for start in range(0, len(payload), self.UPLOAD_BATCH_SIZE):
+            batch = payload[start:start + self.UPLOAD_BATCH_SIZE]
+            try:
+                response = requests.post(url, json=batch, headers=headers, timeout=60)
+                if response.status_code in (200, 201, 204):
+                    uploaded += len(batch)
+                else:
+                    logger.warning(f"⚠️ Bulk insert into {weekly_table} failed - Status: {response.status_code}")
+                    logger.warning(f"   Response: {response.text[:300]}")
+            except Exception as e:
+                # Don't crash if Supabase is unavailable - just log and continue
+                logger.warning(f"⚠️ Could not save weekly reports to Supabase: {e}")
+        
+        print(f"   ✅ Saved {uploaded}/{len(payload)} reports to {weekly_table}")
+        return uploaded
     
     def trigger_now(self):
         """Manually trigger report generation (for testing)"""
@@ -282,7 +384,7 @@ class WeeklyReportScheduler:
 # Global scheduler instance
 _scheduler_instance = None
 
-def initialize_scheduler(data_dir: str, archive_dir: str = None) -> WeeklyReportScheduler:
+def initialize_scheduler(data_dir: str, archive_dir: str = None, supabase_sync=None) -> WeeklyReportScheduler:
     """Initialize and return scheduler instance"""
     global _scheduler_instance
     
@@ -290,7 +392,7 @@ def initialize_scheduler(data_dir: str, archive_dir: str = None) -> WeeklyReport
         archive_dir = os.path.join(os.path.dirname(data_dir), 'arhiva')
     
     if _scheduler_instance is None:
-        _scheduler_instance = WeeklyReportScheduler(data_dir, archive_dir)
+        _scheduler_instance = WeeklyReportScheduler(data_dir, archive_dir, supabase_sync=supabase_sync)
     
     return _scheduler_instance
 
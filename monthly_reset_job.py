@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+Monthly Reset Job - journaled, resumable batch reset of all institutions
+Runs on the 1st of the month (auto_reset_all_institutions)
+
+    manifest  -> list of every city/institution target, written first
+    commit    -> each institution is reset atomically by reset_engine
+    journal   -> one JSONL line per committed institution (append-only)
+    resume    -> after a crash, only targets without a journal line are processed;
+                 only the current month is resumed, at most max_attempts runs per period
+    abandoned -> terminal line for a run that is not finished any more: an older month
+                 (its reset would zero today's points) or one that kept failing
+    summary   -> final journal line + returned dict (counts, timings, failures)
+
+Journal: {archive_dir}/{server}/_journal/monthly_reset_{YYYY-MM}.jsonl
+"""
+
+import os
+import json
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from typing import Dict, List, Any, Optional
+
+from reset_engine import reset_institution, ResetError
+
+MAX_ATTEMPTS = 3
+
+
+class MonthlyResetJob:
+    """Journaled batch reset for one server data directory"""
+
+    def __init__(self, data_dir: str, archive_dir: str, server_key: str = "default",
+                 max_workers: int = 4, reset_by: str = "auto_reset", max_attempts: int = MAX_ATTEMPTS):
+        self.data_dir = data_dir
+        self.archive_dir = archive_dir
+        self.server_key = server_key or "default"
+        self.max_workers = max(1, max_workers)
+        self.reset_by = reset_by
+        self.max_attempts = max(1, max_attempts)
+        self.journal_dir = os.path.join(archive_dir, self.server_key, "_journal")
+        self._journal_lock = threading.Lock()
+
+    # ==================== JOURNAL ====================
+
+    def journal_path(self, period: str) -> str:
+        return os.path.join(self.journal_dir, f"monthly_reset_{period}.jsonl")
+
+    def _append(self, path: str, record: Dict[str, Any]):
+        """Append one record and fsync - a torn last line is ignored on read"""
+        line = json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n"
+        with self._journal_lock:
+            with open(path, "a", encoding="utf-8") as f:
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
+
+    @staticmethod
+    def read_journal(path: str) -> List[Dict[str, Any]]:
+        records = []
+        if not os.path.exists(path):
+            return records
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    # Crash mid-append: the record was never committed
+                    break
+        return records
+
+    @staticmethod
+    def _truncate_torn_tail(path: str):
+        """Drop a partially written last line so new records start on a clean line"""
+        if not os.path.exists(path):
+            return
+        with open(path, "rb+") as f:
+            data = f.read()
+            if data and not data.endswith(b"\n"):
+                f.truncate(data.rfind(b"\n") + 1)
+
+    # ==================== MANIFEST ====================
+
+    def discover_targets(self) -> List[Dict[str, str]]:
+        """Every {city, institution} with a JSON file under data_dir"""
+        targets = []
+        if not os.path.isdir(self.data_dir):
+            return targets
+        for city_entry in sorted(os.scandir(self.data_dir), key=lambda e: e.name):
+            if not city_entry.is_dir():
+                continue
+            for inst_entry in sorted(os.scandir(city_entry.path), key=lambda e: e.name):
+                if inst_entry.is_file() and inst_entry.name.endswith(".json"):
+                    targets.append({"city": city_entry.name, "institution": inst_entry.name[:-5]})
+        return targets
+
+    # ==================== RUN ====================
+
+    def _reset_one(self, target: Dict[str, str], reset_at: datetime) -> Dict[str, Any]:
+        city, institution = target["city"], target["institution"]
+        started = time.perf_counter()
+        record = {"type": "commit", "city": city, "institution": institution}
+        try:
+            result = reset_institution(
+                os.path.join(self.data_dir, city, f"{institution}.json"),
+                os.path.join(self.archive_dir, self.server_key, city),
+                city, institution,
+                reset_by=self.reset_by,
+                reset_at=reset_at,
+            )
+            record.update({
+                "status": "done",
+                "employee_count": result["employee_count"],
+                "archive": os.path.basename(result["archive_path"]),
+                "checksum": result["checksum"],
+            })
+        except ResetError as e:
+            record.update({"status": "skipped", "reason": str(e)})
+        except Exception as e:
+            record.update({"status": "failed", "error": str(e)})
+        record["ms"] = round((time.perf_counter() - started) * 1000, 2)
+        return record
+
+    def run(self, now: Optional[datetime] = None) -> Dict[str, Any]:
+        """
+        Run (or resume) the reset for the month of `now`
+        Returns the summary dict
+        """
+        now = now or datetime.now()
+        period = now.strftime("%Y-%m")
+        path = self.journal_path(period)
+        os.makedirs(self.journal_dir, exist_ok=True)
+
+        self._truncate_torn_tail(path)
+        records = self.read_journal(path)
+        manifest = next((r for r in records if r.get("type") == "manifest"), None)
+        previous = next((r for r in records if r.get("type") in ("summary", "abandoned")), None)
+        if previous:
+            return previous
+
+        attempts = sum(1 for r in records if r.get("type") == "attempt")
+        if attempts >= self.max_attempts:
+            return self._abandon(path, period, f"{attempts} attempts failed")
+
+        if manifest is None:
+            manifest = {
+                "type": "manifest",
+                "period": period,
+                "reset_at": now.strftime("%Y-%m-%d %H:%M:%S"),
+                "server_key": self.server_key,
+                "targets": self.discover_targets(),
+            }
+            self._append(path, manifest)
+            resumed = False
+        else:
+            resumed = True
+        self._append(path, {"type": "attempt", "n": attempts + 1,
+                            "at": datetime.now().strftime("%Y-%m-%d %H:%M:%S")})
+
+        # Same reset_at on resume -> same archive names, reset_engine skips finished work
+        reset_at = datetime.strptime(manifest["reset_at"], "%Y-%m-%d %H:%M:%S")
+        committed = {
+            (r["city"], r["institution"]): r
+            for r in records if r.get("type") == "commit" and r.get("status") in ("done", "skipped")
+        }
+        pending = [t for t in manifest["targets"] if (t["city"], t["institution"]) not in committed]
+
+        print(f"[{datetime.now()}] Monthly reset {period}: {len(pending)}/{len(manifest['targets'])} "
+              f"institutions pending{' (resumed)' if resumed else ''}")
+
+        started = time.perf_counter()
+        results = list(committed.values())
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="MonthlyReset") as pool:
+            futures = [pool.submit(self._reset_one, target, reset_at) for target in pending]
+            for future in as_completed(futures):
+                record = future.result()
+                if record["status"] != "failed":
+                    self._append(path, record)
+                else:
+                    print(f"  ✗ Eroare la reset {record['city']}/{record['institution']}: {record['error']}")
+                results.append(record)
+
+        failed = [r for r in results if r["status"] == "failed"]
+        summary = {
+            "type": "summary",
+            "period": period,
+            "resumed": resumed,
+            "targets": len(manifest["targets"]),
+            "done": sum(1 for r in results if r["status"] == "done"),
+            "skipped": sum(1 for r in results if r["status"] == "skipped"),
+            "failed": [{"city": r["city"], "institution": r["institution"], "error": r["error"]} for r in failed],
+            "employees_reset": sum(r.get("employee_count", 0) for r in results if r["status"] == "done"),
+            "duration_ms": round((time.perf_counter() - started) * 1000, 2),
+            "completed_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        }
+
+        # Failed targets stay pending: no summary line, so the next run (this month,
+        # up to max_attempts) resumes them
+        if not failed:
+            self._append(path, summary)
+
+        print(f"[{datetime.now()}] Monthly reset {period}: {summary['done']} done, "
+              f"{summary['skipped']} skipped, {len(failed)} failed, "
+              f"{summary['employees_reset']} employees in {summary['duration_ms']:.0f} ms")
+        return summary
+
+    def _abandon(self, path: str, period: str, reason: str) -> Dict[str, Any]:
+        records = self.read_journal(path)
+        manifest = next((r for r in records if r.get("type") == "manifest"), {})
+        finished = {(r["city"], r["institution"]) for r in records
+                    if r.get("type") == "commit" and r.get("status") in ("done", "skipped")}
+        record = {
+            "type": "abandoned",
+            "period": period,
+            "reason": reason,
+            "pending": [t for t in manifest.get("targets", []) if (t["city"], t["institution"]) not in finished],
+            "abandoned_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        }
+        self._append(path, record)
+        print(f"[{datetime.now()}] ⚠️ Monthly reset {period} abandoned ({reason}): "
+              f"{len(record['pending'])} institutions were not reset")
+        return record
+
+    def incomplete_periods(self) -> List[str]:
+        """Periods with a manifest but no summary / abandoned line (crashed or failed runs)"""
+        periods = []
+        if not os.path.isdir(self.journal_dir):
+            return periods
+        for name in sorted(os.listdir(self.journal_dir)):
+            if not (name.startswith("monthly_reset_") and name.endswith(".jsonl")):
+                continue
+            records = self.read_journal(os.path.join(self.journal_dir, name))
+            if any(r.get("type") == "manifest" for r in records) and \
+                    not any(r.get("type") in ("summary", "abandoned") for r in records):
+                periods.append(name[len("monthly_reset_"):-len(".jsonl")])
+        return periods
+
+    def resume_incomplete(self, now: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """
+        Finish an interrupted run of the current month (called at startup)
+        Older unfinished months are marked abandoned, never re-run: their reset would zero
+        the points gathered since and stamp an old reset_at
+        """
+        now = now or datetime.now()
+        current = now.strftime("%Y-%m")
+        results = []
+        for period in self.incomplete_periods():
+            if period == current:
+                results.append(self.run(now))
+            else:
+                self._truncate_torn_tail(self.journal_path(period))
+                results.append(self._abandon(self.journal_path(period), period, "period over"))
+        return results
@@ -10,23 +10,27 @@ Sincronizează TOT din cloud la orice dispozitiv
 
 import os
 import json
+import time
 import requests
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, Tuple
-import threading
-import time
+
+from app_scheduler import get_default_scheduler, IntervalTrigger
+from audit_mirror import AuditLogMirror, AUDIT_MIRROR_FILE, DEFAULT_RETENTION_DAYS
+from police_data_materializer import materialize
 
 class MultiDeviceSyncManager:
     """Sincronizează toate datele din cloud pentru multi-device support"""
     
-    def __init__(self, supabase_sync, data_dir: str):
+    def __init__(self, supabase_sync, data_dir: str, audit_retention_days: int = DEFAULT_RETENTION_DAYS):
         """
         Initialize multi-device sync manager
         
         Args:
             supabase_sync: SupabaseSync instance
             data_dir: Local data directory
+            audit_retention_days: Zile de audit log păstrate local (None = tot istoricul)
         """
         self.supabase_sync = supabase_sync
         self.data_dir = Path(data_dir)
@@ -39,14 +43,29 @@ class MultiDeviceSyncManager:
             "Content-Type": "application/json"
         }
         
+        # Oglinda locală a audit_logs (incrementală, interogabilă offline)
+        self.audit_mirror = AuditLogMirror(self.data_dir / AUDIT_MIRROR_FILE, audit_retention_days)
+        self.audit_mirror.import_legacy_json(str(self.data_dir / "audit_logs.json"))
+        
         # Sync status
         self.is_syncing = False
         self.last_sync_time = None
-        self.sync_thread = None
+        self.scheduler = None
+        # Apelat cu [(city, institution)] rescrise de sync-ul din background
+        self.on_police_data_changed = None
         
         print(f"🔄 Multi-Device Sync Manager initialized")
         print(f"   Data directory: {data_dir}")
     
+    def set_data_dir(self, data_dir: str):
+        """Serverul activ s-a schimbat: sync-ul și oglinda audit lucrează pe noul director"""
+        previous = self.audit_mirror
+        self.data_dir = Path(data_dir)
+        self.audit_mirror = AuditLogMirror(self.data_dir / AUDIT_MIRROR_FILE, previous.retention_days)
+        self.audit_mirror.import_legacy_json(str(self.data_dir / "audit_logs.json"))
+        previous.close()
+        print(f"🔄 Multi-Device Sync: data directory -> {data_dir}")
+    
     def full_cloud_sync_on_startup(self) -> Dict:
         """
         Sincronizează COMPLET din cloud la startup
@@ -157,36 +176,23 @@ class MultiDeviceSyncManager:
             
             print(f"     Found {len(data)} police records")
             
-            # Group by city and save locally
-            cities_data = {}
-            for record in data:
-                city = record.get('city', 'Unknown')
-                if city not in cities_data:
-                    cities_data[city] = []
-                cities_data[city].append(record)
-            
-            # Save to local files
-            synced_count = 0
-            for city, records in cities_data.items():
-                city_path = self.data_dir / city
-                city_path.mkdir(parents=True, exist_ok=True)
-                
-                # Save as JSON files organized by institution
-                for record in records:
-                    institution = record.get('institution', 'Unknown')
-                    file_path = city_path / f"{institution}.json"
-                    
-                    with open(file_path, 'w', encoding='utf-8') as f:
-                        json.dump(record, f, ensure_ascii=False, indent=2)
-                    
-                    synced_count += 1
-            
-            print(f"     ✅ Synced {synced_count} police records across {len(cities_data)} cities")
+            # Doar instituțiile cu versiune mai nouă, în schema columns/ranks/rows, scrise atomic
+            result = materialize(data, str(self.data_dir))
+            changed = result["changed"]
+            cities = {city for city, _ in changed}
+            for error in result["errors"]:
+                print(f"     ⚠️  {error}")
+            
+            print(f"     ✅ {len(changed)} institutions updated across {len(cities)} cities "
+                  f"({result['unchanged']} up to date, {result['skipped']} skipped)")
             
             return {
                 "status": "success",
-                "count": len(cities_data),
-                "records": synced_count
+                "count": len(cities),
+                "records": len(changed),
+                "changed": changed,
+                "unchanged": result["unchanged"],
+                "skipped": result["skipped"]
             }
             
         except Exception as e:
@@ -258,48 +264,21 @@ class MultiDeviceSyncManager:
             return {"status": "error", "count": 0, "error": str(e)}
     
     def _sync_audit_logs(self) -> Dict:
-        """Sincronizează audit logs din cloud"""
+        """Sincronizează audit logs din cloud - doar rândurile noi (id > ultimul id local)"""
         try:
-            print(f"  📋 Fetching audit logs...")
-            
-            # Query: Get recent logs (last 1000)
-            url = f"{self.supabase_url}/rest/v1/audit_logs"
-            params = {
-                "select": "*",
-                "order": "created_at.desc",
-                "limit": 1000
-            }
+            print(f"  📋 Fetching new audit logs (after id {self.audit_mirror.last_id()})...")
             
-            response = requests.get(url, headers=self.headers, params=params, timeout=30)
+            table = getattr(self.supabase_sync, "table_logs", None) or "audit_logs"
+            stats = self.audit_mirror.sync_from_supabase(self.supabase_url, self.headers, table=table)
             
-            if response.status_code not in [200, 206]:
-                print(f"     ⚠️  HTTP {response.status_code} - logs may not be available")
-                return {"status": "warning", "count": 0}
-            
-            data = response.json()
-            if not data:
-                print(f"     ℹ️  No logs found")
-                return {"status": "success", "count": 0}
-            
-            print(f"     Found {len(data)} log entries")
-            
-            # Save to logs file
-            logs_file = self.data_dir / "audit_logs.json"
-            logs_data = {
-                "logs": data[:1000],  # Keep last 1000
-                "last_sync": datetime.now().isoformat(),
-                "total_count": len(data)
-            }
-            
-            self.data_dir.mkdir(parents=True, exist_ok=True)
-            with open(logs_file, 'w', encoding='utf-8') as f:
-                json.dump(logs_data, f, ensure_ascii=False, indent=2)
-            
-            print(f"     ✅ Synced {len(data)} logs")
+            print(f"     ✅ {stats['inserted']} new logs in {stats['pages']} page(s), "
+                  f"{stats['pruned']} expired, {stats['total']} stored locally")
             
             return {
                 "status": "success",
-                "count": len(data)
+                "count": stats["inserted"],
+                "total": stats["total"],
+                "pruned": stats["pruned"]
             }
             
         except Exception as e:
@@ -353,32 +332,44 @@ class MultiDeviceSyncManager:
                 "error": str(e)
             }
     
-    def start_background_sync(self, interval: int = 300):
+    BACKGROUND_JOB_NAME = "multi_device_sync"
+    
+    def start_background_sync(self, interval: int = 300, scheduler=None):
         """
-        Pornește sync-ul în background (la 5 minute)
+        Pornește sync-ul în background (la 5 minute) pe scheduler-ul comun al aplicației
         
         Args:
             interval: Interval în secunde (default 300 = 5 min)
+            scheduler: AppScheduler (default: scheduler-ul global)
         """
-        if self.sync_thread and self.sync_thread.is_alive():
-            print("⚠️  Sync thread already running")
+        if self.scheduler is not None:
+            print("⚠️  Background sync already scheduled")
             return
         
-        def sync_worker():
-            while True:
-                try:
-                    time.sleep(interval)
-                    print(f"\n🔄 Background sync check...")
-                    result = self.full_cloud_sync_on_startup()
-                    if result["status"] != "success":
-                        print(f"  ⚠️  Sync warning: {result['message']}")
-                except Exception as e:
-                    print(f"  ❌ Background sync error: {e}")
+        def sync_job():
+            print(f"\n🔄 Background sync check...")
+            result = self.full_cloud_sync_on_startup()
+            if result["status"] != "success":
+                print(f"  ⚠️  Sync warning: {result.get('message')}")
+            changed = result.get("police_data", {}).get("changed")
+            if changed and self.on_police_data_changed:
+                self.on_police_data_changed(changed)
         
-        self.sync_thread = threading.Thread(target=sync_worker, daemon=True)
-        self.sync_thread.start()
+        self.scheduler = scheduler or get_default_scheduler()
+        self.scheduler.add_job(
+            self.BACKGROUND_JOB_NAME,
+            sync_job,
+            IntervalTrigger(interval),
+            jitter=min(30, interval / 10)
+        )
         print(f"✅ Background sync started (interval: {interval}s)")
     
+    def stop_background_sync(self):
+        """Oprește sync-ul periodic"""
+        if self.scheduler is not None:
+            self.scheduler.cancel_job(self.BACKGROUND_JOB_NAME)
+            self.scheduler = None
+    
     def get_last_sync_time(self) -> str:
         """Retorna time-ul ultimei sincronizări"""
         if self.last_sync_time:
@@ -5,17 +5,19 @@ Notifică utilizatorii când permisiunile se schimbă
 Forțează sincronizare automată
 """
 
-import threading
-import time
 from datetime import datetime
 from typing import Dict, Callable, Optional, List
 import json
 
+from app_scheduler import get_default_scheduler, IntervalTrigger
+
 
 class PermissionNotificationSystem:
     """Sistem de notificări real-time pentru permisiuni"""
     
-    def __init__(self, permission_manager, supabase_sync, check_interval: int = 30):
+    JOB_NAME = "permission_monitor"
+    
+    def __init__(self, permission_manager, supabase_sync, check_interval: int = 30, scheduler=None):
         """
         Inițializează sistemul de notificări
         
@@ -23,6 +25,7 @@ class PermissionNotificationSystem:
             permission_manager: InstitutionPermissionManager instance
             supabase_sync: SupabaseSync instance
             check_interval: Interval în secunde pentru verificare permisiuni
+            scheduler: AppScheduler (default: scheduler-ul global)
         """
         self.perm_manager = permission_manager
         self.supabase_sync = supabase_sync
@@ -35,8 +38,8 @@ class PermissionNotificationSystem:
         # Callback-uri pentru notificări
         self.notification_callbacks = []  # [(callback, user_id), ...]
         
-        # Thread de monitoring
-        self.monitor_thread = None
+        # Job de monitoring pe scheduler-ul comun
+        self.scheduler = scheduler
         self.running = False
         
         print("✅ Permission Notification System initialized")
@@ -51,14 +54,16 @@ class PermissionNotificationSystem:
         
         print(f"✅ Started monitoring permissions for {discord_id}")
         
-        # Pornește thread de monitoring dacă nu rulează
+        # Pornește job-ul de monitoring dacă nu rulează
         if not self.running:
             self.running = True
-            self.monitor_thread = threading.Thread(
-                target=self._monitor_loop,
-                daemon=True
+            self.scheduler = self.scheduler or get_default_scheduler()
+            self.scheduler.add_job(
+                self.JOB_NAME,
+                self._check_permissions,
+                IntervalTrigger(self.check_interval),
+                jitter=min(5, self.check_interval / 10)
             )
-            self.monitor_thread.start()
     
     def stop_monitoring(self, discord_id: str):
         """Oprește monitorizarea pentru un user"""
@@ -77,40 +82,33 @@ class PermissionNotificationSystem:
         self.notification_callbacks.append((callback, discord_id))
         print(f"✅ Registered notification callback for {discord_id}")
     
-    def _monitor_loop(self):
-        """Thread loop care monitorizează permisiunile"""
-        print("🔄 Permission monitoring loop started")
-        
-        while self.running:
-            try:
-                # Verifică fiecare user monitorizat
-                for discord_id, is_active in list(self.monitoring_users.items()):
-                    if not is_active:
-                        continue
-                    
-                    # Obține permisiuni curente
-                    current_perms = self.perm_manager.get_all_permissions(discord_id)
-                    current_hash = self._hash_permissions(current_perms)
-                    
-                    # Compară cu cache
-                    cached_hash = self.user_permissions_cache.get(discord_id)
-                    
-                    if cached_hash and cached_hash != current_hash:
-                        # PERMISIUNI S-AU SCHIMBAT!
-                        print(f"🔔 PERMISIUNI SCHIMBATE PENTRU {discord_id}!")
-                        
-                        # Notifică
-                        self._notify_permission_change(discord_id, current_perms)
-                        
-                        # Actualizează cache
-                        self.user_permissions_cache[discord_id] = current_hash
+    def _check_permissions(self):
+        """O verificare a permisiunilor (rulează periodic pe scheduler)"""
+        try:
+            # Verifică fiecare user monitorizat
+            for discord_id, is_active in list(self.monitoring_users.items()):
+                if not is_active:
+                    continue
+                
+                # Obține permisiuni curente
+                current_perms = self.perm_manager.get_all_permissions(discord_id)
+                current_hash = self._hash_permissions(current_perms)
                 
-                # Așteptă înainte de următoarea verificare
-                time.sleep(self.check_interval)
+                # Compară cu cache
+                cached_hash = self.user_permissions_cache.get(discord_id)
                 
-            except Exception as e:
-                print(f"❌ Error in monitoring loop: {e}")
-                time.sleep(self.check_interval)
+                if cached_hash and cached_hash != current_hash:
+                    # PERMISIUNI S-AU SCHIMBAT!
+                    print(f"🔔 PERMISIUNI SCHIMBATE PENTRU {discord_id}!")
+                    
+                    # Notifică
+                    self._notify_permission_change(discord_id, current_perms)
+                    
+                    # Actualizează cache
+                    self.user_permissions_cache[discord_id] = current_hash
+            
+        except Exception as e:
+            print(f"❌ Error in monitoring check: {e}")
     
     def _notify_permission_change(self, discord_id: str, new_permissions: Dict):
         """Notifică user-ul despre schimbarea permisiunilor"""
@@ -144,6 +142,8 @@ class PermissionNotificationSystem:
     def stop(self):
         """Oprește sistemul de monitoring"""
         self.running = False
+        if self.scheduler:
+            self.scheduler.cancel_job(self.JOB_NAME)
         print("⏹️ Permission Notification System stopped")
 
 
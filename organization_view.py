@@ -9,6 +9,8 @@ This replaces the notebook tabs with a clear visual structure
 import tkinter as tk
 from tkinter import ttk
 
+from virtual_org_view import VirtualOrgView
+
 def create_city_institution_view(parent, structure, on_employee_click=None, ranks_map=None):
     """
     Create hierarchical view: City -> Institution -> Employees
@@ -20,88 +22,15 @@ def create_city_institution_view(parent, structure, on_employee_click=None, rank
         ranks_map: {rank_number: role_name}
     """
     
-    main_frame = tk.Frame(parent, bg="#f5f5f5")
+    # One virtualized Canvas: only the rows in the viewport are drawn,
+    # clicking a city / institution header collapses it
+    main_frame = VirtualOrgView(parent, structure, ranks_map=ranks_map, on_employee_click=on_employee_click)
     main_frame.pack(fill="both", expand=True)
-    
-    # Canvas with scrollbar
-    canvas = tk.Canvas(main_frame, bg="#f5f5f5", highlightthickness=0)
-    scrollbar = tk.Scrollbar(main_frame, orient="vertical", command=canvas.yview)
-    scroll_frame = tk.Frame(canvas, bg="#f5f5f5")
-    
-    scroll_frame.bind(
-        "<Configure>",
-        lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
-    )
-    
-    canvas.create_window((0, 0), window=scroll_frame, anchor="nw")
-    canvas.configure(yscrollcommand=scrollbar.set)
-    
-    # Build hierarchy
-    for city in sorted(structure.keys()):
-        # ===== CITY HEADER =====
-        city_frame = tk.Frame(scroll_frame, bg="#1565c0", height=50)
-        city_frame.pack(fill="x", padx=5, pady=10)
-        city_frame.pack_propagate(False)
-        
-        city_label = tk.Label(
-            city_frame,
-            text=f"  📍 {city.upper()}",
-            font=("Segoe UI", 14, "bold"),
-            bg="#1565c0",
-            fg="white",
-            anchor="w"
-        )
-        city_label.pack(fill="x", padx=10, pady=10)
-        
-        institutions = structure[city]
-        
-        # ===== INSTITUTIONS UNDER THIS CITY =====
-        city_content = tk.Frame(scroll_frame, bg="#f5f5f5")
-        city_content.pack(fill="x", padx=20, pady=0)
-        
-        for institution in sorted(institutions.keys()):
-            employees = institutions[institution]
-            
-            # Institution header
-            inst_header = tk.Frame(city_content, bg="#0d47a1", height=40)
-            inst_header.pack(fill="x", padx=10, pady=(10, 0))
-            inst_header.pack_propagate(False)
-            
-            inst_label = tk.Label(
-                inst_header,
-                text=f"    🏢 {institution}   ({len(employees)} employees)",
-                font=("Segoe UI", 11, "bold"),
-                bg="#0d47a1",
-                fg="#e3f2fd",
-                anchor="w"
-            )
-            inst_label.pack(fill="x", padx=10, pady=8)
-            
-            # Employees under this institution
-            emp_frame = tk.Frame(city_content, bg="#ffffff", relief="solid", borderwidth=1)
-            emp_frame.pack(fill="x", padx=10, pady=(0, 10))
-            
-            if not employees:
-                empty_label = tk.Label(
-                    emp_frame,
-                    text="        (No employees)",
-                    font=("Segoe UI", 9, "italic"),
-                    bg="#ffffff",
-                    fg="#999"
-                )
-                empty_label.pack(pady=10)
-            else:
-                for i, emp in enumerate(employees):
-                    create_employee_row(emp_frame, emp, i % 2 == 0, ranks_map, on_employee_click)
-    
-    canvas.pack(side="left", fill="both", expand=True)
-    scrollbar.pack(side="right", fill="y")
-    
     return main_frame
 
 
 def create_employee_row(parent, emp, alternate_bg=False, ranks_map=None, on_click=None):
-    """Create visual row for single employee"""
+    """Create visual row for single employee (widget per row - for short lists only)"""
     
     bg = "#ffffff" if alternate_bg else "#f9f9f9"
     
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Bulk Points Edit - one transaction for a PUNCTAJ change on many employees
+Used by add_points / remove_points / punctaj_cu_selectie
+
+    compute  -> new PUNCTAJ per selected row (add, or subtract clamped at 0)
+    local    -> one atomic write of data/{city}/{institution}.json (only touched rows change)
+    audit    -> one batched edit_points entry set (ActionLogger.log_edit_points_bulk)
+    cloud    -> one delta upsert of the touched employees (at most one GET to resolve ids)
+
+The UI is updated before any network call; audit + cloud run on POINTS_CLOUD_QUEUE
+and report back through a callback.
+"""
+
+import json
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from atomic_io import atomic_write_json
+from reset_engine import BackgroundReportQueue
+
+# Cloud side of points edits: ordered, one worker, off the UI thread
+POINTS_CLOUD_QUEUE = BackgroundReportQueue(name="PointsCloudQueue")
+
+
+def new_points(current: Any, amount: int, mode: str = "add") -> int:
+    """PUNCTAJ after the edit; non-numeric values count as 0, never below 0"""
+    try:
+        current = int(current)
+    except (TypeError, ValueError):
+        current = 0
+    return current + amount if mode == "add" else max(0, current - amount)
+
+
+def _row_keys(row: Dict[str, Any]) -> List[Tuple[str, str]]:
+    return [(field, str(row[field])) for field in ("DISCORD", "NUME IC") if row.get(field) not in (None, "")]
+
+
+def apply_points_changes(inst_path: str, changes: List[Dict[str, Any]],
+                         timestamp: Optional[str] = None) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    """
+    Write PUNCTAJ / ULTIMA_MOD of the touched rows with a single atomic write
+
+    Args:
+        changes: [{"row": app row (DISCORD / NUME IC identify it), "new": points}, ...]
+        timestamp: ULTIMA_MOD + last_punctaj_update value (default: now)
+
+    Returns:
+        (inst_data, touched stored rows - with their Supabase "id" when known)
+    """
+    timestamp = timestamp or datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    with open(inst_path, "r", encoding="utf-8") as f:
+        inst_data = json.load(f)
+    if isinstance(inst_data, list):
+        inst_data = {"columns": ["DISCORD", "RANK", "PUNCTAJ"], "rows": inst_data}
+
+    columns = inst_data.setdefault("columns", [])
+    if "ULTIMA_MOD" not in columns:
+        columns.append("ULTIMA_MOD")
+    rows = inst_data.setdefault("rows", [])
+
+    index = {}
+    for position, row in enumerate(rows):
+        if not isinstance(row, dict):
+            row = rows[position] = dict(zip(columns, row))
+        for key in _row_keys(row):
+            index.setdefault(key, position)
+
+    touched = []
+    for change in changes:
+        position = next((index[k] for k in _row_keys(change["row"]) if k in index), None)
+        if position is None:
+            # Row only in the tree (not saved yet): keep it, like save_institution would
+            row = {col: change["row"].get(col, "") for col in columns}
+            rows.append(row)
+            position = len(rows) - 1
+            for key in _row_keys(row):
+                index.setdefault(key, position)
+        row = rows[position]
+        row["PUNCTAJ"] = change["new"]
+        row["ULTIMA_MOD"] = timestamp
+        touched.append(row)
+
+    inst_data["last_punctaj_update"] = timestamp
+    atomic_write_json(inst_path, inst_data, indent=4, verify=False)
+    return inst_data, touched
+
+
+def apply_points_changes_to_store(store, city: str, institution: str, changes: List[Dict[str, Any]],
+                                  timestamp: Optional[str] = None) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    """
+    apply_points_changes for a local_store backend (sqlite: UPDATE of the touched rows only)
+    Returns (institution metadata without rows, touched stored rows)
+    """
+    timestamp = timestamp or datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    rows = [dict(change["row"], PUNCTAJ=change["new"], ULTIMA_MOD=timestamp) for change in changes]
+    touched = store.update_rows(city, institution, rows, meta={"last_punctaj_update": timestamp})
+    return store.meta(city, institution) or {}, touched
+
+
+def upload_points_delta(employee_manager, institution_id, rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Upsert only the touched employees (points + updated_at) by Supabase id
+
+    Rows without a local "id" are matched with one GET (DISCORD, then NUME IC);
+    rows still unmatched are returned so the caller can fall back to a full sync.
+    """
+    result = {"uploaded": 0, "unmatched": [], "institution_id": institution_id}
+    if not rows:
+        return result
+    if institution_id is None:
+        result["unmatched"] = list(rows)
+        return result
+
+    with_id = [row for row in rows if row.get("id") not in (None, "")]
+    without_id = [row for row in rows if row.get("id") in (None, "")]
+    if without_id:
+        ids, unmatched = employee_manager.find_employee_ids(institution_id, without_id)
+        matched = [row for row in without_id if row not in unmatched]
+        for row, emp_id in zip(matched, ids):
+            with_id.append(dict(row, id=emp_id))
+        result["unmatched"] = unmatched
+
+    updated_at = datetime.now().astimezone().isoformat()
+    records = [{
+        "id": row["id"],
+        "institution_id": institution_id,
+        "discord_username": row.get("DISCORD", ""),
+        "employee_name": row.get("NUME IC", ""),
+        "points": new_points(row.get("PUNCTAJ", 0), 0),
+        "updated_at": updated_at,
+    } for row in with_id]
+    result["uploaded"] = employee_manager.upsert_employees(records) if records else 0
+    return result
+
+
+def queue_points_cloud_sync(log_job: Optional[Callable[[], Any]],
+                            upload_job: Optional[Callable[[], Dict[str, Any]]],
+                            on_done: Optional[Callable[[Dict[str, Any]], None]] = None,
+                            cloud_queue: Optional[BackgroundReportQueue] = None):
+    """Audit log + delta upload on the background queue; on_done(result) after the upload"""
+    cloud_queue = cloud_queue or POINTS_CLOUD_QUEUE
+
+    def run():
+        if log_job:
+            try:
+                log_job()
+            except Exception as e:
+                print(f"⚠️ Error logging points edit: {e}")
+        result = {"uploaded": 0, "unmatched": [], "error": None}
+        if upload_job:
+            try:
+                result = upload_job()
+            except Exception as e:
+                result["error"] = str(e)
+        if on_done:
+            on_done(result)
+
+    cloud_queue.submit(run, "points edit")
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+police_data materializer - Supabase police_data rows -> data/{city}/{institution}.json
+
+    unwrap    -> the institution dict from data (JSONB) or data_json (string)
+    schema    -> columns / ranks / rows, same shape load_institution reads
+    version   -> police_data.version vs "version" of the local file; only newer rows are written
+    write     -> one pass over the batch, each file replaced atomically
+
+Result: {"changed": [(city, institution)], "unchanged": n, "skipped": n, "errors": [...]}
+"changed" is what the UI has to refresh - everything else was left untouched
+"""
+
+import json
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from local_store import JsonInstitutionStore
+
+DEFAULT_COLUMNS = ["DISCORD", "NUME IC", "SERIE DE BULETIN", "RANK", "ROLE", "PUNCTAJ", "ULTIMA_MOD"]
+
+# Row columns of police_data - the institution itself lives in data / data_json
+RECORD_FIELDS = ("id", "city", "institution", "data", "data_json", "version",
+                 "last_synced", "synced_by", "created_at", "updated_at")
+
+
+def _version(value) -> int:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return 0
+
+
+def unwrap_record(record: Dict[str, Any]) -> Optional[Any]:
+    """Institution payload of a police_data row (None when missing / unreadable)"""
+    for field in ("data", "data_json"):
+        payload = record.get(field)
+        if isinstance(payload, str):
+            try:
+                payload = json.loads(payload)
+            except ValueError:
+                continue
+        if isinstance(payload, (dict, list)):
+            return payload
+    return None
+
+
+def to_institution_schema(payload: Any) -> Optional[Dict[str, Any]]:
+    """
+    columns / ranks / rows dict, or None if the payload is not an institution
+    Accepts a bare row list and list rows (positional, by columns) like the JSON store
+    """
+    if isinstance(payload, list):
+        payload = {"rows": payload}
+    if not isinstance(payload, dict):
+        return None
+    if "rows" not in payload and set(payload) & set(RECORD_FIELDS):
+        # A whole police_data row saved as the payload - unwrap it once more
+        return to_institution_schema(unwrap_record(payload))
+    data = {k: v for k, v in payload.items() if k not in RECORD_FIELDS or k == "version"}
+    columns = list(data.get("columns") or DEFAULT_COLUMNS)
+    rows = []
+    for row in data.get("rows") or []:
+        if isinstance(row, dict):
+            rows.append(row)
+        elif isinstance(row, (list, tuple)):
+            rows.append(dict(zip(columns, row)))
+    data["columns"] = columns
+    data["ranks"] = data.get("ranks") or {}
+    data["rows"] = rows
+    return data
+
+
+def local_version(meta: Optional[Dict[str, Any]]) -> Optional[int]:
+    """
+    Version from the local file's meta; None = nothing usable locally
+    (missing, unreadable, or a raw police_data row written by the old sync)
+    """
+    if meta is None or (set(meta) & {"city", "institution", "data"} and "columns" not in meta):
+        return None
+    return _version(meta.get("version", 1))
+
+
+def latest_records(records: Iterable[Dict[str, Any]]) -> Tuple[Dict[Tuple[str, str], Dict], int]:
+    """Highest-version row per (city, institution); rows without a usable name are skipped"""
+    latest, skipped = {}, 0
+    for record in records:
+        city, institution = record.get("city"), record.get("institution")
+        if not city or not institution or any(sep in f"{city}{institution}" for sep in ("/", "\\")):
+            skipped += 1
+            continue
+        key = (city, institution)
+        if key not in latest or _version(record.get("version")) > _version(latest[key].get("version")):
+            latest[key] = record
+    return latest, skipped
+
+
+def materialize(records: Iterable[Dict[str, Any]], data_dir: str,
+                store: Optional[JsonInstitutionStore] = None) -> Dict[str, Any]:
+    """Write every police_data row newer than the local file, in one batch"""
+    store = store or JsonInstitutionStore(data_dir)
+    latest, skipped = latest_records(records)
+
+    # Pass 1: decide (reads only) - pass 2: write what is newer
+    pending: List[Tuple[str, str, Dict]] = []
+    unchanged = 0
+    for (city, institution), record in latest.items():
+        remote = _version(record.get("version"))
+        meta = store.meta(city, institution)
+        local = local_version(meta)
+        if local is not None and remote <= local:
+            unchanged += 1
+            continue
+        data = to_institution_schema(unwrap_record(record))
+        if data is None:
+            skipped += 1
+            continue
+        data["version"] = remote
+        data["last_synced"] = record.get("updated_at") or record.get("last_synced")
+        data["pending_sync"] = False
+        if local is not None:
+            # Supabase relation ids are local knowledge - keep them when the payload has none
+            for field in ("city_id", "institution_id"):
+                if data.get(field) is None and meta.get(field) is not None:
+                    data[field] = meta[field]
+        pending.append((city, institution, data))
+
+    changed, errors = [], []
+    for city, institution, data in pending:
+        try:
+            store.save(city, institution, data)
+            changed.append((city, institution))
+        except OSError as e:
+            errors.append(f"{city}/{institution}: {e}")
+    return {"changed": changed, "unchanged": unchanged, "skipped": skipped, "errors": errors}
@@ -17,11 +17,26 @@ import shutil
 import csv
 import subprocess
 from datetime import datetime
-import schedule
 import threading
 import time
 import requests
 
+from reset_engine import reset_institution, queue_reset_report, ResetError, BackgroundReportQueue
+from points_edit import (new_points, apply_points_changes, apply_points_changes_to_store,
+                         upload_points_delta, queue_points_cloud_sync, POINTS_CLOUD_QUEUE)
+from save_coordinator import DebouncedSaveCoordinator, resolve_debounce_ms, changed_rows, upload_rows, settle_pending
+from local_store import open_store, resolve_backend, row_key
+from local_revision import LocalRevisionLog, plan_row_updates
+from search_index import EmployeeSearchIndex
+from id_registry import REGISTRY_FILE_NAME
+from audit_mirror import AuditLogMirror, AUDIT_MIRROR_FILE
+from theme_registry import ThemeRegistry, RDR_THEME_COLORS
+from monthly_reset_job import MonthlyResetJob
+from app_scheduler import get_default_scheduler, IntervalTrigger, MonthlyTrigger
+from realtime_apply import RealtimeApplyEngine
+from supabase_realtime_ws import MainThreadHandoff
+from lazy_imports import lazy, module_available
+
 # Adaugă calea pentru PyInstaller bundle (sys._MEIPASS)
 if getattr(sys, 'frozen', False):
     # Rulează ca executabil - adaugă calea către fișierele bundle-uite
@@ -64,6 +79,11 @@ def get_base_directory():
 BASE_DIR = get_base_directory()
 print(f"📁 BASE_DIR set to: {BASE_DIR}")
 
+# Logging structurat (logging_config.ini): coadă + fișier rotativ, fără print per rând
+from app_logging import setup_logging, get_logger
+setup_logging(base_dir=BASE_DIR)
+logger = get_logger("punctaj")
+
 def _is_no_cloud_mode() -> bool:
     return os.getenv("PUNCTAJ_NO_CLOUD_DB", "0").strip().lower() in {"1", "true", "yes", "on"}
 
@@ -200,31 +220,26 @@ except Exception as e:
     SUPABASE_EMPLOYEE_MANAGER = None
     print(f"⚠️ Supabase Employee Manager error: {e}")
 
+# ⚡ Subsistemele opționale de mai jos se importă la prima folosire (lazy_imports),
+# nu la pornire - fereastra apare fără să aștepte modulele care nu sunt încă necesare
+
 # Cloud Sync Manager - sincronizare forțată cu cloud
-try:
-    from cloud_sync_manager import CloudSyncManager
-    CLOUD_SYNC_AVAILABLE = True
-    print("✓ Cloud sync manager module loaded")
-except ImportError as e:
-    CLOUD_SYNC_AVAILABLE = False
-    CloudSyncManager = None
-    print(f"⚠️ Cloud sync manager module lipsește: {e}")
+CloudSyncManager = lazy("cloud_sync_manager", "CloudSyncManager")
+CLOUD_SYNC_AVAILABLE = CloudSyncManager is not None
+if not CLOUD_SYNC_AVAILABLE:
+    print("⚠️ Cloud sync manager module lipsește")
 
 # Backup Manager - periodic backup of local data
-try:
-    from backup_manager import BackupManager, create_backup_ui
-    BACKUP_MANAGER_AVAILABLE = True
-    print("✓ Backup manager module loaded")
-except ImportError as e:
-    BACKUP_MANAGER_AVAILABLE = False
-    BackupManager = None
-    create_backup_ui = None
-    print(f"⚠️ Backup manager module lipsește: {e}")
+BackupManager = lazy("backup_manager", "BackupManager")
+create_backup_ui = lazy("backup_manager", "create_backup_ui")
+BACKUP_MANAGER_AVAILABLE = BackupManager is not None
+if not BACKUP_MANAGER_AVAILABLE:
+    print("⚠️ Backup manager module lipsește")
 
 # Admin Panel & Action Logger
 try:
-    from admin_panel import AdminPanel
-    from admin_ui import open_admin_panel
+    # admin_ui / admin_panel se încarcă doar la deschiderea panoului
+    open_admin_panel = lazy("admin_ui", "open_admin_panel")
     from admin_permissions import open_granular_permissions_panel, InstitutionPermissionManager
     from action_logger import ActionLogger as ActionLoggerNew
     from permission_check_helpers import (
@@ -232,60 +247,41 @@ try:
         check_can_edit_city,
         check_can_delete_city
     )
-    ADMIN_PANEL_AVAILABLE = True
+    ADMIN_PANEL_AVAILABLE = open_admin_panel is not None
     print("✓ Admin panel and logging module loaded")
 except Exception as e:
     ADMIN_PANEL_AVAILABLE = False
     open_admin_panel = None
     open_granular_permissions_panel = None
+    InstitutionPermissionManager = None
     ActionLoggerNew = None
     print(f"⚠️ Admin panel module error: {e}")
     import traceback
     traceback.print_exc()
 
 # Permission Sync Manager - for keeping permissions in sync with Supabase
-try:
-    from permission_sync_fix import PermissionSyncManager
-    PERMISSION_SYNC_AVAILABLE = True
-    print("✓ Permission sync manager loaded")
-except Exception as e:
-    PERMISSION_SYNC_AVAILABLE = False
-    PermissionSyncManager = None
-    print(f"⚠️ Permission sync manager error: {e}")
+PermissionSyncManager = lazy("permission_sync_fix", "PermissionSyncManager")
+PERMISSION_SYNC_AVAILABLE = PermissionSyncManager is not None
+if not PERMISSION_SYNC_AVAILABLE:
+    print("⚠️ Permission sync manager lipsește")
 
 # Multi-Device Sync Manager - sincronizează TOȚI datele din cloud pentru orice dispozitiv
-try:
-    from multi_device_sync_manager import MultiDeviceSyncManager
-    MULTI_DEVICE_SYNC_AVAILABLE = True
-    print("✓ Multi-device sync manager loaded")
-except Exception as e:
-    MULTI_DEVICE_SYNC_AVAILABLE = False
-    MultiDeviceSyncManager = None
-    print(f"⚠️ Multi-device sync manager error: {e}")
+MultiDeviceSyncManager = lazy("multi_device_sync_manager", "MultiDeviceSyncManager")
+MULTI_DEVICE_SYNC_AVAILABLE = MultiDeviceSyncManager is not None
+if not MULTI_DEVICE_SYNC_AVAILABLE:
+    print("⚠️ Multi-device sync manager lipsește")
 
 # Real-Time Cloud Sync Manager - for syncing institution data in real-time
-try:
-    from realtime_sync import RealTimeSyncManager
-    REALTIME_SYNC_AVAILABLE = True
-    print("✓ Real-time cloud sync manager loaded")
-except Exception as e:
-    REALTIME_SYNC_AVAILABLE = False
-    RealTimeSyncManager = None
-    print(f"⚠️ Real-time sync manager error: {e}")
+RealTimeSyncManager = lazy("realtime_sync", "RealTimeSyncManager")
+REALTIME_SYNC_AVAILABLE = RealTimeSyncManager is not None
+if not REALTIME_SYNC_AVAILABLE:
+    print("⚠️ Real-time sync manager lipsește")
 
 # Organization View (hierarchical display)
-try:
-    from organization_view import create_city_institution_view
-    ORGANIZATION_VIEW_AVAILABLE = True
-    print("✓ Organization view module loaded")
-except Exception as e:
-    ORGANIZATION_VIEW_AVAILABLE = False
-    create_city_institution_view = None
-    print(f"⚠️ Organization view error: {e}")
-    InstitutionPermissionManager = None
-    print(f"⚠️ Admin panel module lipsește: {e}")
-    import traceback
-    traceback.print_exc()
+create_city_institution_view = lazy("organization_view", "create_city_institution_view")
+ORGANIZATION_VIEW_AVAILABLE = create_city_institution_view is not None
+if not ORGANIZATION_VIEW_AVAILABLE:
+    print("⚠️ Organization view lipsește")
 
 # JSON Action Logger - înregistrează orice modificare pe JSON-uri
 try:
@@ -298,13 +294,10 @@ except ImportError as e:
     print(f"⚠️ JSON logger module lipsește: {e}")
 
 # Git support - complet opțional (DEPRECATED - folosește Supabase)
-try:
-    from git import Repo
-    from git.exc import InvalidGitRepositoryError
-    GIT_AVAILABLE = True
-except ImportError:
+# GitPython se importă doar la primul commit (_ensure_git_repo), nu la pornire
+GIT_AVAILABLE = module_available("git")
+if not GIT_AVAILABLE:
     # Git nu e instalat sau GitPython lipsește - aplicația va funcționa fără Git
-    GIT_AVAILABLE = False
     print("⚠️ Git nu este disponibil - funcționalitatea Git este dezactivată")
 
 # ================== GLOBAL OBJECTS INITIALIZATION ==================
@@ -378,6 +371,131 @@ try:
 except Exception as e:
     print(f"⚠️ Server data scope detection failed: {e}")
 
+# ================== SHARED SCHEDULER ==================
+# Un singur thread pentru toate job-urile periodice (backup, sync, reset lunar)
+APP_SCHEDULER = get_default_scheduler()
+APP_SCHEDULER.set_state_file(os.path.join(DATA_DIR, "scheduler_state.json"))
+
+# ================== SUPABASE ID REGISTRY ==================
+# Nume oraș/instituție -> ID: din fișierul serverului la pornire, reîmprospătat într-un request,
+# ținut la zi de evenimentele realtime cities/institutions
+if SUPABASE_EMPLOYEE_MANAGER_AVAILABLE:
+    SUPABASE_EMPLOYEE_MANAGER.ids.set_state_file(os.path.join(DATA_DIR, REGISTRY_FILE_NAME))
+    APP_SCHEDULER.run_soon("supabase_id_registry", SUPABASE_EMPLOYEE_MANAGER.prime_id_cache)
+
+# ================== AUDIT LOG MIRROR ==================
+_AUDIT_MIRROR = None
+
+
+def get_audit_mirror():
+    """Oglinda locală audit_logs - aceeași bază pe care o actualizează MultiDeviceSyncManager"""
+    global _AUDIT_MIRROR
+    manager = globals().get("MULTI_DEVICE_SYNC_MANAGER")
+    if manager is not None:
+        return manager.audit_mirror
+    if _AUDIT_MIRROR is None:
+        # Doar citire din viewer: retenția se aplică la sincronizare
+        _AUDIT_MIRROR = AuditLogMirror(os.path.join(DATA_DIR, AUDIT_MIRROR_FILE), retention_days=None)
+    return _AUDIT_MIRROR
+
+# ================== LOCAL STORE ==================
+# json (implicit) = un fișier per instituție; sqlite = DATA_DIR/punctaj_local.db (WAL)
+# Alegere: $PUNCTAJ_STORAGE_BACKEND sau [storage] backend = sqlite în supabase_config.ini
+STORAGE_BACKEND = resolve_backend([
+    os.path.join(BASE_DIR, "supabase_config.ini"),
+    os.path.join(os.getcwd(), "supabase_config.ini"),
+])
+LOCAL_STORE = open_store(DATA_DIR, STORAGE_BACKEND)
+# sqlite: fișierele JSON rămân oglindă (scrisă în fundal) pentru modulele care le citesc direct
+JSON_MIRROR_QUEUE = BackgroundReportQueue(name="JsonMirrorQueue")
+print(f"🗄️ Local storage backend: {STORAGE_BACKEND}")
+
+
+def mirror_institution_json(city, institution):
+    store = LOCAL_STORE  # store-ul serverului pe care s-a scris, chiar dacă între timp se schimbă serverul
+    if store.backend == "sqlite":
+        JSON_MIRROR_QUEUE.submit(lambda: store.export_institution(city, institution),
+                                 f"mirror {city}/{institution}")
+
+
+# ================== SALVARE AMÂNATĂ ==================
+# Editările rapide (punctaj, editare / adăugare membru, sync roluri) pe aceeași instituție
+# se unesc: o scriere, un upload delta. Fereastra: $PUNCTAJ_SAVE_DEBOUNCE_MS sau
+# [ui] save_debounce_ms în supabase_config.ini (0 = salvare imediată)
+SAVE_DEBOUNCE_MS = resolve_debounce_ms([
+    os.path.join(BASE_DIR, "supabase_config.ini"),
+    os.path.join(os.getcwd(), "supabase_config.ini"),
+])
+SAVE_COORDINATOR = DebouncedSaveCoordinator(
+    lambda key, pending: _flush_institution_save(key, pending),
+    schedule=lambda delay_ms, callback: root.after(delay_ms, callback),
+    cancel=lambda handle: root.after_cancel(handle),
+    delay_ms=SAVE_DEBOUNCE_MS,
+)
+# Revizie locală pe fiecare salvare + rândurile trimise: ecourile propriilor scrieri
+# (realtime, sync, refresh) sunt recunoscute și nu mai reîncarcă tabelul
+LOCAL_REVISIONS = LocalRevisionLog()
+
+
+# ================== CĂUTARE GLOBALĂ (INDEX) ==================
+# Index inversat peste toți angajații serverului activ; actualizat pe instituție,
+# în fundal (un singur worker, în ordine) - thread-ul Tkinter doar citește
+SEARCH_INDEX = EmployeeSearchIndex()
+SEARCH_INDEX_QUEUE = BackgroundReportQueue(name="SearchIndexQueue")
+
+
+def _institution_signature(city, institution):
+    try:
+        return os.stat(institution_path(city, institution)).st_mtime_ns
+    except OSError:
+        return None
+
+
+def refresh_search_index():
+    """Reindexează doar instituțiile modificate de la ultima trecere (mtime)"""
+    def job():
+        institutions = [(city, inst) for city in LOCAL_STORE.list_cities()
+                        for inst in LOCAL_STORE.list_institutions(city)]
+        stats = SEARCH_INDEX.sync_from(institutions, LOCAL_STORE.load, _institution_signature)
+        logger.debug("🔎 Search index: %s (%s angajați)", stats, len(SEARCH_INDEX))
+    SEARCH_INDEX_QUEUE.submit(job, "search index refresh")
+
+
+def _reopen_server_scope():
+    """
+    DATA_DIR s-a schimbat (alt server): store-ul local, indexul de căutare, registrul de ID-uri
+    și oglinda audit se redeschid pe fișierele noului server - altfel load / save / căutarea
+    ar lucra în continuare pe datele serverului anterior
+    """
+    global LOCAL_STORE, _AUDIT_MIRROR
+    previous = LOCAL_STORE
+    LOCAL_STORE = open_store(DATA_DIR, STORAGE_BACKEND)
+    if previous.backend == "sqlite":
+        # După oglindirile JSON deja programate pe vechiul store (coada le rulează în ordine)
+        JSON_MIRROR_QUEUE.submit(previous.close, "close previous store")
+
+    SEARCH_INDEX_QUEUE.submit(SEARCH_INDEX.clear, "search index clear")
+    refresh_search_index()
+
+    if SUPABASE_EMPLOYEE_MANAGER_AVAILABLE:
+        SUPABASE_EMPLOYEE_MANAGER.ids.set_state_file(os.path.join(DATA_DIR, REGISTRY_FILE_NAME))
+        APP_SCHEDULER.run_soon("supabase_id_registry", SUPABASE_EMPLOYEE_MANAGER.prime_id_cache)
+
+    if _AUDIT_MIRROR is not None:
+        _AUDIT_MIRROR.close()
+        _AUDIT_MIRROR = None
+    manager = globals().get("MULTI_DEVICE_SYNC_MANAGER")
+    if manager is not None:
+        manager.set_data_dir(DATA_DIR)
+
+
+def index_institution_data(city, institution, data):
+    rows = list(data.get("rows", []))
+    SEARCH_INDEX_QUEUE.submit(
+        lambda: SEARCH_INDEX.index_institution(city, institution, rows, data.get("columns"),
+                                               _institution_signature(city, institution)),
+        f"index {city}/{institution}")
+
 # ================== BACKUP MANAGER INITIALIZATION ==================
 # Auto-backup periodic al datelor locale
 if BACKUP_MANAGER_AVAILABLE and BackupManager:
@@ -398,6 +516,7 @@ else:
 # ================== SUPABASE SYNC CONFIGURATION ==================
 # Sincronizare cloud cu Supabase PostgreSQL
 SUPABASE_SYNC = None
+REALTIME_APPLY = None
 if NO_CLOUD_DB_MODE:
     print("ℹ️ NO-CLOUD mode: skipping Supabase initialization")
 elif SUPABASE_MODULE_AVAILABLE:
@@ -417,6 +536,13 @@ elif SUPABASE_MODULE_AVAILABLE:
     if config_found:
         SUPABASE_SYNC = SupabaseSync(config_found)
         print(f"📡 Supabase config: {config_found}")
+        
+        # Realtime employee events patch the local JSON + visible table directly
+        REALTIME_APPLY = RealtimeApplyEngine(lambda: DATA_DIR, echo_filter=LOCAL_REVISIONS.is_echo)
+        REALTIME_APPLY.add_listener(lambda patch: _on_realtime_patch(patch))
+        SUPABASE_SYNC.attach_realtime_engine(REALTIME_APPLY)
+        if SUPABASE_EMPLOYEE_MANAGER_AVAILABLE:
+            SUPABASE_SYNC.attach_id_registry(SUPABASE_EMPLOYEE_MANAGER.ids)
     else:
         print("⚠️ supabase_config.ini nu găsit")
 else:
@@ -487,8 +613,17 @@ GIT_REPO = None
 GIT_AUTHOR = "PunctajApp"
 GIT_EMAIL = "app@punctaj.local"
 
-# Inițializează Git repo în folderul datelor (Documents\PunctajManager)
-if GIT_AVAILABLE:
+_GIT_INIT_DONE = False
+
+
+def _ensure_git_repo():
+    """Inițializează Git repo în folderul datelor (Documents\\PunctajManager) la prima folosire"""
+    global GIT_REPO, GIT_ENABLED, _GIT_INIT_DONE
+    if _GIT_INIT_DONE or not GIT_AVAILABLE:
+        return GIT_ENABLED
+    _GIT_INIT_DONE = True
+    from git import Repo
+    from git.exc import InvalidGitRepositoryError
     try:
         GIT_REPO = Repo(BASE_DIR)
         GIT_ENABLED = True
@@ -510,7 +645,10 @@ if GIT_AVAILABLE:
         except Exception as e:
             print(f"Nu pot inițializa Git: {e}")
             GIT_ENABLED = False
-else:
+    return GIT_ENABLED
+
+
+if not GIT_AVAILABLE:
     print("ℹ️ Aplicația rulează fără suport Git")
 
 
@@ -556,7 +694,7 @@ def deduplicate_rows(rows):
                 seen_discord.add(discord_id)
     
     if duplicates_count > 0:
-        print(f"   🧹 Removed {duplicates_count} duplicate rows (by Discord ID)")
+        logger.info("🧹 Removed %s duplicate rows (by Discord ID)", duplicates_count)
     
     return deduplicated
 
@@ -568,12 +706,12 @@ def supabase_upload(city, institution, json_data, file_path=None):
     Sincronizează angajații cu Supabase din JSON local
     Include și logurile din folderul logs/
     """
-    print(f"\n📡 SUPABASE_UPLOAD: Starting for {city}/{institution}")
-    print(f"   🔍 SUPABASE_EMPLOYEE_MANAGER_AVAILABLE = {SUPABASE_EMPLOYEE_MANAGER_AVAILABLE}")
-    print(f"   🔍 SUPABASE_SYNC enabled = {SUPABASE_SYNC.enabled if SUPABASE_SYNC else False}")
+    logger.debug("📡 SUPABASE_UPLOAD: Starting for %s/%s", city, institution)
+    logger.debug("🔍 SUPABASE_EMPLOYEE_MANAGER_AVAILABLE = %s", SUPABASE_EMPLOYEE_MANAGER_AVAILABLE)
+    logger.debug("🔍 SUPABASE_SYNC enabled = %s", SUPABASE_SYNC.enabled if SUPABASE_SYNC else False)
     
     if not SUPABASE_EMPLOYEE_MANAGER_AVAILABLE:
-        print(f"   ⚠️  EMPLOYEE_MANAGER not available - checking SUPABASE_SYNC only")
+        logger.warning("⚠️  EMPLOYEE_MANAGER not available - checking SUPABASE_SYNC only")
         # Don't return here - try SUPABASE_SYNC sync_data instead
 
     try:
@@ -585,92 +723,57 @@ def supabase_upload(city, institution, json_data, file_path=None):
         # Fallback: resolve IDs if missing (needed for reliable employees table updates)
         if SUPABASE_EMPLOYEE_MANAGER_AVAILABLE and (not city_id or not institution_id):
             try:
-                city_obj = SUPABASE_EMPLOYEE_MANAGER.get_city_by_name(city)
-                if city_obj:
-                    city_id = city_id or city_obj.get("id")
-                    inst_obj = SUPABASE_EMPLOYEE_MANAGER.get_institution_by_name(city_id, institution)
-                    if inst_obj:
-                        institution_id = institution_id or inst_obj.get("id")
-
-                        # Keep IDs in payload for current run and future saves
-                        json_data["city_id"] = city_id
-                        json_data["institution_id"] = institution_id
-                        if file_path:
-                            try:
-                                with open(file_path, "w", encoding="utf-8") as f:
-                                    json.dump(json_data, f, indent=4, ensure_ascii=False)
-                            except Exception as persist_err:
-                                print(f"   ⚠️  Could not persist resolved IDs to local file: {persist_err}")
+                # Name -> id din cache (un singur request la prima folosire a orașului)
+                resolved_inst_id = SUPABASE_EMPLOYEE_MANAGER.resolve_institution_id(city, institution)
+                city_id = city_id or SUPABASE_EMPLOYEE_MANAGER.resolve_city_id(city)
+                if city_id and resolved_inst_id:
+                    institution_id = institution_id or resolved_inst_id
+
+                    # Keep IDs in payload for current run and future saves
+                    json_data["city_id"] = city_id
+                    json_data["institution_id"] = institution_id
+                    if file_path:
+                        try:
+                            with open(file_path, "w", encoding="utf-8") as f:
+                                json.dump(json_data, f, indent=4, ensure_ascii=False)
+                        except Exception as persist_err:
+                            logger.warning("⚠️  Could not persist resolved IDs to local file: %s", persist_err)
             except Exception as e:
-                print(f"   ⚠️  Could not resolve city/institution IDs for upload: {e}")
+                logger.warning("⚠️  Could not resolve city/institution IDs for upload: %s", e)
         
-        print(f"   📊 Data: {len(rows)} rows, city_id={city_id}, institution_id={institution_id}")
+        logger.debug("📊 Data: %s rows, city_id=%s, institution_id=%s", len(rows), city_id, institution_id)
         
+        employees_ok = True
         if SUPABASE_EMPLOYEE_MANAGER_AVAILABLE and city_id and institution_id:
-            # Sincronizează fiecare angajat - cu verificare îmbunătățită anti-dublare
-            synced = 0
-            for row in rows:
-                try:
-                    emp_data = SUPABASE_EMPLOYEE_MANAGER.format_employee_for_supabase(row)
-                    employee_name = row.get("NUME IC", "")
-                    employee_discord = row.get("DISCORD", "")
-                    
-                    # DUPLICATE FIX: Verificare robustă prin nume ȘI Discord ID
-                    existing = None
-                    if employee_name:
-                        existing = SUPABASE_EMPLOYEE_MANAGER.get_employee_by_name(institution_id, employee_name)
-                    
-                    # Dacă nu găsește prin nume și avem Discord ID, încearcă și prin Discord
-                    if not existing and employee_discord:
-                        try:
-                            # Verificare suplimentară prin Discord ID pentru evitarea duplicatelor
-                            url = f"{SUPABASE_EMPLOYEE_MANAGER.url}/rest/v1/employees?institution_id=eq.{institution_id}&discord=eq.{employee_discord}&select=*"
-                            resp = requests.get(url, headers=SUPABASE_EMPLOYEE_MANAGER.headers, timeout=10)
-                            if resp.status_code == 200:
-                                data = resp.json()
-                                existing = data[0] if data else None
-                        except:
-                            pass  # Dacă nu poate verifica prin Discord, continuă cu numele
-                    
-                    if existing:
-                        # Update - IMPORTANT: Make sure punctaj is updated!
-                        print(f"   🔄 Updating employee: {employee_name} - PUNCTAJ: {row.get('PUNCTAJ', 0)}")
-                        SUPABASE_EMPLOYEE_MANAGER.update_employee(existing['id'], emp_data)
-                    else:
-                        # Adaugă nou - Verificare finală înainte de ADD pentru evitarea duplicatelor
-                        print(f"   ➕ Adding new employee: {employee_name} - PUNCTAJ: {row.get('PUNCTAJ', 0)}")
-                        result = SUPABASE_EMPLOYEE_MANAGER.add_employee(institution_id, emp_data)
-                        if not result:
-                            # Posibil duplicat - încearcă UPDATE în loc de ADD
-                            print(f"      ⚠️ Add failed (possibly duplicate) - trying update instead")
-                            # Re-verifică și încearcă update
-                            existing = SUPABASE_EMPLOYEE_MANAGER.get_employee_by_name(institution_id, employee_name)
-                            if existing:
-                                SUPABASE_EMPLOYEE_MANAGER.update_employee(existing['id'], emp_data)
-                                print(f"      ✅ Updated instead of added: {employee_name}")
-                    synced += 1
-                except Exception as e:
-                    print(f"   ⚠️  Error sync {row.get('NUME IC', 'Unknown')}: {e}")
-                    import traceback
-                    traceback.print_exc()
-            
-            print(f"   ✅ Synced {synced}/{len(rows)} employees to Supabase")
+            # Upsert pe id (rândurile care îl au - un DISCORD redenumit rămâne același rând),
+            # restul potrivite după DISCORD / NUME IC sau pe cheia unică (institution_id, discord_username)
+            try:
+                result = SUPABASE_EMPLOYEE_MANAGER.upsert_institution_employees(institution_id, rows)
+                logger.info("✅ Synced %s/%s employees to Supabase (%s new without Discord)",
+                            result["upserted"] + result["inserted"], len(rows), result["inserted"])
+                for row in result["conflicts"]:
+                    logger.warning("⚠️  DISCORD '%s' (%s) already used in %s/%s - row not uploaded",
+                                   row.get("DISCORD"), row.get("NUME IC"), city, institution)
+                employees_ok = not result["failed"] and not result["conflicts"]
+            except Exception as e:
+                logger.exception("⚠️  Error syncing employees: %s", e)
+                employees_ok = False
         elif not SUPABASE_EMPLOYEE_MANAGER_AVAILABLE:
-            print(f"   ⚠️  Cannot sync employees - MANAGER not available")
+            logger.warning("⚠️  Cannot sync employees - MANAGER not available")
         
         # 📊 DIRECT SYNC TO police_data TABLE - UPDATE INSTITUTION DATA WITH PUNCTAJ
         # This ensures that the police_data table always has the latest employee data
         if SUPABASE_SYNC and SUPABASE_SYNC.enabled:
             try:
-                print(f"   📊 Syncing institution data to police_data table...")
+                logger.debug("📊 Syncing institution data to police_data table...")
                 # Update the police_data table with the latest JSON data
                 result = SUPABASE_SYNC.sync_data(city, institution, json_data, DISCORD_AUTH)
                 if result:
-                    print(f"   ✅ police_data table updated with latest institution data")
+                    logger.debug("✅ police_data table updated with latest institution data")
                 else:
-                    print(f"   ⚠️  police_data table update returned False")
+                    logger.warning("⚠️  police_data table update returned False")
             except Exception as e:
-                print(f"   ⚠️  Error syncing to police_data: {e}")
+                logger.warning("⚠️  Error syncing to police_data: %s", e)
         
         # Upload logurile din folderul logs/ (organized by server/city/institution)
         # IMPORTANT: Logurile sunt criptate local, trebuie să le decriptez înainte upload
@@ -685,7 +788,7 @@ def supabase_upload(city, institution, json_data, file_path=None):
                     has_encryption = True
                 except ImportError:
                     has_encryption = False
-                    print("   ⚠️  Encryption module not available - will try plain JSON")
+                    logger.warning("⚠️  Encryption module not available - will try plain JSON")
                 
                 # Find all institution log files (logs/**/{institution}.enc)
                 institution_log_files = glob.glob(os.path.join(logs_dir, "**", "*.enc"), recursive=True)
@@ -709,7 +812,7 @@ def supabase_upload(city, institution, json_data, file_path=None):
                         if not isinstance(logs_array, list):
                             logs_array = [logs_array]
                         
-                        print(f"   📤 Uploading {len(logs_array)} logs from {os.path.basename(log_file)}...")
+                        logger.debug("📤 Uploading %s logs from %s...", len(logs_array), os.path.basename(log_file))
                         
                         # Upload each log entry
                         for log_data in logs_array:
@@ -736,44 +839,42 @@ def supabase_upload(city, institution, json_data, file_path=None):
                             if response.status_code in [200, 201]:
                                 logs_uploaded += 1
                             else:
-                                print(f"      ⚠️  Failed to upload log: HTTP {response.status_code}")
+                                logger.warning("⚠️  Failed to upload log: HTTP %s", response.status_code)
                         
                         # Delete file after successful upload of all logs
                         os.remove(log_file)
-                        print(f"      ✅ Uploaded {logs_uploaded} logs total")
+                        logger.debug("✅ Uploaded %s logs total", logs_uploaded)
                     except Exception as e:
-                        print(f"   ⚠️  Error with logs from {log_file}: {e}")
-                        import traceback
-                        traceback.print_exc()
+                        logger.exception("⚠️  Error with logs from %s: %s", log_file, e)
         except Exception as e:
-            print(f"   ⚠️  Logs upload error: {e}")
+            logger.warning("⚠️  Logs upload error: %s", e)
         
         # ===== SYNC INSTITUTION DATA TO SUPABASE DATA TABLE =====
         # This synchronizes the complete institution JSON to the "data" table
         if SUPABASE_SYNC and SUPABASE_SYNC.enabled:
             try:
-                print(f"   📡 Calling SUPABASE_SYNC.sync_data()...")
+                logger.debug("📡 Calling SUPABASE_SYNC.sync_data()...")
                 result = SUPABASE_SYNC.sync_data(city, institution, json_data, DISCORD_AUTH)
-                if result:
-                    print(f"   ✅ Institution data synced: {city}/{institution}")
+                if result and employees_ok:
+                    logger.info("✅ Institution data synced: %s/%s", city, institution)
                     return {"status": "success"}
+                elif result:
+                    # police_data la zi, dar angajații nu - apelantul reîncearcă rândurile
+                    logger.warning("⚠️  Employees not fully synced for %s/%s", city, institution)
+                    return {"status": "partial", "employees_failed": True}
                 else:
-                    print(f"   ⚠️  sync_data returned False for {city}/{institution}")
+                    logger.warning("⚠️  sync_data returned False for %s/%s", city, institution)
                     # But don't return error - local save was successful
                     return {"status": "partial"}
             except Exception as e:
-                print(f"   ❌ Error calling sync_data: {e}")
-                import traceback
-                traceback.print_exc()
+                logger.exception("❌ Error calling sync_data: %s", e)
                 return {"status": "error", "message": str(e)}
         else:
-            print(f"   ⚠️  SUPABASE_SYNC not available")
+            logger.warning("⚠️  SUPABASE_SYNC not available")
             return {"status": "no_sync"}
         
     except Exception as e:
-        print(f"   ❌ SUPABASE_UPLOAD ERROR: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("❌ SUPABASE_UPLOAD ERROR: %s", e)
         return {"status": "error", "message": str(e)}
 
 
@@ -796,59 +897,44 @@ def sync_all_local_cities_to_supabase():
         cities_created = 0
         institutions_created = 0
         
-        # Iterează prin toate orașele din local
+        # Registry-ul de ID-uri reîncărcat într-un singur request; fără el nu creăm nimic (duplicate)
+        if SUPABASE_EMPLOYEE_MANAGER.prime_id_cache() is None:
+            print("  ❌ Cannot load city/institution ids - city sync skipped")
+            return
+        registry = SUPABASE_EMPLOYEE_MANAGER.ids
+        
+        # Orașele și instituțiile locale (foldere / fișiere .json)
+        local = {}
         for city_dir_name in sorted(os.listdir(DATA_DIR)):
             city_path = os.path.join(DATA_DIR, city_dir_name)
-            
-            # Skip files, doar directories
-            if not os.path.isdir(city_path):
-                continue
-            
-            # Check dacă orașul deja există în Supabase
-            existing_city = SUPABASE_EMPLOYEE_MANAGER.get_city_by_name(city_dir_name)
-            
-            if not existing_city:
-                # Creează orașul
-                print(f"  📍 Creating city: {city_dir_name}")
-                new_city = SUPABASE_EMPLOYEE_MANAGER.add_city(city_dir_name)
-                if new_city:
-                    cities_created += 1
-                else:
-                    print(f"    ❌ Failed to create city")
-                    continue
-            else:
-                existing_city_id = existing_city['id']
-            
-            # Get city ID (din new_city sau existing)
-            if existing_city:
-                city_id = existing_city['id']
-            else:
-                city_id = new_city.get('id') if new_city else None
-            
-            if not city_id:
+            if os.path.isdir(city_path):
+                local[city_dir_name] = [f[:-5] for f in sorted(os.listdir(city_path)) if f.endswith('.json')]
+        
+        # Diff cu registry-ul: doar lipsurile se creează, câte un POST pentru toate orașele / instituțiile
+        missing_cities = [city for city in local if registry.city_id(city) is None]
+        if missing_cities:
+            print(f"  📍 Creating {len(missing_cities)} cities: {', '.join(missing_cities)}")
+            cities_created = len(SUPABASE_EMPLOYEE_MANAGER.add_cities(missing_cities))
+        
+        missing_institutions = [(registry.city_id(city), name) for city, names in local.items()
+                                if registry.city_id(city) is not None
+                                for name in names if registry.institution_id(registry.city_id(city), name) is None]
+        if missing_institutions:
+            print(f"  🏢 Creating {len(missing_institutions)} institutions")
+            institutions_created = len(SUPABASE_EMPLOYEE_MANAGER.add_institutions(missing_institutions))
+        
+        for city_dir_name, institution_names in local.items():
+            city_path = os.path.join(DATA_DIR, city_dir_name)
+            if registry.city_id(city_dir_name) is None:
                 print(f"    ⚠️  Cannot get city ID for {city_dir_name}")
                 continue
             
-            # Iterează prin instituții din orașul local
-            for json_file in sorted(os.listdir(city_path)):
-                if not json_file.endswith('.json'):
+            for institution_name in institution_names:
+                json_file = f"{institution_name}.json"
+                if registry.institution_id(registry.city_id(city_dir_name), institution_name) is None:
+                    print(f"       ❌ Failed to create institution {city_dir_name}/{institution_name}")
                     continue
                 
-                institution_name = json_file[:-5]  # Remove .json
-                
-                # Check dacă instituția deja există
-                existing_inst = SUPABASE_EMPLOYEE_MANAGER.get_institution_by_name(city_id, institution_name)
-                
-                if not existing_inst:
-                    # Creează instituția
-                    print(f"    🏢 Creating institution: {institution_name}")
-                    new_inst = SUPABASE_EMPLOYEE_MANAGER.add_institution(city_id, institution_name)
-                    if new_inst:
-                        institutions_created += 1
-                    else:
-                        print(f"       ❌ Failed to create institution")
-                        continue
-                
                 # Și sincronizează și datele la police_data table
                 try:
                     inst_path = os.path.join(city_path, json_file)
@@ -1002,7 +1088,7 @@ def git_commit_and_push(file_path, message):
     DEPRECATED: Folosește supabase_upload() în loc de Git
     Păstrat pentru compatibilitate backwards
     """
-    if not GIT_ENABLED or not GIT_REPO:
+    if not _ensure_git_repo() or not GIT_REPO:
         return
     
     try:
@@ -1030,7 +1116,7 @@ def git_commit_and_push(file_path, message):
 
 def git_pull_and_sync():
     """Face pull de pe Git și sincronizează datele locale"""
-    if not GIT_ENABLED or not GIT_REPO:
+    if not _ensure_git_repo() or not GIT_REPO:
         return
     
     try:
@@ -1063,23 +1149,12 @@ def load_institution(city, institution):
     Falls back to Supabase if local file doesn't exist
     """
     
-    # PRIORITIZE LOCAL JSON FIRST
-    local_path = institution_path(city, institution)
-    if os.path.exists(local_path):
+    # PRIORITIZE LOCAL STORE FIRST (JSON / SQLite)
+    if LOCAL_STORE.exists(city, institution) or os.path.exists(institution_path(city, institution)):
         try:
-            with open(local_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-            
-            # Asigură că avem structura corectă
-            if isinstance(data, list):
-                rows = deduplicate_rows(data)
-                return {
-                    "columns": ["DISCORD", "RANK", "PUNCTAJ"],
-                    "ranks": {},
-                    "rows": rows,
-                    "version": 1,
-                    "source": "local"
-                }
+            data = LOCAL_STORE.load(city, institution)
+            if data is None:
+                raise ValueError("date locale ilizibile")
             
             # Asigură rankuri și rânduri
             if "ranks" not in data:
@@ -1102,53 +1177,40 @@ def load_institution(city, institution):
     # FALLBACK: Try Supabase if local doesn't exist
     if SUPABASE_EMPLOYEE_MANAGER_AVAILABLE:
         try:
-            city_obj = SUPABASE_EMPLOYEE_MANAGER.get_city_by_name(city)
-            if city_obj:
-                institution_obj = SUPABASE_EMPLOYEE_MANAGER.get_institution_by_name(city_obj['id'], institution)
-                if institution_obj:
-                    employees = SUPABASE_EMPLOYEE_MANAGER.get_employees_by_institution(institution_obj['id'])
-                    
-                    rows = []
-                    seen_discord = set()
-                    for emp in employees:
-                        formatted = SUPABASE_EMPLOYEE_MANAGER.format_employee_for_app(emp)
-                        discord_id = formatted.get("DISCORD", "")
-                        if discord_id and discord_id not in seen_discord:
-                            rows.append(formatted)
-                            seen_discord.add(discord_id)
-                        elif not discord_id:
-                            rows.append(formatted)
-                    
-                    rows = deduplicate_rows(rows)
-                    
-                    result = {
-                        "columns": ["DISCORD", "NUME IC", "SERIE DE BULETIN", "RANK", "ROLE", "PUNCTAJ", "ULTIMA_MOD"],
-                        "ranks": {
-                            "1": "Offiter",
-                            "2": "Caporal",
-                            "3": "Sergent",
-                            "4": "Plutonier",
-                            "5": "Locotenent Instructor",
-                            "6": "Sherif Adjunct",
-                            "7": "Sherif"
-                        },
-                        "rows": rows,
-                        "version": 2,
-                        "source": "supabase",
-                        "city_id": city_obj['id'],
-                        "institution_id": institution_obj['id']
-                    }
-                    
-                    # Save to local for future use
-                    try:
-                        path = institution_path(city, institution)
-                        os.makedirs(os.path.dirname(path), exist_ok=True)
-                        with open(path, "w", encoding="utf-8") as f:
-                            json.dump(result, f, indent=2, ensure_ascii=False)
-                    except:
-                        pass
-                    
-                    return result
+            # Oraș + instituție + angajați într-un singur request (resource embedding)
+            fetched = SUPABASE_EMPLOYEE_MANAGER.get_institution_employees(city, institution)
+            if fetched:
+                employees = fetched["employees"]
+                
+                rows = deduplicate_rows([SUPABASE_EMPLOYEE_MANAGER.format_employee_for_app(emp) for emp in employees])
+                
+                result = {
+                    "columns": ["DISCORD", "NUME IC", "SERIE DE BULETIN", "RANK", "ROLE", "PUNCTAJ", "ULTIMA_MOD"],
+                    "ranks": {
+                        "1": "Offiter",
+                        "2": "Caporal",
+                        "3": "Sergent",
+                        "4": "Plutonier",
+                        "5": "Locotenent Instructor",
+                        "6": "Sherif Adjunct",
+                        "7": "Sherif"
+                    },
+                    "rows": rows,
+                    "version": 2,
+                    "source": "supabase",
+                    "city_id": fetched['city_id'],
+                    "institution_id": fetched['institution_id']
+                }
+                
+                # Save to local for future use
+                try:
+                    LOCAL_STORE.save(city, institution, result)
+                    mirror_institution_json(city, institution)
+                    index_institution_data(city, institution, result)
+                except Exception:
+                    pass
+                
+                return result
         except Exception as e:
             print(f"⚠️ Error loading from Supabase: {e}")
     
@@ -1298,6 +1360,94 @@ def save_institution(city, institution, tree, update_timestamp=False, updated_it
         )
         return
     
+    # Salvare amânată: editările rapide din fereastra SAVE_DEBOUNCE_MS se unesc într-o
+    # singură scriere + un singur upload delta (vezi _flush_institution_save)
+    SAVE_COORDINATOR.request((city, institution), tree, update_timestamp, updated_items, skip_logging)
+
+
+def _flush_institution_save(key, pending):
+    """Scrierea efectivă pentru salvările unite de SAVE_COORDINATOR (thread-ul Tkinter)"""
+    city, institution = key
+    tree = pending.tree
+    if not tree.winfo_exists():
+        logger.warning("⚠️ Tabelul %s/%s a fost închis înainte de salvare - %s editări pierdute",
+                       city, institution, pending.requests)
+        return
+    data, delta, file_path = _write_institution(city, institution, tree, pending.update_timestamp,
+                                                pending.updated_items, pending.skip_logging)
+    logger.debug("💾 Save %s/%s (%s): %s editări unite, %s rânduri modificate",
+                 city, institution, data["local_revision"], pending.requests, len(delta))
+    
+    # Sincronizare Supabase (înlocuiește Git) - doar rândurile modificate, în fundal;
+    # fără reîncărcarea tabelului: UI-ul are deja datele salvate
+    _queue_institution_upload(city, institution, data, delta)
+    
+    # Auto-commit și push la Git (DEPRECATED)
+    git_commit_and_push(file_path, f"Update {city}/{institution}")
+
+
+def _queue_institution_upload(city, institution, data, delta):
+    # Delta + rândurile rămase din upload-urile eșuate anterior (pending_sync_rows)
+    rows, full = upload_rows(data, delta)
+    if not rows:
+        logger.debug("ℹ️ %s/%s: niciun rând modificat - upload omis", city, institution)
+        return
+    # Aceeași coadă ca upload-ul de punctaj: scrierile pe employees rămân în ordine
+    payload = {k: v for k, v in data.items() if k not in ("pending_sync", "pending_sync_rows")}
+    payload["rows"] = [dict(row) for row in rows]
+    keys = [list(row_key(row)) for row in rows]
+    store = LOCAL_STORE
+    
+    def job():
+        result = supabase_upload(city, institution, payload)
+        ok = result.get("status") == "success"
+        if ok:
+            # Amprentele ecourilor: doar pentru scrierile ajunse în cloud
+            LOCAL_REVISIONS.record(city, institution, payload["rows"])
+            logger.info("✅ Auto-sync UPLOAD: %s/%s → Supabase (%s rânduri)", city, institution, len(rows))
+        else:
+            logger.warning("⚠️  Auto-sync UPLOAD failed: %s/%s - %s rânduri reîncercate la următoarea "
+                           "salvare / pornire", city, institution, len(rows))
+        # ID-uri rezolvate de upload + rândurile încă nesincronizate: persistate din thread-ul Tkinter
+        ids = {k: payload.get(k) for k in ("city_id", "institution_id")
+               if payload.get(k) and payload.get(k) != data.get(k)}
+        REALTIME_UI_HANDOFF.submit(_record_upload_result, store, city, institution, keys, ok, full, ids)
+    
+    POINTS_CLOUD_QUEUE.submit(job, f"save {city}/{institution}")
+
+
+def _record_upload_result(store, city, institution, keys, ok, full, ids):
+    """pending_sync / pending_sync_rows (+ ID-urile rezolvate) în fișierul instituției"""
+    meta = store.meta(city, institution)
+    if meta is None:
+        return
+    pending = settle_pending(meta.get("pending_sync_rows"), keys, ok, full)
+    changes = dict(ids)
+    if pending != (meta.get("pending_sync_rows") or []) or bool(pending) != bool(meta.get("pending_sync")):
+        changes.update(pending_sync=bool(pending), pending_sync_rows=pending)
+    if changes:
+        store.update_rows(city, institution, [], meta=changes)
+        if store is LOCAL_STORE:
+            mirror_institution_json(city, institution)
+
+
+def retry_pending_uploads():
+    """La pornire: instituțiile rămase cu pending_sync sunt urcate din nou (rândurile reținute)"""
+    store = LOCAL_STORE
+    count = 0
+    for city in store.list_cities():
+        for institution in store.list_institutions(city):
+            meta = store.meta(city, institution) or {}
+            if meta.get("pending_sync"):
+                _queue_institution_upload(city, institution, store.load(city, institution) or {}, [])
+                count += 1
+    if count:
+        logger.info("🔁 %s instituții cu upload-uri eșuate reîncercate", count)
+    return count
+
+
+def _write_institution(city, institution, tree, update_timestamp=False, updated_items=None, skip_logging=False):
+    """Scriere locală + log; returnează (data, rânduri modificate față de fișier, file_path)"""
     # Încarcă datele existente pentru a păstra rankurile și timestamp-ul
     existing_data = load_institution(city, institution)
     ranks_map = existing_data.get("ranks", {})
@@ -1309,6 +1459,7 @@ def save_institution(city, institution, tree, update_timestamp=False, updated_it
     current_version = existing_data.get("version", 1)
     last_synced = existing_data.get("last_synced")
     pending_sync = existing_data.get("pending_sync", False)
+    pending_sync_rows = existing_data.get("pending_sync_rows") or []
     
     # Dacă e o modificare de punctaj, actualizează timestamp-ul global
     if update_timestamp:
@@ -1330,6 +1481,7 @@ def save_institution(city, institution, tree, update_timestamp=False, updated_it
         "version": current_version,
         "last_synced": last_synced,
         "pending_sync": pending_sync,
+        "pending_sync_rows": pending_sync_rows,
         # Preserve Supabase relation IDs used by employee sync
         "city_id": existing_data.get("city_id"),
         "institution_id": existing_data.get("institution_id"),
@@ -1351,9 +1503,14 @@ def save_institution(city, institution, tree, update_timestamp=False, updated_it
         
         data["rows"].append(row_dict)
     
+    # Revizia scrisă de noi - tabelul o ține minte, un refresh care o regăsește e propriul ecou
+    data["local_revision"] = LOCAL_REVISIONS.next_revision(city, institution)
+    tree.local_revision = data["local_revision"]
+    
     file_path = institution_path(city, institution)
-    with open(file_path, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=4, ensure_ascii=False)
+    LOCAL_STORE.save(city, institution, data)
+    mirror_institution_json(city, institution)
+    index_institution_data(city, institution, data)
     
     # LOG: Salvare date
     log_json_action(file_path, "edit", {
@@ -1416,40 +1573,27 @@ def save_institution(city, institution, tree, update_timestamp=False, updated_it
         except Exception as e:
             print(f"⚠️ Error logging institution save: {e}")
     
-    # Sincronizare Supabase (înlocuiește Git)
-    try:
-        result = supabase_upload(city, institution, data, file_path)
-        if result.get("status") == "success":
-            print(f"✅ Auto-sync UPLOAD: {city}/{institution} → Supabase")
-            # 🔄 FORCE REFRESH - pull the updated data back from cloud to ensure police_data is updated
-            print(f"   🔄 Force-refreshing the active table after sync...")
-            root.after(100, refresh_active_institution_table)
-        else:
-            print(f"⚠️  Auto-sync UPLOAD failed: {city}/{institution} (will retry later)")
-    except Exception as e:
-        print(f"❌ Auto-sync error: {e}")
-    
-    # Auto-commit și push la Git (DEPRECATED)
-    git_commit_and_push(file_path, f"Update {city}/{institution}")
+    return data, changed_rows(existing_data.get("rows", []), data["rows"]), file_path
 
 
 def delete_institution(city, institution):
+    SAVE_COORDINATOR.discard((city, institution))
     path = institution_path(city, institution)
     
     # ===== GET INSTITUTION ID BEFORE DELETION =====
     institution_id = None
     try:
-        if os.path.exists(path):
-            with open(path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-                institution_id = data.get("institution_id")
-    except:
+        institution_id = (LOCAL_STORE.meta(city, institution) or {}).get("institution_id")
+    except Exception:
         pass
     
+    if LOCAL_STORE.backend == "sqlite":
+        LOCAL_STORE.delete_institution(city, institution)
+    SEARCH_INDEX_QUEUE.submit(lambda: SEARCH_INDEX.remove_institution(city, institution))
     if os.path.exists(path):
         os.remove(path)
         # Commit delete-ul la Git
-        if GIT_ENABLED and GIT_REPO:
+        if _ensure_git_repo() and GIT_REPO:
             try:
                 GIT_REPO.index.remove([path])
                 GIT_REPO.index.commit(f"Delete {city}/{institution}")
@@ -1473,14 +1617,16 @@ def delete_city(city):
     city_id = None
     if SUPABASE_EMPLOYEE_MANAGER_AVAILABLE:
         try:
-            city_obj = SUPABASE_EMPLOYEE_MANAGER.get_city_by_name(city)
-            if city_obj:
-                city_id = city_obj.get('id')
+            city_id = SUPABASE_EMPLOYEE_MANAGER.resolve_city_id(city)
+            if city_id:
                 print(f"   City ID retrieved: {city_id}")
         except Exception as e:
             print(f"   ⚠️ Could not retrieve city ID from Supabase: {e}")
     
     # ===== DELETE LOCALLY =====
+    if LOCAL_STORE.backend == "sqlite":
+        LOCAL_STORE.delete_city(city)
+    SEARCH_INDEX_QUEUE.submit(lambda: SEARCH_INDEX.remove_city(city))
     path = city_dir(city)
     if os.path.exists(path):
         shutil.rmtree(path)
@@ -1615,6 +1761,11 @@ def discord_login():
         # Make main window closable during login (user can X to close app, even during auth)
         def close_app_cleanly():
             if messagebox.askyesno("Închide", "Sigur vrei să inchizi aplicația?"):
+                # Salvările amânate se scriu acum; upload-urile lor se termină înainte de ieșire
+                SAVE_COORDINATOR.flush()
+                if not POINTS_CLOUD_QUEUE.join(timeout=10):
+                    print("⚠️ Upload-uri încă în curs la închidere")
+                
                 # Stop backup manager if running
                 global PERMISSION_SYNC_MANAGER, REALTIME_SYNC_MANAGER, BACKUP_MANAGER
                 if BACKUP_MANAGER:
@@ -1879,6 +2030,7 @@ def discord_login():
                                 
                                 # ⭐ Start background sync (every 5 minutes)
                                 try:
+                                    MULTI_DEVICE_SYNC_MANAGER.on_police_data_changed = _refresh_active_table_from_sync
                                     MULTI_DEVICE_SYNC_MANAGER.start_background_sync(interval=300)
                                 except Exception as e:
                                     print(f"⚠️  Background sync start warning: {e}")
@@ -2143,6 +2295,7 @@ def discord_login():
                         
                         # ⭐ Start background sync (every 5 minutes)
                         try:
+                            MULTI_DEVICE_SYNC_MANAGER.on_police_data_changed = _refresh_active_table_from_sync
                             MULTI_DEVICE_SYNC_MANAGER.start_background_sync(interval=300)
                         except Exception as e:
                             print(f"⚠️  Background sync start warning: {e}")
@@ -2323,23 +2476,9 @@ Token Status: Valid
     messagebox.showinfo("Discord Profile", profile_text)
 
 # ================== THEME COLORS - RDR STYLE FROM CSS ====================
-THEME_COLORS = {
-    "bg_dark": "#000000",              # Negru profund (ca în design)
-    "bg_dark_secondary": "#0a0604",    # Negru foarte închis
-    "bg_frame": "#050302",             # Frame background negru
-    "fg_light": "#ff8844",             # Text portocaliu (ca în design)
-    "fg_secondary": "#cc6633",         # Text gri portocaliu
-    "accent_red": "#ff3000",           # Portocaliu intens glow
-    "accent_orange": "#ff6b47",        # Portocaliu CSS din design
-    "accent_orange_bright": "#ff8844", # Portocaliu mai deschis
-    "accent_orange_soft": "#ffb37e",   # Portocaliu CSS deschis
-    "button_bg": "#0a0604",            # Button background negru
-    "button_border": "#ff6b47",        # Button border portocaliu (vizibil)
-    "frame_bg": "#000000",             # Frame background negru profund
-    "input_bg": "#1a0f08",             # Input background negru profund
-    "tree_bg": "#000000",              # Treeview background negru profund
-    "tree_fg": "#ff8844",              # Treeview text portocaliu
-}
+# Paleta și opțiunile pe clasă de widget stau în theme_registry (option database + teme pe subarbori)
+THEME_COLORS = dict(RDR_THEME_COLORS)
+THEME = ThemeRegistry(THEME_COLORS)
 
 def apply_theme_root(window):
     """Aplică tema pe fereastra principală"""
@@ -2429,129 +2568,51 @@ def _register_titlebar_theme_hooks(window):
 
 def apply_theme_frame(frame):
     """Aplică tema pe Frame widget"""
-    try:
-        frame.configure(bg=THEME_COLORS["bg_dark"])
-    except:
-        pass
+    THEME.apply(frame, "Frame")
 
 def apply_theme_button(button, accent=True):
     """Aplică tema pe Butoane - RDR Style CSS cu GLOW"""
+    if accent:
+        THEME.apply(button, "Button")
+        return
     try:
-        if accent:
-            button.configure(
-                bg=THEME_COLORS["button_bg"],           # Negru profund
-                fg=THEME_COLORS["fg_light"],            # #ff8844 portocaliu bold
-                activebackground=THEME_COLORS["accent_orange"],    # Hover portocaliu intens
-                activeforeground=THEME_COLORS["fg_light"],         # Hover text portocaliu
-                relief="solid",
-                bd=3,  # Border mai gros pentru glow
-                highlightbackground=THEME_COLORS["button_border"],  # Border portocaliu #ff6b47
-                highlightcolor=THEME_COLORS["accent_red"],          # Highlight roșu #ff3000
-                highlightthickness=2,
-                font=("Segoe UI", 10, "bold"),  # Bold ca în design
-                padx=12,
-                pady=8
-            )
-        else:
-            button.configure(
-                bg=THEME_COLORS["bg_dark_secondary"],
-                fg=THEME_COLORS["fg_light"],
-                activebackground=THEME_COLORS["accent_orange"],
-                activeforeground=THEME_COLORS["fg_light"],
-                relief="solid",
-                bd=2,
-                font=("Segoe UI", 9, "bold")
-            )
-    except:
+        button.configure(
+            bg=THEME_COLORS["bg_dark_secondary"],
+            fg=THEME_COLORS["fg_light"],
+            activebackground=THEME_COLORS["accent_orange"],
+            activeforeground=THEME_COLORS["fg_light"],
+            relief="solid",
+            bd=2,
+            font=("Segoe UI", 9, "bold")
+        )
+    except tk.TclError:
         pass
 
 def apply_theme_label(label):
     """Aplică tema pe Label widget - Text portocaliu bold"""
-    try:
-        label.configure(
-            bg=THEME_COLORS["bg_dark"],
-            fg=THEME_COLORS["fg_light"],  # #ff8844 portocaliu
-            font=("Segoe UI", 10, "bold")
-        )
-    except:
-        pass
+    THEME.apply(label, "Label")
 
 def apply_theme_entry(entry):
     """Aplică tema pe Entry widget - Negru profund cu text portocaliu"""
-    try:
-        entry.configure(
-            bg=THEME_COLORS["input_bg"],  # #1a0f08 negru profund
-            fg=THEME_COLORS["fg_light"],  # #ff8844 portocaliu
-            insertbackground=THEME_COLORS["accent_red"],  # #ff3000 roșu cursor
-            relief="solid",
-            bd=2,
-            font=("Segoe UI", 10)
-        )
-    except:
-        pass
+    THEME.apply(entry, "Entry")
 
 
 def apply_theme_checkbutton(checkbutton):
     """Aplică tema pe Checkbutton widget."""
-    try:
-        checkbutton.configure(
-            bg=THEME_COLORS["bg_dark"],
-            fg=THEME_COLORS["fg_light"],
-            activebackground=THEME_COLORS["bg_dark_secondary"],
-            activeforeground=THEME_COLORS["fg_light"],
-            selectcolor=THEME_COLORS["input_bg"],
-            font=("Segoe UI", 10),
-            highlightthickness=0,
-            bd=0
-        )
-    except:
-        pass
+    THEME.apply(checkbutton, "Checkbutton")
 
 
 def apply_theme_scrollbar(scrollbar):
     """Aplică tema pe Scrollbar widget."""
-    try:
-        scrollbar.configure(
-            bg=THEME_COLORS["button_bg"],
-            activebackground=THEME_COLORS["accent_orange"],
-            troughcolor=THEME_COLORS["bg_dark_secondary"],
-            relief="flat",
-            bd=0
-        )
-    except:
-        pass
+    THEME.apply(scrollbar, "Scrollbar")
 
 def apply_theme_to_children(widget):
-    """Aplică tema recursiv pe toți copiii unui widget - RDR Style"""
-    try:
-        # Aplică pe widget-ul curent
-        widget_type = widget.__class__.__name__
-        
-        if widget_type == "Button":
-            apply_theme_button(widget)
-        elif widget_type == "Label":
-            apply_theme_label(widget)
-        elif widget_type == "Entry":
-            apply_theme_entry(widget)
-        elif hasattr(widget, 'configure'):
-            # Frame, Canvas, etc - toate negru profund
-            try:
-                if widget_type in ["Frame", "Canvas"]:
-                    widget.configure(bg=THEME_COLORS["bg_dark"])  # #000000 negru
-                elif widget_type == "Text":
-                    widget.configure(
-                        bg=THEME_COLORS["input_bg"],
-                        fg=THEME_COLORS["fg_light"],
-                        insertbackground=THEME_COLORS["accent_red"]
-                    )
-            except:
-                pass
-        
-        # Aplică recursiv pe copii
-        for child in widget.winfo_children():
-            apply_theme_to_children(child)
-    except:
-        pass
+    """
+    Aplică tema pe un subarbore de widget-uri (iterativ) - RDR Style
+    Widget-urile deja tematizate nu se mai reconfigurează; cele noi primesc tema
+    oricum din option database (THEME.install), deci apelul e util doar pentru subarbori noi
+    """
+    return THEME.theme_subtree(widget)
 
 
 def themed_askstring(title, prompt, initialvalue="", parent=None):
@@ -2633,8 +2694,8 @@ def _themed_tk_init(self, *args, **kwargs):
 def _themed_toplevel_init(self, *args, **kwargs):
     _original_toplevel_init(self, *args, **kwargs)
     try:
+        # Fundalul vine din option database (*Toplevel.background) - doar title bar-ul Windows
         _register_titlebar_theme_hooks(self)
-        self.after(0, lambda: apply_theme_root(self))
     except Exception:
         pass
 
@@ -2644,6 +2705,8 @@ tk.Toplevel.__init__ = _themed_toplevel_init
 
 # ================== UI ==================
 root = tk.Tk()
+# Tema pe clase, o singură dată: toate widget-urile create de acum înainte o primesc la creare
+THEME.install(root)
 root.title("Manager punctaj - orase / institutii / angajati")
 apply_theme_root(root)
 
@@ -2659,13 +2722,10 @@ root.geometry(f"{responsive_width}x{responsive_height}")
 root.minsize(800, 600)
 root.resizable(True, True)
 
-# Import admin panel
-try:
-    from admin_panel import AdminPanel
-    ADMIN_PANEL_AVAILABLE = True
-except Exception as e:
-    ADMIN_PANEL_AVAILABLE = False
-    print(f"⚠️ Admin panel nu este disponibil: {e}")
+# Admin panel - modulul se importă doar la deschiderea panoului (open_admin_panel)
+ADMIN_PANEL_AVAILABLE = ADMIN_PANEL_AVAILABLE and module_available("admin_panel")
+if not ADMIN_PANEL_AVAILABLE:
+    print("⚠️ Admin panel nu este disponibil")
 
 style = ttk.Style()
 style.theme_use("default")
@@ -2920,9 +2980,14 @@ def _switch_active_server(server_key, reload_ui=True):
     target_data_dir = os.path.join(BASE_DATA_DIR, server_key)
     os.makedirs(target_data_dir, exist_ok=True)
 
+    # Salvările amânate aparțin serverului curent - scrise înainte de schimbare
+    SAVE_COORDINATOR.flush()
+
     ACTIVE_SERVER_KEY = server_key
-    DATA_DIR = target_data_dir
+    previous_data_dir, DATA_DIR = DATA_DIR, target_data_dir
     os.environ["PUNCTAJ_SERVER_KEY"] = server_key
+    if os.path.abspath(previous_data_dir) != os.path.abspath(DATA_DIR):
+        _reopen_server_scope()
 
     if DISCORD_AUTH:
         try:
@@ -3985,65 +4050,74 @@ def refresh_admin_buttons():
                 child.destroy()
             
             try:
-                if not SUPABASE_SYNC:
-                    tk.Label(scroll_frame, text="⚠️ Supabase nu e disponibil", font=("Segoe UI", 10)).pack(pady=20)
-                    return
-                
                 selected = selected_institution.get()
                 selected_srv = selected_server.get()
-                
-                # Build query
-                url = f"{SUPABASE_SYNC.url}/rest/v1/{SUPABASE_SYNC.table_logs}?order=timestamp.desc&limit=100"
-                if selected_srv != "Toate":
-                    url += f"&server_key=eq.{selected_srv}"
+                filter_server = selected_srv if selected_srv != "Toate" else None
+                filter_city = filter_institution = None
                 if selected != "Toate":
                     # Filter by institution
                     inst_parts = selected.split(" / ")
                     if len(inst_parts) == 2:
-                        city, institution = inst_parts
-                        url += f"&institution=eq.{institution}&city=eq.{city}"
+                        filter_city, filter_institution = inst_parts
                 
-                headers = {
-                    "apikey": SUPABASE_SYNC.key,
-                    "Authorization": f"Bearer {SUPABASE_SYNC.key}"
-                }
-                
-                response = requests.get(url, headers=headers)
-                if response.status_code == 200:
-                    logs = response.json()
+                logs = None
+                if SUPABASE_SYNC:
+                    # Build query
+                    url = f"{SUPABASE_SYNC.url}/rest/v1/{SUPABASE_SYNC.table_logs}?order=timestamp.desc&limit=100"
+                    if filter_server:
+                        url += f"&server_key=eq.{filter_server}"
+                    if filter_institution:
+                        url += f"&institution=eq.{filter_institution}&city=eq.{filter_city}"
                     
-                    if not logs:
-                        tk.Label(scroll_frame, text="📭 Nicio activitate înregistrată", font=("Segoe UI", 10, "italic"), fg="#999").pack(pady=20)
-                    else:
-                        for log in logs:
-                            # Card pentru fiecare log
-                            card = tk.Frame(scroll_frame, bg=THEME_COLORS["bg_dark_secondary"], relief="solid", borderwidth=1)
-                            card.pack(fill="x", padx=5, pady=5)
-                            
-                            # Timestamp + action
-                            header_text = f"🕐 {log.get('timestamp', 'N/A')[:19]} - {log.get('action_type', 'unknown').upper()}"
-                            tk.Label(card, text=header_text, font=("Segoe UI", 9, "bold"), bg=THEME_COLORS["bg_dark_secondary"], fg=THEME_COLORS["accent_orange"], anchor="w").pack(fill="x", padx=10, pady=(8, 3))
-                            
-                            # Discord ID
-                            discord_id = log.get('discord_id', 'Unknown')
-                            tk.Label(card, text=f"👤 Discord ID: {discord_id}", font=("Segoe UI", 9), bg=THEME_COLORS["bg_dark_secondary"], fg=THEME_COLORS["fg_secondary"], anchor="w").pack(fill="x", padx=20, pady=1)
-                            
-                            # Discord Username
-                            discord_username = log.get('discord_username', discord_id)
-                            tk.Label(card, text=f"👤 Discord Username: {discord_username}", font=("Segoe UI", 9, "bold"), bg=THEME_COLORS["bg_dark_secondary"], fg=THEME_COLORS["accent_orange"], anchor="w").pack(fill="x", padx=20, pady=1)
-                            
-                            # Institution
-                            institution = log.get('institution', 'N/A')
-                            city = log.get('city', 'N/A')
-                            server_key = log.get('server_key', 'default')
-                            tk.Label(card, text=f"🖥️ Server: {server_key}", font=("Segoe UI", 9), bg=THEME_COLORS["bg_dark_secondary"], fg=THEME_COLORS["fg_light"], anchor="w").pack(fill="x", padx=20, pady=1)
-                            tk.Label(card, text=f"🏢 {city} / {institution}", font=("Segoe UI", 9), bg=THEME_COLORS["bg_dark_secondary"], fg=THEME_COLORS["fg_light"], anchor="w").pack(fill="x", padx=20, pady=1)
-                            
-                            # Details
-                            details = log.get('details', 'No details')
-                            tk.Label(card, text=f"📝 {details}", font=("Segoe UI", 8), bg=THEME_COLORS["bg_dark_secondary"], fg=THEME_COLORS["fg_secondary"], anchor="w", wraplength=850, justify="left").pack(fill="x", padx=20, pady=(1, 8))
+                    headers = {
+                        "apikey": SUPABASE_SYNC.key,
+                        "Authorization": f"Bearer {SUPABASE_SYNC.key}"
+                    }
+                    
+                    try:
+                        response = requests.get(url, headers=headers, timeout=10)
+                        if response.status_code == 200:
+                            logs = response.json()
+                    except requests.RequestException:
+                        pass
+                
+                if logs is None:
+                    # Offline / cloud indisponibil: oglinda locală audit_logs (data/audit_logs.db)
+                    logs = get_audit_mirror().query(server_key=filter_server, city=filter_city,
+                                                    institution=filter_institution, limit=100)
+                    tk.Label(scroll_frame, text="📴 Offline - loguri din copia locală", font=("Segoe UI", 9, "italic"),
+                             fg="#999").pack(pady=(5, 0))
+                
+                if not logs:
+                    tk.Label(scroll_frame, text="📭 Nicio activitate înregistrată", font=("Segoe UI", 10, "italic"), fg="#999").pack(pady=20)
                 else:
-                    tk.Label(scroll_frame, text=f"❌ Eroare la citire: {response.status_code}", font=("Segoe UI", 10), fg="#c41e3a").pack(pady=20)
+                    for log in logs:
+                        # Card pentru fiecare log
+                        card = tk.Frame(scroll_frame, bg=THEME_COLORS["bg_dark_secondary"], relief="solid", borderwidth=1)
+                        card.pack(fill="x", padx=5, pady=5)
+                        
+                        # Timestamp + action
+                        header_text = f"🕐 {(log.get('timestamp') or 'N/A')[:19]} - {(log.get('action_type') or 'unknown').upper()}"
+                        tk.Label(card, text=header_text, font=("Segoe UI", 9, "bold"), bg=THEME_COLORS["bg_dark_secondary"], fg=THEME_COLORS["accent_orange"], anchor="w").pack(fill="x", padx=10, pady=(8, 3))
+                        
+                        # Discord ID
+                        discord_id = log.get('discord_id', 'Unknown')
+                        tk.Label(card, text=f"👤 Discord ID: {discord_id}", font=("Segoe UI", 9), bg=THEME_COLORS["bg_dark_secondary"], fg=THEME_COLORS["fg_secondary"], anchor="w").pack(fill="x", padx=20, pady=1)
+                        
+                        # Discord Username
+                        discord_username = log.get('discord_username', discord_id)
+                        tk.Label(card, text=f"👤 Discord Username: {discord_username}", font=("Segoe UI", 9, "bold"), bg=THEME_COLORS["bg_dark_secondary"], fg=THEME_COLORS["accent_orange"], anchor="w").pack(fill="x", padx=20, pady=1)
+                        
+                        # Institution
+                        institution = log.get('institution', 'N/A')
+                        city = log.get('city', 'N/A')
+                        server_key = log.get('server_key', 'default')
+                        tk.Label(card, text=f"🖥️ Server: {server_key}", font=("Segoe UI", 9), bg=THEME_COLORS["bg_dark_secondary"], fg=THEME_COLORS["fg_light"], anchor="w").pack(fill="x", padx=20, pady=1)
+                        tk.Label(card, text=f"🏢 {city} / {institution}", font=("Segoe UI", 9), bg=THEME_COLORS["bg_dark_secondary"], fg=THEME_COLORS["fg_light"], anchor="w").pack(fill="x", padx=20, pady=1)
+                        
+                        # Details
+                        details = log.get('details', 'No details')
+                        tk.Label(card, text=f"📝 {details}", font=("Segoe UI", 8), bg=THEME_COLORS["bg_dark_secondary"], fg=THEME_COLORS["fg_secondary"], anchor="w", wraplength=850, justify="left").pack(fill="x", padx=20, pady=(1, 8))
             except Exception as e:
                 tk.Label(scroll_frame, text=f"❌ Eroare: {str(e)}", font=("Segoe UI", 10), fg="#c41e3a").pack(pady=20)
             
@@ -4088,8 +4162,101 @@ tk.Frame(sidebar, height=2, bg=THEME_COLORS["accent_orange"]).pack(fill=tk.X, pa
 content = tk.Frame(main, bg=THEME_COLORS["bg_dark"])
 content.pack(side="right", fill="both", expand=True)
 
+# -------- CĂUTARE GLOBALĂ --------
+# Un angajat după DISCORD / NUME IC / SERIE / RANK / ROLE în toate orașele (SEARCH_INDEX)
+GLOBAL_SEARCH_COLUMNS = ("Oraș", "Instituție", "DISCORD", "NUME IC", "RANK", "PUNCTAJ")
+global_search_frame = tk.Frame(content, bg=THEME_COLORS["bg_dark"])
+global_search_frame.pack(fill="x", padx=10, pady=(8, 0))
+tk.Label(global_search_frame, text="🔎 Caută global:", bg=THEME_COLORS["bg_dark"],
+         fg=THEME_COLORS["fg_light"], font=("Segoe UI", 9, "bold")).pack(side="left")
+global_search_var = tk.StringVar()
+global_search_entry = tk.Entry(global_search_frame, textvariable=global_search_var, width=40,
+                               bg=THEME_COLORS["input_bg"], fg=THEME_COLORS["fg_light"],
+                               insertbackground=THEME_COLORS["fg_light"])
+global_search_entry.pack(side="left", padx=8)
+global_search_status = tk.Label(global_search_frame, text="", bg=THEME_COLORS["bg_dark"],
+                                fg=THEME_COLORS["fg_secondary"], font=("Segoe UI", 8))
+global_search_status.pack(side="left")
+
+global_search_results = ttk.Treeview(content, columns=GLOBAL_SEARCH_COLUMNS, show="headings", height=8)
+for _col in GLOBAL_SEARCH_COLUMNS:
+    global_search_results.heading(_col, text=_col)
+    global_search_results.column(_col, width=120 if _col not in ("PUNCTAJ", "RANK") else 70)
+global_search_hits = {}
+_global_search_job = None
+
+
+def run_global_search():
+    global _global_search_job
+    _global_search_job = None
+    query = global_search_var.get().strip()
+    global_search_results.delete(*global_search_results.get_children())
+    global_search_hits.clear()
+    if not query:
+        global_search_results.pack_forget()
+        global_search_status.config(text="")
+        return
+    start = time.perf_counter()
+    # Doar orașele vizibile pentru utilizator (cele încărcate în tab-uri)
+    hits = SEARCH_INDEX.search(query, limit=100, cities=set(tabs.keys()))
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    for hit in hits:
+        item = global_search_results.insert("", tk.END, values=(
+            hit.city, hit.institution, hit.row.get("DISCORD", ""), hit.row.get("NUME IC", ""),
+            hit.row.get("RANK", ""), hit.row.get("PUNCTAJ", "")))
+        global_search_hits[item] = hit
+    global_search_status.config(text=f"{len(hits)} rezultate ({elapsed_ms:.1f} ms, {len(SEARCH_INDEX)} indexați)")
+    if not global_search_results.winfo_ismapped():
+        global_search_results.pack(fill="x", padx=10, pady=(4, 0), before=city_notebook)
+
+
+def schedule_global_search(_event=None):
+    """Caută după o scurtă pauză de tastare (nu la fiecare tastă)"""
+    global _global_search_job
+    if _global_search_job is not None:
+        root.after_cancel(_global_search_job)
+    _global_search_job = root.after(150, run_global_search)
+
+
+def open_global_search_hit(_event=None):
+    """Deschide orașul + instituția rezultatului selectat și selectează angajatul"""
+    selection = global_search_results.selection()
+    hit = global_search_hits.get(selection[0]) if selection else None
+    if hit is None or hit.city not in tabs:
+        return
+    for tab_id in city_notebook.tabs():
+        if city_notebook.tab(tab_id, "text") == hit.city:
+            city_notebook.select(tab_id)
+            break
+    inst_nb = tabs[hit.city]["nb"]
+    for tab_id in inst_nb.tabs():
+        if inst_nb.tab(tab_id, "text") == hit.institution:
+            inst_nb.select(tab_id)
+            break
+    tree = tabs[hit.city]["trees"].get(hit.institution)
+    if tree is None:
+        return
+    columns = list(tree.columns)
+    for field in ("DISCORD", "NUME IC"):
+        if field in columns and hit.row.get(field):
+            idx = columns.index(field)
+            for item in tree.get_children():
+                values = tree.item(item, "values")
+                if idx < len(values) and str(values[idx]) == str(hit.row[field]):
+                    tree.selection_set(item)
+                    tree.see(item)
+                    return
+
+
+global_search_entry.bind("<KeyRelease>", schedule_global_search)
+global_search_entry.bind("<Escape>", lambda e: (global_search_var.set(""), run_global_search()))
+global_search_results.bind("<Double-1>", open_global_search_hit)
+global_search_results.bind("<Return>", open_global_search_hit)
+
 city_notebook = ttk.Notebook(content)
 city_notebook.pack(fill="both", expand=True)
+# Schimbarea tabului scrie salvările amânate (tabelul părăsit nu mai primește editări)
+city_notebook.bind("<<NotebookTabChanged>>", lambda e: SAVE_COORDINATOR.flush())
 
 
 # ================== GIT PERIODIC SYNC ==================
@@ -4105,8 +4272,8 @@ def git_periodic_sync():
         except Exception as e:
             print(f"[Git] Eroare la sync: {str(e)}")
     
-    # Rulează sync la fiecare 5 minute
-    schedule.every(5).minutes.do(sync)
+    # Rulează sync la fiecare 5 minute (scheduler-ul comun al aplicației)
+    APP_SCHEDULER.add_job("git_sync", sync, IntervalTrigger(300), jitter=30)
 
 
 # Inițializează Git sync
@@ -4114,112 +4281,67 @@ git_periodic_sync()
 
 
 # ================== AUTO-RESET SCHEDULER ==================
+def _monthly_reset_job():
+    active_server = (ACTIVE_SERVER_KEY or os.getenv("PUNCTAJ_SERVER_KEY", "") or "default").strip() or "default"
+    return MonthlyResetJob(DATA_DIR, ARCHIVE_DIR, server_key=active_server, max_workers=4)
+
+
 def auto_reset_all_institutions():
-    """Face reset automat la toate instituțiile din toate orașele"""
+    """
+    Face reset automat la toate instituțiile din toate orașele
+    Job jurnalizat: dacă aplicația se oprește la mijloc, la repornire se reia de unde a rămas
+    """
     print(f"[{datetime.now()}] Inițiez reset automat pentru prima zi a lunii...")
-    
-    # Iterează prin toate orașele
-    for city_dir_name in os.listdir(DATA_DIR):
-        city_path = os.path.join(DATA_DIR, city_dir_name)
-        if not os.path.isdir(city_path):
-            continue
-        
-        # Iterează prin toate instituțiile din oraș
-        for json_file in os.listdir(city_path):
-            if not json_file.endswith('.json'):
-                continue
-            
-            institution = json_file[:-5]
-            
-            try:
-                inst_data = load_institution(city_dir_name, institution)
-                columns = inst_data.get("columns", [])
-                rows = inst_data.get("rows", [])
-                
-                if "PUNCTAJ" not in columns:
-                    continue
-                
-                # Creează folder de arhivă și salvează raport
-                archive_city_dir = os.path.join(ARCHIVE_DIR, city_dir_name)
-                os.makedirs(archive_city_dir, exist_ok=True)
-                
-                csv_filename = f"{institution}.csv"
-                csv_path = os.path.join(archive_city_dir, csv_filename)
-                
-                reset_timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                
-                # Verifică dacă CSV-ul există
-                file_exists = os.path.exists(csv_path)
-                
-                # Salvează datele vechi în CSV
-                with open(csv_path, "a", newline="", encoding="utf-8") as csvfile:
-                    writer = csv.writer(csvfile)
-                    
-                    if not file_exists:
-                        header = ["RESET_DATA"] + columns
-                        writer.writerow(header)
-                    
-                    for row in rows:
-                        if isinstance(row, dict):
-                            values = [row.get(col, "") for col in columns]
-                        else:
-                            values = list(row) if isinstance(row, (list, tuple)) else [row]
-                        
-                        writer.writerow([reset_timestamp] + values)
-                    
-                    writer.writerow([])
-                
-                # Resetează PUNCTAJ la 0
-                current_timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                for row in rows:
-                    if isinstance(row, dict):
-                        row["PUNCTAJ"] = 0
-                        row["ULTIMA_MOD"] = current_timestamp
-                    else:
-                        row_dict = {}
-                        for i, col in enumerate(columns):
-                            row_dict[col] = row[i] if i < len(row) else ""
-                        row_dict["PUNCTAJ"] = 0
-                        row_dict["ULTIMA_MOD"] = current_timestamp
-                        rows[rows.index(row)] = row_dict
-                
-                # Asigură ULTIMA_MOD în coloane
-                if "ULTIMA_MOD" not in columns:
-                    columns.append("ULTIMA_MOD")
-                
-                # Salvează în JSON
-                inst_data["columns"] = columns
-                inst_data["rows"] = rows
-                inst_data["last_punctaj_update"] = reset_timestamp
-                
-                with open(institution_path(city_dir_name, institution), "w", encoding="utf-8") as f:
-                    json.dump(inst_data, f, indent=4, ensure_ascii=False)
-                
-                print(f"  ✓ Reset: {city_dir_name}/{institution}")
-            
-            except Exception as e:
-                print(f"  ✗ Eroare la reset {city_dir_name}/{institution}: {str(e)}")
-    
+    summary = _monthly_reset_job().run()
     print(f"[{datetime.now()}] Reset automat finalizat!")
+    return summary
+
+
+# Catch-up-ul resetului lunar rulează doar dacă aplicația pornește în 24h de la 1 ale lunii
+MONTHLY_RESET_GRACE_SECONDS = 24 * 3600
+
+
+def _confirm_missed_monthly_reset(missed_at):
+    """Resetul ratat (în afara ferestrei de catch-up) nu rulează singur: utilizatorul confirmă"""
+    print(f"⚠️ Resetul lunar din {missed_at:%Y-%m-%d %H:%M} nu a rulat (aplicația era închisă)")
+
+    def ask():
+        if messagebox.askyesno(
+            "Reset lunar ratat",
+            f"Resetul lunar programat pe {missed_at:%d.%m.%Y} nu a rulat (aplicația era închisă).\n\n"
+            "Vrei să resetezi ACUM punctajul la toate instituțiile?"
+        ):
+            APP_SCHEDULER.run_soon("monthly_reset_confirmed", auto_reset_all_institutions)
+        else:
+            print("ℹ️ Reset lunar ratat: amânat de utilizator")
+
+    root.after(0, ask)
 
 
 def schedule_daily_check():
-    """Scheduler care verifica daca e prima zi a lunii la 00:00"""
-    def check_and_reset():
-        now = datetime.now()
-        if now.day == 1 and now.hour == 0:
-            auto_reset_all_institutions()
-    
-    schedule.every(1).minutes.do(check_and_reset)
-    
-    while True:
-        schedule.run_pending()
-        time.sleep(30)  # Verifica la fiecare 30 de secunde
+    """
+    Programează resetul lunar: prima zi a lunii la 00:00
+    Dacă aplicația a fost închisă la 00:00 pe 1, resetul rulează o dată la pornire (catch-up),
+    dar doar în fereastra MONTHLY_RESET_GRACE_SECONDS; după aceea se cere confirmare
+    """
+    # Reia un reset lunar întrerupt (crash / închidere în timpul resetului)
+    try:
+        _monthly_reset_job().resume_incomplete()
+    except Exception as e:
+        print(f"⚠️ Could not resume monthly reset: {e}")
+    
+    APP_SCHEDULER.add_job(
+        "monthly_reset",
+        auto_reset_all_institutions,
+        MonthlyTrigger(day=1, hour=0, minute=0),
+        catch_up="run_once",
+        catch_up_grace=MONTHLY_RESET_GRACE_SECONDS,
+        on_missed=_confirm_missed_monthly_reset,
+    )
 
 
-# Lansează scheduler-ul în background thread
-scheduler_thread = threading.Thread(target=schedule_daily_check, daemon=True)
-scheduler_thread.start()
+# Programează resetul lunar pe scheduler-ul comun (fără thread dedicat)
+APP_SCHEDULER.run_soon("monthly_reset_setup", schedule_daily_check)
 tabs = {}  # oras -> {"nb": notebook institutii, "trees": {institutie: tree}}
 
 # ================== FUNCȚII ==================
@@ -4270,6 +4392,7 @@ def create_city_ui(city):
 
     inst_nb = ttk.Notebook(city_frame)
     inst_nb.pack(fill="both", expand=True)
+    inst_nb.bind("<<NotebookTabChanged>>", lambda e: SAVE_COORDINATOR.flush())
 
     tabs[city] = {"nb": inst_nb, "trees": {}, "info_frames": {}}
 
@@ -4655,15 +4778,17 @@ def sync_roles_with_ranks(tree, ranks_map):
 def reset_punctaj(tree, city, institution):
     """Resetează PUNCTAJ-ul la 0, arhivează datele vechi în JSON cu timestamp"""
     
-    print(f"\n🔄 RESET PUNCTAJ STARTED for {city}/{institution}")
+    logger.info("🔄 RESET PUNCTAJ STARTED for %s/%s", city, institution)
     
     if not messagebox.askyesno(
         "Confirmare resetare",
         f"Sigur vrei să resetezi punctajul pentru toți angajații?\n\nDatele vechi vor fi salvate în arhiva."
     ):
-        print("❌ Reset cancelled by user")
+        logger.info("Reset cancelled by user")
         return
     
+    SAVE_COORDINATOR.flush((city, institution))
+    
     # 🚫 IMPORTANT: Load from LOCAL file ONLY, don't sync with Supabase yet
     # This prevents pulling old data from cloud and overwriting the reset
     inst_path = institution_path(city, institution)
@@ -4671,234 +4796,59 @@ def reset_punctaj(tree, city, institution):
         messagebox.showerror("Eroare", f"Fișierul instituției nu există!")
         return
     
-    with open(inst_path, 'r', encoding='utf-8') as f:
-        inst_data = json.load(f)
-    
-    columns = inst_data.get("columns", [])
-    rows = inst_data.get("rows", [])
-    
-    print(f"📋 Loaded data: {len(rows)} employees, columns: {columns}")
-    
-    if "PUNCTAJ" not in columns:
-        messagebox.showwarning("Eroare", "Nu există coloana PUNCTAJ!")
-        print("❌ PUNCTAJ column not found!")
-        return
-    
     # Creează folder de arhivă pentru server + oraș
     active_server = (ACTIVE_SERVER_KEY or os.getenv("PUNCTAJ_SERVER_KEY", "") or "default").strip() or "default"
     archive_city_dir = os.path.join(ARCHIVE_DIR, active_server, city)
-    os.makedirs(archive_city_dir, exist_ok=True)
-    print(f"✅ Archive dir created: {archive_city_dir}")
-    
-    # Timestamp pentru reset - format: YYYY-MM-DD_HH-MM-SS
-    reset_timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-    
-    # JSON-ul va fi salvat cu timestamp
-    json_filename = f"{institution}_{reset_timestamp}.json"
-    json_path = os.path.join(archive_city_dir, json_filename)
     
-    # Salvează datele vechi în JSON (cu metadata)
     reset_by_name = DISCORD_AUTH.user_info.get('username', 'Unknown') if DISCORD_AUTH and DISCORD_AUTH.user_info else "Unknown"
     reset_by_id = DISCORD_AUTH.get_discord_id() if DISCORD_AUTH else ""
     
-    archive_data = {
-        "archived_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-        "institution": institution,
-        "city": city,
-        "reset_by": reset_by_name,
-        "discord_id": reset_by_id,
-        "columns": columns,
-        "rows": rows,
-        "employee_count": len(rows)
-    }
-    
-    with open(json_path, "w", encoding="utf-8") as f:
-        json.dump(archive_data, f, indent=4, ensure_ascii=False)
-    
-    print(f"✅ Archive saved: {json_path}")
-    
-    # Resetează PUNCTAJ-ul la 0 și adaug ULTIMA_MOD
-    current_timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    
-    print(f"🔄 Resetting PUNCTAJ for {len(rows)} employees...")
-    updated_count = 0
-    
-    for i, row in enumerate(rows):
-        if isinstance(row, dict):
-            print(f"   Row {i}: {row.get('DISCORD', 'Unknown')} - Old PUNCTAJ: {row.get('PUNCTAJ', 'N/A')} → New: 0")
-            row["PUNCTAJ"] = 0
-            row["ULTIMA_MOD"] = current_timestamp
-            updated_count += 1
-        else:
-            print(f"   ⚠️ Row {i} is not dict: {type(row)}")
-            # Convertește la dict dacă e list
-            row_dict = {}
-            for j, col in enumerate(columns):
-                row_dict[col] = row[j] if j < len(row) else ""
-            row_dict["PUNCTAJ"] = 0
-            row_dict["ULTIMA_MOD"] = current_timestamp
-            rows[i] = row_dict
-            updated_count += 1
-    
-    print(f"✅ Updated {updated_count} rows with PUNCTAJ = 0")
-    
-    # Asigură că ULTIMA_MOD este în coloane
-    if "ULTIMA_MOD" not in columns:
-        columns.append("ULTIMA_MOD")
-        print(f"✅ Added ULTIMA_MOD column")
-    
-    # 📦 SALVEAZĂ RAPORTUL DUPĂ RESET ÎN ARHIVĂ (cu PUNCTAJ = 0)
-    reset_report_filename = f"{institution}_{reset_timestamp}_AFTER_RESET.json"
-    reset_report_path = os.path.join(archive_city_dir, reset_report_filename)
-    
-    reset_report_data = {
-        "archived_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-        "institution": institution,
-        "city": city,
-        "reset_by": reset_by_name,
-        "discord_id": reset_by_id,
-        "columns": columns,
-        "rows": rows,
-        "employee_count": len(rows),
-        "status": "after_reset",
-        "reset_timestamp": reset_timestamp
-    }
-    
-    with open(reset_report_path, "w", encoding="utf-8") as f:
-        json.dump(reset_report_data, f, indent=4, ensure_ascii=False)
-    
-    print(f"✅ Reset report saved: {reset_report_path}")
-    
-    # Salvează datele resetate în JSON cu timestamp
-    inst_data["columns"] = columns
-    inst_data["rows"] = rows
-    inst_data["last_punctaj_update"] = current_timestamp
-    
-    inst_path = institution_path(city, institution)
-    print(f"💾 Saving to {inst_path}...")
-    with open(inst_path, "w", encoding="utf-8") as f:
-        json.dump(inst_data, f, indent=4, ensure_ascii=False)
-    
-    print(f"✅ Updated institution data: {inst_path}")
-    
-    # VERIFY that data was saved correctly
-    print(f"✓ Verifying saved data...")
-    with open(inst_path, 'r', encoding='utf-8') as f:
-        verify_data = json.load(f)
+    # Un singur pas: arhivă (date vechi) + reset + scriere atomică verificată + marker de reset
+    try:
+        result = reset_institution(
+            inst_path, archive_city_dir, city, institution,
+            reset_by=reset_by_name, discord_id=reset_by_id
+        )
+    except ResetError as e:
+        messagebox.showwarning("Eroare", f"Nu pot reseta punctajul: {e}")
+        logger.error("❌ Reset failed: %s", e)
+        return
     
-    verify_rows = verify_data.get("rows", [])
-    for i, row in enumerate(verify_rows):
-        discord = row.get('DISCORD', 'Unknown')
-        punctaj = row.get('PUNCTAJ', 'N/A')
-        print(f"   Verify Row {i}: {discord} - PUNCTAJ: {punctaj}")
+    rows = result["rows"]
+    json_path = result["archive_path"]
     
-    print(f"✅ Verification complete")
+    logger.info("✅ Reset %s employees, archive: %s (sha256 %s)", result['employee_count'], json_path, result['checksum'][:12])
     
     # 🔴 LOG RESET ACTION - CINE A RESETAT SCORUL
     if ACTION_LOGGER:
-        discord_id = DISCORD_AUTH.get_discord_id() if DISCORD_AUTH else "unknown"
+        discord_id = reset_by_id or "unknown"
         discord_username = DISCORD_AUTH.user_info.get('username', discord_id) if DISCORD_AUTH and DISCORD_AUTH.user_info else discord_id
         
-        employee_count = len(rows)
-        
         ACTION_LOGGER.log_custom_action(
             discord_id=discord_id,
             action_type="reset_punctaj_all",
             institution_name=institution,
             city=city,
-            details=f"Reset punctaj pentru {employee_count} angajați. Archive: {json_path}",
+            details=f"Reset punctaj pentru {result['employee_count']} angajați. Archive: {json_path}",
             discord_username=discord_username
         )
-        
-        print(f"✅ Reset action logged: {discord_username} resetted {employee_count} employees in {institution}")
     else:
-        print("⚠️ ACTION_LOGGER not available")
+        logger.warning("⚠️ ACTION_LOGGER not available")
     
-            # 📊 SAVE TO SUPABASE weekly reports table (configurable)
-    print(f"💾 Attempting to save to Supabase...")
-    try:
-        if SUPABASE_SYNC and SUPABASE_SYNC.enabled:
-            import requests
-            from datetime import datetime as dt
-            
-            print(f"✅ SUPABASE_SYNC is enabled")
-            
-            # Get the Monday of the current week
-            today = dt.now()
-            monday = today - __import__('datetime').timedelta(days=today.weekday())
-            
-            discord_id = DISCORD_AUTH.get_discord_id() if DISCORD_AUTH else ""
-            discord_username = DISCORD_AUTH.user_info.get('username', 'Unknown') if DISCORD_AUTH and DISCORD_AUTH.user_info else "Unknown"
-            
-            # Get institution_id from inst_data if available
-            institution_id = inst_data.get("institution_id", None)
-            
-            # Prepare data for weekly reports table
-            report_json = {
-                "week_start": monday.strftime('%Y-%m-%d'),
-                "week_end": today.strftime('%Y-%m-%d'),
-                "city": city,
-                "institution": institution,
-                "employee_count": len(rows),
-                "reset_by": discord_username,
-                "discord_id": discord_id,
-                "report_data": {
-                    "columns": columns,
-                    "rows": rows,
-                    "employee_count": len(rows),
-                    "reset_at": current_timestamp,
-                    "action": "reset_punctaj"
-                },
-                "archived_at": current_timestamp
-            }
-            
-            # Use REST API to insert into configured weekly reports table
-            headers = {
-                "apikey": SUPABASE_SYNC.key,
-                "Authorization": f"Bearer {SUPABASE_SYNC.key}",
-                "Content-Type": "application/json"
-            }
-            
-            weekly_table = getattr(SUPABASE_SYNC, "table_weekly_reports", "weekly_reports")
-            url = f"{SUPABASE_SYNC.url}/rest/v1/{weekly_table}"
-            print(f"📡 Posting to: {url}")
-            response = requests.post(url, json=report_json, headers=headers)
-            
-            print(f"📊 Response status: {response.status_code}")
-            
-            if response.status_code == 201:
-                print(f"✅ Reset logged to Supabase {weekly_table}: {city}/{institution}")
-            else:
-                print(f"⚠️ Failed to log reset to Supabase table '{weekly_table}' (Status {response.status_code})")
-                print(f"   Response: {response.text}")
-            
-            # 📊 UPDATE EMPLOYEES TABLE IN SUPABASE - Set all PUNCTAJ to 0
-            if institution_id:
-                print(f"💾 Updating employees in Supabase to PUNCTAJ = 0...")
-                try:
-                    # Update all employees for this institution to PUNCTAJ = 0
-                    update_url = f"{SUPABASE_SYNC.url}/rest/v1/employees?institution_id=eq.{institution_id}"
-                    update_data = {"punctaj": 0, "updated_at": current_timestamp}
-                    
-                    update_response = requests.patch(update_url, json=update_data, headers=headers)
-                    
-                    if update_response.status_code == 200:
-                        print(f"✅ Updated employees in Supabase: PUNCTAJ = 0")
-                    else:
-                        print(f"⚠️ Failed to update employees (Status {update_response.status_code})")
-                except Exception as e:
-                    print(f"⚠️ Could not update employees in Supabase: {e}")
-            else:
-                print(f"⚠️ Institution ID not found - skipping employees update")
-        else:
-            print(f"⚠️ SUPABASE_SYNC not enabled or not initialized")
-    except Exception as e:
-        print(f"⚠️ Could not save reset to Supabase: {e}")
-        import traceback
-        traceback.print_exc()
+    # 📊 SAVE TO SUPABASE weekly reports table - queued in background, UI doesn't wait
+    if SUPABASE_SYNC and SUPABASE_SYNC.enabled:
+        queue_reset_report(
+            SUPABASE_SYNC.url,
+            SUPABASE_SYNC.key,
+            getattr(SUPABASE_SYNC, "table_weekly_reports", "weekly_reports"),
+            city, institution, result,
+            reset_by=reset_by_name, discord_id=reset_by_id
+        )
+    else:
+        logger.warning("⚠️ SUPABASE_SYNC not enabled or not initialized")
     
     # Reîncarcă treeview-ul cu noua coloană
-    print(f"🔄 Refreshing tree view...")
+    logger.info("🔄 Refreshing tree view...")
     if "ULTIMA_MOD" not in tree.columns:
         tree.columns = list(tree.columns) + ["ULTIMA_MOD"]
         tree.heading("ULTIMA_MOD", text="ULTIMA_MOD", anchor="center")
@@ -4915,7 +4865,7 @@ def reset_punctaj(tree, city, institution):
     update_info_label(city, institution)
     sort_tree_by_punctaj(tree)
     
-    print(f"✅ RESET PUNCTAJ COMPLETED for {city}/{institution}\n")
+    logger.info("✅ RESET PUNCTAJ COMPLETED for %s/%s", city, institution)
     messagebox.showinfo("Succes", f"✅ Punctaj resetat!\n\n📦 Datele vechi salvate în:\n{json_path}")
 
 
@@ -5376,6 +5326,10 @@ def create_institution_tab(city, institution):
     
     # Salvează coloanele pe tree pentru a le folosi în save_institution
     tree.columns = columns
+    # Revizia locală afișată (vezi refresh_active_institution_table)
+    tree.local_revision = inst_data.get("local_revision")
+    # Rândurile din memorie (căutare) - actualizate și de apply_realtime_patch
+    tree.all_rows = rows
 
     for col in columns:
         tree.heading(col, text=col.upper(), anchor="center")
@@ -5388,23 +5342,8 @@ def create_institution_tab(city, institution):
             width = 200
         tree.column(col, anchor="center", width=width)
 
-    # Încarcă rândurile din date - deduplicare
-    seen_discord = set()
-    unique_rows = []
+    # Încarcă rândurile din date (load_institution a eliminat deja duplicatele)
     for row in rows:
-        if isinstance(row, dict):
-            discord_id = row.get("DISCORD", "")
-            # Skip if already seen (deduplicate)
-            if discord_id and discord_id in seen_discord:
-                print(f"⚠️ Duplicate employee skipped: {row.get('NUME IC', discord_id)}")
-                continue
-            if discord_id:
-                seen_discord.add(discord_id)
-            unique_rows.append(row)
-        else:
-            unique_rows.append(row)
-    
-    for row in unique_rows:
         if isinstance(row, dict):
             values = tuple(row.get(col, "") for col in columns)
         else:
@@ -6135,8 +6074,15 @@ def delete_members(tree, city, institution):
     item_to_supabase_id = {}  # Map tree items to Supabase IDs
 
     rows = data.get("rows", [])
+    # Index rânduri cu ID Supabase după DISCORD / NUME IC (tree-ul e sortat după punctaj, nu în ordinea din JSON)
+    supabase_id_index = {}
+    for row in rows:
+        if isinstance(row, dict) and row.get("id") is not None:
+            for field in ("DISCORD", "NUME IC"):
+                if row.get(field):
+                    supabase_id_index.setdefault((field, str(row[field])), row["id"])
     
-    for i, item in enumerate(tree.get_children()):
+    for item in tree.get_children():
         values = tree.item(item, "values")
         # Arată primele 3 coloane pentru identificare
         display = " | ".join(str(v) for v in values[:3])
@@ -6152,8 +6098,12 @@ def delete_members(tree, city, institution):
         vars_items.append((item, var))
         
         # Store Supabase ID if available
-        if i < len(rows) and isinstance(rows[i], dict) and "id" in rows[i]:
-            item_to_supabase_id[item] = rows[i]["id"]
+        row_values = dict(zip(tree.columns, values))
+        for field in ("DISCORD", "NUME IC"):
+            key = (field, str(row_values.get(field, "")))
+            if key in supabase_id_index:
+                item_to_supabase_id[item] = supabase_id_index[key]
+                break
 
     # ---------- BUTOANE CONTROL ----------
     btn_frame = tk.Frame(win, bg=THEME_COLORS["bg_dark"])
@@ -6199,85 +6149,52 @@ def delete_members(tree, city, institution):
         deleted_names = []
         deleted_data = []
         deleted_supabase_ids = []
+        rows_without_id = []
         
         for item in selectati:
             values = tree.item(item, "values")
             if values:
+                row_data = dict(zip(tree.columns, values))
                 deleted_names.append(str(values[0])[:50])
-                deleted_data.append(dict(zip(tree.columns, values)))
+                deleted_data.append(row_data)
                 if item in item_to_supabase_id:
                     deleted_supabase_ids.append(item_to_supabase_id[item])
+                else:
+                    rows_without_id.append(row_data)
             tree.delete(item)
 
-        # 2. SALVEAZĂ LOCAL ÎN JSON
-        save_institution(city, institution, tree)
-        
-        # ===== SUPABASE SYNC - ALWAYS TRY =====
+        # 2. SUPABASE - un singur DELETE id=in.(...) pentru tot lotul
+        # (+ un singur GET dacă unele rânduri nu au ID Supabase)
         if SUPABASE_EMPLOYEE_MANAGER_AVAILABLE:
-            print(f"\n[DEBUG] Employee delete sync attempt:")
-            print(f"   SUPABASE_EMPLOYEE_MANAGER_AVAILABLE: {SUPABASE_EMPLOYEE_MANAGER_AVAILABLE}")
-            print(f"   Deleted IDs found: {deleted_supabase_ids}")
-            print(f"   Deleted data: {deleted_data}")
-            
-            # If we have IDs, delete them from Supabase
-            if deleted_supabase_ids:
-                try:
-                    for supabase_id in deleted_supabase_ids:
-                        result = SUPABASE_EMPLOYEE_MANAGER.delete_employee(supabase_id)
-                        if result:
-                            print(f"✓ Employee deleted from Supabase (ID: {supabase_id})")
-                        else:
-                            print(f"⚠️ Failed to delete employee {supabase_id} from Supabase")
-                except Exception as e:
-                    print(f"⚠️ Error syncing delete to Supabase: {e}")
-            else:
-                print(f"   ⚠️ No direct Supabase IDs found for deleted employees")
-                print(f"   Attempting to find and delete by name in Supabase...")
-                
-                # Try to find and delete by institution and name
-                try:
+            try:
+                if rows_without_id:
+                    print(f"   ⚠️ {len(rows_without_id)} employees without Supabase ID - matching by Discord/name...")
                     institution_id = data.get("institution_id")
                     
                     # If institution_id missing, try to fetch it
                     if not institution_id:
-                        city_obj = SUPABASE_EMPLOYEE_MANAGER.get_city_by_name(city)
-                        if city_obj:
-                            inst_obj = SUPABASE_EMPLOYEE_MANAGER.get_institution_by_name(city_obj['id'], institution)
-                            if inst_obj:
-                                institution_id = inst_obj['id']
-                                print(f"   ✓ Retrieved institution_id: {institution_id}")
+                        institution_id = SUPABASE_EMPLOYEE_MANAGER.resolve_institution_id(city, institution)
+                        if institution_id:
+                            print(f"   ✓ Retrieved institution_id: {institution_id}")
                     
                     if institution_id:
-                        # Get all employees from Supabase for this institution
-                        all_employees = SUPABASE_EMPLOYEE_MANAGER.get_employees_by_institution(institution_id)
-                        print(f"   📊 Found {len(all_employees)} employees in Supabase for this institution")
-                        
-                        # Try to match and delete
-                        for deleted_emp in deleted_data:
-                            emp_name = deleted_emp.get('NUME IC', '').strip()
-                            discord = deleted_emp.get('DISCORD', '').strip()
-                            
-                            for supabase_emp in all_employees:
-                                supabase_name = supabase_emp.get('employee_name', '').strip()
-                                supabase_discord = supabase_emp.get('discord_username', '').strip()
-                                
-                                # Match by name or Discord username
-                                if (emp_name and emp_name == supabase_name) or (discord and discord == supabase_discord):
-                                    emp_id = supabase_emp.get('id')
-                                    result = SUPABASE_EMPLOYEE_MANAGER.delete_employee(emp_id)
-                                    if result:
-                                        print(f"✓ Employee deleted from Supabase by name match: {emp_name} (ID: {emp_id})")
-                                    else:
-                                        print(f"⚠️ Failed to delete {emp_name} from Supabase")
-                                    break
-                            else:
-                                print(f"   ⚠️ Could not find '{emp_name}' in Supabase to delete")
+                        found_ids, unmatched = SUPABASE_EMPLOYEE_MANAGER.find_employee_ids(institution_id, rows_without_id)
+                        deleted_supabase_ids.extend(found_ids)
+                        for row_data in unmatched:
+                            print(f"   ⚠️ Could not find '{row_data.get('NUME IC', '')}' in Supabase to delete")
                     else:
                         print(f"   ❌ Cannot find institution_id to lookup employees")
-                except Exception as e:
-                    print(f"   ❌ Error finding/deleting employees by name: {e}")
-                    import traceback
-                    traceback.print_exc()
+                
+                if deleted_supabase_ids:
+                    deleted_count = SUPABASE_EMPLOYEE_MANAGER.delete_employees(deleted_supabase_ids)
+                    print(f"✓ {deleted_count}/{len(deleted_supabase_ids)} employees deleted from Supabase")
+            except Exception as e:
+                print(f"⚠️ Error syncing delete to Supabase: {e}")
+                import traceback
+                traceback.print_exc()
+
+        # 3. SALVEAZĂ LOCAL ÎN JSON (o singură dată, după tot lotul)
+        save_institution(city, institution, tree)
         
         # ===== ACTION LOGGING =====
         if ACTION_LOGGER:
@@ -6507,6 +6424,149 @@ def edit_member(tree, city, institution):
     )
     btn_cancel.pack(side="left", padx=8, pady=10)
 
+def bulk_points_edit(tree, city, institution, items, amount, mode="add"):
+    """
+    ⚡ Modificare punctaj pe mai mulți angajați - o singură tranzacție
+    UI imediat, o singură scriere locală, un lot de loguri și un upload delta
+    (doar rândurile atinse); confirmarea din cloud vine asincron
+    Returnează lista de modificări [{"row", "old", "new"}]
+    """
+    if is_read_only_user():
+        messagebox.showerror("Acces Interzis", "Contul tău este read-only.\n\nNu poți salva modificări.")
+        return []
+    if not can_edit_city(city):
+        messagebox.showerror(
+            "Acces Interzis",
+            f"Nu ai permisiunea să editezi orașul: {city}\n\n"
+            f"Contactează un administrator pentru acces."
+        )
+        return []
+    
+    columns = list(tree.columns)
+    if "PUNCTAJ" not in columns or not items:
+        return []
+    punctaj_idx = columns.index("PUNCTAJ")
+    # Salvarea amânată a aceluiași tabel se scrie înainte (pe valorile de dinainte de lot)
+    SAVE_COORDINATOR.flush((city, institution))
+    
+    # 1. UI - actualizează rândurile imediat
+    changes = []
+    for item in items:
+        values = list(tree.item(item, "values"))
+        while len(values) < len(columns):
+            values.append("")
+        old_points = new_points(values[punctaj_idx], 0)
+        points = new_points(old_points, amount, mode)
+        values[punctaj_idx] = str(points)
+        tree.item(item, values=tuple(values))
+        changes.append({"row": dict(zip(columns, values)), "old": old_points, "new": points})
+    
+    # 2. LOCAL - o singură scriere atomică (doar PUNCTAJ / ULTIMA_MOD pe rândurile atinse)
+    file_path = institution_path(city, institution)
+    if not LOCAL_STORE.exists(city, institution):
+        # Fișier local lipsă: salvare completă ca înainte
+        save_institution(city, institution, tree, update_timestamp=True, updated_items=list(items), skip_logging=True)
+        return changes
+    if LOCAL_STORE.backend == "sqlite":
+        # UPDATE doar pe rândurile atinse, oglinda JSON în fundal
+        inst_data, touched = apply_points_changes_to_store(LOCAL_STORE, city, institution, changes)
+        mirror_institution_json(city, institution)
+    else:
+        inst_data, touched = apply_points_changes(file_path, changes)
+    indexed_rows = [dict(row) for row in touched]
+    SEARCH_INDEX_QUEUE.submit(lambda: SEARCH_INDEX.update_rows(city, institution, indexed_rows))
+    log_json_action(file_path, "edit", {
+        "rows_count": len(inst_data.get("rows", [])) or len(tree.get_children()),
+        "updated_items": len(changes),
+        "version": inst_data.get("version")
+    })
+    
+    # Lista de rânduri din memorie (folosită de căutare)
+    all_rows = getattr(tree, "all_rows", None)
+    if all_rows is not None:
+        positions = {}
+        for index, existing in enumerate(all_rows):
+            if isinstance(existing, dict):
+                for field in ("DISCORD", "NUME IC"):
+                    if existing.get(field):
+                        positions.setdefault((field, str(existing[field])), index)
+        for row in touched:
+            index = next((positions[(f, str(row[f]))] for f in ("DISCORD", "NUME IC")
+                          if row.get(f) and (f, str(row[f])) in positions), None)
+            if index is not None:
+                all_rows[index] = dict(all_rows[index], PUNCTAJ=row["PUNCTAJ"], ULTIMA_MOD=row["ULTIMA_MOD"])
+    
+    update_info_label(city, institution)
+    sort_tree_by_punctaj(tree)
+    
+    # 3. AUDIT + CLOUD - în fundal, un lot de loguri + un upsert delta
+    action = f"{'Adăugare' if mode == 'add' else 'Scădere'} {amount} puncte"
+    log_job = None
+    if ACTION_LOGGER:
+        discord_id = DISCORD_AUTH.get_discord_id() if DISCORD_AUTH else "unknown"
+        discord_username = DISCORD_AUTH.user_info.get('username', discord_id) if DISCORD_AUTH and DISCORD_AUTH.user_info else discord_id
+        log_changes = [{
+            "employee_name": change["row"].get("NUME IC") or str(change["row"].get(columns[0], "Unknown")),
+            "old_points": change["old"],
+            "new_points": change["new"],
+            "entity_id": change["row"].get("DISCORD", ""),
+        } for change in changes]
+        logger.debug("📝 EDIT_POINTS LOG: user=%s (%s), %s angajați, city=%s, inst=%s, %s", discord_username, discord_id, len(log_changes), city, institution, action)
+        log_job = lambda: ACTION_LOGGER.log_edit_points_bulk(
+            discord_id, city, institution, log_changes, action, discord_username=discord_username
+        )
+    else:
+        logger.warning("⚠️ ACTION_LOGGER is None - cannot log points edit")
+    
+    upload_job = None
+    if SUPABASE_EMPLOYEE_MANAGER_AVAILABLE:
+        institution_id = inst_data.get("institution_id")
+        delta_rows = [dict(row) for row in touched]
+        
+        def upload_job():
+            inst_id = institution_id
+            if not inst_id:
+                inst_id = SUPABASE_EMPLOYEE_MANAGER.resolve_institution_id(city, institution)
+            result = upload_points_delta(SUPABASE_EMPLOYEE_MANAGER, inst_id, delta_rows)
+            uploaded = [row for row in delta_rows if row not in result["unmatched"]]
+            if result["uploaded"] >= len(uploaded):
+                # Doar scrierile ajunse în cloud pot avea ecou
+                LOCAL_REVISIONS.record(city, institution, uploaded)
+            if result["unmatched"]:
+                # Angajați care nu există încă în cloud: sincronizare completă (ca înainte)
+                logger.warning("⚠️ %s angajați fără ID Supabase - sincronizare completă", len(result['unmatched']))
+                supabase_upload(city, institution, LOCAL_STORE.load(city, institution), file_path)
+            return result
+    
+    store = LOCAL_STORE
+    
+    def on_done(result):
+        expected = len(changes) - len(result.get("unmatched") or [])
+        if result.get("error") or result.get("uploaded", 0) < expected:
+            # Rândurile rămân în pending_sync_rows - urcate cu următoarea salvare / la pornire
+            keys = [list(row_key(change["row"])) for change in changes]
+            REALTIME_UI_HANDOFF.submit(_record_upload_result, store, city, institution, keys, False, False, {})
+        REALTIME_UI_HANDOFF.submit(_show_points_cloud_status, city, institution, result,
+                                   key=("points_cloud", city, institution))
+    
+    queue_points_cloud_sync(log_job, upload_job, on_done if upload_job else None)
+    return changes
+
+
+def _show_points_cloud_status(city, institution, result):
+    """Confirmarea din cloud pentru bulk_points_edit (thread-ul Tkinter)"""
+    if city not in tabs or institution not in tabs[city]["info_frames"]:
+        return
+    info_label = tabs[city]["info_frames"][institution]
+    text = info_label.cget("text").split(" | ")[0]
+    if result.get("error"):
+        logger.warning("⚠️ Points upload failed for %s/%s: %s", city, institution, result['error'])
+        info_label.config(text=f"{text} | ⚠️ Cloud: eroare (se reîncearcă la următoarea salvare)")
+    else:
+        logger.info("✅ Points upload: %s angajați → Supabase (%s/%s)", result.get('uploaded', 0), city, institution)
+        info_label.config(text=f"{text} | ☁️ Sincronizat: {result.get('uploaded', 0)} angajați")
+
+
 def add_points(tree, city, institution):
     sel = tree.selection()
     if not sel:
@@ -6517,47 +6577,7 @@ def add_points(tree, city, institution):
     if value is None:
         return
 
-    columns = tree.columns
-    for item in sel:
-        old_values = tree.item(item, "values")
-        values = list(old_values)
-        
-        # Găsește indexul PUNCTAJ
-        if "PUNCTAJ" in columns:
-            punctaj_idx = columns.index("PUNCTAJ")
-            old_points = int(values[punctaj_idx]) if punctaj_idx < len(values) else 0
-            new_points = old_points + value
-            values[punctaj_idx] = str(new_points)
-            
-            tree.item(item, values=tuple(values))
-            
-            # ===== ACTION LOGGING =====
-            if ACTION_LOGGER:
-                try:
-                    employee_name = str(values[0]) if values else "Unknown"
-                    discord_id = DISCORD_AUTH.get_discord_id() if DISCORD_AUTH else "unknown"
-                    discord_username = DISCORD_AUTH.user_info.get('username', discord_id) if DISCORD_AUTH else "unknown"
-                    entity_id = values[len(values)-1] if len(values) > 0 else ""  # Get NUME_IC if available
-                    print(f"📝 ADD_POINTS LOG: user={discord_username} ({discord_id}), employee={employee_name}, city={city}, inst={institution}, points={old_points}→{new_points}")
-                    ACTION_LOGGER.log_edit_points(
-                        discord_id,
-                        city,
-                        institution,
-                        employee_name,
-                        old_points,
-                        new_points,
-                        f"Adăugare {new_points - old_points} puncte",
-                        discord_username=discord_username,
-                        entity_id=entity_id
-                    )
-                except Exception as e:
-                    print(f"⚠️ Error logging add_points action: {e}")
-                    import traceback
-                    traceback.print_exc()
-            else:
-                print(f"⚠️ ACTION_LOGGER is None - cannot log add_points")
-
-    save_institution(city, institution, tree, update_timestamp=True, updated_items=list(sel), skip_logging=True)
+    bulk_points_edit(tree, city, institution, list(sel), value, mode="add")
 
 def remove_points(tree, city, institution):
     sel = tree.selection()
@@ -6569,47 +6589,7 @@ def remove_points(tree, city, institution):
     if value is None:
         return
 
-    columns = tree.columns
-    for item in sel:
-        old_values = tree.item(item, "values")
-        values = list(old_values)
-        
-        # Găsește indexul PUNCTAJ
-        if "PUNCTAJ" in columns:
-            punctaj_idx = columns.index("PUNCTAJ")
-            old_points = int(values[punctaj_idx]) if punctaj_idx < len(values) else 0
-            new_points = max(0, old_points - value)
-            values[punctaj_idx] = str(new_points)
-            
-            tree.item(item, values=tuple(values))
-            
-            # ===== ACTION LOGGING =====
-            if ACTION_LOGGER:
-                try:
-                    employee_name = str(values[0]) if values else "Unknown"
-                    discord_id = DISCORD_AUTH.get_discord_id() if DISCORD_AUTH else "unknown"
-                    discord_username = DISCORD_AUTH.user_info.get('username', discord_id) if DISCORD_AUTH else "unknown"
-                    entity_id = values[len(values)-1] if len(values) > 0 else ""  # Get NUME_IC if available
-                    print(f"📝 REMOVE_POINTS LOG: user={discord_username} ({discord_id}), employee={employee_name}, city={city}, inst={institution}, points={old_points}→{new_points}")
-                    ACTION_LOGGER.log_edit_points(
-                        discord_id,
-                        city,
-                        institution,
-                        employee_name,
-                        old_points,
-                        new_points,
-                        f"Scădere {old_points - new_points} puncte",
-                        discord_username=discord_username,
-                        entity_id=entity_id
-                    )
-                except Exception as e:
-                    print(f"⚠️ Error logging remove_points action: {e}")
-                    import traceback
-                    traceback.print_exc()
-            else:
-                print(f"⚠️ ACTION_LOGGER is None - cannot log remove_points")
-
-    save_institution(city, institution, tree, update_timestamp=True, updated_items=list(sel), skip_logging=True)
+    bulk_points_edit(tree, city, institution, list(sel), value, mode="remove")
 
 # ================== LEGARE BUTOANE ==================
 btn_add_tab.config(command=add_tab)
@@ -6683,23 +6663,26 @@ def build_structure_for_view():
 
 
 # ================== AUTO-REFRESH ACTIVE INSTITUTION TABLE ==================
-def refresh_active_institution_table():
+def refresh_active_institution_table(only=None):
     """
     🔄 AUTO-REFRESH ACTIVE TABLE - Reîncarcă tabelul instituției curente după sincronizare cloud
     
     Aceasta funcție este apelată de RealTimeSyncManager după fiecare descărcare din cloud
     pentru a actualiza automat interfața cu noile date
+    only: [(city, institution)] modificate - tabelul activ se reîncarcă doar dacă e printre ele
     
     NOTE: Aceasta funcție TREBUIE sa fie apelata prin root.after() din Tkinter main thread,
           deoarece RealTimeSyncManager ruleaza in background thread
     """
     try:
-        print("\n🔄 AUTO-REFRESH: Starting active institution table refresh...")
+        logger.debug("🔄 AUTO-REFRESH: Starting active institution table refresh...")
+        # Datele descărcate pot atinge orice instituție - indexul global se reface incremental
+        refresh_search_index()
         
         # Get the currently selected city tab
         current_city_tab = city_notebook.select()
         if not current_city_tab:
-            print("   ℹ️ No city tab selected - skipping refresh")
+            logger.debug("ℹ️ No city tab selected - skipping refresh")
             return
         
         # Get city name from tab text
@@ -6710,25 +6693,25 @@ def refresh_active_institution_table():
                 break
         
         if not current_city:
-            print("   ⚠️ Could not determine current city name")
+            logger.warning("⚠️ Could not determine current city name")
             return
         
-        print(f"   📍 Active city: {current_city}")
+        logger.debug("📍 Active city: %s", current_city)
         
         # Get the institution notebook for this city
         if current_city not in tabs:
-            print(f"   ⚠️ City '{current_city}' not found in tabs")
+            logger.warning("⚠️ City '%s' not found in tabs", current_city)
             return
         
         inst_nb = tabs[current_city].get("nb")
         if not inst_nb:
-            print(f"   ⚠️ No institution notebook for {current_city}")
+            logger.warning("⚠️ No institution notebook for %s", current_city)
             return
         
         # Get currently selected institution tab
         current_inst_tab = inst_nb.select()
         if not current_inst_tab:
-            print("   ℹ️ No institution tab selected in this city - skipping refresh")
+            logger.debug("ℹ️ No institution tab selected in this city - skipping refresh")
             return
         
         # Get institution name from tab text
@@ -6739,87 +6722,223 @@ def refresh_active_institution_table():
                 break
         
         if not current_institution:
-            print("   ⚠️ Could not determine current institution name")
+            logger.warning("⚠️ Could not determine current institution name")
             return
         
-        print(f"   🏢 Active institution: {current_institution}")
+        logger.debug("🏢 Active institution: %s", current_institution)
+        
+        if only is not None and (current_city, current_institution) not in set(map(tuple, only)):
+            logger.debug("ℹ️ %s/%s nemodificat de sync - skipping refresh", current_city, current_institution)
+            return
         
         # Get the treeview for this institution
         if current_institution not in tabs[current_city]["trees"]:
-            print(f"   ⚠️ Tree not found for {current_institution}")
+            logger.warning("⚠️ Tree not found for %s", current_institution)
             return
         
         tree = tabs[current_city]["trees"][current_institution]
+        # Editările locale încă nescrise ar fi pierdute de reîncărcare
+        SAVE_COORDINATOR.flush((current_city, current_institution))
         
         # 📤 RELOAD DATA - Load fresh data from local JSON (which was just synced from cloud)
-        print(f"   📥 Loading fresh data from cloud for {current_city}/{current_institution}...")
+        logger.debug("📥 Loading fresh data from cloud for %s/%s...", current_city, current_institution)
         inst_data = load_institution(current_city, current_institution)
+        revision = inst_data.get("local_revision")
+        if revision and revision == getattr(tree, "local_revision", None):
+            # Fișierul e exact ce am scris noi (ecou prin sync / realtime) - tabelul e deja la zi
+            logger.debug("ℹ️ %s/%s: ecou propriu (%s) - skipping refresh", current_city, current_institution, revision)
+            return True
         
         # 🔧 FOLOSEȘTE COLOANELE DIN JSON, NU CELE VECHI DIN TREE!
-        saved_columns = inst_data.get("columns", tree.columns)
+        saved_columns = list(inst_data.get("columns", tree.columns))
         rows = inst_data.get("rows", [])
+        logger.debug("✅ Loaded %s rows for %s", len(rows), current_institution)
         
-        # 🔄 RECONFIGUREAZĂ TREE CU COLOANELE CORECTE
-        if list(tree.columns) != saved_columns:
-            print(f"   🔧 Reconfiguring tree columns: {tree.columns} → {saved_columns}")
-            tree.configure(columns=saved_columns)
-            
-            # Configurează headings pentru coloanele noi
-            for col in saved_columns:
-                if col not in tree.columns or not tree.heading(col)['text']:
-                    tree.heading(col, text=col.upper(), anchor="center")
-                    # Setează width-uri pentru coloanele cunoscute
-                    if col == "PUNCTAJ":
-                        width = 80
-                    else:
-                        width = 120
-                    tree.column(col, anchor="center", width=width)
-        
-        print(f"   ✅ Loaded {len(rows)} rows for {current_institution}")
-        
-        # ♻️ REFRESH TREEVIEW - Clear and repopulate with new data
-        print(f"   🔄 Refreshing treeview with new data...")
-        tree.delete(*tree.get_children())
-        
-        # Folosește saved_columns în loc de columns
-        for row in rows:
-            if isinstance(row, dict):
-                values = tuple(row.get(col, "") for col in saved_columns)
-            else:
-                values = tuple(row) if isinstance(row, (list, tuple)) else (row,)
-            tree.insert("", tk.END, values=values)
-        
-        # ⏱️ UPDATE INFO LABEL
-        update_info_label(current_city, current_institution)
-        
-        # 📊 RE-SORT BY PUNCTAJ
-        sort_tree_by_punctaj(tree)
-        
-        print(f"✅ AUTO-REFRESH COMPLETE: {current_city}/{current_institution} refreshed with cloud data!")
+        changes = apply_rows_to_tree(tree, current_city, current_institution, saved_columns, rows)
+        if getattr(tree, "echo_rows_skipped", 0):
+            # Fișierul are încă valorile vechi ale ecoului: tabelul (mai nou) se scrie înapoi,
+            # iar revizia o setează scrierea - nu o adoptăm pe cea din fișier
+            SAVE_COORDINATOR.request((current_city, current_institution), tree, skip_logging=True)
+        else:
+            tree.local_revision = revision
+        if changes:
+            # ⏱️ UPDATE INFO LABEL
+            update_info_label(current_city, current_institution)
+            logger.info("✅ AUTO-REFRESH COMPLETE: %s/%s - %s rânduri schimbate din cloud", current_city, current_institution, changes)
+        else:
+            logger.debug("ℹ️ %s/%s: nicio schimbare reală - tabel neatins", current_city, current_institution)
         return True
         
     except Exception as e:
-        print(f"❌ AUTO-REFRESH ERROR: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("❌ AUTO-REFRESH ERROR: %s", e)
         return False
 
 
-def _refresh_active_table_from_sync():
+def apply_rows_to_tree(tree, city, institution, columns, rows):
+    """
+    ♻️ Aduce tabelul la rows fără redesenare completă
+    Doar rândurile schimbate sunt actualizate / inserate / șterse; rândurile care repetă
+    o scriere mai veche de-a noastră (ecou întârziat) sunt ignorate și numărate în
+    tree.echo_rows_skipped. Selecția și poziția de scroll rămân. Returnează numărul de
+    rânduri schimbate.
+    """
+    selected = {row_key(dict(zip(tree.columns, tree.item(item, "values")))) for item in tree.selection()}
+    top = tree.yview()[0]
+    
+    # 🔄 RECONFIGUREAZĂ TREE CU COLOANELE CORECTE (valorile existente nu mai corespund)
+    if list(tree.columns) != columns:
+        logger.debug("🔧 Reconfiguring tree columns: %s → %s", tree.columns, columns)
+        tree.delete(*tree.get_children())
+        tree.configure(columns=columns)
+        tree.columns = columns
+        for col in columns:
+            tree.heading(col, text=col.upper(), anchor="center")
+            tree.column(col, anchor="center", width=80 if col == "PUNCTAJ" else 120)
+    
+    current = [(item, tree.item(item, "values")) for item in tree.get_children()]
+    plan = plan_row_updates(current, columns, rows)
+    updates, echoes = [], {}
+    for item, values, row in plan["update"]:
+        if LOCAL_REVISIONS.is_echo(city, institution, row):
+            echoes[row_key(row)] = dict(zip(columns, tree.item(item, "values")))
+        else:
+            updates.append((item, values))
+    tree.echo_rows_skipped = len(echoes)
+    if echoes:
+        logger.debug("ℹ️ %s/%s: %s rânduri ignorate (ecou al unei salvări mai vechi)",
+                     city, institution, len(echoes))
+    
+    for item, values in updates:
+        tree.item(item, values=values)
+    for values, _ in plan["insert"]:
+        tree.insert("", tk.END, values=values)
+    if plan["delete"]:
+        tree.delete(*plan["delete"])
+    changes = len(updates) + len(plan["insert"]) + len(plan["delete"])
+    if not changes:
+        return 0
+    
+    # Lista de rânduri din memorie (căutare) - aceeași listă, actualizată pe loc;
+    # rândurile de ecou ignorate rămân cu valorile din tabel, nu cu cele (mai vechi) din fișier
+    all_rows = getattr(tree, "all_rows", None)
+    if all_rows is not None:
+        kept = {row_key(row): row for row in all_rows if isinstance(row, dict) and row_key(row) in echoes}
+        merged = []
+        for row in rows:
+            row = row if isinstance(row, dict) else dict(zip(columns, row))
+            key = row_key(row)
+            merged.append(dict(kept.get(key, {}), **echoes[key]) if key in echoes else row)
+        all_rows[:] = merged
+    
+    # 📊 RE-SORT BY PUNCTAJ, apoi selecția și scroll-ul de dinainte
+    sort_tree_by_punctaj(tree)
+    if selected:
+        keep = [item for item in tree.get_children()
+                if row_key(dict(zip(columns, tree.item(item, "values")))) in selected]
+        tree.selection_set(keep)
+    tree.yview_moveto(top)
+    return changes
+
+
+def _refresh_active_table_from_sync(only=None):
     """
     🔄 WRAPPER for thread-safe UI refresh from sync manager
     
-    Apelata de RealTimeSyncManager din background thread.
+    Apelata de RealTimeSyncManager / MultiDeviceSyncManager din background thread.
     Trebuie sa inregistreze cu root.after() pentru a rula in Tkinter main thread
+    only: instituțiile schimbate de sync (None = reîncarcă oricum tabelul activ)
     """
     try:
         # Schedule refresh in main Tkinter thread
-        root.after(0, refresh_active_institution_table)
+        root.after(0, lambda: refresh_active_institution_table(only))
     except Exception as e:
         print(f"❌ Error scheduling refresh: {e}")
 
 
 
+def apply_realtime_patch(patch, resort=True):
+    """
+    ⚡ Aplică un singur rând venit prin realtime (RealtimeApplyEngine) în tabelul vizibil
+    Fără re-descărcare: modifică doar rândul din Treeview și lista folosită la căutare
+    """
+    city, institution = patch["city"], patch["institution"]
+    tree = tabs.get(city, {}).get("trees", {}).get(institution)
+    if tree is None:
+        return  # Tab neîncărcat - fișierul local e deja actualizat
+    
+    columns = list(tree.columns)
+    row, previous = patch["row"], patch.get("previous")
+    match = previous or row
+    
+    # Rândul din Treeview (potrivire după DISCORD, apoi NUME IC)
+    target_item = None
+    for field in ("DISCORD", "NUME IC"):
+        if field not in columns or not match.get(field):
+            continue
+        idx = columns.index(field)
+        for item in tree.get_children():
+            values = tree.item(item, "values")
+            if idx < len(values) and str(values[idx]) == str(match[field]):
+                target_item = item
+                break
+        if target_item:
+            break
+    
+    if patch["action"] == "delete":
+        if target_item:
+            tree.delete(target_item)
+    else:
+        values = tuple(row.get(col, "") for col in columns)
+        if target_item:
+            tree.item(target_item, values=values)
+        else:
+            tree.insert("", tk.END, values=values)
+    
+    # Lista de rânduri din memorie (folosită de căutare)
+    all_rows = getattr(tree, "all_rows", None)
+    if all_rows is not None:
+        for index, existing in enumerate(all_rows):
+            if isinstance(existing, dict) and any(
+                    match.get(f) and str(existing.get(f, "")) == str(match[f]) for f in ("DISCORD", "NUME IC")):
+                if patch["action"] == "delete":
+                    del all_rows[index]
+                else:
+                    all_rows[index] = row
+                break
+        else:
+            if patch["action"] != "delete":
+                all_rows.append(row)
+    
+    if resort:
+        sort_tree_by_punctaj(tree)
+
+
+def _resort_realtime_tree(city, institution):
+    tree = tabs.get(city, {}).get("trees", {}).get(institution)
+    if tree is not None:
+        sort_tree_by_punctaj(tree)
+
+
+# Un singur root.after per rafală de evenimente realtime (nu unul per rând)
+REALTIME_UI_HANDOFF = MainThreadHandoff(lambda fn: root.after(0, fn))
+
+
+def _on_realtime_patch(patch):
+    """Apelată din thread-ul realtime - trimite patch-ul în thread-ul Tkinter"""
+    city, institution = patch["city"], patch["institution"]
+    previous, row = patch.get("previous"), patch["row"]
+    if patch["action"] == "delete":
+        SEARCH_INDEX_QUEUE.submit(lambda: SEARCH_INDEX.remove_rows(city, institution, [previous or row]))
+    else:
+        def reindex_row():
+            if previous:
+                SEARCH_INDEX.remove_rows(city, institution, [previous])
+            SEARCH_INDEX.update_rows(city, institution, [row])
+        SEARCH_INDEX_QUEUE.submit(reindex_row)
+    REALTIME_UI_HANDOFF.submit(apply_realtime_patch, patch, False)
+    REALTIME_UI_HANDOFF.submit(_resort_realtime_tree, city, institution, key=("sort", city, institution))
+
+
 # ================== AUTO-ÎNCĂRCARE ORAȘE / INSTITUȚII ==================
 def load_existing_tables():
     """Încarcă automat toate orașele și instituțiile cu noua vizualizare organizată"""
@@ -6859,32 +6978,22 @@ def load_existing_tables():
         if can_view_city:
             frame = create_city_ui(city)
             city_notebook.select(frame)
+    
+    refresh_search_index()
 
 
 def punctaj_cu_selectie(tree, city, institution, mode="add"):
+    # Coloana PUNCTAJ e obligatorie: bulk_points_edit (fișier, SQLite, cloud) lucrează doar pe ea
+    if "PUNCTAJ" not in tree.columns:
+        messagebox.showerror("Eroare", "Nu găsesc coloana PUNCTAJ!\n\nModificarea în lot funcționează doar pe coloana PUNCTAJ.")
+        return
+    numeric_col = "PUNCTAJ"
+
     win = tk.Toplevel(root)
     win.title("Adaugă/Șterge valori" if mode == "add" else "Șterge valori")
     win.geometry("600x750")
     win.grab_set()
 
-    # Detectează coloana PUNCTAJ (obligatorie)
-    numeric_col = None
-    columns = tree.columns
-    
-    # Caută exact "PUNCTAJ"
-    if "PUNCTAJ" in columns:
-        numeric_col = "PUNCTAJ"
-    else:
-        # Fallback pe alte coloane numerice
-        for col in columns:
-            if col.upper() in ["PUNCTAJ", "VALOARE", "SCOR"]:
-                numeric_col = col
-                break
-    
-    if not numeric_col:
-        messagebox.showwarning("Eroare", "Nu găsesc coloana PUNCTAJ!")
-        return
-
     # Variabile pentru locație
     locatie_var = tk.StringVar(value="")
     
@@ -6999,92 +7108,10 @@ def punctaj_cu_selectie(tree, city, institution, mode="add"):
             )
             return
 
-        # Definim columns înainte de a fi folosit
-        columns = list(tree.columns)
-        
-        # Simplificat: Nu mai adăugăm coloane automat pentru NR_ACTIUNI sau ZONA
-
-        col_idx = columns.index(numeric_col)
-        
-        for item in selectati:
-            values = list(tree.item(item, "values"))
-            try:
-                current = int(values[col_idx]) if col_idx < len(values) else 0
-            except (ValueError, IndexError):
-                current = 0
-            
-            if mode == "add":
-                nou = current + valoare
-            else:
-                nou = max(0, current - valoare)
-
-            values[col_idx] = str(nou)
-            
-            # Ajustează lungimea values la numărul de coloane
-            while len(values) < len(columns):
-                values.append("")
-            
-            # Simplu: doar actualizăm punctajul, fără logică de acțiuni sau zone
-            tree.item(item, values=tuple(values))
-
-        save_institution(city, institution, tree, update_timestamp=True, updated_items=selectati, skip_logging=True)
-        
-        # Închide fereastra imediat după salvare
+        # Închide fereastra imediat - UI-ul se actualizează local, cloud-ul în fundal
         win.destroy()
         
-        # ===== ACTION LOGGING for punctaj_cu_selectie =====
-        if ACTION_LOGGER and selectati:
-            try:
-                discord_id = DISCORD_AUTH.get_discord_id() if DISCORD_AUTH else "unknown"
-                discord_username = DISCORD_AUTH.user_info.get('username', discord_id) if DISCORD_AUTH else "unknown"
-                
-                for item in selectati:
-                    values = list(tree.item(item, "values"))
-                    employee_name = values[0] if values else "Unknown"
-                    col_idx = columns.index(numeric_col)
-                    
-                    # Get current value (after edit)
-                    current_val = str(values[col_idx]) if col_idx < len(values) else "0"
-                    # Calculate old value
-                    if mode == "add":
-                        old_val = str(int(current_val) - valoare) if current_val.isdigit() else "0"
-                    else:
-                        old_val = str(int(current_val) + valoare) if current_val.isdigit() else "0"
-                    
-                    entity_id = values[-1] if values else ""  # Get DISCORD column
-                    
-                    # Creează mesaj descriptiv pentru log
-                    punctaj_operation = f"{'Adăugare' if mode == 'add' else 'Scădere'} {valoare} puncte"
-                    
-                    ACTION_LOGGER.log_edit_points(
-                        discord_id,
-                        city,
-                        institution,
-                        employee_name,
-                        old_val,
-                        current_val,
-                        punctaj_operation,  # Este parametrul 'action'
-                        discord_username=discord_username,
-                        entity_id=entity_id
-                    )
-            except Exception as e:
-                print(f"⚠️ Error logging punctaj_cu_selectie: {e}")
-                import traceback
-                traceback.print_exc()
-        
-        update_info_label(city, institution)
-        sort_tree_by_punctaj(tree)
-        
-        # 📊 SYNC CU RAPORTUL DE ACȚIUNI - dacă au fost adăugate acțiuni
-        if is_police_institution and mode == "add" and action and selectati:
-            try:
-                print(f"📊 Sincronizez cu raportul de acțiuni pentru {len(selectati)} angajați...")
-                # Trigger manual recalc pentru raportul de acțiuni 
-                # (în caz că trigger-ul Supabase nu e încă activ)
-
-                print(f"   ✅ Acțiunea '{action}' la '{locatie}' adăugată pentru {len(selectati)} angajați")
-            except Exception as e:
-                print(f"⚠️ Error syncing actions report: {e}")
+        bulk_points_edit(tree, city, institution, selectati, valoare, mode=mode)
         
         tree.selection_set(selectati)
         if selectati:
@@ -7390,7 +7417,7 @@ def force_multi_device_sync():
             
             # Refresh current view if any table is open
             try:
-                _refresh_active_table_from_sync()
+                _refresh_active_table_from_sync(sync_result['police_data'].get('changed', []))
             except:
                 pass
             
@@ -7823,7 +7850,11 @@ initialize_cloud_sync()
 # Încarcă orașele după sincronizare și după ce Discord section e actualizat
 root.after(1000, load_existing_tables)
 
-# Aplică tema RDR pe toți widget-urile
-root.after(500, lambda: apply_theme_to_children(root))
+# Upload-urile eșuate în sesiunea anterioară (pending_sync) - reîncercate o dată la pornire
+if SUPABASE_EMPLOYEE_MANAGER_AVAILABLE:
+    root.after(1500, lambda: APP_SCHEDULER.run_soon("pending_sync_retry", retry_pending_uploads))
+
+# Aplică tema RDR pe widget-urile cu culori explicite (o trecere; reapelurile ating doar widget-uri noi)
+root.after(500, lambda: logger.debug("🎨 Theme pass: %s", apply_theme_to_children(root)))
 
 root.mainloop()
@@ -1,9 +1,12 @@
 # -*- mode: python ; coding: utf-8 -*-
 from PyInstaller.utils.hooks import collect_all
 
-datas = [('d:\\punctaj\\supabase_config.ini', '.'), ('d:\\punctaj\\discord_config.ini', '.')]
+datas = [('d:\\punctaj\\supabase_config.ini', '.'), ('d:\\punctaj\\discord_config.ini', '.'), ('d:\\punctaj\\logging_config.ini', '.')]
 binaries = []
-hiddenimports = ['tkinter', 'requests', 'cryptography', 'cv2', 'PIL', 'configparser']
+hiddenimports = ['tkinter', 'requests', 'cryptography', 'configparser']
+# Modules imported on first use via lazy_imports.lazy() - invisible to the static analysis
+hiddenimports += ['cloud_sync_manager', 'backup_manager', 'admin_ui', 'admin_panel', 'permission_sync_fix',
+                  'multi_device_sync_manager', 'realtime_sync', 'organization_view', 'git']
 tmp_ret = collect_all('tkinter')
 datas += tmp_ret[0]; binaries += tmp_ret[1]; hiddenimports += tmp_ret[2]
 tmp_ret = collect_all('requests')
@@ -0,0 +1,84 @@
+# -*- mode: python ; coding: utf-8 -*-
+# Fast-start build profile (onedir)
+#
+#   pyinstaller punctaj_fast.spec  ->  dist/punctaj/punctaj.exe
+#
+# Differences from punctaj.spec (onefile + UPX):
+#   - onedir: no extraction to %TEMP% on every launch; the files stay next to the exe
+#   - upx=False: no decompression of every DLL/pyd at load time
+#   - no collect_all('tkinter') / collect_all('requests'): the standard hooks already pick
+#     what is imported; cv2 / PIL are never imported by the app and are excluded
+#   - optional subsystems are imported on first use (lazy_imports.lazy) -> listed below
+#
+# Startup budget: bench_startup_imports.py (STARTUP_IMPORT_BUDGET_MS)
+import os
+
+ROOT = SPECPATH
+
+datas = [
+    (os.path.join(ROOT, 'supabase_config.ini'), '.'),
+    (os.path.join(ROOT, 'discord_config.ini'), '.'),
+    (os.path.join(ROOT, 'logging_config.ini'), '.'),
+]
+
+# Modules imported on first use via lazy_imports.lazy() - invisible to the static analysis
+LAZY_MODULES = [
+    'cloud_sync_manager',
+    'backup_manager',
+    'admin_ui',
+    'admin_panel',
+    'permission_sync_fix',
+    'multi_device_sync_manager',
+    'realtime_sync',
+    'organization_view',
+    'git',
+]
+
+hiddenimports = ['tkinter', 'tkinter.ttk', 'requests', 'cryptography', 'configparser'] + LAZY_MODULES
+
+# Heavy packages the app never imports (pulled in only by other packages' hooks)
+excludes = ['cv2', 'PIL', 'numpy', 'pandas', 'matplotlib', 'scipy', 'IPython', 'pytest']
+
+
+a = Analysis(
+    [os.path.join(ROOT, 'punctaj.py')],
+    pathex=[ROOT],
+    binaries=[],
+    datas=datas,
+    hiddenimports=hiddenimports,
+    hookspath=[],
+    hooksconfig={},
+    runtime_hooks=[],
+    excludes=excludes,
+    noarchive=False,
+    optimize=0,
+)
+pyz = PYZ(a.pure)
+
+exe = EXE(
+    pyz,
+    a.scripts,
+    [],
+    exclude_binaries=True,
+    name='punctaj',
+    debug=False,
+    bootloader_ignore_signals=False,
+    strip=False,
+    upx=False,
+    console=False,
+    disable_windowed_traceback=False,
+    argv_emulation=False,
+    target_arch=None,
+    codesign_identity=None,
+    entitlements_file=None,
+)
+
+coll = COLLECT(
+    exe,
+    a.binaries,
+    a.datas,
+    strip=False,
+    upx=False,
+    upx_exclude=[],
+    name='punctaj',
+)
@@ -8,6 +8,7 @@ import os
 import sys
 import tkinter as tk
 from tkinter import ttk, messagebox, scrolledtext
+import shlex
 import subprocess
 import threading
 import time
@@ -17,6 +18,8 @@ import configparser
 import requests
 from pathlib import Path
 
+from delta_updater import DeltaUpdater, UpdateError, load_update_config
+
 # Versiune
 VERSION = "2.0.0"
 APP_NAME = "Punctaj Git Pull"
@@ -61,6 +64,10 @@ class PunctajUpdater:
             # Dacă rulezi direct .py din punctaj/
             self.repo_path = current_dir
         
+        # Canal delta (update_config.ini) - fără git pe calculatorul utilizatorului
+        self.update_config = load_update_config(self.repo_path)
+        self.delta_url = self.update_config["url"]
+        
         # Status aplicație punctaj
         self.punctaj_running = False
         
@@ -327,8 +334,7 @@ class PunctajUpdater:
             self.log(f"Executând: {command}", "CMD")
             
             result = subprocess.run(
-                command,
-                shell=True,
+                shlex.split(command),
                 cwd=cwd,
                 capture_output=True,
                 text=True,
@@ -360,6 +366,18 @@ class PunctajUpdater:
         self.log("Începând verificările de sistem...")
         self.update_status("Verificând sistemul...")
         
+        # Canal delta configurat - git nu mai e necesar
+        if self.delta_url:
+            self.status_labels["git_status"].config(
+                text=f"🔗 Canal actualizări: ✅ {self.delta_url}",
+                fg=self.colors["success"]
+            )
+            self.log(f"Canal delta activ: {self.delta_url}")
+            self.check_punctaj_app()
+            self.check_config_files()
+            self.update_status("Sistem verificat - Gata pentru actualizări")
+            return
+        
         # Verifică git status
         success, _ = self.run_git_command("git status --porcelain")
         if success:
@@ -428,6 +446,74 @@ class PunctajUpdater:
                 fg=self.colors["warning"]
             )
     
+    def make_delta_updater(self):
+        """DeltaUpdater pentru folderul aplicației (log în jurnalul UI)"""
+        return DeltaUpdater(
+            self.delta_url,
+            self.repo_path,
+            workers=self.update_config["workers"],
+            timeout=self.update_config["timeout"],
+            log=self.log,
+        )
+    
+    def check_delta_updates(self):
+        """Compară manifestul canalului cu fișierele locale (doar hash-uri, fără descărcare)"""
+        self.update_progress(10, "Descărcând manifestul...")
+        plan = self.make_delta_updater().plan()
+        self.update_progress(100, "Verificare completă")
+        
+        if plan.up_to_date:
+            self.log(f"Aplicația este la zi (versiunea {plan.version})")
+            messagebox.showinfo("✅ La Zi", f"🛡️ Aplicația Punctaj este deja la versiunea {plan.version}!")
+            return
+        
+        self.log(f"Versiunea {plan.version}: {len(plan.changed)} fișiere modificate, "
+                 f"{len(plan.removed)} șterse ({plan.download_bytes / 1024:.1f} KB de descărcat)")
+        for rel in plan.changed[:5]:
+            self.log(f"  • {rel}")
+        if len(plan.changed) > 5:
+            self.log(f"  ... și încă {len(plan.changed) - 5} fișiere")
+        messagebox.showinfo(
+            "🔄 Actualizări Disponibile",
+            f"Versiunea {plan.version} este disponibilă!\n\n"
+            f"📄 {len(plan.changed)} fișiere modificate\n"
+            f"⬇️ {plan.download_bytes / 1024:.1f} KB de descărcat"
+        )
+    
+    def run_delta_update(self):
+        """Descarcă doar fișierele modificate, verifică sha256 și le înlocuiește atomic (cu rollback)"""
+        self.log("🚀 Începând actualizarea din canalul delta...", "INFO")
+        self.update_progress(10, "Comparând fișierele locale...")
+        
+        def on_progress(done, total, rel):
+            self.update_progress(10 + 80 * done / max(total, 1), f"Descărcat {done}/{total}: {rel}")
+        
+        try:
+            result = self.make_delta_updater().update(progress=on_progress)
+        except UpdateError as e:
+            self.update_progress(0, "Actualizare eșuată - fișierele locale au rămas neschimbate")
+            self.log(f"❌ EROARE ACTUALIZARE: {e}", "ERROR")
+            messagebox.showerror("❌ Eroare Actualizare", f"Actualizarea a eșuat!\n\n{e}\n\n"
+                                 f"Fișierele locale au rămas neschimbate.")
+            return
+        
+        if not result.changed and not result.removed:
+            self.update_progress(100, "Deja la zi - nicio actualizare")
+            self.log(f"✅ Aplicația era deja la versiunea {result.version}", "SUCCESS")
+            messagebox.showinfo("✅ La Zi", f"🛡️ Punctaj era deja la versiunea {result.version}!")
+            return
+        
+        self.update_progress(100, f"Actualizat la {result.version}")
+        self.log(f"✅ ACTUALIZARE COMPLETĂ: {len(result.changed)} fișiere, "
+                 f"{result.downloaded_bytes / 1024:.1f} KB descărcați", "SUCCESS")
+        messagebox.showinfo(
+            "🎉 Actualizare Completă",
+            f"✅ Punctaj actualizat la versiunea {result.version}!\n\n"
+            f"📄 {len(result.changed)} fișiere înlocuite\n"
+            f"⬇️ {result.downloaded_bytes / 1024:.1f} KB descărcați\n\n"
+            "🔄 Repornește aplicația Punctaj pentru a folosi noua versiune"
+        )
+    
     def check_updates(self):
         """Verifică actualizări disponibile"""
         if self.is_updating:
@@ -439,6 +525,14 @@ class PunctajUpdater:
             self.update_status("Verificând actualizări...")
             
             try:
+                if self.delta_url:
+                    try:
+                        self.check_delta_updates()
+                    except UpdateError as e:
+                        self.log(f"Eroare canal delta: {e}", "ERROR")
+                        messagebox.showerror("Eroare Conexiune", f"Nu pot verifica actualizările!\n\n{e}")
+                    return
+                
                 self.update_progress(10, "Conectând la repository...")
                 success, _ = self.run_git_command("git fetch origin")
                 
@@ -506,7 +600,35 @@ class PunctajUpdater:
         if self.is_updating:
             return
         
-        # Confirmă actualizarea simplă
+        if self.delta_url:
+            if not messagebox.askyesno(
+                "🔄 Actualizare Punctaj",
+                "Vei actualiza aplicația Punctaj din canalul de actualizări.\n\n"
+                "⚡ Se descarcă DOAR fișierele modificate, verificate prin sha256.\n"
+                "↩️ La orice eroare fișierele anterioare sunt restaurate.\n\n"
+                "Continuă actualizarea?"
+            ):
+                return
+            
+            def delta_thread():
+                self.is_updating = True
+                self.update_button.config(state=tk.DISABLED)
+                self.check_button.config(state=tk.DISABLED)
+                try:
+                    self.run_delta_update()
+                except Exception as e:
+                    self.log(f"Excepție în timpul actualizării: {e}", "ERROR")
+                    messagebox.showerror("Eroare", f"Eroare neașteptată la actualizare:\n{e}")
+                finally:
+                    self.is_updating = False
+                    self.update_button.config(state=tk.NORMAL)
+                    self.check_button.config(state=tk.NORMAL)
+                    self.update_status("gata pentru actualizări")
+            
+            threading.Thread(target=delta_thread, daemon=True).start()
+            return
+        
+        # Confirmă actualizarea simplă (checkout de dezvoltare - git pull)
         if not messagebox.askyesno(
             "🔄 Actualizare Punctaj",
             "Vei actualiza aplicația Punctaj cu ultimele modificări de pe git.\n\n"
@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+"""
+Realtime Apply Engine - applies Supabase employee row events to local state
+Used by SupabaseSync for the employees realtime channel
+
+    event     -> INSERT / UPDATE / DELETE row from the employees table
+    resolve   -> institution_id -> (city, institution) via local JSON files
+    version   -> updated_at per employee id; stale / out-of-order events dropped
+                 (a DELETE carries the last UPDATE's updated_at, so it is applied when >=;
+                 the tombstone then blocks upserts that are not newer)
+    patch     -> one row changed in data/{city}/{institution}.json (atomic write)
+    echo      -> optional echo_filter(city, institution, row): events that only repeat
+                 this app's own writes are dropped before touching the file
+    listeners -> patch dict handed to the UI (Treeview row + in-memory rows)
+
+Patch: {action: 'upsert'|'delete', city, institution, columns, row, previous}
+(previous = the local row before the change, None for an insert)
+"""
+
+import os
+import json
+import logging
+import threading
+from datetime import datetime
+from typing import Callable, Dict, Any, Optional, Tuple, List, Union
+
+from atomic_io import atomic_write_json
+
+logger = logging.getLogger(__name__)
+
+# Supabase employees column -> app column (same mapping as SupabaseEmployeeManager.format_employee_for_app)
+EMPLOYEE_FIELD_MAP = {
+    "discord_username": "DISCORD",
+    "employee_name": "NUME IC",
+    "rank": "RANK",
+    "role": "ROLE",
+    "points": "PUNCTAJ",
+    "id_card_series": "SERIE DE BULETIN",
+    "updated_at": "ULTIMA_MOD",
+}
+
+
+def employee_row_from_record(record: Dict[str, Any]) -> Dict[str, Any]:
+    """App row with only the fields present in the event record"""
+    row = {}
+    if record.get("id") is not None:
+        row["id"] = record["id"]
+    for field, column in EMPLOYEE_FIELD_MAP.items():
+        if field in record:
+            value = record[field]
+            row[column] = (value if value is not None else 0) if column == "PUNCTAJ" else (value or "")
+    return row
+
+
+def parse_version(value) -> Optional[float]:
+    """updated_at (ISO 8601, 'Z' or offset) -> epoch seconds; None if missing/unparseable"""
+    if not value:
+        return None
+    try:
+        text = str(value).replace("Z", "+00:00")
+        moment = datetime.fromisoformat(text)
+        if moment.tzinfo is None:
+            moment = moment.astimezone()
+        return moment.timestamp()
+    except ValueError:
+        return None
+
+
+class RealtimeApplyEngine:
+    """
+    Turns employee row events into targeted local patches
+
+    Usage:
+        engine = RealtimeApplyEngine(lambda: DATA_DIR)
+        engine.add_listener(lambda patch: root.after(0, apply_patch_to_tree, patch))
+        SUPABASE_SYNC.attach_realtime_engine(engine)
+    """
+
+    def __init__(self, data_dir: Union[str, Callable[[], str]],
+                 resolver: Optional[Callable[[Any], Optional[Tuple[str, str]]]] = None,
+                 echo_filter: Optional[Callable[[str, str, Dict[str, Any]], bool]] = None):
+        """
+        Args:
+            data_dir: data folder, or a callable returning it (active server can change)
+            resolver: fallback institution_id -> (city, institution) lookup (e.g. Supabase REST)
+            echo_filter: True for an upsert row that is the echo of our own save (LocalRevisionLog.is_echo)
+        """
+        self._data_dir = data_dir
+        self.resolver = resolver
+        self.echo_filter = echo_filter
+        self._lock = threading.RLock()
+        self._institutions: Dict[str, Tuple[str, str]] = {}
+        self._index_dir = None
+        self._versions: Dict[str, float] = {}
+        self._deleted: Dict[str, float] = {}
+        self._listeners: List[Callable[[Dict[str, Any]], None]] = []
+        self.stats = {"applied": 0, "stale": 0, "unchanged": 0, "unresolved": 0, "errors": 0, "echo": 0}
+
+    @property
+    def data_dir(self) -> str:
+        return self._data_dir() if callable(self._data_dir) else self._data_dir
+
+    def add_listener(self, listener: Callable[[Dict[str, Any]], None]):
+        """listener(patch) is called after each applied patch (from the event thread)"""
+        self._listeners.append(listener)
+
+    # ==================== INSTITUTION INDEX ====================
+
+    def _scan_institutions(self):
+        """institution_id -> (city, institution) from the local JSON files"""
+        index = {}
+        data_dir = self.data_dir
+        if os.path.isdir(data_dir):
+            for city_entry in os.scandir(data_dir):
+                if not city_entry.is_dir():
+                    continue
+                for inst_entry in os.scandir(city_entry.path):
+                    if not (inst_entry.is_file() and inst_entry.name.endswith(".json")):
+                        continue
+                    try:
+                        with open(inst_entry.path, "r", encoding="utf-8") as f:
+                            inst_id = json.load(f).get("institution_id")
+                    except (OSError, ValueError, AttributeError):
+                        continue
+                    if inst_id is not None:
+                        index[str(inst_id)] = (city_entry.name, inst_entry.name[:-5])
+        self._institutions = index
+        self._index_dir = data_dir
+
+    def register_institution(self, institution_id, city: str, institution: str):
+        with self._lock:
+            self._institutions[str(institution_id)] = (city, institution)
+
+    def resolve_institution(self, institution_id) -> Optional[Tuple[str, str]]:
+        if institution_id is None:
+            return None
+        key = str(institution_id)
+        with self._lock:
+            if self._index_dir != self.data_dir:
+                self._scan_institutions()
+            target = self._institutions.get(key)
+            if target is None:
+                # New institution or file written since the last scan
+                self._scan_institutions()
+                target = self._institutions.get(key)
+            if target is None and self.resolver:
+                try:
+                    target = self.resolver(institution_id)
+                except Exception as e:
+                    logger.warning("⚠️ Realtime: could not resolve institution %s: %s", institution_id, e)
+                if target:
+                    self._institutions[key] = target
+            return target
+
+    # ==================== VERSION CHECK ====================
+
+    @staticmethod
+    def _employee_key(record: Dict[str, Any]) -> Optional[str]:
+        if record.get("id") is not None:
+            return f"id:{record['id']}"
+        if record.get("discord_username"):
+            return f"discord:{record.get('institution_id')}:{record['discord_username']}"
+        return None
+
+    def _is_stale(self, key: Optional[str], version: Optional[float], event_type: str = "update") -> bool:
+        if key is None or version is None:
+            return False
+        last = self._versions.get(key)
+        if event_type == "delete":
+            # REPLICA IDENTITY FULL: a DELETE carries the old row, so its updated_at equals
+            # the last UPDATE's - only a delete older than what we have seen is stale
+            return last is not None and version < last
+        if last is not None and version <= last:
+            return True
+        # Tombstone: upserts not newer than the delete must not resurrect the employee
+        deleted_at = self._deleted.get(key)
+        return deleted_at is not None and version <= deleted_at
+
+    # ==================== APPLY ====================
+
+    @staticmethod
+    def _find_row(rows: list, columns: list, row: Dict[str, Any]) -> Optional[int]:
+        """Index of the local row matching by id, then DISCORD, then NUME IC"""
+        for field in ("id", "DISCORD", "NUME IC"):
+            value = row.get(field)
+            if value in (None, ""):
+                continue
+            for index, existing in enumerate(rows):
+                if not isinstance(existing, dict):
+                    existing = dict(zip(columns, existing))
+                if str(existing.get(field, "")) == str(value):
+                    return index
+        return None
+
+    def handle_event(self, event_type: str, record: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Apply one employees event ('insert' | 'update' | 'delete')
+        Returns the patch dict, or None when the event was dropped
+        """
+        event_type = event_type.lower()
+        key = self._employee_key(record)
+        version = parse_version(record.get("updated_at"))
+
+        with self._lock:
+            if self._is_stale(key, version, event_type):
+                self.stats["stale"] += 1
+                return None
+
+            target = self.resolve_institution(record.get("institution_id"))
+            if target is None:
+                self.stats["unresolved"] += 1
+                return None
+            city, institution = target
+            row = employee_row_from_record(record)
+
+            if event_type != "delete" and self.echo_filter and self.echo_filter(city, institution, row):
+                # Our own upload coming back - the local file already has it (or something newer)
+                if key is not None and version is not None:
+                    self._versions[key] = version
+                self.stats["echo"] += 1
+                return None
+
+            try:
+                patch = self._patch_file(event_type, city, institution, row)
+            except Exception as e:
+                self.stats["errors"] += 1
+                logger.warning("⚠️ Realtime: failed to apply %s on %s/%s: %s", event_type, city, institution, e)
+                return None
+
+            if key is not None and version is not None:
+                if event_type == "delete":
+                    self._deleted[key] = version
+                    self._versions.pop(key, None)
+                else:
+                    self._versions[key] = version
+                    self._deleted.pop(key, None)
+
+            if patch is None:
+                self.stats["unchanged"] += 1
+                return None
+            self.stats["applied"] += 1
+
+        for listener in self._listeners:
+            try:
+                listener(patch)
+            except Exception as e:
+                logger.warning("⚠️ Realtime listener error: %s", e)
+        return patch
+
+    @staticmethod
+    def _comparable(row: Dict[str, Any]) -> Dict[str, str]:
+        return {k: str(v) for k, v in row.items() if k not in ("id", "ULTIMA_MOD")}
+
+    def _patch_file(self, event_type: str, city: str, institution: str,
+                    row: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Change one row of the institution JSON; None if nothing changed"""
+        path = os.path.join(self.data_dir, city, f"{institution}.json")
+        with open(path, "r", encoding="utf-8") as f:
+            inst_data = json.load(f)
+        if isinstance(inst_data, list):
+            inst_data = {"columns": ["DISCORD", "RANK", "PUNCTAJ"], "rows": inst_data}
+        columns = inst_data.setdefault("columns", [])
+        rows = inst_data.setdefault("rows", [])
+        index = self._find_row(rows, columns, row)
+        previous = None
+
+        if event_type == "delete":
+            if index is None:
+                return None
+            removed = rows.pop(index)
+            if not isinstance(removed, dict):
+                removed = dict(zip(columns, removed))
+            action, result_row, previous = "delete", removed, removed
+        else:
+            if index is None:
+                new_row = {col: "" for col in columns}
+                new_row.update(row)
+                rows.append(new_row)
+                result_row = new_row
+            else:
+                existing = rows[index]
+                if not isinstance(existing, dict):
+                    existing = dict(zip(columns, existing))
+                merged = dict(existing)
+                merged.update(row)
+                # Only id / ULTIMA_MOD differing is the echo of our own save
+                if self._comparable(merged) == self._comparable(existing):
+                    return None
+                rows[index] = merged
+                result_row, previous = merged, existing
+            action = "upsert"
+
+        atomic_write_json(path, inst_data, indent=4, verify=False)
+        return {
+            "action": action,
+            "city": city,
+            "institution": institution,
+            "columns": list(columns),
+            "row": result_row,
+            "previous": previous,
+        }
@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+Reset Engine - single-pass, single-write PUNCTAJ reset for one institution
+Used by the manual reset (reset_punctaj) and the monthly auto-reset
+
+Per institution:
+    1. read data/{server}/{city}/{institution}.json once
+    2. write ONE archive snapshot (data before reset)
+    3. reset PUNCTAJ in a single pass over the rows
+    4. write the institution file atomically, verified by SHA-256 checksum
+    5. write a compact reset marker (replaces the old *_AFTER_RESET.json copy)
+Network reporting (weekly_reports / employees) is queued on a background worker.
+"""
+
+import os
+import json
+import queue
+import threading
+from datetime import datetime
+from typing import Dict, List, Any, Optional, Callable
+
+import requests
+
+from atomic_io import atomic_write_json
+
+
+class ResetError(Exception):
+    """Raised when an institution cannot be reset"""
+
+
+# ==================== RESET ====================
+
+def reset_rows(columns: List[str], rows: List[Any], timestamp: str) -> List[Dict[str, Any]]:
+    """
+    Single pass: PUNCTAJ -> 0, ULTIMA_MOD -> timestamp
+    List/tuple rows are converted to dicts by column position
+    """
+    result = []
+    for row in rows:
+        if isinstance(row, dict):
+            row["PUNCTAJ"] = 0
+            row["ULTIMA_MOD"] = timestamp
+            result.append(row)
+        else:
+            values = list(row) if isinstance(row, (list, tuple)) else [row]
+            row_dict = {col: (values[i] if i < len(values) else "") for i, col in enumerate(columns)}
+            row_dict["PUNCTAJ"] = 0
+            row_dict["ULTIMA_MOD"] = timestamp
+            result.append(row_dict)
+    return result
+
+
+def reset_institution(inst_path: str, archive_city_dir: str, city: str, institution: str,
+                      reset_by: str = "Unknown", discord_id: str = "",
+                      reset_at: Optional[datetime] = None) -> Dict[str, Any]:
+    """
+    Reset one institution file in place
+    Returns a result dict with: inst_data, columns, rows, archive_path, marker_path,
+    checksum, employee_count, reset_timestamp, current_timestamp, already_reset
+    Raises ResetError if the file is missing or has no PUNCTAJ column
+    """
+    if not os.path.exists(inst_path):
+        raise ResetError(f"Institution file not found: {inst_path}")
+
+    with open(inst_path, "r", encoding="utf-8") as f:
+        inst_data = json.load(f)
+
+    columns = list(inst_data.get("columns", []))
+    rows = inst_data.get("rows", [])
+
+    if "PUNCTAJ" not in columns:
+        raise ResetError("PUNCTAJ column not found")
+
+    reset_at = reset_at or datetime.now()
+    reset_timestamp = reset_at.strftime("%Y-%m-%d_%H-%M-%S")
+    current_timestamp = reset_at.strftime("%Y-%m-%d %H:%M:%S")
+    archive_path = os.path.join(archive_city_dir, f"{institution}_{reset_timestamp}.json")
+    marker_path = os.path.join(archive_city_dir, f"{institution}_{reset_timestamp}.reset")
+
+    # Idempotent for a given reset_at: a resumed batch must not archive the zeroed data
+    if inst_data.get("last_punctaj_update") == current_timestamp and os.path.exists(archive_path):
+        return {
+            "inst_data": inst_data,
+            "columns": columns,
+            "rows": rows,
+            "archive_path": archive_path,
+            "marker_path": marker_path,
+            "checksum": None,
+            "employee_count": len(rows),
+            "reset_timestamp": reset_timestamp,
+            "current_timestamp": current_timestamp,
+            "already_reset": True,
+        }
+
+    # 1 snapshot: data BEFORE reset (Institution_YYYY-MM-DD_HH-MM-SS.json)
+    atomic_write_json(archive_path, {
+        "archived_at": current_timestamp,
+        "institution": institution,
+        "city": city,
+        "reset_by": reset_by,
+        "discord_id": discord_id,
+        "columns": columns,
+        "rows": rows,
+        "employee_count": len(rows),
+    }, indent=None)
+
+    rows = reset_rows(columns, rows, current_timestamp)
+    if "ULTIMA_MOD" not in columns:
+        columns.append("ULTIMA_MOD")
+
+    inst_data["columns"] = columns
+    inst_data["rows"] = rows
+    inst_data["last_punctaj_update"] = current_timestamp
+    checksum = atomic_write_json(inst_path, inst_data)
+
+    # Compact marker instead of a second full copy of the data
+    atomic_write_json(marker_path, {
+        "status": "after_reset",
+        "reset_timestamp": reset_timestamp,
+        "reset_at": current_timestamp,
+        "archive": os.path.basename(archive_path),
+        "employee_count": len(rows),
+        "reset_by": reset_by,
+        "discord_id": discord_id,
+        "institution_sha256": checksum,
+    }, indent=None)
+
+    return {
+        "inst_data": inst_data,
+        "columns": columns,
+        "rows": rows,
+        "archive_path": archive_path,
+        "marker_path": marker_path,
+        "checksum": checksum,
+        "employee_count": len(rows),
+        "reset_timestamp": reset_timestamp,
+        "current_timestamp": current_timestamp,
+        "already_reset": False,
+    }
+
+
+# ==================== BACKGROUND REPORTING ====================
+
+class BackgroundReportQueue:
+    """
+    One daemon worker that runs queued network jobs in order
+    Keeps HTTP calls (weekly_reports POST, employees PATCH) off the UI thread
+    """
+
+    def __init__(self, name: str = "ResetReportQueue"):
+        self.name = name
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def submit(self, job: Callable[[], None], description: str = ""):
+        """Queue a callable; errors are printed, never raised to the caller"""
+        self._queue.put((job, description))
+        self._ensure_worker()
+
+    def join(self, timeout: Optional[float] = None) -> bool:
+        """Wait until all queued jobs are done (used by tests / shutdown)"""
+        done = threading.Event()
+        self._queue.put((done.set, ""))
+        self._ensure_worker()
+        return done.wait(timeout)
+
+    def _ensure_worker(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._worker, daemon=True, name=self.name)
+                self._thread.start()
+
+    def _worker(self):
+        while True:
+            job, description = self._queue.get()
+            try:
+                job()
+            except Exception as e:
+                print(f"⚠️ Background report failed ({description}): {e}")
+            finally:
+                self._queue.task_done()
+
+
+REPORT_QUEUE = BackgroundReportQueue()
+
+
+def queue_reset_report(supabase_url: str, supabase_key: str, weekly_table: str,
+                       city: str, institution: str, result: Dict[str, Any],
+                       reset_by: str = "Unknown", discord_id: str = "",
+                       report_queue: Optional[BackgroundReportQueue] = None):
+    """
+    Queue the weekly_reports insert + employees PUNCTAJ=0 update for a reset
+    Returns immediately; the requests run on the background worker
+    """
+    from datetime import timedelta
+
+    inst_data = result["inst_data"]
+    current_timestamp = result["current_timestamp"]
+    today = datetime.now()
+    monday = today - timedelta(days=today.weekday())
+
+    report_json = {
+        "week_start": monday.strftime('%Y-%m-%d'),
+        "week_end": today.strftime('%Y-%m-%d'),
+        "city": city,
+        "institution": institution,
+        "employee_count": result["employee_count"],
+        "reset_by": reset_by,
+        "discord_id": discord_id,
+        "report_data": {
+            "columns": result["columns"],
+            "rows": result["rows"],
+            "employee_count": result["employee_count"],
+            "reset_at": current_timestamp,
+            "action": "reset_punctaj"
+        },
+        "archived_at": current_timestamp
+    }
+    headers = {
+        "apikey": supabase_key,
+        "Authorization": f"Bearer {supabase_key}",
+        "Content-Type": "application/json"
+    }
+    institution_id = inst_data.get("institution_id")
+
+    def send():
+        response = requests.post(f"{supabase_url}/rest/v1/{weekly_table}", json=report_json, headers=headers, timeout=15)
+        if response.status_code == 201:
+            print(f"✅ Reset logged to Supabase {weekly_table}: {city}/{institution}")
+        else:
+            print(f"⚠️ Failed to log reset to Supabase table '{weekly_table}' (Status {response.status_code})")
+
+        if institution_id:
+            update_response = requests.patch(
+                f"{supabase_url}/rest/v1/employees?institution_id=eq.{institution_id}",
+                json={"punctaj": 0, "updated_at": current_timestamp},
+                headers=headers,
+                timeout=15
+            )
+            if update_response.status_code not in (200, 204):
+                print(f"⚠️ Failed to update employees (Status {update_response.status_code})")
+
+    (report_queue or REPORT_QUEUE).submit(send, f"reset report {city}/{institution}")
@@ -1,16 +1,36 @@
 """
 Revolut API Integration Module
 Handles authentication and transaction fetching from Revolut
+
+Transactions are ingested into a local ledger (revolut_ledger.RevolutLedger):
+every account is paged to exhaustion (date-window cursor), accounts are fetched
+concurrently on the shared session, and each sync only asks for what is newer than
+the account's watermark (minus a small overlap so pending -> completed is picked up).
 """
 
 import requests
+from requests.adapters import HTTPAdapter
 import json
-from datetime import datetime, timedelta
-from typing import List, Dict, Optional
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta, timezone
+from typing import Iterator, List, Dict, Optional
 import logging
 
+from revolut_ledger import RevolutLedger, DEFAULT_LEDGER_PATH
+
 logger = logging.getLogger(__name__)
 
+
+def _iso(moment: datetime) -> str:
+    """UTC timestamp in Revolut's created_at format (sortable as text)"""
+    if moment.tzinfo is None:
+        moment = moment.astimezone()
+    return moment.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+
+
+def _parse_time(value: str) -> datetime:
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
 class RevolutAPI:
     """
     Integration with Revolut API for balance and transaction retrieval
@@ -21,22 +41,42 @@ class RevolutAPI:
     
     BASE_URL = "https://api.revolut.com"
     SANDBOX_URL = "https://sandbox-api.revolut.com"
+    PAGE_SIZE = 100
+    SYNC_OVERLAP = timedelta(days=3)
     
-    def __init__(self, access_token: str, sandbox: bool = False):
+    def __init__(self, access_token: str, sandbox: bool = False, base_url: Optional[str] = None,
+                 ledger_path: Optional[str] = None, max_workers: int = 4, timeout: int = 30):
         """
         Initialize Revolut API client
         
         Args:
             access_token: Revolut OAuth access token (from user authorization)
             sandbox: Use sandbox environment for testing
+            base_url: Override the API host (local stub in tests)
+            ledger_path: SQLite ledger file (default data/revolut_ledger.db)
+            max_workers: Accounts fetched in parallel
         """
         self.access_token = access_token
-        self.base_url = self.SANDBOX_URL if sandbox else self.BASE_URL
+        self.base_url = base_url or (self.SANDBOX_URL if sandbox else self.BASE_URL)
+        self.timeout = timeout
+        self.max_workers = max(1, max_workers)
         self.session = requests.Session()
         self.session.headers.update({
             "Authorization": f"Bearer {access_token}",
             "Content-Type": "application/json"
         })
+        # One pooled connection per worker on the shared session
+        adapter = HTTPAdapter(pool_connections=self.max_workers, pool_maxsize=self.max_workers)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.ledger_path = ledger_path or DEFAULT_LEDGER_PATH
+        self._ledger = None
+    
+    @property
+    def ledger(self) -> RevolutLedger:
+        if self._ledger is None:
+            self._ledger = RevolutLedger(self.ledger_path)
+        return self._ledger
     
     def get_accounts(self) -> List[Dict]:
         """
@@ -117,6 +157,67 @@ class RevolutAPI:
             logger.error(f"❌ Error fetching Revolut transactions: {e}")
             return []
     
+    def iter_transaction_pages(self, account_id: str, from_date: datetime, to_date: datetime,
+                               page_size: int = PAGE_SIZE) -> Iterator[List[Dict]]:
+        """
+        All transactions of an account in [from_date, to_date], page by page (newest first)
+        
+        The cursor is the window end: the next page asks for `to` = oldest created_at seen,
+        ids already returned at that boundary are skipped. HTTP errors are raised, so a
+        failed sync never looks like an empty (or truncated) account.
+        """
+        cursor = _iso(to_date)
+        seen = set()
+        while True:
+            response = self.session.get(
+                f"{self.base_url}/2.0/accounts/{account_id}/transactions",
+                params={"limit": page_size, "from": _iso(from_date), "to": cursor},
+                timeout=self.timeout
+            )
+            response.raise_for_status()
+            page = response.json()
+            fresh = [t for t in page if t.get("id") not in seen]
+            if fresh:
+                seen.update(t.get("id") for t in fresh)
+                yield fresh
+            if len(page) < page_size or not fresh:
+                return
+            cursor = min(t.get("created_at", cursor) for t in page)
+    
+    def sync_transactions(self, days: int = 30, accounts: Optional[List[Dict]] = None) -> Dict:
+        """
+        Bring the ledger up to date for every account (concurrently)
+        
+        Returns:
+            {"accounts": {account_id: new/updated rows}, "errors": {account_id: message}}
+        """
+        accounts = self.get_accounts() if accounts is None else accounts
+        now = datetime.now(timezone.utc)
+        window_start = now - timedelta(days=days)
+        result = {"accounts": {}, "errors": {}}
+        
+        def fetch(account_id):
+            start = window_start
+            watermark = self.ledger.watermark(account_id)
+            if watermark:
+                start = max(window_start, _parse_time(watermark) - self.SYNC_OVERLAP)
+            return [t for page in self.iter_transaction_pages(account_id, start, now) for t in page]
+        
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="RevolutSync") as pool:
+            futures = {pool.submit(fetch, a.get("id")): a.get("id") for a in accounts if a.get("id")}
+            for future in as_completed(futures):
+                account_id = futures[future]
+                try:
+                    # Ledger writes stay on this thread, one transaction per account
+                    result["accounts"][account_id] = self.ledger.upsert(account_id, future.result())
+                except Exception as e:
+                    logger.error(f"❌ Revolut sync failed for account {account_id}: {e}")
+                    result["errors"][account_id] = str(e)
+        
+        logger.info(f"✅ Revolut ledger synced: {sum(result['accounts'].values())} transactions "
+                    f"from {len(result['accounts'])} accounts")
+        return result
+    
     def get_all_transactions_summary(self, days: int = 30) -> Dict:
         """
         Get summary of all transactions across all accounts for last N days
@@ -129,43 +230,28 @@ class RevolutAPI:
         """
         try:
             accounts = self.get_accounts()
-            from_date = datetime.now() - timedelta(days=days)
-            to_date = datetime.now()
+            sync = self.sync_transactions(days, accounts)
+            now = datetime.now(timezone.utc)
+            from_time, to_time = _iso(now - timedelta(days=days)), _iso(now)
             
             summary = {
                 "fetch_date": datetime.now().isoformat(),
                 "period_days": days,
-                "accounts": []
+                "accounts": [],
+                "sync_errors": sync["errors"]
             }
             
+            # Totals for every account in one aggregate query over the ledger
+            totals = self.ledger.summaries(from_time, to_time)
+            empty = {"total_transactions": 0, "income": 0, "expenses": 0, "net": 0}
+            
             for account in accounts:
                 account_id = account.get("id")
-                transactions = self.get_transactions(
-                    account_id,
-                    limit=100,
-                    from_date=from_date,
-                    to_date=to_date
-                )
-                
-                # Calculate totals
-                income = sum(t.get("amount", 0) for t in transactions 
-                            if t.get("amount", 0) > 0)
-                expenses = sum(t.get("amount", 0) for t in transactions 
-                              if t.get("amount", 0) < 0)
-                
-                account["transactions"] = transactions
-                account["summary"] = {
-                    "total_transactions": len(transactions),
-                    "income": income,
-                    "expenses": abs(expenses),
-                    "net": income + expenses  # Already negative for expenses
-                }
-                
                 summary["accounts"].append({
                     "account_info": {k: v for k, v in account.items() 
                                     if k not in ["transactions"]},
-                    "summary": account["summary"],
-                    "transactions": transactions[:10]  # Return last 10 for preview
+                    "summary": totals.get(account_id, dict(empty)),
+                    "transactions": self.ledger.latest(account_id, from_time, to_time, 10)  # Last 10 for preview
                 })
             
             logger.info(f"✅ Generated Revolut summary for {len(accounts)} accounts")
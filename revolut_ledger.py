@@ -0,0 +1,127 @@
+"""
+Revolut Ledger Module
+Local SQLite cache of Revolut transactions, keyed by transaction id
+
+    transactions -> one row per transaction (upsert: pending -> completed updates it)
+    sync_state   -> per-account watermark (newest created_at stored) + last sync time
+    summaries    -> computed in SQL (SUM / COUNT over the window), not row by row in Python
+"""
+
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LEDGER_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "revolut_ledger.db")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS transactions (
+    id TEXT PRIMARY KEY,
+    account_id TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    amount REAL NOT NULL DEFAULT 0,
+    currency TEXT,
+    type TEXT,
+    state TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_transactions_account_time ON transactions(account_id, created_at);
+CREATE TABLE IF NOT EXISTS sync_state (
+    account_id TEXT PRIMARY KEY,
+    watermark TEXT,
+    synced_at TEXT
+);
+"""
+
+
+def transaction_amount(transaction: Dict, account_id: str) -> float:
+    """Top-level amount, or the sum of the legs that belong to this account (Business API)"""
+    if transaction.get("amount") is not None:
+        return float(transaction["amount"])
+    legs = [leg for leg in transaction.get("legs", []) if leg.get("account_id") in (None, account_id)]
+    return float(sum(leg.get("amount", 0) for leg in legs))
+
+
+def transaction_currency(transaction: Dict) -> Optional[str]:
+    if transaction.get("currency"):
+        return transaction["currency"]
+    legs = transaction.get("legs") or [{}]
+    return legs[0].get("currency")
+
+
+class RevolutLedger:
+    """Append/upsert-only transaction store with per-account sync watermarks"""
+
+    def __init__(self, db_path: str = DEFAULT_LEDGER_PATH):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+    def upsert(self, account_id: str, transactions: Iterable[Dict]) -> int:
+        """Insert new transactions, update known ones (state / amount can change); one transaction"""
+        rows = [(t["id"], account_id, t.get("created_at", ""), transaction_amount(t, account_id),
+                 transaction_currency(t), t.get("type"), t.get("state"), json.dumps(t, ensure_ascii=False))
+                for t in transactions if t.get("id")]
+        with self._lock, self.conn:
+            self.conn.executemany(
+                "INSERT INTO transactions (id, account_id, created_at, amount, currency, type, state, data) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(id) DO UPDATE SET created_at = excluded.created_at, amount = excluded.amount, "
+                "currency = excluded.currency, type = excluded.type, state = excluded.state, data = excluded.data",
+                rows)
+            if rows:
+                self.conn.execute(
+                    "INSERT INTO sync_state (account_id, watermark, synced_at) VALUES (?, ?, ?) "
+                    "ON CONFLICT(account_id) DO UPDATE SET watermark = MAX(COALESCE(watermark, ''), excluded.watermark), "
+                    "synced_at = excluded.synced_at",
+                    (account_id, max(r[2] for r in rows), datetime.now().isoformat()))
+            else:
+                self.conn.execute(
+                    "INSERT INTO sync_state (account_id, synced_at) VALUES (?, ?) "
+                    "ON CONFLICT(account_id) DO UPDATE SET synced_at = excluded.synced_at",
+                    (account_id, datetime.now().isoformat()))
+        return len(rows)
+
+    def watermark(self, account_id: str) -> Optional[str]:
+        with self._lock:
+            row = self.conn.execute("SELECT watermark FROM sync_state WHERE account_id = ?", (account_id,)).fetchone()
+        return row[0] if row else None
+
+    def count(self, account_id: Optional[str] = None) -> int:
+        with self._lock:
+            if account_id is None:
+                return self.conn.execute("SELECT COUNT(*) FROM transactions").fetchone()[0]
+            return self.conn.execute("SELECT COUNT(*) FROM transactions WHERE account_id = ?",
+                                     (account_id,)).fetchone()[0]
+
+    def summaries(self, from_time: str, to_time: str) -> Dict[str, Dict]:
+        """Per-account totals over [from_time, to_time] in one aggregate query"""
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT account_id, COUNT(*), "
+                "COALESCE(SUM(CASE WHEN amount > 0 THEN amount END), 0), "
+                "COALESCE(SUM(CASE WHEN amount < 0 THEN amount END), 0) "
+                "FROM transactions WHERE created_at >= ? AND created_at <= ? GROUP BY account_id",
+                (from_time, to_time)).fetchall()
+        return {account_id: {"total_transactions": count, "income": income, "expenses": abs(expenses),
+                             "net": income + expenses}
+                for account_id, count, income, expenses in rows}
+
+    def latest(self, account_id: str, from_time: str, to_time: str, limit: int = 10) -> List[Dict]:
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT data FROM transactions WHERE account_id = ? AND created_at >= ? AND created_at <= ? "
+                "ORDER BY created_at DESC LIMIT ?", (account_id, from_time, to_time, limit)).fetchall()
+        return [json.loads(r[0]) for r in rows]
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Save Coordinator - debounced, coalescing save_institution for rapid UI edits
+
+    request   -> request(key, ...): the edit is remembered per institution and a timer
+                 (delay_ms, default 400 ms) is restarted; the next edit inside the window
+                 is merged into the same pending save
+    merge     -> last tree wins, update_timestamp = any, updated_items = union (in order),
+                 skip_logging = all
+    max wait  -> a stream of edits cannot postpone the write past max_delay_ms
+    flush     -> flush(key) / flush() writes now (tab switch, app close, before a reload)
+    delta     -> changed_rows(old, new): the rows to upload - new or different by row_key
+    retry     -> a failed upload leaves pending_sync + pending_sync_rows (row keys) in the
+                 institution file; upload_rows(data, delta) adds them to the next upload
+                 (pending_sync without keys = the whole institution), settle_pending(...)
+                 keeps what is still not in the cloud
+
+Tk-agnostic: schedule(delay_ms, callback) -> handle and cancel(handle) are root.after /
+root.after_cancel in the app, a fake clock in tests. Used from the Tkinter thread only.
+
+Window: $PUNCTAJ_SAVE_DEBOUNCE_MS or [ui] save_debounce_ms in supabase_config.ini
+"""
+
+import os
+import time
+import configparser
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Tuple
+
+from local_store import row_key
+
+DEFAULT_DELAY_MS = 400
+DEFAULT_MAX_DELAY_MS = 2000
+
+
+def resolve_debounce_ms(config_paths: Iterable[str] = (), env: str = "PUNCTAJ_SAVE_DEBOUNCE_MS",
+                        default: int = DEFAULT_DELAY_MS) -> int:
+    value = (os.getenv(env, "") or "").strip()
+    if not value:
+        for path in config_paths:
+            if path and os.path.exists(path):
+                config = configparser.ConfigParser()
+                config.read(path, encoding="utf-8")
+                value = config.get("ui", "save_debounce_ms", fallback="").strip()
+                if value:
+                    break
+    try:
+        return max(0, int(value))
+    except ValueError:
+        return default
+
+
+def _as_text(row: Dict) -> Dict[str, str]:
+    return {str(k): "" if v is None else str(v) for k, v in row.items()}
+
+
+def changed_rows(old_rows: List[Dict], new_rows: List[Dict]) -> List[Dict]:
+    """
+    Rows of new_rows that are new or differ from the row with the same key in old_rows
+    Values compare as text: the Treeview gives "12" where the file may hold 12
+    """
+    old = {row_key(row): _as_text(row) for row in old_rows if isinstance(row, dict)}
+    return [row for row in new_rows if old.get(row_key(row)) != _as_text(row)]
+
+
+def upload_rows(data: Dict, delta: List[Dict]) -> Tuple[List[Dict], bool]:
+    """
+    Rows for the next upload: delta + current rows of earlier failed uploads
+    Returns (rows, full) - full when the whole institution is sent
+    """
+    rows = [row for row in data.get("rows", []) if isinstance(row, dict)]
+    pending = {tuple(key) for key in data.get("pending_sync_rows") or []}
+    if data.get("pending_sync") and not pending:
+        return rows, True
+    keys = {row_key(row) for row in delta}
+    retried = [row for row in rows if row_key(row) in pending and row_key(row) not in keys]
+    return list(delta) + retried, False
+
+
+def settle_pending(pending: Iterable, uploaded: Iterable, ok: bool, full: bool = False) -> List[List[str]]:
+    """pending_sync_rows after an upload of uploaded (row keys): removed on success, kept on failure"""
+    pending = [list(key) for key in pending or []]
+    uploaded = [list(key) for key in uploaded]
+    if ok:
+        return [] if full else [key for key in pending if key not in uploaded]
+    return pending + [key for key in uploaded if key not in pending]
+
+
+class PendingSave:
+    """Merged arguments of the save_institution calls inside one window"""
+
+    __slots__ = ("tree", "update_timestamp", "updated_items", "skip_logging", "requests",
+                 "first_at", "handle")
+
+    def __init__(self, tree, first_at: float):
+        self.tree = tree
+        self.update_timestamp = False
+        self.updated_items: Optional[List[Any]] = None
+        self.skip_logging = True
+        self.requests = 0
+        self.first_at = first_at
+        self.handle = None
+
+    def merge(self, tree, update_timestamp=False, updated_items=None, skip_logging=False):
+        self.tree = tree
+        self.update_timestamp = self.update_timestamp or update_timestamp
+        if updated_items:
+            if self.updated_items is None:
+                self.updated_items = []
+            self.updated_items.extend(item for item in updated_items if item not in self.updated_items)
+        self.skip_logging = self.skip_logging and skip_logging
+        self.requests += 1
+
+
+class DebouncedSaveCoordinator:
+    """One pending save per institution key; flush_fn(key, pending) does the actual write"""
+
+    def __init__(self, flush_fn: Callable[[Hashable, PendingSave], Any],
+                 schedule: Callable[[int, Callable[[], None]], Any],
+                 cancel: Callable[[Any], None],
+                 delay_ms: int = DEFAULT_DELAY_MS,
+                 max_delay_ms: int = DEFAULT_MAX_DELAY_MS,
+                 clock: Callable[[], float] = time.monotonic):
+        self.flush_fn = flush_fn
+        self.schedule = schedule
+        self.cancel = cancel
+        self.delay_ms = delay_ms
+        self.max_delay_ms = max(max_delay_ms, delay_ms)
+        self.clock = clock
+        self._pending: Dict[Hashable, PendingSave] = {}
+        self.stats = {"requests": 0, "flushes": 0}
+
+    def request(self, key: Hashable, tree, update_timestamp=False, updated_items=None,
+                skip_logging=False) -> PendingSave:
+        """Merge one save into the pending one for key and restart its timer"""
+        now = self.clock()
+        pending = self._pending.get(key)
+        if pending is None:
+            pending = self._pending[key] = PendingSave(tree, now)
+        pending.merge(tree, update_timestamp, updated_items, skip_logging)
+        self.stats["requests"] += 1
+
+        if self.delay_ms <= 0:
+            self.flush(key)
+            return pending
+        if pending.handle is not None:
+            self.cancel(pending.handle)
+        waited_ms = (now - pending.first_at) * 1000
+        delay = int(max(0, min(self.delay_ms, self.max_delay_ms - waited_ms)))
+        pending.handle = self.schedule(delay, lambda: self._on_timer(key, pending))
+        return pending
+
+    def _on_timer(self, key, pending):
+        # A timer that fired after an explicit flush / a newer window belongs to nobody
+        if self._pending.get(key) is pending:
+            pending.handle = None
+            self.flush(key)
+
+    def pending(self, key: Optional[Hashable] = None) -> bool:
+        return bool(self._pending) if key is None else key in self._pending
+
+    def discard(self, key: Hashable) -> bool:
+        """Drop a pending save without writing (institution deleted / reset meanwhile)"""
+        pending = self._pending.pop(key, None)
+        if pending is not None and pending.handle is not None:
+            self.cancel(pending.handle)
+        return pending is not None
+
+    def flush(self, key: Optional[Hashable] = None) -> int:
+        """Write the pending save of key (all keys when None) now; returns how many ran"""
+        keys = list(self._pending) if key is None else [key]
+        flushed = 0
+        for k in keys:
+            pending = self._pending.pop(k, None)
+            if pending is None:
+                continue
+            if pending.handle is not None:
+                self.cancel(pending.handle)
+                pending.handle = None
+            try:
+                self.flush_fn(k, pending)
+            except Exception as e:
+                print(f"⚠️ Debounced save failed for {k}: {e}")
+            flushed += 1
+            self.stats["flushes"] += 1
+        return flushed
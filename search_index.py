@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+Search Index - in-memory inverted index over every employee of the active server
+
+    tokens   -> DISCORD, NUME IC, SERIE DE BULETIN, RANK, ROLE split on non-word
+                characters, lowercased, without diacritics (+ the whole value as a token)
+    prefixes -> prefix -> field weight -> tokens (vocabulary level), so "ion" finds "ionescu"
+    postings -> token -> field weight -> doc ids (insertion ordered)
+
+Institutions are (re)indexed one at a time: index_institution() replaces only that
+institution's documents, so saves / realtime patches / sync refreshes never rebuild
+everything. search() ANDs the query tokens and ranks hits by field weight
+(exact token > prefix; DISCORD > NUME IC > SERIE > ROLE / RANK); it walks the
+postings from the best weight down and stops once the top `limit` cannot change.
+"""
+
+import re
+import heapq
+import threading
+import unicodedata
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+INDEXED_FIELDS = {"DISCORD": 5, "NUME IC": 4, "SERIE DE BULETIN": 3, "ROLE": 1, "RANK": 1}
+MAX_PREFIX = 16
+_WORD = re.compile(r"\w+", re.UNICODE)
+
+
+def normalize(text) -> str:
+    """Lowercase without diacritics (ș -> s, ă -> a)"""
+    value = str(text or "").lower()
+    if value.isascii():
+        return value.strip()
+    decomposed = unicodedata.normalize("NFKD", value)
+    return "".join(ch for ch in decomposed if not unicodedata.combining(ch)).strip()
+
+
+def tokenize(text) -> List[str]:
+    value = normalize(text)
+    if not value:
+        return []
+    tokens = _WORD.findall(value)
+    if len(tokens) != 1 or tokens[0] != value:
+        tokens.append(value)       # "john.doe" is also findable as typed
+    return tokens
+
+
+def _identity(row: Dict) -> Tuple[str, str]:
+    discord = str(row.get("DISCORD") or "").strip()
+    return ("discord", discord) if discord else ("name", str(row.get("NUME IC") or "").strip())
+
+
+@dataclass
+class SearchHit:
+    city: str
+    institution: str
+    row: Dict
+    score: int
+    fields: List[str] = field(default_factory=list)
+
+
+class EmployeeSearchIndex:
+    """Thread-safe: writers are the index queue, readers the Tkinter thread"""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._next_id = 0
+        self._docs: Dict[int, Tuple[str, str, Dict, Dict[str, int]]] = {}
+        self._by_institution: Dict[Tuple[str, str], Dict[Tuple[str, str], List[int]]] = {}
+        self._postings: Dict[str, Dict[int, Dict[int, None]]] = {}
+        self._prefixes: Dict[str, Dict[int, Set[str]]] = {}
+        self._signatures: Dict[Tuple[str, str], object] = {}
+
+    # ==================== WRITE ====================
+
+    def _add_doc(self, city: str, institution: str, row: Dict) -> int:
+        doc_id = self._next_id
+        self._next_id += 1
+        weights: Dict[str, int] = {}
+        for column, weight in INDEXED_FIELDS.items():
+            for token in tokenize(row.get(column)):
+                if weights.get(token, 0) < weight:
+                    weights[token] = weight
+        for token, weight in weights.items():
+            postings = self._postings.setdefault(token, {})
+            if weight not in postings:
+                postings[weight] = {}
+                for n in range(2, min(len(token), MAX_PREFIX) + 1):
+                    self._prefixes.setdefault(token[:n], {}).setdefault(weight, set()).add(token)
+            postings[weight][doc_id] = None
+        self._docs[doc_id] = (city, institution, dict(row), weights)
+        return doc_id
+
+    def _remove_doc(self, doc_id: int):
+        _, _, _, weights = self._docs.pop(doc_id)
+        for token, weight in weights.items():
+            postings = self._postings[token]
+            tier = postings[weight]
+            tier.pop(doc_id, None)
+            if tier:
+                continue
+            del postings[weight]
+            if not postings:
+                del self._postings[token]
+            for n in range(2, min(len(token), MAX_PREFIX) + 1):
+                groups = self._prefixes[token[:n]]
+                groups[weight].discard(token)
+                if not groups[weight]:
+                    del groups[weight]
+                    if not groups:
+                        del self._prefixes[token[:n]]
+
+    def index_institution(self, city: str, institution: str, rows: Iterable, columns: Optional[List[str]] = None,
+                          signature=None):
+        """Replace the documents of one institution"""
+        with self._lock:
+            self.remove_institution(city, institution)
+            docs = {}
+            for row in rows:
+                if not isinstance(row, dict):
+                    row = dict(zip(columns or [], row))
+                docs.setdefault(_identity(row), []).append(self._add_doc(city, institution, row))
+            self._by_institution[(city, institution)] = docs
+            if signature is not None:
+                self._signatures[(city, institution)] = signature
+
+    def update_rows(self, city: str, institution: str, rows: Iterable[Dict]):
+        """Upsert single employees (points edit, realtime patch)"""
+        with self._lock:
+            docs = self._by_institution.setdefault((city, institution), {})
+            for row in rows:
+                key = _identity(row)
+                for doc_id in docs.pop(key, []):
+                    self._remove_doc(doc_id)
+                docs[key] = [self._add_doc(city, institution, row)]
+            self._signatures.pop((city, institution), None)
+
+    def remove_rows(self, city: str, institution: str, rows: Iterable[Dict]):
+        with self._lock:
+            docs = self._by_institution.get((city, institution), {})
+            for row in rows:
+                for doc_id in docs.pop(_identity(row), []):
+                    self._remove_doc(doc_id)
+            self._signatures.pop((city, institution), None)
+
+    def remove_institution(self, city: str, institution: str):
+        with self._lock:
+            for doc_ids in self._by_institution.pop((city, institution), {}).values():
+                for doc_id in doc_ids:
+                    self._remove_doc(doc_id)
+            self._signatures.pop((city, institution), None)
+
+    def remove_city(self, city: str):
+        with self._lock:
+            for key in [k for k in self._by_institution if k[0] == city]:
+                self.remove_institution(*key)
+
+    def clear(self):
+        """Drop every document (the active server changed)"""
+        with self._lock:
+            self._docs.clear()
+            self._by_institution.clear()
+            self._postings.clear()
+            self._prefixes.clear()
+            self._signatures.clear()
+
+    def sync_from(self, institutions: Iterable[Tuple[str, str]], load: Callable[[str, str], Optional[Dict]],
+                  signature: Callable[[str, str], object] = lambda city, institution: None) -> Dict[str, int]:
+        """
+        Incremental build: only institutions whose signature (e.g. file mtime) changed are
+        loaded again; institutions that disappeared are dropped
+        """
+        seen, stats = set(), {"indexed": 0, "unchanged": 0, "removed": 0}
+        for city, institution in institutions:
+            key = (city, institution)
+            seen.add(key)
+            current = signature(city, institution)
+            if current is not None and self._signatures.get(key) == current:
+                stats["unchanged"] += 1
+                continue
+            data = load(city, institution)
+            if data is None:
+                continue
+            self.index_institution(city, institution, data.get("rows", []), data.get("columns"), current)
+            stats["indexed"] += 1
+        with self._lock:
+            for key in [k for k in self._by_institution if k not in seen]:
+                self.remove_institution(*key)
+                stats["removed"] += 1
+        return stats
+
+    # ==================== READ ====================
+
+    def __len__(self):
+        return len(self._docs)
+
+    def _tiers(self, query_token: str) -> List[Tuple[int, Iterable[str], bool]]:
+        """
+        (score, tokens, exact) groups a query token matches, best score first:
+        the token itself (weight x2) and the tokens it prefixes (weight x1)
+        """
+        tiers = [(weight * 2, (query_token,), True) for weight in self._postings.get(query_token, {})]
+        if len(query_token) >= 2:
+            for weight, tokens in self._prefixes.get(query_token[:MAX_PREFIX], {}).items():
+                if len(query_token) > MAX_PREFIX:
+                    tokens = [t for t in tokens if t.startswith(query_token)]
+                tiers.append((weight, tokens, False))
+        tiers.sort(key=lambda tier: -tier[0])
+        return tiers
+
+    def _estimate(self, query_token: str, tiers) -> int:
+        """Candidate count for choosing the driver token (one doc per prefixed token, at least)"""
+        exact = sum(len(docs) for docs in self._postings.get(query_token, {}).values())
+        return exact + sum(len(tokens) for _, tokens, is_exact in tiers if not is_exact)
+
+    @staticmethod
+    def _token_score(query_token: str, weights: Dict[str, int]) -> int:
+        """Best match of a query token inside one document: exact x2, prefix x1"""
+        best = weights.get(query_token, 0) * 2
+        if len(query_token) >= 2:
+            for token, weight in weights.items():
+                if weight > best and token.startswith(query_token):
+                    best = weight
+        return best
+
+    def search(self, query: str, limit: int = 50, cities: Optional[Set[str]] = None) -> List[SearchHit]:
+        """
+        The most selective query token drives: its postings are walked best score first,
+        the other tokens are checked against each candidate's own token weights
+        """
+        query_tokens = list(dict.fromkeys(_WORD.findall(normalize(query))))
+        if not query_tokens:
+            return []
+        with self._lock:
+            expanded = []
+            for q in query_tokens:
+                tiers = self._tiers(q)
+                if not tiers:
+                    return []
+                expanded.append((self._estimate(q, tiers), q, tiers))
+            expanded.sort(key=lambda item: item[0])
+            _, driver, driver_tiers = expanded[0]
+            others = [q for _, q, _ in expanded[1:]]
+            # Best score the other tokens can still add to a driver candidate
+            headroom = sum(tiers[0][0] for _, _, tiers in expanded[1:])
+
+            def driver_docs():
+                for score, tokens, exact in driver_tiers:
+                    for token in tokens:
+                        docs = self._postings[token].get(score // 2 if exact else score)
+                        if docs:
+                            yield score, docs
+
+            seen: Set[int] = set()
+            best: List[Tuple[int, int, int]] = []     # min-heap of (score, -visit order, doc_id)
+            for tier_score, docs in driver_docs():
+                if len(best) >= limit and tier_score + headroom <= best[0][0]:
+                    break
+                for doc_id in docs:
+                    if doc_id in seen:
+                        continue
+                    seen.add(doc_id)
+                    city, _, _, weights = self._docs[doc_id]
+                    if cities is not None and city not in cities:
+                        continue
+                    score = tier_score
+                    for q in others:
+                        extra = self._token_score(q, weights)
+                        if not extra:
+                            break
+                        score += extra
+                    else:
+                        # Equal scores keep the first visited (lower doc ids first)
+                        if len(best) < limit:
+                            heapq.heappush(best, (score, -len(seen), doc_id))
+                        elif score > best[0][0]:
+                            heapq.heapreplace(best, (score, -len(seen), doc_id))
+                    if len(best) >= limit and tier_score + headroom <= best[0][0]:
+                        break
+
+            result = []
+            for score, _, doc_id in sorted(best, reverse=True):
+                city, institution, row, _ = self._docs[doc_id]
+                fields = [column for column in INDEXED_FIELDS
+                          if any(t.startswith(q) for t in tokenize(row.get(column)) for q in query_tokens)]
+                result.append(SearchHit(city, institution, dict(row), score, fields))
+            return result
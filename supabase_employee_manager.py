@@ -6,15 +6,25 @@ Handles: Read cities/institutions/employees, Write changes back to Supabase
 
 import requests
 import json
-from typing import List, Dict, Optional
+from datetime import datetime
+from typing import Any, Iterator, List, Dict, Optional, Tuple
 from pathlib import Path
 import configparser
 
+from id_registry import SupabaseIdRegistry
+
+# Unique key of the employees table (ADD_EMPLOYEES_UNIQUE_CONSTRAINT.sql)
+UNIQUE_EMPLOYEE_KEY = "institution_id,discord_username"
+
+# Institutions (with embedded employees) per request in iter_structure
+STRUCTURE_PAGE_SIZE = 50
+
+
 class SupabaseEmployeeManager:
     """Manage cities, institutions, and employees in Supabase"""
     
-    def __init__(self, config_path: str = "supabase_config.ini"):
-        """Initialize Supabase connection"""
+    def __init__(self, config_path: str = "supabase_config.ini", id_registry_path: Optional[str] = None):
+        """Initialize Supabase connection (id_registry_path: persisted name -> id registry)"""
         self.config = configparser.ConfigParser()
         
         # Try different config paths
@@ -43,6 +53,63 @@ class SupabaseEmployeeManager:
             "Content-Type": "application/json",
             "Prefer": "return=representation"
         }
+        
+        # name -> id registry (filled by every read that sees the ids, dropped on delete,
+        # persisted once punctaj.py gives it the server's state file)
+        self.ids = SupabaseIdRegistry(server=self.url, state_file=id_registry_path)
+    
+    # ==================== ID REGISTRY ====================
+    
+    def _remember_city(self, city: Optional[Dict]):
+        if city:
+            self.ids.set_city(city.get("name"), city.get("id"))
+    
+    def _remember_institution(self, institution: Optional[Dict], city_id: Optional[int] = None):
+        if institution:
+            self.ids.set_institution(institution.get("city_id", city_id), institution.get("name"), institution.get("id"))
+    
+    def _forget_institution(self, institution_id: int):
+        self.ids.forget_institution(institution_id)
+    
+    def _forget_city(self, city_id: int):
+        self.ids.forget_city(city_id)
+    
+    def prime_id_cache(self) -> Optional[int]:
+        """Reload the whole registry in one request; returns institutions known (None on failure)"""
+        try:
+            resp = requests.get(f"{self.url}/rest/v1/cities", headers=self.headers, timeout=15,
+                                params={"select": "id,name,institutions(id,name)"})
+            if resp.status_code == 200:
+                self.ids.replace_all(resp.json())
+                return len(self.ids)
+            print(f"❌ Error loading city/institution ids: Status {resp.status_code}")
+        except Exception as e:
+            print(f"❌ Error loading city/institution ids: {e}")
+        return None
+    
+    def resolve_city_id(self, city_name: str) -> Optional[int]:
+        """City id by name - from the registry, one request on a miss"""
+        if self.ids.city_id(city_name) is None:
+            self.get_city_by_name(city_name)
+        return self.ids.city_id(city_name)
+    
+    def resolve_institution_id(self, city_name: str, institution_name: str) -> Optional[int]:
+        """Institution id by names - from the registry; a miss loads the ids of the whole city in one request"""
+        city_id = self.ids.city_id(city_name)
+        if city_id is not None and self.ids.institution_id(city_id, institution_name) is not None:
+            return self.ids.institution_id(city_id, institution_name)
+        try:
+            resp = requests.get(f"{self.url}/rest/v1/cities", headers=self.headers, timeout=10,
+                                params={"select": "id,name,institutions(id,name)", "name": f"eq.{city_name}"})
+            if resp.status_code == 200:
+                for city in resp.json():
+                    self._remember_city(city)
+                    for institution in city.get("institutions") or []:
+                        self._remember_institution(institution, city["id"])
+        except Exception as e:
+            print(f"❌ Error resolving institution {city_name}/{institution_name}: {e}")
+        city_id = self.ids.city_id(city_name)
+        return self.ids.institution_id(city_id, institution_name) if city_id is not None else None
     
     # ==================== READ OPERATIONS ====================
     
@@ -53,7 +120,10 @@ class SupabaseEmployeeManager:
         try:
             resp = requests.get(url, headers=self.headers, timeout=10)
             if resp.status_code == 200:
-                return resp.json()
+                cities = resp.json()
+                for city in cities:
+                    self._remember_city(city)
+                return cities
         except Exception as e:
             print(f"❌ Error fetching cities: {e}")
         
@@ -67,6 +137,8 @@ class SupabaseEmployeeManager:
             resp = requests.get(url, headers=self.headers, timeout=10)
             if resp.status_code == 200:
                 data = resp.json()
+                if data:
+                    self._remember_city(data[0])
                 return data[0] if data else None
         except Exception as e:
             print(f"❌ Error fetching city {city_name}: {e}")
@@ -80,7 +152,10 @@ class SupabaseEmployeeManager:
         try:
             resp = requests.get(url, headers=self.headers, timeout=10)
             if resp.status_code == 200:
-                return resp.json()
+                institutions = resp.json()
+                for institution in institutions:
+                    self._remember_institution(institution, city_id)
+                return institutions
         except Exception as e:
             print(f"❌ Error fetching institutions: {e}")
         
@@ -94,6 +169,8 @@ class SupabaseEmployeeManager:
             resp = requests.get(url, headers=self.headers, timeout=10)
             if resp.status_code == 200:
                 data = resp.json()
+                if data:
+                    self._remember_institution(data[0], city_id)
                 return data[0] if data else None
         except Exception as e:
             print(f"❌ Error fetching institution: {e}")
@@ -138,7 +215,9 @@ class SupabaseEmployeeManager:
             resp = requests.post(url, json=payload, headers=self.headers, timeout=10)
             if resp.status_code in [200, 201]:
                 result = resp.json()
-                return result[0] if isinstance(result, list) else result
+                city = result[0] if isinstance(result, list) else result
+                self._remember_city(city)
+                return city
         except Exception as e:
             print(f"❌ Error creating city: {e}")
         
@@ -153,12 +232,51 @@ class SupabaseEmployeeManager:
             resp = requests.post(url, json=payload, headers=self.headers, timeout=10)
             if resp.status_code in [200, 201]:
                 result = resp.json()
-                return result[0] if isinstance(result, list) else result
+                institution = result[0] if isinstance(result, list) else result
+                self._remember_institution(institution, city_id)
+                return institution
         except Exception as e:
             print(f"❌ Error creating institution: {e}")
         
         return None
     
+    def add_cities(self, city_names: List[str]) -> List[Dict]:
+        """Create many cities with one POST; returns the created rows (ids registered)"""
+        names = list(dict.fromkeys(n for n in city_names if n))
+        if not names:
+            return []
+        try:
+            resp = requests.post(f"{self.url}/rest/v1/cities", json=[{"name": n} for n in names],
+                                 headers=self.headers, timeout=15)
+            if resp.status_code in [200, 201]:
+                created = resp.json()
+                for city in created:
+                    self._remember_city(city)
+                return created
+            print(f"❌ Error creating cities: Status {resp.status_code}")
+        except Exception as e:
+            print(f"❌ Error creating cities: {e}")
+        return []
+    
+    def add_institutions(self, institutions: List[tuple]) -> List[Dict]:
+        """Create many institutions ((city_id, name) pairs, any cities) with one POST"""
+        pairs = list(dict.fromkeys((city_id, name) for city_id, name in institutions if city_id and name))
+        if not pairs:
+            return []
+        try:
+            resp = requests.post(f"{self.url}/rest/v1/institutions",
+                                 json=[{"city_id": city_id, "name": name} for city_id, name in pairs],
+                                 headers=self.headers, timeout=15)
+            if resp.status_code in [200, 201]:
+                created = resp.json()
+                for institution in created:
+                    self._remember_institution(institution)
+                return created
+            print(f"❌ Error creating institutions: Status {resp.status_code}")
+        except Exception as e:
+            print(f"❌ Error creating institutions: {e}")
+        return []
+    
     def add_employee(self, institution_id: int, employee_data: Dict) -> Optional[Dict]:
         """Create a new employee"""
         url = f"{self.url}/rest/v1/employees"
@@ -188,6 +306,95 @@ class SupabaseEmployeeManager:
         
         return None
     
+    def upsert_employees(self, records: List[Dict], chunk_size: int = 500, on_conflict: str = "id") -> int:
+        """Insert-or-update many employees with one POST ?on_conflict=... per chunk_size rows
+        on_conflict="id" (default) or UNIQUE_EMPLOYEE_KEY (see ADD_EMPLOYEES_UNIQUE_CONSTRAINT.sql)
+        Every record must carry the same keys (conflict columns + NOT NULL columns); returns rows written"""
+        written = 0
+        url = f"{self.url}/rest/v1/employees?on_conflict={on_conflict}"
+        headers = dict(self.headers, Prefer="resolution=merge-duplicates,return=minimal")
+        for start in range(0, len(records), chunk_size):
+            chunk = records[start:start + chunk_size]
+            try:
+                resp = requests.post(url, json=chunk, headers=headers, timeout=15)
+                if resp.status_code in [200, 201, 204]:
+                    written += len(chunk)
+                else:
+                    print(f"❌ Error upserting employees: Status {resp.status_code}")
+            except Exception as e:
+                print(f"❌ Error upserting employees: {e}")
+        return written
+    
+    def upsert_institution_employees(self, institution_id: int, rows: List[Dict], chunk_size: int = 500) -> Dict[str, Any]:
+        """
+        Write all app rows of an institution with one GET and bulk writes
+        - rows with an "id": upsert on id (a renamed DISCORD updates the same cloud row)
+        - rows without "id": matched by DISCORD then NUME IC -> upsert by id;
+          unmatched rows with DISCORD upsert on the (institution_id, discord_username) key,
+          the rest are inserted in one POST
+        - a row whose new DISCORD is already used by another employee of the institution
+          would break uq_employees_institution_discord for its whole chunk: it is held back
+          and returned in "conflicts" (the app rows, unchanged)
+        Returns {"upserted", "inserted", "failed", "conflicts", "total"} (failed = records not written)
+        """
+        now = datetime.now().isoformat()
+        index_rows = self.get_employees_by_institution(institution_id) if rows else []
+        index = self.build_employee_index(index_rows)
+
+        # Last row wins: a key repeated inside one statement is rejected by Postgres
+        by_id, keyed, new = {}, {}, []
+        for row in rows:
+            record = dict(self.format_employee_for_supabase(row), institution_id=institution_id, updated_at=now)
+            emp_id = row.get("id") or (self.match_employee(index, row) or {}).get("id")
+            if emp_id:
+                by_id[emp_id] = (row, dict(record, id=emp_id))
+            elif record["discord_username"]:
+                keyed[record["discord_username"]] = record
+            else:
+                new.append(record)
+
+        conflicts = self._discord_conflicts(index_rows, by_id, keyed)
+        for emp_id in conflicts:
+            print(f"⚠️ DISCORD '{by_id[emp_id][1]['discord_username']}' already used in institution "
+                  f"{institution_id} - employee {emp_id} not written")
+        conflict_rows = [by_id.pop(emp_id)[0] for emp_id in conflicts]
+
+        upserted = self.upsert_employees([record for _, record in by_id.values()], chunk_size)
+        upserted += self.upsert_employees(list(keyed.values()), chunk_size, on_conflict=UNIQUE_EMPLOYEE_KEY)
+        inserted = 0
+        for start in range(0, len(new), chunk_size):
+            chunk = new[start:start + chunk_size]
+            try:
+                resp = requests.post(f"{self.url}/rest/v1/employees", json=chunk,
+                                     headers=dict(self.headers, Prefer="return=minimal"), timeout=15)
+                if resp.status_code in [200, 201, 204]:
+                    inserted += len(chunk)
+                else:
+                    print(f"❌ Error inserting employees: Status {resp.status_code}")
+            except Exception as e:
+                print(f"❌ Error inserting employees: {e}")
+        failed = len(by_id) + len(keyed) + len(new) - upserted - inserted
+        return {"upserted": upserted, "inserted": inserted, "failed": failed,
+                "conflicts": conflict_rows, "total": len(rows)}
+
+    @staticmethod
+    def _discord_conflicts(employees: List[Dict], by_id: Dict[Any, tuple], keyed: Dict[str, Dict]) -> List[Any]:
+        """
+        IDs in by_id whose DISCORD changed to one another employee ends up with
+        (cloud rows not in the batch keep theirs; keyed rows claim theirs)
+        """
+        current = {emp.get("id"): str(emp.get("discord_username") or "").strip() for emp in employees}
+        final = dict(current)
+        final.update({emp_id: record["discord_username"] or "" for emp_id, (_, record) in by_id.items()})
+        owners = {}
+        for emp_id, discord in final.items():
+            if discord:
+                owners.setdefault(discord, []).append(emp_id)
+        for discord in keyed:
+            owners.setdefault(discord, []).append(None)
+        shared = {emp_id for ids in owners.values() if len(ids) > 1 for emp_id in ids}
+        return [emp_id for emp_id in by_id if emp_id in shared and final[emp_id] != current.get(emp_id)]
+    
     def delete_employee(self, employee_id: int) -> bool:
         """Delete an employee"""
         url = f"{self.url}/rest/v1/employees?id=eq.{employee_id}"
@@ -200,6 +407,26 @@ class SupabaseEmployeeManager:
         
         return False
     
+    def delete_employees(self, employee_ids: List[int], chunk_size: int = 200) -> int:
+        """Delete many employees with id=in.(...) - one request per chunk_size IDs
+        Returns the number of employees deleted"""
+        ids = list(dict.fromkeys(i for i in employee_ids if i is not None))
+        deleted = 0
+        for start in range(0, len(ids), chunk_size):
+            chunk = ids[start:start + chunk_size]
+            url = f"{self.url}/rest/v1/employees?id=in.({','.join(str(i) for i in chunk)})"
+            try:
+                resp = requests.delete(url, headers=self.headers, timeout=15)
+                if resp.status_code == 200 and resp.text:
+                    deleted += len(resp.json())
+                elif resp.status_code in [200, 204]:
+                    deleted += len(chunk)
+                else:
+                    print(f"❌ Error deleting employees: Status {resp.status_code}")
+            except Exception as e:
+                print(f"❌ Error deleting employees: {e}")
+        return deleted
+    
     def delete_institution(self, institution_id: int) -> bool:
         """Delete an institution (and all its employees cascade)"""
         url = f"{self.url}/rest/v1/institutions?id=eq.{institution_id}"
@@ -207,6 +434,7 @@ class SupabaseEmployeeManager:
         try:
             resp = requests.delete(url, headers=self.headers, timeout=10)
             if resp.status_code in [200, 204]:
+                self._forget_institution(institution_id)
                 print(f"✓ Institution deleted from Supabase (ID: {institution_id})")
                 return True
             else:
@@ -223,6 +451,7 @@ class SupabaseEmployeeManager:
         try:
             resp = requests.delete(url, headers=self.headers, timeout=10)
             if resp.status_code in [200, 204]:
+                self._forget_city(city_id)
                 print(f"✓ City deleted from Supabase (ID: {city_id})")
                 return True
             else:
@@ -234,19 +463,106 @@ class SupabaseEmployeeManager:
     
     # ==================== HELPER METHODS ====================
     
-    def get_full_structure(self) -> Dict:
-        """Get full structure: cities -> institutions -> employees"""
-        structure = {}
+    @staticmethod
+    def build_employee_index(employees: List[Dict]) -> Dict[tuple, Dict]:
+        """Index Supabase employees by ("discord", username) and ("name", employee_name)"""
+        index = {}
+        for emp in employees:
+            discord = str(emp.get("discord_username") or "").strip()
+            name = str(emp.get("employee_name") or "").strip()
+            if discord:
+                index.setdefault(("discord", discord), emp)
+            if name:
+                index.setdefault(("name", name), emp)
+        return index
+    
+    @staticmethod
+    def match_employee(index: Dict[tuple, Dict], row: Dict) -> Optional[Dict]:
+        """Find the Supabase employee of an app row (DISCORD first, then NUME IC)"""
+        discord = str(row.get("DISCORD") or "").strip()
+        name = str(row.get("NUME IC") or "").strip()
+        return (discord and index.get(("discord", discord))) or (name and index.get(("name", name))) or None
+    
+    def find_employee_ids(self, institution_id: int, rows: List[Dict]) -> tuple:
+        """Supabase IDs for app rows with one GET - returns (ids, unmatched_rows)"""
+        index = self.build_employee_index(self.get_employees_by_institution(institution_id))
+        ids, unmatched = [], []
+        for row in rows:
+            emp = self.match_employee(index, row)
+            if emp:
+                ids.append(emp.get("id"))
+            else:
+                unmatched.append(row)
+        return ids, unmatched
+    
+    # ==================== BULK READS (resource embedding) ====================
+    
+    def get_institution_employees(self, city_name: str, institution_name: str) -> Optional[Dict]:
+        """
+        One institution with its employees in a single request
+        (cities?select=id,name,institutions(id,name,employees(*)) filtered on both names)
+        Returns {"city_id", "institution_id", "employees"} or None when city/institution don't exist
+        """
+        params = {
+            "select": "id,name,institutions(id,name,employees(*))",
+            "name": f"eq.{city_name}",
+            "institutions.name": f"eq.{institution_name}",
+            "institutions.employees.order": "employee_name.asc",
+        }
+        try:
+            resp = requests.get(f"{self.url}/rest/v1/cities", params=params, headers=self.headers, timeout=15)
+            if resp.status_code == 200:
+                for city in resp.json():
+                    self._remember_city(city)
+                    for institution in city.get("institutions") or []:
+                        self._remember_institution(institution, city["id"])
+                        return {"city_id": city["id"], "institution_id": institution["id"],
+                                "employees": institution.get("employees") or []}
+            else:
+                print(f"❌ Error fetching {city_name}/{institution_name}: Status {resp.status_code}")
+        except Exception as e:
+            print(f"❌ Error fetching {city_name}/{institution_name}: {e}")
+        return None
+    
+    def _iter_institution_pages(self, cities: List[Dict], page_size: int) -> Iterator[Tuple[str, str, List[Dict]]]:
+        names = {city["id"]: city["name"] for city in cities}
+        last_id = None
+        while True:
+            params = {"select": "id,name,city_id,employees(*)", "order": "id.asc", "limit": page_size,
+                      "employees.order": "employee_name.asc"}
+            if last_id is not None:
+                params["id"] = f"gt.{last_id}"     # keyset paging: stable while rows are added
+            try:
+                resp = requests.get(f"{self.url}/rest/v1/institutions", params=params, headers=self.headers, timeout=30)
+            except Exception as e:
+                print(f"❌ Error fetching institutions page: {e}")
+                return
+            if resp.status_code != 200:
+                print(f"❌ Error fetching institutions page: Status {resp.status_code}")
+                return
+            page = resp.json()
+            for institution in page:
+                self._remember_institution(institution)
+                city_name = names.get(institution.get("city_id"))
+                if city_name is not None:       # city created after the cities request
+                    yield city_name, institution["name"], institution.get("employees") or []
+            if len(page) < page_size:
+                return
+            last_id = page[-1]["id"]
+    
+    def iter_structure(self, page_size: int = STRUCTURE_PAGE_SIZE) -> Iterator[Tuple[str, str, List[Dict]]]:
+        """Stream (city, institution, employees) - one cities request, then pages of
+        page_size institutions with their employees embedded"""
+        return self._iter_institution_pages(self.get_all_cities(), page_size)
+    
+    def get_full_structure(self, page_size: int = STRUCTURE_PAGE_SIZE) -> Dict:
+        """Get full structure: cities -> institutions -> employees
+        1 + ceil(institutions / page_size) requests instead of one per city and per institution"""
+        cities = self.get_all_cities()
+        structure = {city['name']: {} for city in cities}
         
-        for city in self.get_all_cities():
-            city_id = city['id']
-            city_name = city['name']
-            structure[city_name] = {}
-            
-            for institution in self.get_institutions_by_city(city_id):
-                inst_id = institution['id']
-                inst_name = institution['name']
-                structure[city_name][inst_name] = self.get_employees_by_institution(inst_id)
+        for city_name, inst_name, employees in self._iter_institution_pages(cities, page_size):
+            structure[city_name][inst_name] = employees
         
         return structure
     
@@ -254,7 +570,7 @@ class SupabaseEmployeeManager:
         """Format Supabase employee to app format"""
         return {
             "id": emp.get("id"),  # IMPORTANT: Preserve for delete operations
-            "DISCORD": emp.get("discord_username", ""),
+            "DISCORD": emp.get("discord_username") or "",
             "NUME IC": emp.get("employee_name", ""),
             "RANK": emp.get("rank", ""),
             "ROLE": emp.get("role", ""),
@@ -265,12 +581,13 @@ class SupabaseEmployeeManager:
     
     def format_employee_for_supabase(self, emp: Dict) -> Dict:
         """Format app employee to Supabase format"""
+        # Empty DISCORD -> NULL: NULLs never collide on the (institution_id, discord_username) key
         return {
-            "discord_username": emp.get("DISCORD", ""),
+            "discord_username": str(emp.get("DISCORD") or "").strip() or None,
             "employee_name": emp.get("NUME IC", ""),
             "rank": emp.get("RANK", ""),
             "role": emp.get("ROLE", ""),
-            "points": int(emp.get("PUNCTAJ", 0)),
+            "points": int(emp.get("PUNCTAJ", 0) or 0),
             "id_card_series": emp.get("SERIE DE BULETIN", "")
         }
 
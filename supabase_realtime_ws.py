@@ -2,24 +2,90 @@
 """
 Supabase Real-time WebSocket Manager
 Handles real-time data sync via WebSocket for instant updates
+
+- one asyncio loop reads the socket; events are coalesced per (table, id)
+- one dispatcher thread runs the callbacks in order (no thread per message)
+- bounded pending set: the reader stops reading when full (backpressure)
+- unlimited jittered reconnects, resubscribe, REST backfill of the gap
+- MainThreadHandoff: batched hand-off to the Tk thread (root.after)
 """
 
 import threading
 import time
 import json
+import random
 import asyncio
-from datetime import datetime
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
 from typing import Dict, Any, Callable, Optional, List
 import sys
 
 try:
     import websockets
-    import websockets.client
+    try:
+        from websockets.asyncio.client import connect as ws_connect
+    except ImportError:  # websockets < 13
+        from websockets.client import connect as ws_connect
     WEBSOCKETS_AVAILABLE = True
 except ImportError:
     WEBSOCKETS_AVAILABLE = False
     print("⚠️  websockets not installed. Run: pip install websockets")
 
+try:
+    import requests
+    REQUESTS_AVAILABLE = True
+except ImportError:
+    REQUESTS_AVAILABLE = False
+
+
+class MainThreadHandoff:
+    """
+    Runs callables submitted from background threads on the UI thread, in batches
+    One schedule() call (e.g. root.after) per burst instead of one per event
+
+    Usage:
+        handoff = MainThreadHandoff(lambda fn: root.after(0, fn))
+        handoff.submit(apply_patch, patch)
+        handoff.submit(resort, tree, key=("sort", city, institution))  # deduplicated, runs last
+    """
+    
+    def __init__(self, schedule: Callable[[Callable[[], None]], Any]):
+        self.schedule = schedule
+        self._lock = threading.Lock()
+        self._calls: List[tuple] = []
+        self._scheduled = False
+        self.handoffs = 0
+        self.calls = 0
+    
+    def submit(self, func: Callable, *args, key=None):
+        """Queue func(*args); a keyed call replaces its pending duplicate and moves to the end"""
+        with self._lock:
+            if key is not None:
+                self._calls = [c for c in self._calls if c[0] != key]
+            self._calls.append((key, func, args))
+            if self._scheduled:
+                return
+            self._scheduled = True
+            self.handoffs += 1
+        try:
+            self.schedule(self._flush)
+        except Exception as e:
+            with self._lock:
+                self._scheduled = False
+            print(f"❌ UI hand-off failed: {e}")
+    
+    def _flush(self):
+        with self._lock:
+            calls, self._calls = self._calls, []
+            self._scheduled = False
+        for _, func, args in calls:
+            self.calls += 1
+            try:
+                func(*args)
+            except Exception as e:
+                print(f"❌ Error in UI callback: {e}")
+
 
 class SupabaseRealtimeWS:
     """
@@ -27,7 +93,8 @@ class SupabaseRealtimeWS:
     Automatically syncs data across multiple devices instantly
     """
     
-    def __init__(self, url: str, key: str, tables: List[str] = None):
+    def __init__(self, url: str, key: str, tables: List[str] = None, ws_url: str = None,
+                 max_pending: int = 10000, backfill_margin: float = 30.0):
         """
         Initialize WebSocket manager
         
@@ -35,6 +102,9 @@ class SupabaseRealtimeWS:
             url: Supabase URL
             key: Supabase API key
             tables: List of tables to listen to (e.g., ['employees', 'institutions'])
+            ws_url: Override the realtime endpoint (default: derived from url)
+            max_pending: Distinct pending (table, id) keys before the reader stops reading (backpressure)
+            backfill_margin: Seconds re-fetched before the last seen event after a reconnect
         """
         if not WEBSOCKETS_AVAILABLE:
             print("❌ websockets library not available - real-time sync disabled")
@@ -47,19 +117,43 @@ class SupabaseRealtimeWS:
         self.tables = tables or ['employees', 'institutions', 'cities']
         
         # Extract WebSocket URL from REST API URL
-        self.ws_url = self._get_ws_url(url)
+        self.ws_url = ws_url or self._get_ws_url(url)
         
-        # Connection state
+        # Connection state - reconnects forever with jittered exponential backoff
         self.ws = None
         self.connected = False
         self.reconnect_attempts = 0
-        self.max_reconnect_attempts = 5
         self.reconnect_delay = 2
+        self.max_reconnect_delay = 60
+        self.backfill_margin = backfill_margin
+        self._synced_until: Optional[float] = None
         
         # Thread control
         self.ws_thread = None
         self.stop_event = threading.Event()
         self.loop = None
+        self._stopping = None
+        
+        # Dispatcher: pending events coalesced per (table, id), delivered in order
+        # by one worker thread (never one thread per message)
+        self.max_pending = max(1, max_pending)
+        self._pending: "OrderedDict[tuple, tuple]" = OrderedDict()
+        self._seq = 0
+        self._wakeup = None
+        self._space = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="RealtimeDispatch")
+        self.metrics = {
+            "received": 0,
+            "coalesced": 0,
+            "delivered": 0,
+            "batches": 0,
+            "last_batch_size": 0,
+            "max_queue_depth": 0,
+            "backpressure_waits": 0,
+            "backpressure_ms": 0.0,
+            "reconnects": 0,
+            "backfilled": 0,
+        }
         
         # Callbacks for UI updates
         self.on_insert_callbacks: Dict[str, Callable] = {}
@@ -87,7 +181,7 @@ class SupabaseRealtimeWS:
         Args:
             event_type: 'insert', 'update', or 'delete'
             table: Table name
-            callback: Function to call with payload
+            callback: Function to call with payload (runs on the dispatcher thread)
         """
         if event_type == "insert":
             self.on_insert_callbacks[table] = callback
@@ -110,78 +204,119 @@ class SupabaseRealtimeWS:
             return
         
         self.stop_event.clear()
-        self.ws_thread = threading.Thread(target=self._ws_loop, daemon=True)
+        self.ws_thread = threading.Thread(target=self._ws_loop, daemon=True, name="RealtimeWS")
         self.ws_thread.start()
         print("✅ WebSocket connection thread started")
     
     def stop(self):
         """Stop WebSocket connection"""
         self.stop_event.set()
-        if self.ws_thread:
+        if self.loop and self.loop.is_running():
+            try:
+                self.loop.call_soon_threadsafe(self._request_stop)
+            except RuntimeError:
+                pass  # loop closed meanwhile
+        if self.ws_thread and self.ws_thread is not threading.current_thread():
             self.ws_thread.join(timeout=5)
-        if self.loop:
-            self.loop.call_soon_threadsafe(self.loop.stop)
         print("🛑 WebSocket stopped")
     
+    def _request_stop(self):
+        if self._stopping:
+            self._stopping.set()
+        if self._wakeup:
+            self._wakeup.set()
+        if self.ws is not None:
+            asyncio.ensure_future(self.ws.close())
+    
+    # ==================== CONNECTION ====================
+    
     def _ws_loop(self):
         """Main WebSocket loop running in background thread"""
         self.loop = asyncio.new_event_loop()
         asyncio.set_event_loop(self.loop)
+        try:
+            self.loop.run_until_complete(self._run())
+        finally:
+            self.loop.close()
+            self.loop = None
+    
+    async def _run(self):
+        self._stopping = asyncio.Event()
+        self._wakeup = asyncio.Event()
+        self._space = asyncio.Event()
+        self._space.set()
+        dispatcher = asyncio.ensure_future(self._dispatch_loop())
         
-        while not self.stop_event.is_set():
-            try:
-                self.loop.run_until_complete(self._connect_and_listen())
-            except Exception as e:
-                print(f"❌ WebSocket error: {e}")
-                if self.on_error_callback:
-                    self.on_error_callback(str(e))
-                
-                # Reconnect with backoff
-                if self.reconnect_attempts < self.max_reconnect_attempts:
-                    self.reconnect_attempts += 1
-                    wait_time = self.reconnect_delay * (2 ** (self.reconnect_attempts - 1))
-                    print(f"🔄 Reconnecting in {wait_time}s (attempt {self.reconnect_attempts}/{self.max_reconnect_attempts})")
-                    time.sleep(wait_time)
-                else:
-                    print(f"❌ Max reconnection attempts reached")
+        try:
+            while not self.stop_event.is_set():
+                try:
+                    await self._connect_and_listen()
+                except asyncio.CancelledError:
+                    break
+                except Exception as e:
+                    print(f"❌ WebSocket error: {e}")
+                    if self.on_error_callback:
+                        self.on_error_callback(str(e))
+                self.connected = False
+                self.ws = None
+                if self.stop_event.is_set():
                     break
+                
+                # Reconnect forever: exponential backoff, capped, with full jitter on the upper half
+                self.reconnect_attempts += 1
+                delay = min(self.max_reconnect_delay,
+                            self.reconnect_delay * (2 ** min(self.reconnect_attempts - 1, 10)))
+                wait_time = random.uniform(delay / 2, delay)
+                print(f"🔄 Reconnecting in {wait_time:.1f}s (attempt {self.reconnect_attempts})")
+                try:
+                    await asyncio.wait_for(self._stopping.wait(), timeout=wait_time)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            # Deliver what was already received, then stop the dispatcher
+            self._wakeup.set()
+            await asyncio.sleep(0)
+            dispatcher.cancel()
+            try:
+                await dispatcher
+            except asyncio.CancelledError:
+                pass
+            if self._pending:
+                await self.loop.run_in_executor(self._executor, self._deliver, self._take_batch())
     
     async def _connect_and_listen(self):
-        """Connect to WebSocket and listen for events"""
-        try:
-            async with websockets.client.connect(
-                self.ws_url,
-                subprotocols=["realtime"],
-                ping_interval=30,
-                ping_timeout=10
-            ) as ws:
-                self.ws = ws
-                self.connected = True
-                self.reconnect_attempts = 0
-                print(f"✅ WebSocket connected!")
-                
-                # Subscribe to table changes
-                await self._subscribe_to_tables()
-                
-                # Listen for messages
-                async for message in ws:
-                    if self.stop_event.is_set():
-                        break
-                    
-                    try:
-                        payload = json.loads(message)
-                        await self._handle_payload(payload)
-                    except json.JSONDecodeError:
-                        print(f"⚠️  Invalid JSON received: {message}")
-                    except Exception as e:
-                        print(f"❌ Error processing message: {e}")
-        
-        except asyncio.CancelledError:
-            print("🛑 WebSocket connection cancelled")
-        except Exception as e:
-            self.connected = False
-            print(f"❌ WebSocket connection error: {e}")
-            raise
+        """Connect, subscribe, backfill the gap after a reconnect, then listen"""
+        async with ws_connect(
+            self.ws_url,
+            subprotocols=["realtime"],
+            ping_interval=30,
+            ping_timeout=10
+        ) as ws:
+            self.ws = ws
+            self.connected = True
+            if self.reconnect_attempts:
+                self.metrics["reconnects"] += 1
+            self.reconnect_attempts = 0
+            print(f"✅ WebSocket connected!")
+            
+            # Subscribe to table changes
+            await self._subscribe_to_tables()
+            
+            gap_start = self._synced_until
+            self._synced_until = time.time()
+            if gap_start is not None:
+                await self._backfill(gap_start - self.backfill_margin)
+            
+            # Listen for messages
+            async for message in ws:
+                if self.stop_event.is_set():
+                    break
+                try:
+                    payload = json.loads(message)
+                except json.JSONDecodeError:
+                    print(f"⚠️  Invalid JSON received: {message}")
+                    continue
+                await self._handle_payload(payload)
     
     async def _subscribe_to_tables(self):
         """Subscribe to changes on all configured tables"""
@@ -196,40 +331,117 @@ class SupabaseRealtimeWS:
             await self.ws.send(json.dumps(subscribe_msg))
             print(f"📥 Subscribed to {table} changes")
     
-    async def _handle_payload(self, payload: Dict[str, Any]):
-        """Handle incoming WebSocket message"""
-        event_type = payload.get("type")
-        
-        if event_type in ["INSERT", "UPDATE", "DELETE"]:
-            new_record = payload.get("data", {})
-            old_record = payload.get("old_record", {})
-            table = payload.get("table", "unknown")
-            
-            if event_type == "INSERT" and table in self.on_insert_callbacks:
-                callback = self.on_insert_callbacks[table]
-                print(f"✅ INSERT in {table}: {new_record.get('id', 'N/A')}")
-                self._run_callback(callback, new_record)
-            
-            elif event_type == "UPDATE" and table in self.on_update_callbacks:
-                callback = self.on_update_callbacks[table]
-                print(f"🔄 UPDATE in {table}: {new_record.get('id', 'N/A')}")
-                self._run_callback(callback, new_record)
-            
-            elif event_type == "DELETE" and table in self.on_delete_callbacks:
-                callback = self.on_delete_callbacks[table]
-                print(f"❌ DELETE in {table}: {old_record.get('id', 'N/A')}")
-                self._run_callback(callback, old_record)
-    
-    def _run_callback(self, callback: Callable, data: Dict[str, Any]):
-        """Run callback in a separate thread to not block WebSocket"""
-        def run():
+    async def _backfill(self, since: float):
+        """Re-fetch rows changed while disconnected (updated_at > since) and queue them as updates"""
+        if not REQUESTS_AVAILABLE:
+            return
+        since_iso = datetime.fromtimestamp(since, timezone.utc).isoformat()
+        for table in self.tables:
+            if table in self.on_update_callbacks:
+                event_type = "UPDATE"
+            elif table in self.on_insert_callbacks:
+                event_type = "INSERT"
+            else:
+                continue
+            rows = await self.loop.run_in_executor(None, self._fetch_changed_rows, table, since_iso)
+            for record in rows:
+                await self._enqueue(table, event_type, record)
+            self.metrics["backfilled"] += len(rows)
+            if rows:
+                print(f"📥 Backfilled {len(rows)} {table} changes missed while disconnected")
+    
+    def _fetch_changed_rows(self, table: str, since_iso: str, page_size: int = 1000) -> List[Dict[str, Any]]:
+        headers = {"apikey": self.key, "Authorization": f"Bearer {self.key}"}
+        rows, offset = [], 0
+        while True:
             try:
-                callback(data)
+                response = requests.get(
+                    f"{self.url.rstrip('/')}/rest/v1/{table}",
+                    params={"updated_at": f"gt.{since_iso}", "order": "updated_at.asc",
+                            "limit": page_size, "offset": offset},
+                    headers=headers, timeout=15
+                )
             except Exception as e:
-                print(f"❌ Error in callback: {e}")
+                print(f"⚠️  Backfill of {table} failed: {e}")
+                return rows
+            if response.status_code != 200:
+                return rows  # e.g. table without updated_at
+            page = response.json()
+            rows.extend(page)
+            if len(page) < page_size:
+                return rows
+            offset += page_size
+    
+    # ==================== DISPATCHER ====================
+    
+    async def _handle_payload(self, payload: Dict[str, Any]):
+        """Queue an INSERT / UPDATE / DELETE message for the dispatcher"""
+        event_type = payload.get("type")
+        if event_type not in ("INSERT", "UPDATE", "DELETE"):
+            return
+        table = payload.get("table", "unknown")
+        record = payload.get("old_record", {}) if event_type == "DELETE" else payload.get("data", {})
+        self._synced_until = time.time()
+        await self._enqueue(table, event_type, record or {})
+    
+    async def _enqueue(self, table: str, event_type: str, record: Dict[str, Any]):
+        """Coalesce per (table, id): only the latest event of a row is delivered"""
+        self.metrics["received"] += 1
+        record_id = record.get("id")
+        if record_id is None:
+            self._seq += 1
+            key = (table, None, self._seq)
+        else:
+            key = (table, record_id)
         
-        thread = threading.Thread(target=run, daemon=True)
-        thread.start()
+        if key in self._pending:
+            self._pending[key] = (event_type, record)
+            self.metrics["coalesced"] += 1
+        else:
+            # Backpressure: stop reading the socket until the dispatcher catches up
+            while len(self._pending) >= self.max_pending:
+                self._space.clear()
+                self.metrics["backpressure_waits"] += 1
+                started = time.perf_counter()
+                await self._space.wait()
+                self.metrics["backpressure_ms"] += (time.perf_counter() - started) * 1000
+            self._pending[key] = (event_type, record)
+            self.metrics["max_queue_depth"] = max(self.metrics["max_queue_depth"], len(self._pending))
+        self._wakeup.set()
+    
+    def _take_batch(self) -> List[tuple]:
+        batch = list(self._pending.items())
+        self._pending.clear()
+        self._space.set()
+        return batch
+    
+    async def _dispatch_loop(self):
+        """Single consumer: each key has at most one event pending and one in flight"""
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            if not self._pending:
+                continue
+            batch = self._take_batch()
+            await self.loop.run_in_executor(self._executor, self._deliver, batch)
+    
+    def _deliver(self, batch: List[tuple]):
+        """Run callbacks for one batch, in arrival order (dispatcher thread)"""
+        callbacks_by_type = {
+            "INSERT": self.on_insert_callbacks,
+            "UPDATE": self.on_update_callbacks,
+            "DELETE": self.on_delete_callbacks,
+        }
+        for key, (event_type, record) in batch:
+            callback = callbacks_by_type[event_type].get(key[0])
+            if callback:
+                try:
+                    callback(record)
+                except Exception as e:
+                    print(f"❌ Error in callback: {e}")
+            self.metrics["delivered"] += 1
+        self.metrics["batches"] += 1
+        self.metrics["last_batch_size"] = len(batch)
     
     def get_status(self) -> Dict[str, Any]:
         """Get WebSocket connection status"""
@@ -241,14 +453,16 @@ class SupabaseRealtimeWS:
             "reconnect_attempts": self.reconnect_attempts,
             "insert_callbacks": len(self.on_insert_callbacks),
             "update_callbacks": len(self.on_update_callbacks),
-            "delete_callbacks": len(self.on_delete_callbacks)
+            "delete_callbacks": len(self.on_delete_callbacks),
+            "queue_depth": len(self._pending),
+            "metrics": dict(self.metrics),
         }
 
 
-def create_realtime_ws_manager(url: str, key: str, tables: List[str] = None) -> Optional[SupabaseRealtimeWS]:
+def create_realtime_ws_manager(url: str, key: str, tables: List[str] = None, **kwargs) -> Optional[SupabaseRealtimeWS]:
     """Factory function to create WebSocket manager"""
     if not WEBSOCKETS_AVAILABLE:
         print("❌ websockets library not installed")
         return None
     
-    return SupabaseRealtimeWS(url, key, tables)
+    return SupabaseRealtimeWS(url, key, tables, **kwargs)
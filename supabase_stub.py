@@ -0,0 +1,432 @@
+#!/usr/bin/env python3
+"""
+Local Supabase / PostgREST stub for tests and benchmarks
+In-memory tables served over HTTP on 127.0.0.1 - no network, no credentials
+
+Supports the subset of PostgREST used by the app:
+    GET    /rest/v1/<table>?col=eq.x&select=a,b&order=col.asc&limit=N&offset=M
+    POST   /rest/v1/<table>               (insert, or upsert with
+                                           Prefer: resolution=merge-duplicates
+                                           and ?on_conflict=col1,col2)
+    PATCH  /rest/v1/<table>?filters       (update matching rows)
+    DELETE /rest/v1/<table>?filters       (delete matching rows)
+
+Filters: eq, neq, gt, gte, lt, lte, in.(a,b,c), is.null
+
+Resource embedding (GET): select=id,name,institutions(id,name,employees(*))
+    one-to-many when the child has <parent singular>_id (cities -> institutions.city_id),
+    many-to-one when the row has <child singular>_id (institutions -> cities(name));
+    embedded filters / order / limit as PostgREST: institutions.name=eq.X,
+    institutions.employees.order=employee_name.asc
+
+RealtimeStub: local websocket endpoint speaking the message format of
+supabase_realtime_ws (SUBSCRIBE in, {"type": "UPDATE", "table", "data"} out),
+used to replay event bursts and to drop connections
+"""
+
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qsl
+from typing import Dict, List, Any, Optional
+
+try:
+    from websockets.asyncio.server import serve as ws_serve
+    WEBSOCKETS_AVAILABLE = True
+except ImportError:
+    WEBSOCKETS_AVAILABLE = False
+
+
+def _coerce(value: Any):
+    """Compare numbers as numbers, everything else as strings"""
+    if isinstance(value, bool) or value is None:
+        return value
+    if isinstance(value, (int, float)):
+        return value
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        pass
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return str(value)
+
+
+def _singular(table: str) -> str:
+    if table.endswith("ies"):
+        return table[:-3] + "y"
+    return table[:-1] if table.endswith("s") else table
+
+
+def _split_select(select: str) -> List[str]:
+    """Split a select list on top-level commas (embedded selects keep their parentheses)"""
+    items, depth, current = [], 0, ""
+    for ch in select:
+        if ch == "," and depth == 0:
+            items.append(current.strip())
+            current = ""
+            continue
+        depth += (ch == "(") - (ch == ")")
+        current += ch
+    if current.strip():
+        items.append(current.strip())
+    return items
+
+
+def _parse_select(select: str):
+    """ -> (columns, [(embedded table, its select)]); aliases / !hints are dropped"""
+    columns, embeds = [], []
+    for item in _split_select(select or "*"):
+        if "(" in item:
+            name, _, inner = item.partition("(")
+            name = name.split(":")[-1].split("!")[0].strip()
+            embeds.append((name, inner[:-1] if inner.endswith(")") else inner))
+        else:
+            columns.append(item)
+    return columns, embeds
+
+
+def _match(row: Dict[str, Any], column: str, expr: str) -> bool:
+    op, _, raw = expr.partition(".")
+    current = row.get(column)
+
+    if op == "is":
+        return current is None if raw == "null" else str(current).lower() == raw
+    if op == "in":
+        options = [o.strip().strip('"') for o in raw.strip("()").split(",") if o.strip()]
+        return str(current) in options or _coerce(current) in [_coerce(o) for o in options]
+    if current is None:
+        return False
+
+    left, right = _coerce(current), _coerce(raw)
+    if type(left) is not type(right):
+        left, right = str(current), raw
+    if op == "eq":
+        return left == right
+    if op == "neq":
+        return left != right
+    if op == "gt":
+        return left > right
+    if op == "gte":
+        return left >= right
+    if op == "lt":
+        return left < right
+    if op == "lte":
+        return left <= right
+    return False
+
+
+class SupabaseStub:
+    """
+    In-memory PostgREST stand-in
+
+    Usage:
+        with SupabaseStub(unique={"discord_users": ["discord_id"]}) as stub:
+            requests.get(f"{stub.url}/rest/v1/discord_users")
+            stub.request_count("POST", "discord_users")
+    """
+
+    RESERVED_PARAMS = {"select", "order", "limit", "offset", "on_conflict"}
+
+    def __init__(self, unique: Optional[Dict[str, List[str]]] = None):
+        self.tables: Dict[str, List[Dict[str, Any]]] = {}
+        self.unique = unique or {}
+        self.requests: List[tuple] = []
+        self._next_id: Dict[str, int] = {}
+        self._lock = threading.RLock()
+        self._server = None
+        self._thread = None
+        self.url = None
+
+    # ==================== TABLE HELPERS ====================
+
+    def seed(self, table: str, rows: List[Dict[str, Any]]):
+        """Insert rows directly (not counted as requests)"""
+        with self._lock:
+            for row in rows:
+                self._insert(table, dict(row))
+
+    def rows(self, table: str) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [dict(r) for r in self.tables.get(table, [])]
+
+    def request_count(self, method: Optional[str] = None, table: Optional[str] = None) -> int:
+        with self._lock:
+            return sum(
+                1 for m, t in self.requests
+                if (method is None or m == method) and (table is None or t == table)
+            )
+
+    def reset_counters(self):
+        with self._lock:
+            self.requests.clear()
+
+    def _insert(self, table: str, row: Dict[str, Any]) -> Dict[str, Any]:
+        rows = self.tables.setdefault(table, [])
+        if row.get("id") is None:
+            self._next_id[table] = self._next_id.get(table, 0) + 1
+            row["id"] = self._next_id[table]
+        elif isinstance(_coerce(row["id"]), int):
+            self._next_id[table] = max(self._next_id.get(table, 0), _coerce(row["id"]))
+        rows.append(row)
+        return row
+
+    def _conflict_index(self, table: str, columns: List[str]) -> Dict[tuple, Dict[str, Any]]:
+        if not columns:
+            return {}
+        # NULL never equals NULL in a unique key (Postgres semantics)
+        return {tuple(str(r.get(c)) for c in columns): r for r in self.tables.get(table, [])
+                if all(r.get(c) is not None for c in columns)}
+
+    def _filter(self, table: str, params: List[tuple]) -> List[Dict[str, Any]]:
+        result = self.tables.get(table, [])
+        for column, expr in params:
+            if column in self.RESERVED_PARAMS or "." in column:
+                continue
+            result = [r for r in result if _match(r, column, expr)]
+        return result
+
+    @staticmethod
+    def _order_and_page(rows: List[Dict[str, Any]], options: Dict[str, str]) -> List[Dict[str, Any]]:
+        order = options.get("order")
+        if order:
+            for clause in reversed(order.split(",")):
+                column, _, direction = clause.partition(".")
+                rows.sort(
+                    key=lambda r: (r.get(column) is None, _coerce(r.get(column)) if r.get(column) is not None else 0),
+                    reverse=direction.startswith("desc"),
+                )
+        offset = int(options.get("offset", 0) or 0)
+        limit = options.get("limit")
+        return rows[offset:offset + int(limit)] if limit else rows[offset:]
+
+    def _shape(self, table: str, rows: List[Dict[str, Any]], select: str,
+               params: List[tuple], path: str = "") -> List[Dict[str, Any]]:
+        """Apply select (columns + embedded resources) to already filtered rows"""
+        columns, embeds = _parse_select(select)
+        shaped = [dict(r) if "*" in columns else {c: r.get(c) for c in columns} for r in rows]
+        for child, child_select in embeds:
+            prefix = f"{path}{child}."
+            child_params = [(k[len(prefix):], v) for k, v in params
+                            if k.startswith(prefix) and "." not in k[len(prefix):]]
+            child_options = dict(child_params)
+            children = self._filter(child, child_params)
+            many_to_one = f"{_singular(child)}_id"
+            if rows and many_to_one in rows[0]:
+                by_id = {str(c.get("id")): c for c in children}
+                for row, item in zip(rows, shaped):
+                    parent = by_id.get(str(row.get(many_to_one)))
+                    item[child] = (self._shape(child, [parent], child_select, params, prefix)[0]
+                                   if parent is not None else None)
+                continue
+            foreign_key = f"{_singular(table)}_id"
+            groups: Dict[str, List[Dict[str, Any]]] = {}
+            for c in children:
+                groups.setdefault(str(c.get(foreign_key)), []).append(c)
+            for row, item in zip(rows, shaped):
+                group = self._order_and_page(list(groups.get(str(row.get("id")), [])), child_options)
+                item[child] = self._shape(child, group, child_select, params, prefix)
+        return shaped
+
+    # ==================== HTTP HANDLING ====================
+
+    def handle(self, method: str, path: str, query: str, headers: Dict[str, str], body: bytes):
+        """Return (status, payload) for one request"""
+        parts = path.strip("/").split("/")
+        if len(parts) < 3 or parts[0] != "rest" or parts[1] != "v1":
+            return 404, {"message": "not found"}
+        table = parts[2]
+        params = parse_qsl(query, keep_blank_values=True)
+        options = dict(params)
+        prefer = headers.get("Prefer", "") or headers.get("prefer", "")
+
+        with self._lock:
+            self.requests.append((method, table))
+
+            if method == "GET":
+                rows = self._order_and_page(list(self._filter(table, params)), options)
+                return 200, self._shape(table, rows, options.get("select", "*") or "*", params)
+
+            payload = json.loads(body.decode("utf-8")) if body else None
+
+            if method == "POST":
+                items = payload if isinstance(payload, list) else [payload]
+                upsert = "resolution=merge-duplicates" in prefer
+                conflict_cols = options.get("on_conflict", "")
+                conflict_cols = [c for c in conflict_cols.split(",") if c] or self.unique.get(table, [])
+                index = self._conflict_index(table, conflict_cols)
+                written = []
+                for item in items:
+                    key = tuple(str(item.get(c)) for c in conflict_cols)
+                    keyed = bool(conflict_cols) and all(item.get(c) is not None for c in conflict_cols)
+                    existing = index.get(key) if keyed else None
+                    if existing is not None:
+                        if not upsert:
+                            return 409, {"code": "23505", "message": "duplicate key value violates unique constraint"}
+                        existing.update(item)
+                        written.append(existing)
+                    else:
+                        row = self._insert(table, dict(item))
+                        if keyed:
+                            index[key] = row
+                        written.append(row)
+                return 201, [dict(r) for r in written]
+
+            if method == "PATCH":
+                matched = self._filter(table, params)
+                for row in matched:
+                    row.update(payload or {})
+                return 200, [dict(r) for r in matched]
+
+            if method == "DELETE":
+                matched = self._filter(table, params)
+                ids = {id(r) for r in matched}
+                self.tables[table] = [r for r in self.tables.get(table, []) if id(r) not in ids]
+                if "return=representation" in prefer:
+                    return 200, [dict(r) for r in matched]
+                return 204, None
+
+        return 405, {"message": "method not allowed"}
+
+    def _make_handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def _dispatch(self):
+                split = urlsplit(self.path)
+                length = int(self.headers.get("Content-Length", 0) or 0)
+                body = self.rfile.read(length) if length else b""
+                status, payload = stub.handle(self.command, split.path, split.query, dict(self.headers), body)
+                data = b"" if payload is None else json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                if data:
+                    self.wfile.write(data)
+
+            do_GET = do_POST = do_PATCH = do_DELETE = _dispatch
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    # ==================== LIFECYCLE ====================
+
+    def start(self) -> "SupabaseStub":
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._make_handler())
+        self._server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self._server.server_address[1]}"
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+class RealtimeStub:
+    """
+    Usage:
+        with RealtimeStub() as rt:
+            manager = SupabaseRealtimeWS(url, key, ["employees"], ws_url=rt.url)
+            manager.start(); rt.wait_for_subscriptions(1)
+            rt.send_events([{"type": "UPDATE", "table": "employees", "data": {...}}])
+            rt.drop_connections()
+    """
+
+    def __init__(self):
+        self.url = None
+        self.connections = 0
+        self.subscriptions: List[str] = []
+        self._clients = set()
+        self._loop = None
+        self._server = None
+        self._thread = None
+        self._ready = threading.Event()
+        self._changed = threading.Condition()
+
+    async def _handler(self, websocket):
+        with self._changed:
+            self.connections += 1
+            self._changed.notify_all()
+        self._clients.add(websocket)
+        try:
+            async for message in websocket:
+                msg = json.loads(message)
+                if msg.get("type") == "SUBSCRIBE":
+                    with self._changed:
+                        self.subscriptions.append(msg.get("topic"))
+                        self._changed.notify_all()
+        except Exception:
+            pass
+        finally:
+            self._clients.discard(websocket)
+
+    async def _serve(self):
+        self._server = await ws_serve(self._handler, "127.0.0.1", 0, subprotocols=["realtime"])
+        port = next(iter(self._server.sockets)).getsockname()[1]
+        self.url = f"ws://127.0.0.1:{port}/realtime/v1"
+        self._ready.set()
+        await self._server.wait_closed()
+
+    def _run(self):
+        self._loop = asyncio.new_event_loop()
+        self._loop.run_until_complete(self._serve())
+        self._loop.close()
+
+    def _call(self, coro, timeout: float = 10):
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result(timeout)
+
+    def wait_for_subscriptions(self, count: int, timeout: float = 10) -> bool:
+        with self._changed:
+            return self._changed.wait_for(lambda: len(self.subscriptions) >= count, timeout)
+
+    def wait_for_connections(self, count: int, timeout: float = 10) -> bool:
+        with self._changed:
+            return self._changed.wait_for(lambda: self.connections >= count, timeout)
+
+    def send_events(self, events: List[Dict[str, Any]]):
+        """Send messages back-to-back to every connected client"""
+        async def send():
+            for client in list(self._clients):
+                for event in events:
+                    await client.send(json.dumps(event))
+        self._call(send())
+
+    def drop_connections(self):
+        """Close every client connection (server keeps listening)"""
+        async def drop():
+            for client in list(self._clients):
+                await client.close()
+        self._call(drop())
+
+    def start(self) -> "RealtimeStub":
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        self._ready.wait(10)
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            self._loop.call_soon_threadsafe(self._server.close)
+            self._thread.join(timeout=5)
+            self._server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
@@ -11,6 +11,7 @@ import time
 from datetime import datetime
 from typing import Dict, Any, Optional, List
 import configparser
+import logging
 import sys
 
 try:
@@ -33,6 +34,8 @@ except ImportError:
     WEBSOCKET_AVAILABLE = False
     print("⚠️  WebSocket support not available")
 
+logger = logging.getLogger(__name__)
+
 
 class SupabaseSync:
     """Manages synchronization with Supabase"""
@@ -112,6 +115,7 @@ class SupabaseSync:
         # Real-time WebSocket manager
         self.ws_manager: Optional[SupabaseRealtimeWS] = None
         self.ws_enabled = False
+        self.realtime_engine = None
         
         print(f"[OK] Supabase initialized: {self.url}")
         
@@ -166,52 +170,66 @@ class SupabaseSync:
         except Exception as e:
             print(f"❌ Failed to initialize WebSocket: {e}")
     
+    def attach_realtime_engine(self, engine):
+        """Employee events are applied locally by `engine` (realtime_apply.RealtimeApplyEngine)"""
+        self.realtime_engine = engine
+        if engine.resolver is None:
+            engine.resolver = self._resolve_institution
+    
+    def attach_id_registry(self, registry):
+        """cities / institutions events keep `registry` (id_registry.SupabaseIdRegistry) current"""
+        if not self.ws_manager:
+            return
+        for table in ("cities", "institutions"):
+            for event_type in ("insert", "update", "delete"):
+                def callback(record, table=table, event_type=event_type):
+                    registry.apply_event(table, event_type, record)
+                    if table == "institutions" and event_type == "update":
+                        self._on_institution_update(record)
+                self.ws_manager.register_callback(event_type, table, callback)
+    
+    def _resolve_institution(self, institution_id) -> Optional[tuple]:
+        """institution_id -> (city name, institution name) from Supabase"""
+        if not REQUESTS_AVAILABLE or not self.url:
+            return None
+        response = requests.get(
+            f"{self.url}/rest/v1/institutions",
+            params={"id": f"eq.{institution_id}", "select": "name,city_id"},
+            headers=self.headers, timeout=10
+        )
+        if response.status_code != 200 or not response.json():
+            return None
+        inst = response.json()[0]
+        response = requests.get(
+            f"{self.url}/rest/v1/cities",
+            params={"id": f"eq.{inst.get('city_id')}", "select": "name"},
+            headers=self.headers, timeout=10
+        )
+        if response.status_code != 200 or not response.json():
+            return None
+        return response.json()[0].get("name"), inst.get("name")
+    
+    def _apply_employee_event(self, event_type: str, record: Dict[str, Any]):
+        if not self.realtime_engine:
+            return
+        patch = self.realtime_engine.handle_event(event_type, record)
+        if patch:
+            print(f"   ✅ Applied to {patch['city']}/{patch['institution']}")
+    
     def _on_employee_insert(self, record: Dict[str, Any]):
-        """Callback when employee is inserted - sync to local files"""
+        """Callback when employee is inserted - patch local file and UI"""
         print(f"📥 NEW EMPLOYEE (real-time): {record.get('employee_name')} at {record.get('institution_id')}")
-        print(f"   📡 Broadcasting to all connected clients...")
-        
-        # Trigger remote data sync for all clients
-        try:
-            self._trigger_client_refresh("employee_insert", {
-                'employee_name': record.get('employee_name'),
-                'institution_id': record.get('institution_id'),
-                'points': record.get('points', 0),
-                'timestamp': datetime.now().isoformat()
-            })
-        except Exception as e:
-            print(f"   ⚠️ Failed to broadcast: {e}")
+        self._apply_employee_event("insert", record)
     
     def _on_employee_update(self, record: Dict[str, Any]):
-        """Callback when employee is updated - sync to local files"""
+        """Callback when employee is updated - patch local file and UI"""
         print(f"🔄 EMPLOYEE UPDATED (real-time): {record.get('employee_name')} - Points: {record.get('points', 0)}")
-        print(f"   📡 Broadcasting to all connected clients...")
-        
-        # Trigger remote data sync for all clients
-        try:
-            self._trigger_client_refresh("employee_update", {
-                'employee_name': record.get('employee_name'),
-                'institution_id': record.get('institution_id'),
-                'points': record.get('points', 0),
-                'timestamp': datetime.now().isoformat()
-            })
-        except Exception as e:
-            print(f"   ⚠️ Failed to broadcast: {e}")
+        self._apply_employee_event("update", record)
     
     def _on_employee_delete(self, record: Dict[str, Any]):
-        """Callback when employee is deleted - sync to local files"""
+        """Callback when employee is deleted - patch local file and UI"""
         print(f"❌ EMPLOYEE DELETED (real-time): {record.get('employee_name')}")
-        print(f"   📡 Broadcasting to all connected clients...")
-        
-        # Trigger remote data sync for all clients
-        try:
-            self._trigger_client_refresh("employee_delete", {
-                'employee_name': record.get('employee_name'),
-                'institution_id': record.get('institution_id'),
-                'timestamp': datetime.now().isoformat()
-            })
-        except Exception as e:
-            print(f"   ⚠️ Failed to broadcast: {e}")
+        self._apply_employee_event("delete", record)
     
     def _on_institution_update(self, record: Dict[str, Any]):
         """Callback when institution is updated - sync to local files"""
@@ -486,36 +504,37 @@ class SupabaseSync:
         
         Returns: True if sync was successful"""
         if not self.enabled:
-            print(f"⚠️  Supabase sync disabled")
+            logger.warning("⚠️  Supabase sync disabled")
             return False
         
-        print(f"🔐 SYNC_DATA: Starting for {city}/{institution}")
+        logger.debug("🔐 SYNC_DATA: Starting for %s/%s", city, institution)
         
         # ✅ CHECK IF USER IS SUPERUSER/ADMIN (highest priority)
         is_superuser_or_admin = self._is_user_superuser_or_admin(discord_auth_obj)
-        print(f"   👑 Is superuser/admin: {is_superuser_or_admin}")
+        logger.debug("👑 Is superuser/admin: %s", is_superuser_or_admin)
         
         # ULTRA-PERMISSIVE MODE: Allow by default
         allow_sync = True
         
         if not allow_sync:
-            print(f"   ❌ SYNC BLOCKED")
+            logger.error("❌ SYNC BLOCKED")
             return False
         
-        print(f"   ✅ SYNC ALLOWED (🔓 permissive mode)")
+        logger.debug("✅ SYNC ALLOWED (🔓 permissive mode)")
         
         try:
             # Extract employee data from the rows
             rows = data.get('rows', [])
             if not rows:
-                print(f"   ⚠️  No employee data to sync")
+                logger.warning("⚠️  No employee data to sync")
                 return False
             
             # 📊 LOG DATA BEING SYNCED (for debugging)
             employee_count = len(rows)
-            punctaj_values = [str(row.get('PUNCTAJ', 0)) for row in rows]
-            print(f"   📤 Syncing {employee_count} employees to Supabase")
-            print(f"      Punctaje: {', '.join(punctaj_values[:5])}" + (" ..." if len(punctaj_values) > 5 else ""))
+            logger.debug("📤 Syncing %s employees to Supabase", employee_count)
+            if logger.isEnabledFor(logging.DEBUG):
+                punctaj_values = [str(row.get('PUNCTAJ', 0)) for row in rows]
+                logger.debug("Punctaje: %s%s", ', '.join(punctaj_values[:5]), " ..." if len(punctaj_values) > 5 else "")
             
             # 📝 SYNC EACH EMPLOYEE'S PUNCTAJ TO THE employees TABLE
             synced_count = 0
@@ -525,7 +544,7 @@ class SupabaseSync:
                     emp_punctaj = employee_row.get('PUNCTAJ', 0)
                     
                     if not emp_name:
-                        print(f"      Row {i}: ⚠️  No employee name, skipping")
+                        logger.debug("Row %s: ⚠️  No employee name, skipping", i)
                         continue
                     
                     # Find employee in Supabase by name
@@ -533,13 +552,13 @@ class SupabaseSync:
                     response = requests.get(search_url, headers=self.headers, timeout=5)
                     
                     if response.status_code != 200:
-                        print(f"      Row {i}: ⚠️  Search failed for {emp_name}")
+                        logger.debug("Row %s: ⚠️  Search failed for %s", i, emp_name)
                         continue
                     
                     employees = response.json()
                     
                     if not employees:
-                        print(f"      Row {i}: ⚠️  Employee not found: {emp_name}")
+                        logger.debug("Row %s: ⚠️  Employee not found: %s", i, emp_name)
                         continue
                     
                     emp_id = employees[0]['id']
@@ -554,25 +573,23 @@ class SupabaseSync:
                     response = requests.patch(update_url, json=update_data, headers=self.headers, timeout=5)
                     
                     if response.status_code in [200, 204]:
-                        print(f"      Row {i}: ✅ {emp_name} → points={emp_punctaj}")
+                        logger.debug("Row %s: ✅ %s → points=%s", i, emp_name, emp_punctaj)
                         synced_count += 1
                     else:
-                        print(f"      Row {i}: ⚠️  Update failed (HTTP {response.status_code}) for {emp_name}")
+                        logger.debug("Row %s: ⚠️  Update failed (HTTP %s) for %s", i, response.status_code, emp_name)
                 
                 except Exception as e:
-                    print(f"      Row {i}: ❌ Error: {e}")
+                    logger.debug("Row %s: ❌ Error: %s", i, e)
             
             if synced_count > 0:
-                print(f"   ✅ SYNC SUCCESS: {synced_count}/{employee_count} employees updated")
+                logger.info("✅ SYNC SUCCESS: %s/%s employees updated", synced_count, employee_count)
                 return True
             else:
-                print(f"   ⚠️  No employees were synced")
+                logger.warning("⚠️  No employees were synced")
                 return False
         
         except Exception as e:
-            print(f"[ERROR] Failed to sync employee data: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Failed to sync employee data: %s", e)
             return False
     
     def get_remote_data(self, city: str = None, institution: str = None) -> Optional[Dict]:
@@ -6,12 +6,16 @@ Test if ActionLogger is being called and saves logs correctly
 
 import sys
 import os
+import tempfile
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from action_logger import ActionLogger
 from supabase_sync import SupabaseSync
 import json
 
+# Logs go to a temp dir so the test never touches tracked files
+LOGS_DIR = tempfile.mkdtemp(prefix="punctaj_logs_test_")
+
 print("=" * 70)
 print("🧪 TESTING ACTION LOGGER - SIMULATING ACTUAL USAGE")
 print("=" * 70)
@@ -30,9 +34,9 @@ except Exception as e:
 # Initialize ActionLogger
 print("\n2️⃣ Initializing ActionLogger...")
 try:
-    action_logger = ActionLogger(supabase_sync, logs_dir="logs_test")
+    action_logger = ActionLogger(supabase_sync, logs_dir=LOGS_DIR)
     print(f"   ✅ ActionLogger initialized")
-    print(f"   📋 Logs dir: {os.path.abspath('logs_test')}")
+    print(f"   📋 Logs dir: {LOGS_DIR}")
 except Exception as e:
     print(f"   ❌ Failed to initialize: {e}")
     sys.exit(1)
@@ -88,7 +92,7 @@ except Exception as e:
 
 # Check local logs
 print("\n5️⃣ Checking local logs...")
-logs_dir = os.path.abspath("logs_test")
+logs_dir = LOGS_DIR
 if os.path.exists(logs_dir):
     print(f"   ✅ logs_test folder exists")
     
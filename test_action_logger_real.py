@@ -11,13 +11,17 @@ class MockSupabaseSync:
         self.table_logs = "audit_logs"
 
 # Importa ActionLogger
+import tempfile
 from action_logger import ActionLogger
 
+# Logurile merg intr-un director temporar, nu in logs/ din repo
+LOGS_DIR = tempfile.mkdtemp(prefix="punctaj_logs_")
+
 # Creeaza mock sync
 mock_sync = MockSupabaseSync()
 
 # Initializeaza ACTION_LOGGER
-action_logger = ActionLogger(mock_sync, logs_dir="logs")
+action_logger = ActionLogger(mock_sync, logs_dir=LOGS_DIR)
 
 print("🧪 TEST: ACTION_LOGGER - Logging per institutie\n")
 
@@ -75,7 +79,7 @@ print("="*60)
 import os
 import json
 
-logs_dir = "logs"
+logs_dir = LOGS_DIR
 if os.path.exists(logs_dir):
     for root, dirs, files in os.walk(logs_dir):
         level = root.replace(logs_dir, '').count(os.sep)
@@ -6,6 +6,7 @@ Test: Simuleaza o actiune si verifica daca ACTION_LOGGER se apeleaza
 import sys
 import os
 import configparser
+import tempfile
 
 print("="*70)
 print("🧪 TEST: ACTION_LOGGER - Monitoring Actions")
@@ -56,9 +57,12 @@ except Exception as e:
     sys.exit(1)
 
 # Step 5: Initialize ActionLogger
+# Logs go to a temp dir so the test never touches tracked files
+LOGS_DIR = tempfile.mkdtemp(prefix="punctaj_logs_")
+
 print("\n5️⃣ Initializing ActionLogger...")
 try:
-    action_logger = ActionLogger(supabase_sync, logs_dir="logs")
+    action_logger = ActionLogger(supabase_sync, logs_dir=LOGS_DIR)
     print("   ✅ ActionLogger initialized")
 except Exception as e:
     print(f"   ❌ Failed to initialize ActionLogger: {e}")
@@ -68,10 +72,10 @@ except Exception as e:
 
 # Step 6: Verify logs folder
 print("\n6️⃣ Checking logs folder...")
-if os.path.exists('logs'):
-    print("   ✅ logs/ folder exists")
+if os.path.exists(LOGS_DIR):
+    print(f"   ✅ {LOGS_DIR} exists")
 else:
-    print("   ⚠️ logs/ folder does not exist - ActionLogger will create it")
+    print(f"   ⚠️ {LOGS_DIR} does not exist - ActionLogger will create it")
 
 # Step 7: SIMULATE AN ACTION - Log add_employee
 print("\n7️⃣ SIMULATING USER ACTION: ADD_EMPLOYEE")
@@ -100,7 +104,7 @@ except Exception as e:
 
 # Step 8: Check if log was created
 print("\n8️⃣ Checking if log file was created...")
-log_file = "logs/Saint_Denis/Politie.json"
+log_file = os.path.join(LOGS_DIR, "Saint_Denis", "Politie.json")
 if os.path.exists(log_file):
     print(f"   ✅ Log file exists: {log_file}")
     
@@ -121,7 +125,7 @@ else:
 
 # Step 9: Check global summary
 print("\n9️⃣ Checking global summary...")
-summary_file = "logs/SUMMARY_global.json"
+summary_file = os.path.join(LOGS_DIR, "SUMMARY_global.json")
 if os.path.exists(summary_file):
     print(f"   ✅ Summary file exists: {summary_file}")
     
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Test app_logging - ini levels per module, lazy formatting at production level,
+queue handler + rotating file written by the background listener
+"""
+
+import logging
+import os
+import sys
+import tempfile
+from logging.handlers import QueueHandler
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+import app_logging
+
+
+class CountingArg:
+    """Counts how many times a log argument gets formatted"""
+
+    def __init__(self):
+        self.formatted = 0
+
+    def __str__(self):
+        self.formatted += 1
+        return "row"
+
+
+def _config(tmp, extra=""):
+    path = os.path.join(tmp, "logging_config.ini")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("[logging]\nlevel = WARNING\nfile = logs/app.log\nmax_bytes = 400\n"
+                "backup_count = 2\nconsole = off\n\n[loggers]\n" + extra)
+    return path
+
+
+def _reset(*names):
+    app_logging.shutdown_logging()
+    logging.getLogger().setLevel(logging.WARNING)
+    for name in names:
+        logging.getLogger(name).setLevel(logging.NOTSET)
+
+
+def test_production_level_skips_per_row_formatting():
+    with tempfile.TemporaryDirectory() as tmp:
+        try:
+            app_logging.setup_logging(_config(tmp), base_dir=tmp, env_level="UNSET_TEST_LEVEL")
+            assert any(isinstance(h, QueueHandler) for h in logging.getLogger().handlers)
+            log = app_logging.get_logger("supabase_sync")
+            arg = CountingArg()
+            for i in range(1000):
+                log.debug("Row %s: %s", i, arg)
+            assert arg.formatted == 0
+            log.warning("⚠️ summary %s", arg)
+            app_logging.shutdown_logging()
+            with open(os.path.join(tmp, "logs", "app.log"), encoding="utf-8") as f:
+                content = f.read()
+            assert "summary row" in content and "Row " not in content
+        finally:
+            _reset("supabase_sync")
+
+
+def test_per_module_levels_and_rotation():
+    with tempfile.TemporaryDirectory() as tmp:
+        try:
+            app_logging.setup_logging(_config(tmp, "punctaj = DEBUG\naction_logger = ERROR\n"),
+                                      base_dir=tmp, env_level="UNSET_TEST_LEVEL")
+            assert logging.getLogger("punctaj").getEffectiveLevel() == logging.DEBUG
+            assert logging.getLogger("action_logger").getEffectiveLevel() == logging.ERROR
+            # Second call is a no-op (one listener per process)
+            assert app_logging.setup_logging(_config(tmp), base_dir=tmp) is app_logging._LISTENER
+
+            for i in range(50):
+                logging.getLogger("punctaj").debug("sync row %s", i)
+            logging.getLogger("action_logger").warning("hidden")
+            app_logging.shutdown_logging()
+
+            files = sorted(os.listdir(os.path.join(tmp, "logs")))
+            assert files == ["app.log", "app.log.1", "app.log.2"]
+            text = "".join(open(os.path.join(tmp, "logs", n), encoding="utf-8").read() for n in files)
+            assert "sync row 49" in text and "hidden" not in text
+        finally:
+            _reset("punctaj", "action_logger")
+
+
+def main():
+    tests = [
+        test_production_level_skips_per_row_formatting,
+        test_per_module_levels_and_rotation,
+    ]
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ PASS: {test.__name__}")
+            passed += 1
+        except AssertionError as e:
+            print(f"❌ FAIL: {test.__name__} {e}")
+    print(f"\nTotal: {passed}/{len(tests)} tests passed")
+
+
+if __name__ == "__main__":
+    main()
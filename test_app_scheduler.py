@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Test app_scheduler - next-fire computation, catch-up of missed runs,
+catch-up grace window, retry of failed calendar runs, jitter, per-job stats
+and zero idle wakeups
+"""
+
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from app_scheduler import AppScheduler, IntervalTrigger, WeeklyTrigger, MonthlyTrigger
+
+
+def test_monthly_and_weekly_next_fire():
+    monthly = MonthlyTrigger(day=1, hour=0, minute=0)
+    assert monthly.next_fire(datetime(2026, 3, 15, 12, 0)) == datetime(2026, 4, 1, 0, 0)
+    assert monthly.next_fire(datetime(2026, 12, 1, 0, 0)) == datetime(2027, 1, 1, 0, 0)
+    assert monthly.previous_fire(datetime(2026, 1, 1, 0, 0, 30)) == datetime(2026, 1, 1, 0, 0)
+    assert monthly.previous_fire(datetime(2026, 1, 10)) == datetime(2026, 1, 1, 0, 0)
+
+    weekly = WeeklyTrigger(weekday=0, hour=0, minute=0)
+    # 2026-10-19 is a Monday
+    assert weekly.next_fire(datetime(2026, 10, 19, 0, 0)) == datetime(2026, 10, 26, 0, 0)
+    assert weekly.next_fire(datetime(2026, 10, 21, 9, 0)) == datetime(2026, 10, 26, 0, 0)
+    assert weekly.previous_fire(datetime(2026, 10, 21, 9, 0)) == datetime(2026, 10, 19, 0, 0)
+
+
+def test_missed_calendar_run_is_caught_up_once():
+    with tempfile.TemporaryDirectory() as tmp:
+        state_file = os.path.join(tmp, "scheduler_state.json")
+        # Last run was two months ago: the app was off on the 1st
+        with open(state_file, "w", encoding="utf-8") as f:
+            json.dump({"monthly_reset": {"last_run": time.time() - 62 * 86400}}, f)
+
+        ran = threading.Event()
+        scheduler = AppScheduler(state_file=state_file)
+        scheduler.start()
+        try:
+            scheduler.add_job("monthly_reset", ran.set, MonthlyTrigger(day=1), catch_up="run_once")
+            assert ran.wait(5)
+            time.sleep(0.1)
+            stats = scheduler.get_stats()["monthly_reset"]
+            assert stats["missed"] == 1
+            assert stats["runs"] == 1
+            with open(state_file, encoding="utf-8") as f:
+                assert json.load(f)["monthly_reset"]["last_run"] > time.time() - 60
+        finally:
+            scheduler.stop()
+
+        # Skip policy: missed run is counted but not executed
+        with open(state_file, "w", encoding="utf-8") as f:
+            json.dump({"monthly_reset": {"last_run": time.time() - 62 * 86400}}, f)
+        skipped = AppScheduler(state_file=state_file)
+        job = skipped.add_job("monthly_reset", lambda: None, MonthlyTrigger(day=1), catch_up="skip")
+        assert job.stats["missed"] == 1
+        assert job.next_run > time.time() + 60
+
+
+def test_fire_missed_two_weeks_ago_is_not_run():
+    with tempfile.TemporaryDirectory() as tmp:
+        state_file = os.path.join(tmp, "scheduler_state.json")
+        # Monthly fire that was due (at least) 14 days ago, app closed since before it
+        missed = datetime.now() - timedelta(days=14)
+        trigger = MonthlyTrigger(day=min(missed.day, 28), hour=missed.hour, minute=missed.minute)
+        with open(state_file, "w", encoding="utf-8") as f:
+            json.dump({"monthly_reset": {"last_run": time.time() - 62 * 86400}}, f)
+
+        calls = []
+        reported = []
+        scheduler = AppScheduler(state_file=state_file)
+        scheduler.start()
+        try:
+            job = scheduler.add_job("monthly_reset", lambda: calls.append(1), trigger,
+                                    catch_up="run_once", catch_up_grace=24 * 3600,
+                                    on_missed=reported.append)
+            time.sleep(0.3)
+        finally:
+            scheduler.stop()
+
+        assert calls == []
+        assert job.stats["missed"] == 1
+        assert job.next_run > time.time() + 60
+        assert len(reported) == 1 and reported[0] <= missed
+
+        # Reported once: the next start logs it again but does not call on_missed
+        again = AppScheduler(state_file=state_file)
+        again.add_job("monthly_reset", lambda: calls.append(1), trigger,
+                      catch_up="run_once", catch_up_grace=24 * 3600, on_missed=reported.append)
+        assert calls == [] and len(reported) == 1
+
+
+def test_failed_calendar_run_is_retried_next_start():
+    with tempfile.TemporaryDirectory() as tmp:
+        state_file = os.path.join(tmp, "scheduler_state.json")
+        old_last_run = time.time() - 62 * 86400
+        with open(state_file, "w", encoding="utf-8") as f:
+            json.dump({"monthly_reset": {"last_run": old_last_run}}, f)
+
+        attempted = threading.Event()
+
+        def failing():
+            attempted.set()
+            raise RuntimeError("disk full")
+
+        scheduler = AppScheduler(state_file=state_file)
+        scheduler.start()
+        try:
+            scheduler.add_job("monthly_reset", failing, MonthlyTrigger(day=1), catch_up="run_once")
+            assert attempted.wait(5)
+            time.sleep(0.1)
+        finally:
+            scheduler.stop()
+
+        with open(state_file, encoding="utf-8") as f:
+            state = json.load(f)["monthly_reset"]
+        assert state["last_run"] == old_last_run
+        assert state["last_failure"] > time.time() - 60
+
+        # Next start sees the fire as still missed and runs it again
+        ran = threading.Event()
+        retry = AppScheduler(state_file=state_file)
+        retry.start()
+        try:
+            retry.add_job("monthly_reset", ran.set, MonthlyTrigger(day=1), catch_up="run_once")
+            assert ran.wait(5)
+        finally:
+            retry.stop()
+
+
+def test_interval_jobs_stats_and_failures():
+    scheduler = AppScheduler()
+    scheduler.start()
+    calls = []
+    failed_at = []
+
+    def flaky():
+        calls.append(1)
+        if len(calls) == 2:
+            failed_at.append(time.time())
+            raise RuntimeError("boom")
+
+    try:
+        scheduler.add_job("flaky", flaky, IntervalTrigger(0.05), run_immediately=True)
+        deadline = time.time() + 5
+        while len(calls) < 4 and time.time() < deadline:
+            time.sleep(0.02)
+        stats = scheduler.get_stats()["flaky"]
+        scheduler.cancel_job("flaky")
+    finally:
+        scheduler.stop()
+
+    # The failure is counted, and the job stays on its interval after it
+    assert len(calls) >= 4
+    assert stats["failures"] == 1 and stats["last_error"] == "boom"
+    assert stats["runs"] >= 3
+    next_run = datetime.fromisoformat(stats["next_run"]).timestamp()
+    assert next_run >= failed_at[0] + 0.05 * 2
+    assert "flaky" not in scheduler.get_stats()
+
+
+def test_jitter_stays_within_bounds():
+    scheduler = AppScheduler()
+    now = time.time()
+    for i in range(20):
+        job = scheduler.add_job(f"j{i}", lambda: None, IntervalTrigger(60), jitter=10)
+        assert now + 59 <= job.next_run <= now + 71
+
+
+def test_idle_scheduler_does_not_wake_up():
+    scheduler = AppScheduler()
+    scheduler.start()
+    try:
+        scheduler.add_job("hourly", lambda: None, IntervalTrigger(3600))
+        time.sleep(0.1)
+        before = scheduler.wakeups
+        time.sleep(0.5)
+        assert scheduler.wakeups == before
+    finally:
+        scheduler.stop()
+
+
+def test_run_soon_runs_once():
+    scheduler = AppScheduler()
+    scheduler.start()
+    calls = []
+    try:
+        scheduler.run_soon("setup", lambda: calls.append(1))
+        deadline = time.time() + 5
+        while not calls and time.time() < deadline:
+            time.sleep(0.02)
+        time.sleep(0.1)
+    finally:
+        scheduler.stop()
+    assert calls == [1]
+    assert "setup" not in scheduler.get_stats()
+
+
+def main():
+    tests = [
+        test_monthly_and_weekly_next_fire,
+        test_missed_calendar_run_is_caught_up_once,
+        test_fire_missed_two_weeks_ago_is_not_run,
+        test_failed_calendar_run_is_retried_next_start,
+        test_interval_jobs_stats_and_failures,
+        test_jitter_stays_within_bounds,
+        test_idle_scheduler_does_not_wake_up,
+        test_run_soon_runs_once,
+    ]
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ PASS: {test.__name__}")
+            passed += 1
+        except AssertionError as e:
+            print(f"❌ FAIL: {test.__name__} {e}")
+    print(f"\nTotal: {passed}/{len(tests)} tests passed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Test audit_mirror - incremental audit_logs mirror: id > last id in pages, retention window,
+offline queries, legacy audit_logs.json import, MultiDeviceSyncManager integration
+(against the local Supabase stub)
+"""
+
+import os
+import sys
+import json
+import tempfile
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from audit_mirror import AuditLogMirror, AUDIT_MIRROR_FILE
+from multi_device_sync_manager import MultiDeviceSyncManager
+from supabase_stub import SupabaseStub
+
+
+def _ago(days=0, minutes=0):
+    return (datetime.now(timezone.utc) - timedelta(days=days, minutes=minutes)).strftime("%Y-%m-%dT%H:%M:%S+00:00")
+
+
+def _logs(start, count, days_ago=0):
+    return [{"id": start + i, "timestamp": _ago(days_ago, minutes=count - i), "server_key": f"srv{i % 2}",
+             "city": "BlackWater" if i % 3 else "Valentine", "institution": "Politie", "action_type": "edit_points",
+             "discord_id": str(1000 + i), "discord_username": f"user{i}", "details": f"+{i % 9} puncte"}
+            for i in range(count)]
+
+
+def test_incremental_pages_and_offline_query():
+    with SupabaseStub() as stub, tempfile.TemporaryDirectory() as tmp:
+        stub.seed("audit_logs", _logs(1, 2500, days_ago=1))
+        headers = {"apikey": "k", "Authorization": "Bearer k"}
+        mirror = AuditLogMirror(os.path.join(tmp, AUDIT_MIRROR_FILE))
+
+        stub.reset_counters()
+        stats = mirror.sync_from_supabase(stub.url, headers)
+        assert stats["inserted"] == 2500 and stats["pages"] == 3 and mirror.last_id() == 2500, stats
+
+        # Next sync: only the new rows travel
+        stub.seed("audit_logs", _logs(2501, 10))
+        stub.reset_counters()
+        stats = mirror.sync_from_supabase(stub.url, headers)
+        assert stats == {"fetched": 10, "inserted": 10, "pruned": 0, "pages": 1, "total": 2510}, stats
+        assert stub.request_count() == 1
+        stats = mirror.sync_from_supabase(stub.url, headers)
+        assert stats["fetched"] == 0 and stats["total"] == 2510
+
+        stub.stop()     # offline from here on
+        newest = mirror.query(limit=3)
+        assert [r["id"] for r in newest] == [2510, 2509, 2508]
+        valentine = mirror.query(city="Valentine", institution="Politie", server_key="srv0", limit=1000)
+        assert valentine and all(r["city"] == "Valentine" and r["server_key"] == "srv0" for r in valentine)
+        assert len(mirror.query(limit=50, offset=2500)) == 10
+        plan = mirror.conn.execute("EXPLAIN QUERY PLAN SELECT * FROM audit_logs WHERE city = ? AND institution = ? "
+                                   "ORDER BY timestamp DESC", ("a", "b")).fetchall()
+        assert "idx_audit_institution_time" in str(plan), plan
+
+
+def test_retention_and_legacy_import():
+    with SupabaseStub() as stub, tempfile.TemporaryDirectory() as tmp:
+        stub.seed("audit_logs", _logs(1, 50, days_ago=200) + _logs(51, 20, days_ago=40) + _logs(71, 5))
+
+        # First sync never downloads rows older than the retention window
+        fresh = AuditLogMirror(os.path.join(tmp, "fresh", AUDIT_MIRROR_FILE), retention_days=90)
+        stats = fresh.sync_from_supabase(stub.url, {})
+        assert stats["fetched"] == 25 and fresh.last_id() == 75, stats
+
+        # Upgrade: the old audit_logs.json snapshot (newest rows at the time) seeds the mirror
+        legacy_dir = os.path.join(tmp, "legacy")
+        os.makedirs(legacy_dir)
+        legacy = os.path.join(legacy_dir, "audit_logs.json")
+        with open(legacy, "w", encoding="utf-8") as f:
+            json.dump({"logs": list(reversed(_logs(51, 20, days_ago=40))), "total_count": 20}, f)
+        supabase_sync = SimpleNamespace(url=stub.url, key="k", table_logs="audit_logs")
+        manager = MultiDeviceSyncManager(supabase_sync, legacy_dir, audit_retention_days=90)
+        stub.reset_counters()
+        result = manager._sync_audit_logs()
+        assert result["status"] == "success" and result["count"] == 5 and result["total"] == 25, result
+        assert stub.request_count() == 1
+
+        # Shorter retention on the next run drops old rows; the watermark stays
+        mirror = AuditLogMirror(os.path.join(legacy_dir, AUDIT_MIRROR_FILE), retention_days=30)
+        stats = mirror.sync_from_supabase(stub.url, {})
+        assert stats["pruned"] == 20 and stats["total"] == 5 and mirror.last_id() == 75
+        assert mirror.import_legacy_json(legacy) == 0      # imported once, by the manager
+
+
+def main():
+    tests = [
+        test_incremental_pages_and_offline_query,
+        test_retention_and_legacy_import,
+    ]
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ PASS: {test.__name__}")
+            passed += 1
+        except AssertionError as e:
+            print(f"❌ FAIL: {test.__name__} {e}")
+    print(f"\nTotal: {passed}/{len(tests)} tests passed")
+
+
+if __name__ == "__main__":
+    main()
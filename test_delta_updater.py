@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Test delta_updater - a release folder served by a local HTTP server stands in for the channel:
+one-file fix = manifest + one object, sha256 verification, rollback on apply failure
+"""
+
+import os
+import sys
+import gzip
+import shutil
+import tempfile
+import threading
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+import delta_updater
+from delta_updater import DeltaUpdater, UpdateError, publish_release, object_path, MANIFEST_NAME
+
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    requested = []
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        QuietHandler.requested.append(self.path.lstrip("/"))
+        super().do_GET()
+
+
+class ReleaseServer:
+    """http.server over a release folder (what a static host would serve)"""
+
+    def __init__(self, directory):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), partial(QuietHandler, directory=directory))
+        self.url = f"http://127.0.0.1:{self.server.server_port}"
+
+    def __enter__(self):
+        QuietHandler.requested = []
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def _write(root, rel, content):
+    path = os.path.join(root, *rel.split("/"))
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(content)
+
+
+def _read(root, rel):
+    with open(os.path.join(root, *rel.split("/")), encoding="utf-8") as f:
+        return f.read()
+
+
+def _make_app(root, files=120):
+    for i in range(files):
+        _write(root, f"module_{i:03d}.py", f"# module {i}\n" + "VALUE = %d\n" % i * 400)
+    _write(root, "docs/README.md", "readme\n")
+    _write(root, "data/BlackWater/Politie.json", "{}")          # user data - excluded
+    _write(root, "supabase_config.ini", "[supabase]\nkey = secret\n")  # local secret - excluded
+    _write(root, "build/punctaj.exe", "binary")                 # build artifact - excluded
+
+
+def _setup(tmp):
+    src, release, install = (os.path.join(tmp, name) for name in ("src", "release", "install"))
+    _make_app(src)
+    publish_release(src, release, "1.0.0")
+    shutil.copytree(src, install)
+    return src, release, install
+
+
+def test_one_file_fix_downloads_kilobytes():
+    with tempfile.TemporaryDirectory() as tmp:
+        src, release, install = _setup(tmp)
+        manifest = publish_release(src, release, "1.0.0")
+        assert "data/BlackWater/Politie.json" not in manifest["files"]
+        assert "supabase_config.ini" not in manifest["files"] and "build/punctaj.exe" not in manifest["files"]
+
+        with ReleaseServer(release) as server:
+            # Fresh install matching 1.0.0: nothing to download, hashes cached
+            result = DeltaUpdater(server.url, install, log=lambda m: None).update()
+            assert result.changed == [] and result.downloaded_bytes == 0
+
+            _write(src, "module_042.py", "# fix\nVALUE = 'fixed'\n")
+            _write(install, "supabase_config.ini", "[supabase]\nkey = mine\n")
+            publish_release(src, release, "1.0.1")
+            QuietHandler.requested = []
+            result = DeltaUpdater(server.url, install, log=lambda m: None).update()
+
+        assert result.version == "1.0.1" and result.changed == ["module_042.py"]
+        objects = [path for path in QuietHandler.requested if path.startswith("objects/")]
+        assert objects == [object_path(delta_updater.file_sha256(os.path.join(src, "module_042.py")))]
+        manifest_size = os.path.getsize(os.path.join(release, MANIFEST_NAME))
+        assert result.downloaded_bytes + manifest_size < 16 * 1024, (result.downloaded_bytes, manifest_size)
+        assert _read(install, "module_042.py") == "# fix\nVALUE = 'fixed'\n"
+        assert "key = mine" in _read(install, "supabase_config.ini")
+        assert not os.path.exists(os.path.join(install, delta_updater.STAGING_DIR))
+
+
+def test_corrupt_object_leaves_install_untouched():
+    with tempfile.TemporaryDirectory() as tmp:
+        src, release, install = _setup(tmp)
+        _write(src, "module_001.py", "VALUE = 'new'\n")
+        manifest = publish_release(src, release, "1.1.0")
+        bad = os.path.join(release, *object_path(manifest["files"]["module_001.py"]["sha256"]).split("/"))
+        with open(bad, "wb") as f:
+            f.write(gzip.compress(b"VALUE = 'tampered'\n"))
+
+        try:
+            DeltaUpdater(release, install, log=lambda m: None).update()
+            assert False, "corrupt object accepted"
+        except UpdateError as e:
+            assert "sha256" in str(e)
+        assert _read(install, "module_001.py").startswith("# module 1")
+        assert not os.path.exists(os.path.join(install, delta_updater.JOURNAL_NAME))
+
+
+def test_apply_failure_rolls_back():
+    with tempfile.TemporaryDirectory() as tmp:
+        src, release, install = _setup(tmp)
+        _write(src, "module_005.py", "VALUE = 'v2'\n")
+        _write(src, "module_006.py", "VALUE = 'v2'\n")
+        _write(src, "plugins/new_feature.py", "NEW = True\n")
+        os.remove(os.path.join(src, "module_007.py"))
+        publish_release(src, release, "2.0.0")
+
+        updater = DeltaUpdater(release, install, log=lambda m: None)
+        plan = updater.plan()
+        assert plan.changed == ["module_005.py", "module_006.py", "plugins/new_feature.py"]
+        real_replace = os.replace
+        calls = {"n": 0}
+
+        def failing_replace(src_path, dst_path):
+            calls["n"] += 1
+            if calls["n"] == 5:      # file locked (e.g. the running exe on Windows)
+                raise PermissionError("locked")
+            return real_replace(src_path, dst_path)
+
+        updater.download(plan)
+        delta_updater.os.replace = failing_replace
+        try:
+            updater.apply(plan)
+            assert False, "apply should fail"
+        except UpdateError as e:
+            assert "rollback" in str(e)
+        finally:
+            delta_updater.os.replace = real_replace
+
+        assert _read(install, "module_005.py").startswith("# module 5")
+        assert _read(install, "module_006.py").startswith("# module 6")
+        assert not os.path.exists(os.path.join(install, "plugins", "new_feature.py"))
+        assert not os.path.exists(os.path.join(install, delta_updater.JOURNAL_NAME))
+
+        # Second attempt succeeds; files dropped from a later release are removed
+        updater.update()
+        assert _read(install, "module_005.py") == "VALUE = 'v2'\n"
+        assert _read(install, "plugins/new_feature.py") == "NEW = True\n"
+        assert updater.load_state()["version"] == "2.0.0"
+        os.remove(os.path.join(src, "plugins", "new_feature.py"))
+        publish_release(src, release, "2.0.1")
+        result = updater.update()
+        assert result.removed == ["plugins/new_feature.py"] and result.changed == []
+        assert not os.path.exists(os.path.join(install, "plugins", "new_feature.py"))
+
+
+def test_update_config_survives_apply():
+    with tempfile.TemporaryDirectory() as tmp:
+        src, release, install = _setup(tmp)
+        mine = "[updates]\nurl = https://updates.example/stable\n"
+        _write(install, delta_updater.UPDATE_CONFIG_NAME, mine)
+        _write(src, delta_updater.UPDATE_CONFIG_NAME, "[updates]\nurl = https://dev.local\n")
+        _write(src, "module_010.py", "VALUE = 'v2'\n")
+        assert delta_updater.UPDATE_CONFIG_NAME not in publish_release(src, release, "1.2.0")["files"]
+
+        # A release published without the excludes still must not touch the local config
+        manifest = publish_release(src, release, "1.2.1", excludes=(".git", "data", "build"))
+        assert delta_updater.UPDATE_CONFIG_NAME in manifest["files"]
+        result = DeltaUpdater(release, install, log=lambda m: None).update()
+        assert result.changed == ["module_010.py"]
+        assert _read(install, delta_updater.UPDATE_CONFIG_NAME) == mine
+        assert delta_updater.load_update_config(install)["url"] == "https://updates.example/stable"
+
+
+def main():
+    tests = [
+        test_one_file_fix_downloads_kilobytes,
+        test_corrupt_object_leaves_install_untouched,
+        test_apply_failure_rolls_back,
+        test_update_config_survives_apply,
+    ]
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ PASS: {test.__name__}")
+            passed += 1
+        except AssertionError as e:
+            print(f"❌ FAIL: {test.__name__} {e}")
+    print(f"\nTotal: {passed}/{len(tests)} tests passed")
+
+
+if __name__ == "__main__":
+    main()
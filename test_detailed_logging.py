@@ -5,6 +5,7 @@ Test action logging with detailed institution info
 """
 import sys
 import os
+import tempfile
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 sys.path.insert(0, BASE_DIR)
 
@@ -17,7 +18,8 @@ from action_logger import ActionLogger
 
 # Test logging
 sync = MockSupabaseSync()
-logger = ActionLogger(sync)
+# Logs go to a temp dir so the test never touches tracked files
+logger = ActionLogger(sync, logs_dir=tempfile.mkdtemp(prefix="punctaj_logs_"))
 
 print("=" * 70)
 print("TEST 1: Log add_employee")
@@ -6,6 +6,7 @@ Test: Verifica noua structura de loguri cu detalii complete
 import os
 import json
 import shutil
+import tempfile
 from supabase_sync import SupabaseSync
 from action_logger import ActionLogger
 
@@ -16,12 +17,14 @@ print("="*80)
 # Setup
 print("\n1️⃣ Setting up...")
 supabase_sync = SupabaseSync('supabase_config.ini')
-action_logger = ActionLogger(supabase_sync, logs_dir="logs")
+# Logs go to a temp dir so the test never touches tracked files
+LOGS_DIR = tempfile.mkdtemp(prefix="punctaj_logs_")
+action_logger = ActionLogger(supabase_sync, logs_dir=LOGS_DIR)
 
 # Clear old logs
-if os.path.exists('logs'):
-    shutil.rmtree('logs')
-    os.makedirs('logs', exist_ok=True)
+if os.path.exists(LOGS_DIR):
+    shutil.rmtree(LOGS_DIR)
+    os.makedirs(LOGS_DIR, exist_ok=True)
 print("   ✅ Setup complete\n")
 
 # Test 1: Add employee
@@ -81,7 +84,7 @@ print("\n" + "="*80)
 print("📊 DETAILED LOG STRUCTURE")
 print("="*80)
 
-log_file = "logs/Saint_Denis/Politie.json"
+log_file = os.path.join(LOGS_DIR, "Saint_Denis", "Politie.json")
 if os.path.exists(log_file):
     with open(log_file, 'r', encoding='utf-8') as f:
         logs = json.load(f)
@@ -99,7 +102,7 @@ if os.path.exists(log_file):
         print(f"  🔄 Changes: {log.get('changes', '?')}")
         print()
 
-blackwater_log_file = "logs/BlackWater/Politie.json"
+blackwater_log_file = os.path.join(LOGS_DIR, "BlackWater", "Politie.json")
 if os.path.exists(blackwater_log_file):
     with open(blackwater_log_file, 'r', encoding='utf-8') as f:
         logs = json.load(f)
@@ -118,7 +121,7 @@ if os.path.exists(blackwater_log_file):
         print()
 
 # Check global summary
-summary_file = "logs/SUMMARY_global.json"
+summary_file = os.path.join(LOGS_DIR, "SUMMARY_global.json")
 if os.path.exists(summary_file):
     with open(summary_file, 'r', encoding='utf-8') as f:
         summary = json.load(f)
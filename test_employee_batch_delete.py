@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Test SupabaseEmployeeManager batch delete - dict index matching by Discord/name,
+one GET + one DELETE id=in.(...) for a whole selection (against the local Supabase stub)
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from supabase_employee_manager import SupabaseEmployeeManager
+from supabase_stub import SupabaseStub
+
+
+def _manager(stub, tmp):
+    config_path = os.path.join(tmp, "supabase_config.ini")
+    with open(config_path, "w", encoding="utf-8") as f:
+        f.write(f"[supabase]\nurl = {stub.url}\nkey = test-key\n")
+    return SupabaseEmployeeManager(config_path)
+
+
+def _seed(stub, count=80):
+    stub.seed("employees", [
+        {"id": i + 1, "institution_id": 7 if i < 60 else 8, "employee_name": f"Emp {i}",
+         "discord_username": f"user{i}" if i % 2 == 0 else "", "points": i}
+        for i in range(count)
+    ])
+
+
+def test_selection_without_ids_costs_two_requests():
+    with SupabaseStub() as stub, tempfile.TemporaryDirectory() as tmp:
+        _seed(stub)
+        manager = _manager(stub, tmp)
+        # Even rows matched by DISCORD, odd rows by NUME IC, plus one unknown
+        selection = [{"DISCORD": f"user{i}" if i % 2 == 0 else "", "NUME IC": f"Emp {i}"} for i in range(50)]
+        selection.append({"DISCORD": "ghost", "NUME IC": "Nobody"})
+        stub.reset_counters()
+
+        ids, unmatched = manager.find_employee_ids(7, selection)
+        deleted = manager.delete_employees(ids)
+
+        assert deleted == 50
+        assert [r["NUME IC"] for r in unmatched] == ["Nobody"]
+        assert stub.request_count() == 2
+        assert stub.request_count("DELETE", "employees") == 1
+        remaining = {r["id"] for r in stub.rows("employees")}
+        assert remaining == set(range(51, 81))
+
+
+def test_delete_is_chunked_and_deduplicated():
+    with SupabaseStub() as stub, tempfile.TemporaryDirectory() as tmp:
+        _seed(stub)
+        manager = _manager(stub, tmp)
+        stub.reset_counters()
+
+        deleted = manager.delete_employees(list(range(1, 46)) + [3, 4, None], chunk_size=20)
+
+        assert deleted == 45
+        assert stub.request_count("DELETE", "employees") == 3
+        assert len(stub.rows("employees")) == 35
+
+
+def main():
+    tests = [
+        test_selection_without_ids_costs_two_requests,
+        test_delete_is_chunked_and_deduplicated,
+    ]
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ PASS: {test.__name__}")
+            passed += 1
+        except AssertionError as e:
+            print(f"❌ FAIL: {test.__name__} {e}")
+    print(f"\nTotal: {passed}/{len(tests)} tests passed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Test employee uniqueness - upsert on (institution_id, discord_username) without per-row lookups,
+streaming dedup job with keyset pages and batched deletes (against the local Supabase stub)
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from employee_dedup import EmployeeDedupJob
+from supabase_employee_manager import SupabaseEmployeeManager
+from supabase_stub import SupabaseStub
+
+UNIQUE = {"employees": ["institution_id", "discord_username"]}
+
+
+def _manager(stub, tmp):
+    config_path = os.path.join(tmp, "supabase_config.ini")
+    with open(config_path, "w", encoding="utf-8") as f:
+        f.write(f"[supabase]\nurl = {stub.url}\nkey = test-key\n")
+    return SupabaseEmployeeManager(config_path)
+
+
+def _rows(count, points=0):
+    return [{"DISCORD": f"user{i}", "NUME IC": f"Emp {i}", "RANK": "1", "ROLE": "Offiter",
+             "PUNCTAJ": points + i, "SERIE DE BULETIN": ""} for i in range(count)]
+
+
+def test_repeated_saves_never_duplicate():
+    with SupabaseStub(unique=UNIQUE) as stub, tempfile.TemporaryDirectory() as tmp:
+        manager = _manager(stub, tmp)
+        rows = _rows(300) + [{"DISCORD": "", "NUME IC": "Fara Discord", "PUNCTAJ": 5}]
+        stub.reset_counters()
+        first = manager.upsert_institution_employees(7, rows)
+        # Keyed rows: one POST; the row without Discord: one GET + one insert
+        assert first == {"upserted": 300, "inserted": 1, "failed": 0, "conflicts": [], "total": 301}
+        assert stub.request_count("POST", "employees") == 2 and stub.request_count("GET", "employees") == 1
+
+        # Same save again with new points + a row repeated inside the batch
+        rows = _rows(300, points=10) + [{"DISCORD": "user3", "NUME IC": "Emp 3", "PUNCTAJ": 99},
+                                        {"DISCORD": "", "NUME IC": "Fara Discord", "PUNCTAJ": 6}]
+        second = manager.upsert_institution_employees(7, rows)
+        assert second["inserted"] == 0
+
+        employees = stub.rows("employees")
+        assert len(employees) == 301
+        by_discord = {e["discord_username"]: e for e in employees}
+        assert by_discord["user3"]["points"] == 99 and by_discord["user10"]["points"] == 20
+        assert by_discord[None]["employee_name"] == "Fara Discord" and by_discord[None]["points"] == 6
+
+
+def test_renamed_discord_updates_the_same_row():
+    with SupabaseStub(unique=UNIQUE) as stub, tempfile.TemporaryDirectory() as tmp:
+        manager = _manager(stub, tmp)
+        manager.upsert_institution_employees(7, _rows(3))
+        ids = {e["discord_username"]: e["id"] for e in stub.rows("employees")}
+
+        # Row loaded from the cloud (carries its id), DISCORD edited in the table
+        stub.reset_counters()
+        rows = [dict(row, id=ids[row["DISCORD"]]) for row in _rows(3)]
+        rows[1]["DISCORD"] = "user1_new"
+        result = manager.upsert_institution_employees(7, rows)
+        assert result == {"upserted": 3, "inserted": 0, "failed": 0, "conflicts": [], "total": 3}
+        assert stub.request_count("GET", "employees") == 1 and stub.request_count("POST", "employees") == 1
+
+        # Legacy row without id, renamed: matched by NUME IC, still no new row
+        manager.upsert_institution_employees(7, [{"DISCORD": "user2_new", "NUME IC": "Emp 2", "PUNCTAJ": 8}])
+        employees = stub.rows("employees")
+        assert len(employees) == 3
+        by_id = {e["id"]: e for e in employees}
+        assert by_id[ids["user1"]]["discord_username"] == "user1_new"
+        assert by_id[ids["user2"]]["discord_username"] == "user2_new" and by_id[ids["user2"]]["points"] == 8
+
+
+def test_discord_collision_is_reported_not_sent():
+    with SupabaseStub(unique=UNIQUE) as stub, tempfile.TemporaryDirectory() as tmp:
+        manager = _manager(stub, tmp)
+        manager.upsert_institution_employees(7, _rows(4))
+        ids = {e["discord_username"]: e["id"] for e in stub.rows("employees")}
+
+        # user1 renamed to user2's DISCORD (user2 still there); user3 only gets new points
+        rows = [dict(row, id=ids[row["DISCORD"]], PUNCTAJ=50) for row in _rows(4)]
+        rows[1]["DISCORD"] = "user2"
+        # A row that is not in this save at all keeps its DISCORD too
+        rows[3]["DISCORD"] = "user0"
+        result = manager.upsert_institution_employees(7, rows[1:])
+
+        assert result["failed"] == 0 and result["upserted"] == 1
+        assert [(row["id"], row["DISCORD"]) for row in result["conflicts"]] == [(ids["user1"], "user2"),
+                                                                                 (ids["user3"], "user0")]
+        by_id = {e["id"]: e for e in stub.rows("employees")}
+        assert by_id[ids["user2"]]["points"] == 50
+        assert by_id[ids["user1"]]["discord_username"] == "user1" and by_id[ids["user1"]]["points"] == 1
+        assert by_id[ids["user3"]]["discord_username"] == "user3"
+
+
+def test_streaming_dedup_job_keeps_newest_in_batches():
+    with SupabaseStub() as stub, tempfile.TemporaryDirectory() as tmp:
+        manager = _manager(stub, tmp)
+        stub.seed("institutions", [{"id": i, "name": f"Inst {i}"} for i in (1, 2, 3)])
+        employees, next_id = [], 1
+        for copy in range(3):                      # every employee saved 3 times (legacy DB)
+            for inst in (1, 2, 3):
+                for i in range(120):
+                    employees.append({"id": next_id, "institution_id": inst, "employee_name": f"Emp {i}",
+                                      "discord_username": f"user{i}" if i % 4 else None, "points": copy})
+                    next_id += 1
+        stub.seed("employees", employees)
+        stub.reset_counters()
+
+        preview = EmployeeDedupJob(manager, page_size=100, dry_run=True, log=lambda m: None).run()
+        assert preview["duplicates"] == 3 * 120 * 2 and len(stub.rows("employees")) == 1080
+        assert stub.request_count("DELETE") == 0
+
+        stats = EmployeeDedupJob(manager, page_size=100, delete_batch=150, log=lambda m: None).run()
+        assert stats["deleted"] == 720 and stats["scanned"] == 1080
+        # State is per institution: never more keys than one institution has
+        assert stats["peak_keys"] == 120
+        assert stub.request_count("DELETE", "employees") == 720 // 150 + 1
+
+        remaining = stub.rows("employees")
+        assert len(remaining) == 360 and all(e["points"] == 2 for e in remaining)
+
+        again = EmployeeDedupJob(manager, page_size=100, log=lambda m: None).run()
+        assert again["duplicates"] == 0
+
+
+def main():
+    tests = [
+        test_repeated_saves_never_duplicate,
+        test_renamed_discord_updates_the_same_row,
+        test_discord_collision_is_reported_not_sent,
+        test_streaming_dedup_job_keeps_newest_in_batches,
+    ]
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ PASS: {test.__name__}")
+            passed += 1
+        except AssertionError as e:
+            print(f"❌ FAIL: {test.__name__} {e}")
+    print(f"\nTotal: {passed}/{len(tests)} tests passed")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,6 +7,7 @@ Verifică dacă ActionLogger uploadează direct pe Supabase
 import os
 import sys
 import configparser
+import tempfile
 import requests
 from datetime import datetime
 
@@ -52,7 +53,9 @@ print(f"   Table: audit_logs")
 print("\n3️⃣  INITIALIZING ACTIONLOGGER")
 print("-" * 80)
 
-action_logger = ActionLogger(mock_sync, logs_dir="logs")
+# Logs go to a temp dir so the test never touches tracked files
+LOGS_DIR = tempfile.mkdtemp(prefix="punctaj_logs_")
+action_logger = ActionLogger(mock_sync, logs_dir=LOGS_DIR)
 print("✅ ActionLogger initialized")
 
 # Test logging an action
@@ -105,7 +108,7 @@ print("\n6️⃣  CHECKING LOCAL ENCRYPTED LOGS")
 print("-" * 80)
 
 import glob
-enc_files = glob.glob("logs/*/*.enc")
+enc_files = glob.glob(os.path.join(LOGS_DIR, "*", "*.enc"))
 enc_files = [f for f in enc_files if "SUMMARY" not in f]
 
 if enc_files:
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Test id_registry - persistent, server-scoped city/institution name -> id map:
+one-request refresh, realtime events, restart without lookups, bulk creates
+(against the local Supabase stub)
+"""
+
+import os
+import sys
+import json
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from id_registry import SupabaseIdRegistry, REGISTRY_FILE_NAME
+from supabase_employee_manager import SupabaseEmployeeManager
+from supabase_stub import SupabaseStub
+
+
+def _manager(stub, tmp, registry_path=None):
+    config_path = os.path.join(tmp, "supabase_config.ini")
+    with open(config_path, "w", encoding="utf-8") as f:
+        f.write(f"[supabase]\nurl = {stub.url}\nkey = test-key\n")
+    return SupabaseEmployeeManager(config_path, id_registry_path=registry_path)
+
+
+def test_registry_events_and_persistence():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "server_a", REGISTRY_FILE_NAME)
+        registry = SupabaseIdRegistry("https://a.supabase.co", path)
+        registry.replace_all([{"id": 1, "name": "BlackWater", "institutions": [{"id": 10, "name": "Politie"}]},
+                              {"id": 2, "name": "Valentine", "institutions": []}])
+        assert registry.city_id("BlackWater") == 1 and registry.institution_id(1, "Politie") == 10
+
+        # Realtime: insert, rename, move, delete
+        registry.apply_event("institutions", "INSERT", {"id": 11, "city_id": 2, "name": "Sherif"})
+        registry.apply_event("cities", "UPDATE", {"id": 2, "name": "Valentine_Nou"})
+        registry.apply_event("institutions", "UPDATE", {"id": 10, "city_id": 1, "name": "Politie_BW"})
+        assert registry.city_id("Valentine") is None and registry.city_id("Valentine_Nou") == 2
+        assert registry.institutions(1) == {"Politie_BW": 10} and registry.institution_id(2, "Sherif") == 11
+        registry.apply_event("cities", "DELETE", {"id": 2})
+        assert registry.institution_id(2, "Sherif") is None and len(registry) == 1
+
+        # Restart: same server reads the file, another Supabase URL ignores it
+        reloaded = SupabaseIdRegistry("https://a.supabase.co", path)
+        assert reloaded.cities() == {"BlackWater": 1} and reloaded.institution_id("1", "Politie_BW") == 10
+        other = SupabaseIdRegistry("https://b.supabase.co", path)
+        assert other.cities() == {} and len(other) == 0
+
+        # Server switch to a folder without a registry file: no ids of the previous server
+        assert not reloaded.set_state_file(os.path.join(tmp, "server_b", REGISTRY_FILE_NAME))
+        assert reloaded.cities() == {} and reloaded.city_id("BlackWater") is None
+
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("{broken")
+        assert not SupabaseIdRegistry("https://a.supabase.co").set_state_file(path)
+
+
+def test_manager_uses_registry_and_bulk_creates():
+    with SupabaseStub() as stub, tempfile.TemporaryDirectory() as tmp:
+        stub.seed("cities", [{"id": 1, "name": "BlackWater"}])
+        stub.seed("institutions", [{"id": 5, "city_id": 1, "name": "Politie"}])
+        path = os.path.join(tmp, REGISTRY_FILE_NAME)
+        manager = _manager(stub, tmp, path)
+
+        stub.reset_counters()
+        assert manager.prime_id_cache() == 1 and stub.request_count() == 1
+
+        # Local tree vs registry -> only the missing entries, one POST per table
+        local = {"BlackWater": ["Politie", "Medici"], "Annesburg": ["Politie"], "Rhodes": ["Sherif", "Medici"]}
+        missing_cities = [c for c in local if manager.ids.city_id(c) is None]
+        assert len(manager.add_cities(missing_cities)) == 2
+        missing = [(manager.ids.city_id(c), n) for c, names in local.items() for n in names
+                   if manager.ids.institution_id(manager.ids.city_id(c), n) is None]
+        assert len(missing) == 4 and len(manager.add_institutions(missing)) == 4
+        assert stub.request_count("POST", "cities") == 1 and stub.request_count("POST", "institutions") == 1
+        assert len(stub.rows("institutions")) == 5
+
+        # Next run: ids come from disk, no lookups for known names
+        restarted = _manager(stub, tmp, path)
+        stub.reset_counters()
+        assert restarted.resolve_institution_id("Rhodes", "Medici") is not None
+        assert restarted.resolve_city_id("Annesburg") == manager.ids.city_id("Annesburg")
+        assert stub.request_count() == 0
+
+        with open(path, encoding="utf-8") as f:
+            assert json.load(f)["server"] == stub.url
+
+
+def main():
+    tests = [
+        test_registry_events_and_persistence,
+        test_manager_uses_registry_and_bulk_creates,
+    ]
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ PASS: {test.__name__}")
+            passed += 1
+        except AssertionError as e:
+            print(f"❌ FAIL: {test.__name__} {e}")
+    print(f"\nTotal: {passed}/{len(tests)} tests passed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Test json_encryptor container v2 - compact + compressed + chunked AES-GCM frames,
+legacy Fernet files still readable, tamper / truncation detection, atomic writes
+"""
+
+import os
+import sys
+import json
+import tempfile
+import threading
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from json_encryptor import JSONEncryptor, ContainerError, CONTAINER_MAGIC
+
+
+def _logs(count):
+    return [{"timestamp": f"2026-10-19T10:{i % 60:02d}:00", "action_type": "edit_points", "city": "BlackWater",
+             "institution": "Politie", "discord_id": str(10 ** 17 + i), "details": f"Adăugare {i % 9} puncte"}
+            for i in range(count)]
+
+
+def test_roundtrip_is_smaller_and_chunked():
+    with tempfile.TemporaryDirectory() as tmp:
+        encryptor = JSONEncryptor(os.path.join(tmp, ".secure_key"))
+        path = os.path.join(tmp, "logs", "Politie.json")
+        data = _logs(20000)
+        assert encryptor.save_json_encrypted(path, data)
+        enc_path = os.path.join(tmp, "logs", "Politie.enc")
+        with open(enc_path, "rb") as f:
+            assert f.read(len(CONTAINER_MAGIC)) == CONTAINER_MAGIC
+        plain_size = len(json.dumps(data, ensure_ascii=False, indent=2).encode("utf-8"))
+        assert os.path.getsize(enc_path) < plain_size / 5, (os.path.getsize(enc_path), plain_size)
+        assert encryptor.load_json_encrypted(path) == data
+
+        # Small chunk size -> many frames, streamed back piece by piece
+        payload = json.dumps(data).encode("utf-8")
+        encryptor.write_encrypted_stream(enc_path, [payload], chunk_size=4096)
+        pieces = list(encryptor.iter_decrypted(enc_path))
+        assert len(pieces) > 3 and b"".join(pieces) == payload
+
+        # Same key file -> a second instance (another process / restart) reads it
+        assert JSONEncryptor(os.path.join(tmp, ".secure_key")).load_encrypted_file(enc_path) == data
+
+
+def test_legacy_fernet_files_still_load():
+    with tempfile.TemporaryDirectory() as tmp:
+        encryptor = JSONEncryptor(os.path.join(tmp, ".secure_key"))
+        legacy = os.path.join(tmp, "summary.enc")
+        data = {"total_actions": 3, "by_type": {"edit_points": 3}}
+        with open(legacy, "wb") as f:
+            f.write(encryptor.cipher.encrypt(json.dumps(data, indent=2).encode("utf-8")))
+        assert encryptor.load_json_encrypted(os.path.join(tmp, "summary.json")) == data
+
+        # Next save rewrites it in the v2 container
+        data["total_actions"] = 4
+        encryptor.save_json_encrypted(os.path.join(tmp, "summary.json"), data)
+        with open(legacy, "rb") as f:
+            assert f.read(len(CONTAINER_MAGIC)) == CONTAINER_MAGIC
+        assert encryptor.load_json_encrypted(legacy) == data
+
+
+def test_tampering_truncation_and_failed_writes():
+    with tempfile.TemporaryDirectory() as tmp:
+        encryptor = JSONEncryptor(os.path.join(tmp, ".secure_key"))
+        enc_path = os.path.join(tmp, "audit.enc")
+        payload = json.dumps(_logs(3000)).encode("utf-8")
+        encryptor.write_encrypted_stream(enc_path, [payload], chunk_size=2048)
+        with open(enc_path, "rb") as f:
+            original = f.read()
+
+        def expect_error(blob, message):
+            with open(enc_path, "wb") as f:
+                f.write(blob)
+            try:
+                b"".join(encryptor.iter_decrypted(enc_path))
+                assert False, "corrupt container accepted"
+            except ContainerError as e:
+                assert message in str(e), str(e)
+
+        flipped = bytearray(original)
+        flipped[len(original) // 2] ^= 0x01
+        expect_error(bytes(flipped), "authentication")
+        expect_error(original[:len(original) // 2], "truncated")
+        assert encryptor.load_json_encrypted(enc_path) == {}     # API keeps returning {} on errors
+
+        # A failed save keeps the previous file (temp file + os.replace)
+        with open(enc_path, "wb") as f:
+            f.write(original)
+        assert not encryptor.save_json_encrypted(enc_path, {"bad": object()})
+        assert b"".join(encryptor.iter_decrypted(enc_path)) == payload
+        assert not [name for name in os.listdir(os.path.dirname(enc_path)) if name.endswith(".tmp")]
+
+
+def test_concurrent_writes_use_own_temp_files():
+    with tempfile.TemporaryDirectory() as tmp:
+        encryptor = JSONEncryptor(os.path.join(tmp, ".secure_key"))
+        enc_path = os.path.join(tmp, "logs", "SUMMARY_global.enc")
+        errors = []
+
+        def writer(n):
+            for i in range(20):
+                if not encryptor.save_json_encrypted(enc_path, {"writer": n, "i": i}):
+                    errors.append(n)
+
+        threads = [threading.Thread(target=writer, args=(n,)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert not errors
+        assert encryptor.load_json_encrypted(enc_path)["i"] == 19
+        assert os.listdir(os.path.dirname(enc_path)) == ["SUMMARY_global.enc"]
+
+
+def main():
+    tests = [
+        test_roundtrip_is_smaller_and_chunked,
+        test_legacy_fernet_files_still_load,
+        test_tampering_truncation_and_failed_writes,
+        test_concurrent_writes_use_own_temp_files,
+    ]
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ PASS: {test.__name__}")
+            passed += 1
+        except AssertionError as e:
+            print(f"❌ FAIL: {test.__name__} {e}")
+    print(f"\nTotal: {passed}/{len(tests)} tests passed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Test lazy_imports - deferred import on first use, missing modules,
+fast-start spec bundles every module that punctaj.py loads lazily
+"""
+
+import ast
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from lazy_imports import lazy, module_available, LazySymbol
+from bench_startup_imports import lazy_imports_in, startup_imports
+
+ROOT = Path(__file__).parent
+
+
+def test_import_happens_on_first_use():
+    with tempfile.TemporaryDirectory() as tmp:
+        with open(os.path.join(tmp, "lazy_probe_mod.py"), "w", encoding="utf-8") as f:
+            f.write("LOADED = True\nclass Probe:\n    def __init__(self, value):\n        self.value = value\n")
+        sys.path.insert(0, tmp)
+        try:
+            Probe = lazy("lazy_probe_mod", "Probe")
+            assert isinstance(Probe, LazySymbol) and not Probe.loaded
+            assert "lazy_probe_mod" not in sys.modules
+            assert Probe(7).value == 7
+            assert Probe.loaded and "lazy_probe_mod" in sys.modules
+            assert lazy("lazy_probe_mod").LOADED is True
+        finally:
+            sys.path.remove(tmp)
+            sys.modules.pop("lazy_probe_mod", None)
+
+
+def test_missing_module_is_none():
+    assert lazy("no_such_module_punctaj", "Anything") is None
+    assert not module_available("no_such_module_punctaj")
+    assert not module_available("no_such_package_punctaj.sub")
+    assert module_available("json")
+
+
+def test_specs_bundle_lazy_modules():
+    deferred = set(lazy_imports_in())
+    assert {"admin_ui", "realtime_sync", "organization_view"} <= deferred
+    # Deferred modules are no longer imported at module load
+    assert not deferred & set(startup_imports())
+    for spec in ("punctaj.spec", "punctaj_fast.spec"):
+        source = (ROOT / spec).read_text(encoding="utf-8")
+        strings = {node.value for node in ast.walk(ast.parse(source))
+                   if isinstance(node, ast.Constant) and isinstance(node.value, str)}
+        missing = deferred - strings
+        assert not missing, f"{spec} missing hiddenimports: {missing}"
+        assert "cv2" not in strings or spec == "punctaj_fast.spec"
+
+
+def main():
+    tests = [
+        test_import_happens_on_first_use,
+        test_missing_module_is_none,
+        test_specs_bundle_lazy_modules,
+    ]
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ PASS: {test.__name__}")
+            passed += 1
+        except AssertionError as e:
+            print(f"❌ FAIL: {test.__name__} {e}")
+    print(f"\nTotal: {passed}/{len(tests)} tests passed")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,8 @@
 #!/usr/bin/env python3
 """Test local logging system"""
 
+import tempfile
+
 from action_logger import ActionLogger
 from datetime import datetime
 
@@ -13,7 +15,9 @@ class MockSupabaseSync:
         self.enabled = False  # Disable cloud upload for this test
 
 sync = MockSupabaseSync()
-logger = ActionLogger(sync)
+# Logs go to a temp dir so the test never touches tracked files
+LOGS_DIR = tempfile.mkdtemp(prefix="punctaj_logs_")
+logger = ActionLogger(sync, logs_dir=LOGS_DIR)
 
 print("=" * 70)
 print("Testing Local Logging System")
@@ -32,7 +36,7 @@ for discord_id, action_type, city, institution, details in actions:
     logger._log_action(discord_id, action_type, city, institution, details)
 
 print("\n" + "=" * 70)
-print("Check the logs/ folder for:")
+print(f"Check the {LOGS_DIR} folder for:")
 print("  - Individual log files: log_*.json")
 print("  - Global summary: SUMMARY_global.json")
 print("=" * 70)
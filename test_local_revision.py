@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Test local_revision - session-unique revisions, echoes of our own writes recognised
+(also late ones, after a newer local edit), refresh plan touching only changed rows
+"""
+
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from local_revision import LocalRevisionLog, plan_row_updates
+from realtime_apply import RealtimeApplyEngine
+
+COLUMNS = ["DISCORD", "NUME IC", "RANK", "PUNCTAJ", "ULTIMA_MOD"]
+
+
+def test_revisions_and_echoes():
+    now = [0.0]
+    log = LocalRevisionLog(ttl_s=60, clock=lambda: now[0])
+    other = LocalRevisionLog()
+    first = log.next_revision("Valentine", "Politie")
+    assert first != log.next_revision("Valentine", "Politie") and log.is_own(first)
+    assert other.next_revision("Valentine", "Politie") != first and not other.is_own(first)
+
+    # Two quick saves of the same employee: 10 -> 15 -> 20
+    log.record("Valentine", "Politie", [{"DISCORD": "ion#1", "NUME IC": "Ion", "PUNCTAJ": "15"}])
+    log.record("Valentine", "Politie", [{"DISCORD": "ion#1", "NUME IC": "Ion", "PUNCTAJ": "20"}])
+    # Echo of the first save arrives late (points as int, extra id / ULTIMA_MOD) - still ours
+    assert log.is_echo("Valentine", "Politie", {"id": 9, "DISCORD": "ion#1", "PUNCTAJ": 15, "ULTIMA_MOD": "x"})
+    assert log.is_echo("Valentine", "Politie", {"DISCORD": "ion#1", "PUNCTAJ": 20})
+    # Consumed: the same value again is a genuine remote change
+    assert not log.is_echo("Valentine", "Politie", {"DISCORD": "ion#1", "PUNCTAJ": 20})
+
+    # Another device, another employee / institution, or an expired write: not an echo
+    log.record("Valentine", "Politie", [{"DISCORD": "ana#2", "PUNCTAJ": "4"}])
+    assert not log.is_echo("Valentine", "Politie", {"DISCORD": "ana#2", "PUNCTAJ": 5})
+    assert not log.is_echo("Valentine", "Medici", {"DISCORD": "ana#2", "PUNCTAJ": 4})
+    now[0] = 61
+    assert not log.is_echo("Valentine", "Politie", {"DISCORD": "ana#2", "PUNCTAJ": 4})
+    assert log.stats["echoes"] == 2
+
+
+def test_realtime_engine_drops_late_echo():
+    with tempfile.TemporaryDirectory() as tmp:
+        os.makedirs(os.path.join(tmp, "Valentine"))
+        path = os.path.join(tmp, "Valentine", "Politie.json")
+        with open(path, "w", encoding="utf-8") as f:
+            # The local file already holds the newer edit (20)
+            json.dump({"columns": COLUMNS, "institution_id": 7,
+                       "rows": [{"DISCORD": "ion#1", "NUME IC": "Ion", "RANK": "1", "PUNCTAJ": "20"}]}, f)
+        log = LocalRevisionLog()
+        log.record("Valentine", "Politie", [{"DISCORD": "ion#1", "NUME IC": "Ion", "RANK": "1", "PUNCTAJ": "15"}])
+        engine = RealtimeApplyEngine(tmp, echo_filter=log.is_echo)
+
+        record = {"id": 1, "institution_id": 7, "discord_username": "ion#1", "employee_name": "Ion",
+                  "points": 15, "updated_at": "2026-10-19T10:00:00+00:00"}
+        assert engine.handle_event("update", record) is None and engine.stats["echo"] == 1
+        with open(path, encoding="utf-8") as f:
+            assert json.load(f)["rows"][0]["PUNCTAJ"] == "20"
+
+        # A genuine change from another device is applied
+        patch = engine.handle_event("update", dict(record, points=30, updated_at="2026-10-19T10:00:05+00:00"))
+        assert patch is not None and patch["row"]["PUNCTAJ"] == 30
+
+
+def test_plan_only_changed_rows():
+    current = [("I1", ("ion#1", "Ion", "1", "10", "")),
+               ("I2", ("ana#2", "Ana", "2", "4", "")),
+               ("I3", ("", "Bob", "1", "0", ""))]
+    rows = [{"DISCORD": "ion#1", "NUME IC": "Ion", "RANK": "1", "PUNCTAJ": 10, "ULTIMA_MOD": ""},
+            {"DISCORD": "ana#2", "NUME IC": "Ana", "RANK": "3", "PUNCTAJ": 4, "ULTIMA_MOD": ""},
+            ["vlad#3", "Vlad", "1", "0", ""]]
+    plan = plan_row_updates(current, COLUMNS, rows)
+    assert [(item, values[2]) for item, values, _ in plan["update"]] == [("I2", "3")]
+    assert [values[0] for values, _ in plan["insert"]] == ["vlad#3"]
+    assert plan["delete"] == ["I3"]
+
+    same = plan_row_updates(current, COLUMNS, [dict(zip(COLUMNS, values)) for _, values in current])
+    assert same == {"update": [], "insert": [], "delete": []}
+
+
+def main():
+    tests = [
+        test_revisions_and_echoes,
+        test_realtime_engine_drops_late_echo,
+        test_plan_only_changed_rows,
+    ]
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ PASS: {test.__name__}")
+            passed += 1
+        except AssertionError as e:
+            print(f"❌ FAIL: {test.__name__} {e}")
+    print(f"\nTotal: {passed}/{len(tests)} tests passed")
+
+
+if __name__ == "__main__":
+    main()
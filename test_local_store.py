@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Test local_store - JSON and SQLite backends behind the same API,
+row-level updates, cross-city search and the JSON import/export bridge
+"""
+
+import os
+import sys
+import json
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from local_store import JsonInstitutionStore, SqliteInstitutionStore, open_store, resolve_backend, SQLITE_FILE_NAME
+from points_edit import apply_points_changes_to_store
+
+COLUMNS = ["DISCORD", "NUME IC", "SERIE DE BULETIN", "RANK", "ROLE", "PUNCTAJ", "ULTIMA_MOD"]
+
+
+def _institution(count, rank_of=lambda i: str(i % 7 + 1)):
+    return {
+        "columns": COLUMNS,
+        "ranks": {"1": "Offiter", "7": "Sherif"},
+        "last_punctaj_update": "",
+        "version": 2,
+        "institution_id": 11,
+        "rows": [{"DISCORD": f"user{i}", "NUME IC": f"Emp {i}", "SERIE DE BULETIN": "", "RANK": rank_of(i),
+                  "ROLE": "Offiter", "PUNCTAJ": i, "ULTIMA_MOD": ""} for i in range(count)],
+    }
+
+
+def test_backends_are_interchangeable():
+    with tempfile.TemporaryDirectory() as tmp:
+        stores = [JsonInstitutionStore(os.path.join(tmp, "json")),
+                  SqliteInstitutionStore(os.path.join(tmp, "db", SQLITE_FILE_NAME))]
+        for store in stores:
+            os.makedirs(os.path.join(tmp, "json", "BlackWater"), exist_ok=True)
+            data = _institution(50)
+            store.save("BlackWater", "Politie", data)
+            store.save("Valentine", "Sherif", _institution(5))
+            assert store.load("BlackWater", "Politie") == data, store.backend
+            assert store.list_cities() == ["BlackWater", "Valentine"]
+            assert store.meta("BlackWater", "Politie")["institution_id"] == 11
+
+            touched = store.update_rows("BlackWater", "Politie",
+                                        [{"DISCORD": "user3", "PUNCTAJ": 99}, {"DISCORD": "new", "NUME IC": "Nou"}],
+                                        meta={"last_punctaj_update": "2026-01-01 10:00:00"})
+            assert touched[0]["NUME IC"] == "Emp 3" and touched[0]["PUNCTAJ"] == 99
+            loaded = store.load("BlackWater", "Politie")
+            assert len(loaded["rows"]) == 51 and loaded["rows"][-1]["NUME IC"] == "Nou"
+            assert loaded["rows"][3]["PUNCTAJ"] == 99 and loaded["last_punctaj_update"] == "2026-01-01 10:00:00"
+
+            hits = store.search("user3")
+            assert [r["DISCORD"] for _, _, r in hits] == ["user3"] + [f"user{i}" for i in range(30, 40)] + ["user3"]
+            assert (hits[0][0], hits[-1][0]) == ("BlackWater", "Valentine")
+            assert [r["DISCORD"] for _, _, r in store.search("user3", exact=True)] == ["user3", "user3"]
+            assert [r["NUME IC"] for _, _, r in store.search("emp 30", exact=True)] == ["Emp 30"]
+            assert {r["RANK"] for _, _, r in store.search(rank="7")} == {"7"}
+
+            store.delete_institution("Valentine", "Sherif")
+            assert not store.exists("Valentine", "Sherif") and store.load("Valentine", "Sherif") is None
+
+
+def test_points_edit_touches_only_given_rows():
+    with tempfile.TemporaryDirectory() as tmp:
+        store = SqliteInstitutionStore(os.path.join(tmp, SQLITE_FILE_NAME))
+        store.save("BlackWater", "Politie", _institution(200))
+        changes = [{"row": {"DISCORD": f"user{i}", "NUME IC": f"Emp {i}"}, "new": 1000 + i} for i in (5, 6)]
+        meta, touched = apply_points_changes_to_store(store, "BlackWater", "Politie", changes, "2026-02-01 12:00:00")
+        assert meta["last_punctaj_update"] == "2026-02-01 12:00:00" and "rows" not in meta
+        assert [r["PUNCTAJ"] for r in touched] == [1005, 1006] and touched[0]["RANK"] == "6"
+        rows = store.load("BlackWater", "Politie")["rows"]
+        assert [r["ULTIMA_MOD"] for r in rows].count("2026-02-01 12:00:00") == 2
+        assert rows[7]["PUNCTAJ"] == 7
+
+
+def test_json_bridge_and_external_writers():
+    with tempfile.TemporaryDirectory() as tmp:
+        json_store = JsonInstitutionStore(tmp)
+        for city in ("BlackWater", "Valentine"):
+            os.makedirs(os.path.join(tmp, city))
+            json_store.save(city, "Politie", _institution(30))
+        # Legacy list layout is imported as well
+        with open(os.path.join(tmp, "Valentine", "Vechi.json"), "w", encoding="utf-8") as f:
+            json.dump([{"DISCORD": "old", "RANK": "1", "PUNCTAJ": 3}], f)
+
+        store = open_store(tmp, "sqlite")
+        assert isinstance(store, SqliteInstitutionStore)
+        assert store.list_institutions("Valentine") == ["Politie", "Vechi"]
+        assert store.load("Valentine", "Vechi")["rows"] == [{"DISCORD": "old", "RANK": "1", "PUNCTAJ": 3}]
+
+        # Another module rewrites the JSON file (reset / realtime) -> next load follows it
+        data = json_store.load("BlackWater", "Politie")
+        data["rows"][0]["PUNCTAJ"] = 0
+        data["rows"][1]["PUNCTAJ"] = 0
+        json_store.save("BlackWater", "Politie", data)
+        st = os.stat(json_store.path("BlackWater", "Politie"))
+        os.utime(json_store.path("BlackWater", "Politie"), ns=(st.st_atime_ns, st.st_mtime_ns + 10 ** 9))
+        assert store.load("BlackWater", "Politie")["rows"][1]["PUNCTAJ"] == 0
+
+        # SQLite write -> JSON mirror, without being re-imported afterwards
+        store.update_rows("BlackWater", "Politie", [{"DISCORD": "user2", "PUNCTAJ": 77}])
+        store.export_institution("BlackWater", "Politie")
+        assert json_store.load("BlackWater", "Politie")["rows"][2]["PUNCTAJ"] == 77
+        assert store.load("BlackWater", "Politie")["rows"][2]["PUNCTAJ"] == 77
+
+        # The file changed after the DB row (realtime apply while the mirror job waited):
+        # the export keeps it and imports it instead of writing older DB content over it
+        store.update_rows("BlackWater", "Politie", [{"DISCORD": "user3", "PUNCTAJ": 5}])
+        data = json_store.load("BlackWater", "Politie")
+        data["rows"][4]["PUNCTAJ"] = 44
+        json_store.save("BlackWater", "Politie", data)
+        st = os.stat(json_store.path("BlackWater", "Politie"))
+        os.utime(json_store.path("BlackWater", "Politie"), ns=(st.st_atime_ns, st.st_mtime_ns + 10 ** 9))
+        assert store.export_institution("BlackWater", "Politie") is False
+        assert json_store.load("BlackWater", "Politie")["rows"][4]["PUNCTAJ"] == 44
+        assert store.load("BlackWater", "Politie")["rows"][4]["PUNCTAJ"] == 44
+        # ... and a file with a higher version than the DB row, even with an older mtime
+        data["version"] = 50
+        json_store.save("BlackWater", "Politie", data)
+        os.utime(json_store.path("BlackWater", "Politie"), ns=(st.st_atime_ns, st.st_mtime_ns - 10 ** 9))
+        assert store.export_institution("BlackWater", "Politie") is False
+        assert store.meta("BlackWater", "Politie")["version"] == 50
+
+        out = JsonInstitutionStore(os.path.join(tmp, "export"))
+        for city in store.list_cities():
+            os.makedirs(os.path.join(out.data_dir, city), exist_ok=True)
+        assert store.export_json_tree(out) == 3
+        assert out.load("Valentine", "Politie") == json_store.load("Valentine", "Politie")
+        store.close()
+
+        os.environ["PUNCTAJ_STORAGE_BACKEND"] = "SQLite"
+        try:
+            assert resolve_backend() == "sqlite"
+        finally:
+            del os.environ["PUNCTAJ_STORAGE_BACKEND"]
+        config = os.path.join(tmp, "supabase_config.ini")
+        with open(config, "w", encoding="utf-8") as f:
+            f.write("[storage]\nbackend = mongo\n")
+        assert resolve_backend([config]) == "json"
+
+
+def main():
+    tests = [
+        test_backends_are_interchangeable,
+        test_points_edit_touches_only_given_rows,
+        test_json_bridge_and_external_writers,
+    ]
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ PASS: {test.__name__}")
+            passed += 1
+        except AssertionError as e:
+            print(f"❌ FAIL: {test.__name__} {e}")
+    print(f"\nTotal: {passed}/{len(tests)} tests passed")
+
+
+if __name__ == "__main__":
+    main()
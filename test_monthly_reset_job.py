@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Test monthly_reset_job - manifest, parallel commits, resume after crash, summary,
+older / repeatedly failing runs abandoned instead of retried
+"""
+
+import json
+import os
+import sys
+import tempfile
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from monthly_reset_job import MonthlyResetJob
+
+FIRST_OF_MONTH = datetime(2026, 3, 1, 0, 0, 0)
+
+
+def _make_tree(root, cities=3, institutions=4):
+    data_dir = os.path.join(root, "data")
+    for c in range(cities):
+        city_dir = os.path.join(data_dir, f"City{c}")
+        os.makedirs(city_dir)
+        for i in range(institutions):
+            rows = [{"DISCORD": str(n), "NUME IC": f"Emp{n}", "PUNCTAJ": n + 1} for n in range(5)]
+            rows.append([str(99), "ListRow", 42])  # legacy list row
+            with open(os.path.join(city_dir, f"Inst{i}.json"), "w", encoding="utf-8") as f:
+                json.dump({"columns": ["DISCORD", "NUME IC", "PUNCTAJ"], "rows": rows}, f)
+        with open(os.path.join(city_dir, "Notes.json"), "w", encoding="utf-8") as f:
+            json.dump({"columns": ["DISCORD"], "rows": []}, f)
+    return data_dir
+
+
+def _punctaj_values(data_dir):
+    values = []
+    for city in os.listdir(data_dir):
+        for name in os.listdir(os.path.join(data_dir, city)):
+            with open(os.path.join(data_dir, city, name), encoding="utf-8") as f:
+                values += [r["PUNCTAJ"] for r in json.load(f)["rows"] if isinstance(r, dict) and "PUNCTAJ" in r]
+    return values
+
+
+def test_full_run_resets_everything_and_writes_summary():
+    with tempfile.TemporaryDirectory() as tmp:
+        data_dir = _make_tree(tmp)
+        job = MonthlyResetJob(data_dir, os.path.join(tmp, "arhiva"), server_key="srv", max_workers=4)
+
+        summary = job.run(FIRST_OF_MONTH)
+
+        assert summary["targets"] == 15
+        assert summary["done"] == 12
+        assert summary["skipped"] == 3
+        assert summary["failed"] == []
+        assert summary["employees_reset"] == 12 * 6
+        assert set(_punctaj_values(data_dir)) == {0}
+
+        # Second trigger in the same month is a no-op
+        again = job.run(FIRST_OF_MONTH)
+        assert again["completed_at"] == summary["completed_at"]
+        assert job.incomplete_periods() == []
+
+
+def test_resume_after_crash_only_processes_pending_targets():
+    with tempfile.TemporaryDirectory() as tmp:
+        data_dir = _make_tree(tmp, cities=2, institutions=2)
+        archive_dir = os.path.join(tmp, "arhiva")
+        job = MonthlyResetJob(data_dir, archive_dir, server_key="srv", max_workers=2)
+
+        # Simulate a crash: manifest written, one institution committed, torn last line
+        path = job.journal_path("2026-03")
+        os.makedirs(job.journal_dir, exist_ok=True)
+        targets = job.discover_targets()
+        first = job._reset_one(targets[0], FIRST_OF_MONTH)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(json.dumps({"type": "manifest", "period": "2026-03", "reset_at": "2026-03-01 00:00:00",
+                                "server_key": "srv", "targets": targets}) + "\n")
+            f.write(json.dumps(first) + "\n")
+            f.write('{"type": "commit", "city": "Ci')
+
+        assert job.incomplete_periods() == ["2026-03"]
+        summaries = job.resume_incomplete(datetime(2026, 3, 2, 9, 0, 0))
+
+        assert len(summaries) == 1
+        assert summaries[0]["resumed"] is True
+        assert summaries[0]["done"] == 4
+        assert set(_punctaj_values(data_dir)) == {0}
+        assert all(r.get("type") for r in job.read_journal(path))
+        assert job.read_journal(path)[-1]["type"] == "summary"
+        # The already-committed institution kept its single pre-reset snapshot
+        archived = os.listdir(os.path.join(archive_dir, "srv", targets[0]["city"]))
+        snapshot = [n for n in archived if n.startswith(targets[0]["institution"] + "_") and n.endswith(".json")]
+        with open(os.path.join(archive_dir, "srv", targets[0]["city"], snapshot[0]), encoding="utf-8") as f:
+            assert json.load(f)["rows"][0]["PUNCTAJ"] == 1
+
+
+def test_old_period_and_failing_runs_are_abandoned():
+    with tempfile.TemporaryDirectory() as tmp:
+        data_dir = _make_tree(tmp, cities=1, institutions=2)
+        job = MonthlyResetJob(data_dir, os.path.join(tmp, "arhiva"), server_key="srv", max_attempts=2)
+        good_reset = job._reset_one
+        job._reset_one = lambda target, reset_at: {"type": "commit", "city": target["city"],
+                                                   "institution": target["institution"],
+                                                   "status": "failed", "error": "disk full"}
+
+        # Every attempt fails -> no summary; the cap ends it
+        assert job.run(FIRST_OF_MONTH)["failed"]
+        assert job.resume_incomplete(datetime(2026, 3, 5))[0]["failed"]
+        abandoned = job.resume_incomplete(datetime(2026, 3, 6))
+        assert abandoned[0]["type"] == "abandoned" and len(abandoned[0]["pending"]) == 3
+        assert job.run(FIRST_OF_MONTH)["type"] == "abandoned"
+        assert job.incomplete_periods() == []
+
+        # A March run still unfinished in April is abandoned, its points untouched
+        job = MonthlyResetJob(data_dir, os.path.join(tmp, "arhiva2"), server_key="srv")
+        job._reset_one = lambda target, reset_at: {"type": "commit", "city": target["city"],
+                                                   "institution": target["institution"],
+                                                   "status": "failed", "error": "offline"}
+        job.run(FIRST_OF_MONTH)
+        job._reset_one = good_reset
+        results = job.resume_incomplete(datetime(2026, 4, 3))
+        assert [r["type"] for r in results] == ["abandoned"] and results[0]["reason"] == "period over"
+        assert 0 not in _punctaj_values(data_dir)
+        assert job.incomplete_periods() == []
+
+
+def main():
+    tests = [
+        test_full_run_resets_everything_and_writes_summary,
+        test_resume_after_crash_only_processes_pending_targets,
+        test_old_period_and_failing_runs_are_abandoned,
+    ]
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ PASS: {test.__name__}")
+            passed += 1
+        except AssertionError as e:
+            print(f"❌ FAIL: {test.__name__} {e}")
+    print(f"\nTotal: {passed}/{len(tests)} tests passed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Test bulk points edit - one local write touching only the selected rows,
+one delta upsert (+ at most one GET) and one batched audit insert (against the local Supabase stub)
+"""
+
+import configparser
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+import action_logger
+import points_edit
+from action_logger import ActionLogger
+from points_edit import new_points, apply_points_changes, upload_points_delta
+from supabase_employee_manager import SupabaseEmployeeManager
+from supabase_stub import SupabaseStub
+
+COLUMNS = ["DISCORD", "NUME IC", "RANK", "PUNCTAJ", "ULTIMA_MOD"]
+
+
+def _institution(tmp, count=30):
+    path = os.path.join(tmp, "Politie.json")
+    rows = [{"id": i + 1 if i < 20 else None, "DISCORD": f"user{i}", "NUME IC": f"Emp {i}",
+             "RANK": "1", "PUNCTAJ": i, "ULTIMA_MOD": "2026-01-01 00:00:00"} for i in range(count)]
+    rows.append(["legacy", "Legacy Row", "1", 5, ""])
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"columns": COLUMNS, "rows": rows, "institution_id": 7, "version": 3}, f)
+    return path
+
+
+def _manager(stub, tmp):
+    config_path = os.path.join(tmp, "supabase_config.ini")
+    with open(config_path, "w", encoding="utf-8") as f:
+        f.write(f"[supabase]\nurl = {stub.url}\nkey = test-key\n")
+    return SupabaseEmployeeManager(config_path)
+
+
+def test_local_write_touches_only_selected_rows_once():
+    assert new_points(5, 3, "add") == 8
+    assert new_points(2, 5, "remove") == 0
+    assert new_points("x", 4, "add") == 4
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = _institution(tmp)
+        changes = [{"row": {"DISCORD": f"user{i}", "NUME IC": f"Emp {i}"}, "new": i + 10} for i in (2, 25)]
+        changes.append({"row": {"DISCORD": "", "NUME IC": "Legacy Row"}, "new": 0})
+
+        with mock.patch.object(points_edit, "atomic_write_json", wraps=points_edit.atomic_write_json) as write:
+            inst_data, touched = apply_points_changes(path, changes, timestamp="2026-10-19 12:00:00")
+        assert write.call_count == 1
+
+        with open(path, encoding="utf-8") as f:
+            saved = json.load(f)
+        by_name = {r["NUME IC"]: r for r in saved["rows"]}
+        assert by_name["Emp 2"]["PUNCTAJ"] == 12 and by_name["Emp 2"]["ULTIMA_MOD"] == "2026-10-19 12:00:00"
+        assert by_name["Emp 25"]["PUNCTAJ"] == 35
+        assert by_name["Legacy Row"]["PUNCTAJ"] == 0
+        assert by_name["Emp 3"]["PUNCTAJ"] == 3 and by_name["Emp 3"]["ULTIMA_MOD"] == "2026-01-01 00:00:00"
+        assert saved["last_punctaj_update"] == "2026-10-19 12:00:00"
+        assert saved["version"] == 3 and saved["institution_id"] == 7
+        assert [r["id"] for r in touched[:2]] == [3, None]
+
+
+def test_delta_upload_is_one_get_and_one_upsert():
+    with SupabaseStub() as stub, tempfile.TemporaryDirectory() as tmp:
+        stub.seed("employees", [
+            {"id": i + 1, "institution_id": 7, "employee_name": f"Emp {i}",
+             "discord_username": f"user{i}", "points": i, "rank": "1"}
+            for i in range(30)
+        ])
+        manager = _manager(stub, tmp)
+        path = _institution(tmp)
+        changes = [{"row": {"DISCORD": f"user{i}", "NUME IC": f"Emp {i}"}, "new": 100 + i} for i in range(0, 30, 3)]
+        changes.append({"row": {"DISCORD": "ghost", "NUME IC": "Nobody"}, "new": 1})
+        _, touched = apply_points_changes(path, changes)
+        stub.reset_counters()
+
+        result = upload_points_delta(manager, 7, touched)
+
+        assert result["uploaded"] == 10
+        assert [r["NUME IC"] for r in result["unmatched"]] == ["Nobody"]
+        assert stub.request_count("GET", "employees") == 1
+        assert stub.request_count("POST", "employees") == 1
+        assert stub.request_count() == 2
+        cloud = {r["id"]: r for r in stub.rows("employees")}
+        assert cloud[1]["points"] == 100 and cloud[28]["points"] == 127
+        assert cloud[2]["points"] == 1 and cloud[2]["rank"] == "1"
+        assert len(cloud) == 30
+
+
+def test_audit_batch_is_one_insert_and_one_local_write():
+    with SupabaseStub() as stub, tempfile.TemporaryDirectory() as tmp:
+        config = configparser.ConfigParser()
+        config.read_dict({"supabase": {"server_key": "srv"}})
+        sync = SimpleNamespace(url=stub.url, key="test-key", table_logs="audit_logs", config=config)
+        logs_dir = os.path.join(tmp, "logs")
+        logger = ActionLogger(sync, logs_dir=logs_dir)
+        changes = [{"employee_name": f"Emp {i}", "old_points": i, "new_points": i + 5, "entity_id": f"user{i}"}
+                   for i in range(25)]
+
+        with mock.patch.dict(os.environ, {"PUNCTAJ_SERVER_KEY": ""}):
+            assert logger.log_edit_points_bulk("42", "LS", "Politie", changes, "Adăugare 5 puncte",
+                                               discord_username="admin")
+
+        assert stub.request_count("POST", "audit_logs") == 1
+        logged = stub.rows("audit_logs")
+        assert len(logged) == 25
+        assert logged[3]["changes"] == "Points: 3 → 8 (Adăugare 5 puncte)"
+        local_file = os.path.join(logs_dir, "srv", "LS", "Politie.json")
+        if action_logger.ENCRYPTION_ENABLED:
+            local = action_logger.load_protected_json(local_file, decrypt=True)
+        else:
+            with open(local_file, encoding="utf-8") as f:
+                local = json.load(f)
+        assert len(local) == 25
+
+
+def main():
+    tests = [
+        test_local_write_touches_only_selected_rows_once,
+        test_delta_upload_is_one_get_and_one_upsert,
+        test_audit_batch_is_one_insert_and_one_local_write,
+    ]
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ PASS: {test.__name__}")
+            passed += 1
+        except AssertionError as e:
+            print(f"❌ FAIL: {test.__name__} {e}")
+    print(f"\nTotal: {passed}/{len(tests)} tests passed")
+
+
+if __name__ == "__main__":
+    main()
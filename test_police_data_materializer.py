@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Test police_data_materializer - police_data rows -> institution JSON in the columns/ranks/rows
+schema, only newer versions written, changed set reported
+(MultiDeviceSyncManager against the local Supabase stub)
+"""
+
+import os
+import sys
+import json
+import tempfile
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from police_data_materializer import materialize, to_institution_schema, unwrap_record
+from multi_device_sync_manager import MultiDeviceSyncManager
+from supabase_stub import SupabaseStub
+
+
+def _institution(points):
+    return {"columns": ["DISCORD", "NUME IC", "RANK", "PUNCTAJ"], "ranks": {"1": "Offiter"},
+            "rows": [{"DISCORD": "ana", "NUME IC": "Ana", "RANK": "1", "PUNCTAJ": points}]}
+
+
+def _load(tmp, city, institution):
+    with open(os.path.join(tmp, city, f"{institution}.json"), encoding="utf-8") as f:
+        return json.load(f)
+
+
+def test_unwrap_and_schema():
+    jsonb = {"city": "A", "institution": "B", "data": _institution(5), "version": 3}
+    legacy = {"city": "A", "institution": "B", "data_json": json.dumps(_institution(7)), "version": 1}
+    assert unwrap_record(jsonb)["rows"][0]["PUNCTAJ"] == 5
+    assert unwrap_record(legacy)["rows"][0]["PUNCTAJ"] == 7
+    assert unwrap_record({"data": "{broken"}) is None
+
+    # Positional rows, bare lists and a nested raw row all end in the same schema
+    positional = to_institution_schema({"columns": ["DISCORD", "PUNCTAJ"], "rows": [["ana", 3]]})
+    assert positional["rows"] == [{"DISCORD": "ana", "PUNCTAJ": 3}] and positional["ranks"] == {}
+    assert to_institution_schema([{"DISCORD": "x"}])["columns"][0] == "DISCORD"
+    assert to_institution_schema(jsonb)["rows"] == _institution(5)["rows"]
+    assert to_institution_schema("nope") is None
+
+
+def test_sync_writes_only_newer_institutions():
+    with SupabaseStub() as stub, tempfile.TemporaryDirectory() as tmp:
+        stub.seed("police_data", [
+            {"id": 1, "city": "BlackWater", "institution": "Politie", "data": _institution(10), "version": 2},
+            {"id": 2, "city": "BlackWater", "institution": "Sherif", "data_json": json.dumps(_institution(4)),
+             "version": 1},
+            {"id": 3, "city": "Valentine", "institution": "Politie", "data": _institution(8), "version": 5,
+             "updated_at": "2026-01-01T00:00:00+00:00"},
+            {"id": 4, "city": "", "institution": "Politie", "data": _institution(1), "version": 1},
+        ])
+        # Local state: Valentine already newer (pending local edit), BlackWater/Politie is a raw row
+        # written by the old sync, with the Supabase ids the app attached
+        os.makedirs(os.path.join(tmp, "Valentine"))
+        local = dict(_institution(99), version=6, institution_id=42)
+        with open(os.path.join(tmp, "Valentine", "Politie.json"), "w", encoding="utf-8") as f:
+            json.dump(local, f)
+        os.makedirs(os.path.join(tmp, "BlackWater"))
+        with open(os.path.join(tmp, "BlackWater", "Politie.json"), "w", encoding="utf-8") as f:
+            json.dump({"id": 1, "city": "BlackWater", "institution": "Politie", "data": {}, "version": 9}, f)
+
+        manager = MultiDeviceSyncManager(SimpleNamespace(url=stub.url, key="k", table_logs="audit_logs"), tmp)
+        result = manager._sync_police_data()
+        assert result["status"] == "success", result
+        assert sorted(result["changed"]) == [("BlackWater", "Politie"), ("BlackWater", "Sherif")], result
+        assert result["unchanged"] == 1 and result["skipped"] == 1 and result["count"] == 1
+
+        politie = _load(tmp, "BlackWater", "Politie")
+        assert politie["rows"][0]["PUNCTAJ"] == 10 and politie["version"] == 2 and politie["columns"][0] == "DISCORD"
+        assert "city" not in politie and "data" not in politie
+        assert _load(tmp, "BlackWater", "Sherif")["rows"][0]["PUNCTAJ"] == 4
+        assert _load(tmp, "Valentine", "Politie") == local
+
+        # Second pass: nothing newer -> nothing rewritten
+        mtime = os.stat(os.path.join(tmp, "BlackWater", "Politie.json")).st_mtime_ns
+        again = manager._sync_police_data()
+        assert again["changed"] == [] and again["unchanged"] == 3
+        assert os.stat(os.path.join(tmp, "BlackWater", "Politie.json")).st_mtime_ns == mtime
+
+        # Cloud moves ahead of the local edit; local relation ids survive the rewrite
+        records = stub.rows("police_data")
+        records[2].update(version=7, data=_institution(50))
+        result = materialize(records, tmp)
+        assert result["changed"] == [("Valentine", "Politie")]
+        valentine = _load(tmp, "Valentine", "Politie")
+        assert valentine["rows"][0]["PUNCTAJ"] == 50 and valentine["institution_id"] == 42
+        assert valentine["version"] == 7 and valentine["pending_sync"] is False
+
+
+def main():
+    tests = [
+        test_unwrap_and_schema,
+        test_sync_writes_only_newer_institutions,
+    ]
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ PASS: {test.__name__}")
+            passed += 1
+        except AssertionError as e:
+            print(f"❌ FAIL: {test.__name__} {e}")
+    print(f"\nTotal: {passed}/{len(tests)} tests passed")
+
+
+if __name__ == "__main__":
+    main()
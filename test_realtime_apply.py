@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Test realtime_apply - employee events patch the local institution JSON,
+stale / out-of-order events are dropped, listeners get one patch per change
+"""
+
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from realtime_apply import RealtimeApplyEngine
+
+COLUMNS = ["DISCORD", "NUME IC", "RANK", "ROLE", "PUNCTAJ", "ULTIMA_MOD"]
+
+
+def _make_institution(data_dir, city="Saint_Denis", institution="Politie", institution_id=7):
+    os.makedirs(os.path.join(data_dir, city), exist_ok=True)
+    path = os.path.join(data_dir, city, f"{institution}.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({
+            "columns": COLUMNS,
+            "institution_id": institution_id,
+            "rows": [
+                {"DISCORD": "ion#1", "NUME IC": "Ion", "RANK": "1", "ROLE": "Agent", "PUNCTAJ": 10, "ULTIMA_MOD": ""},
+                {"DISCORD": "ana#2", "NUME IC": "Ana", "RANK": "2", "ROLE": "Agent", "PUNCTAJ": 4, "ULTIMA_MOD": ""},
+            ],
+        }, f, indent=4)
+    return path
+
+
+def _rows(path):
+    with open(path, encoding="utf-8") as f:
+        return {r["DISCORD"]: r for r in json.load(f)["rows"]}
+
+
+def test_update_insert_delete_patch_one_row():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = _make_institution(tmp)
+        engine = RealtimeApplyEngine(tmp)
+        patches = []
+        engine.add_listener(patches.append)
+
+        patch = engine.handle_event("update", {
+            "id": 1, "institution_id": 7, "discord_username": "ion#1", "employee_name": "Ion",
+            "points": 15, "updated_at": "2026-10-19T10:00:00+00:00"})
+        assert patch["action"] == "upsert"
+        assert (patch["city"], patch["institution"]) == ("Saint_Denis", "Politie")
+        assert patch["previous"]["PUNCTAJ"] == 10
+        rows = _rows(path)
+        assert rows["ion#1"]["PUNCTAJ"] == 15
+        assert rows["ion#1"]["RANK"] == "1"  # fields absent from the event are kept
+        assert rows["ana#2"]["PUNCTAJ"] == 4
+
+        engine.handle_event("insert", {
+            "id": 3, "institution_id": 7, "discord_username": "vlad#3", "employee_name": "Vlad",
+            "points": 0, "rank": "1", "updated_at": "2026-10-19T10:00:01+00:00"})
+        engine.handle_event("delete", {"id": 2, "institution_id": 7, "discord_username": "ana#2",
+                                       "updated_at": "2026-10-19T10:00:02+00:00"})
+        rows = _rows(path)
+        assert set(rows) == {"ion#1", "vlad#3"}
+        assert [p["action"] for p in patches] == ["upsert", "upsert", "delete"]
+
+
+def test_stale_and_duplicate_events_are_dropped():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = _make_institution(tmp)
+        engine = RealtimeApplyEngine(tmp)
+
+        newer = {"id": 1, "institution_id": 7, "discord_username": "ion#1", "points": 20,
+                 "updated_at": "2026-10-19T10:00:05Z"}
+        older = dict(newer, points=12, updated_at="2026-10-19T10:00:01Z")
+        assert engine.handle_event("update", newer) is not None
+        assert engine.handle_event("update", older) is None   # arrived out of order
+        assert engine.handle_event("update", newer) is None   # duplicate delivery
+        assert _rows(path)["ion#1"]["PUNCTAJ"] == 20
+
+        # DELETE right after an UPDATE: old_record (REPLICA IDENTITY FULL) has the same updated_at
+        assert engine.handle_event("delete", dict(newer)) is not None
+        assert "ion#1" not in _rows(path)
+        # The redelivered UPDATE (same version) or an older one must not resurrect the employee
+        assert engine.handle_event("update", dict(newer)) is None
+        assert engine.handle_event("update", dict(newer, points=99, updated_at="2026-10-19T10:00:03Z")) is None
+        assert "ion#1" not in _rows(path)
+        assert engine.stats["stale"] == 4
+
+        # A delete older than an update already applied is stale
+        ana = {"id": 2, "institution_id": 7, "discord_username": "ana#2", "points": 6,
+               "updated_at": "2026-10-19T10:00:05Z"}
+        assert engine.handle_event("update", ana) is not None
+        assert engine.handle_event("delete", dict(ana, updated_at="2026-10-19T10:00:01Z")) is None
+        assert "ana#2" in _rows(path)
+
+
+def test_unknown_institution_uses_resolver_and_echo_is_ignored():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = _make_institution(tmp, institution_id=None)
+        calls = []
+
+        def resolver(institution_id):
+            calls.append(institution_id)
+            return ("Saint_Denis", "Politie") if institution_id == 42 else None
+
+        engine = RealtimeApplyEngine(lambda: tmp, resolver=resolver)
+        assert engine.handle_event("update", {"id": 9, "institution_id": 99, "points": 1}) is None
+        assert engine.stats["unresolved"] == 1
+
+        # Same values as the local row (our own save coming back) -> no write, no patch
+        before = os.stat(path).st_mtime_ns
+        assert engine.handle_event("update", {"institution_id": 42, "discord_username": "ana#2",
+                                              "points": 4, "updated_at": "2026-10-19T10:00:00Z"}) is None
+        assert engine.stats["unchanged"] == 1
+        assert os.stat(path).st_mtime_ns == before
+        assert engine.handle_event("update", {"institution_id": 42, "discord_username": "ana#2",
+                                              "points": 9, "updated_at": "2026-10-19T10:00:01Z"}) is not None
+        assert _rows(path)["ana#2"]["PUNCTAJ"] == 9
+        assert calls.count(42) == 1  # resolved once, then cached
+
+
+def main():
+    tests = [
+        test_update_insert_delete_patch_one_row,
+        test_stale_and_duplicate_events_are_dropped,
+        test_unknown_institution_uses_resolver_and_echo_is_ignored,
+    ]
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ PASS: {test.__name__}")
+            passed += 1
+        except AssertionError as e:
+            print(f"❌ FAIL: {test.__name__} {e}")
+    print(f"\nTotal: {passed}/{len(tests)} tests passed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Test supabase_realtime_ws dispatcher against a local websocket stub -
+bursts coalesced per (table, id), ordered single-thread delivery,
+backpressure, reconnect + resubscribe + REST gap backfill, batched UI hand-off
+"""
+
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from supabase_realtime_ws import SupabaseRealtimeWS, MainThreadHandoff
+from supabase_stub import SupabaseStub, RealtimeStub
+
+
+def _wait(predicate, timeout=10):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return predicate()
+
+
+def _update(record_id, points):
+    return {"type": "UPDATE", "table": "employees", "data": {"id": record_id, "points": points}}
+
+
+def test_burst_is_coalesced_and_delivered_in_order_on_one_thread():
+    with RealtimeStub() as rt:
+        manager = SupabaseRealtimeWS("http://127.0.0.1:9", "key", ["employees"], ws_url=rt.url)
+        seen, threads = {}, set()
+        gate = threading.Event()
+
+        def on_update(record):
+            gate.wait(5)  # hold the first batch so the rest of the burst piles up
+            threads.add(threading.current_thread().name)
+            seen.setdefault(record["id"], []).append(record["points"])
+
+        manager.register_callback("update", "employees", on_update)
+        threads_before = threading.active_count()
+        manager.start()
+        try:
+            assert rt.wait_for_subscriptions(1)
+            rt.send_events([_update(i % 20, i) for i in range(200)])
+            assert _wait(lambda: manager.metrics["received"] == 200)
+            gate.set()
+            assert _wait(lambda: manager.metrics["delivered"] + manager.metrics["coalesced"] == 200)
+        finally:
+            manager.stop()
+
+        assert manager.metrics["coalesced"] > 100
+        assert len(threads) == 1 and threads.pop().startswith("RealtimeDispatch")
+        for record_id, points in seen.items():
+            assert points == sorted(points)             # per-key order
+            assert points[-1] == 180 + record_id        # latest value wins
+        assert threading.active_count() <= threads_before + 3
+
+
+def test_backpressure_stops_reading_until_dispatcher_catches_up():
+    with RealtimeStub() as rt:
+        manager = SupabaseRealtimeWS("http://127.0.0.1:9", "key", ["employees"], ws_url=rt.url, max_pending=5)
+        gate = threading.Event()
+        delivered = []
+        manager.register_callback("update", "employees", lambda r: (gate.wait(5), delivered.append(r["id"])))
+        manager.start()
+        try:
+            assert rt.wait_for_subscriptions(1)
+            rt.send_events([_update(i, 1) for i in range(50)])
+            assert _wait(lambda: manager.metrics["backpressure_waits"] > 0)
+            assert manager.get_status()["queue_depth"] <= 5
+            gate.set()
+            assert _wait(lambda: len(delivered) == 50)
+        finally:
+            manager.stop()
+        assert delivered == list(range(50))
+
+
+def test_reconnect_resubscribes_and_backfills_the_gap():
+    with SupabaseStub() as stub, RealtimeStub() as rt:
+        manager = SupabaseRealtimeWS(stub.url, "key", ["employees"], ws_url=rt.url)
+        manager.reconnect_delay = 0.05
+        received = []
+        manager.register_callback("update", "employees", received.append)
+        manager.start()
+        try:
+            assert rt.wait_for_subscriptions(1)
+            rt.drop_connections()
+            # Changed while the client was disconnected
+            stub.seed("employees", [{"id": 7, "points": 42,
+                                     "updated_at": datetime.now(timezone.utc).isoformat()}])
+            assert rt.wait_for_connections(2)
+            assert rt.wait_for_subscriptions(2)
+            assert _wait(lambda: any(r.get("id") == 7 for r in received))
+            status = manager.get_status()
+            assert status["connected"] is True
+            assert status["metrics"]["reconnects"] == 1
+            assert status["metrics"]["backfilled"] == 1
+        finally:
+            manager.stop()
+
+
+def test_ui_handoff_batches_a_burst_into_one_schedule_call():
+    scheduled = []
+    handoff = MainThreadHandoff(scheduled.append)
+    calls = []
+    for i in range(100):
+        handoff.submit(calls.append, i)
+        handoff.submit(calls.append, "sort", key="sort")
+    assert len(scheduled) == 1
+    scheduled[0]()
+    assert calls == list(range(100)) + ["sort"]
+    handoff.submit(calls.append, "next")
+    assert len(scheduled) == 2
+
+
+def main():
+    tests = [
+        test_burst_is_coalesced_and_delivered_in_order_on_one_thread,
+        test_backpressure_stops_reading_until_dispatcher_catches_up,
+        test_reconnect_resubscribes_and_backfills_the_gap,
+        test_ui_handoff_batches_a_burst_into_one_schedule_call,
+    ]
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ PASS: {test.__name__}")
+            passed += 1
+        except AssertionError as e:
+            print(f"❌ FAIL: {test.__name__} {e}")
+    print(f"\nTotal: {passed}/{len(tests)} tests passed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Test reset_engine - single archive snapshot, compact marker, atomic verified write,
+background weekly_reports queue (against the local Supabase stub)
+"""
+
+import json
+import os
+import sys
+import tempfile
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from reset_engine import reset_institution, queue_reset_report, BackgroundReportQueue, ResetError
+from atomic_io import sha256_bytes
+from supabase_stub import SupabaseStub
+
+
+def _write_institution(path, rows, columns=None):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({
+            "columns": columns or ["DISCORD", "NUME IC", "RANK", "PUNCTAJ"],
+            "rows": rows,
+            "institution_id": 7,
+        }, f, indent=4, ensure_ascii=False)
+
+
+def test_reset_writes_one_snapshot_and_a_marker():
+    with tempfile.TemporaryDirectory() as tmp:
+        inst_path = os.path.join(tmp, "data", "Saint_Denis", "Politie.json")
+        archive_dir = os.path.join(tmp, "arhiva", "default", "Saint_Denis")
+        _write_institution(inst_path, [
+            {"DISCORD": "1", "NUME IC": "Ion", "RANK": "1", "PUNCTAJ": 12},
+            ["2", "Maria", "2", 30],
+        ])
+
+        result = reset_institution(inst_path, archive_dir, "Saint_Denis", "Politie",
+                                   reset_by="tester", reset_at=datetime(2026, 3, 1, 0, 0, 0))
+
+        archived = sorted(os.listdir(archive_dir))
+        assert archived == ["Politie_2026-03-01_00-00-00.json", "Politie_2026-03-01_00-00-00.reset"]
+
+        with open(result["archive_path"], encoding="utf-8") as f:
+            snapshot = json.load(f)
+        assert snapshot["rows"][0]["PUNCTAJ"] == 12
+        assert snapshot["employee_count"] == 2
+
+        with open(inst_path, "rb") as f:
+            raw = f.read()
+        assert sha256_bytes(raw) == result["checksum"]
+        data = json.loads(raw.decode("utf-8"))
+        assert [r["PUNCTAJ"] for r in data["rows"]] == [0, 0]
+        assert data["rows"][1]["NUME IC"] == "Maria"
+        assert "ULTIMA_MOD" in data["columns"]
+
+        with open(result["marker_path"], encoding="utf-8") as f:
+            marker = json.load(f)
+        assert marker["institution_sha256"] == result["checksum"]
+        assert "rows" not in marker
+        assert not [n for n in os.listdir(os.path.dirname(inst_path)) if n.endswith(".tmp")]
+
+
+def test_reset_without_punctaj_column_is_rejected():
+    with tempfile.TemporaryDirectory() as tmp:
+        inst_path = os.path.join(tmp, "Politie.json")
+        _write_institution(inst_path, [{"DISCORD": "1"}], columns=["DISCORD"])
+        try:
+            reset_institution(inst_path, tmp, "Saint_Denis", "Politie")
+        except ResetError:
+            return
+        raise AssertionError("ResetError expected")
+
+
+def test_report_is_sent_in_background():
+    with SupabaseStub() as stub, tempfile.TemporaryDirectory() as tmp:
+        inst_path = os.path.join(tmp, "Politie.json")
+        _write_institution(inst_path, [{"DISCORD": "1", "NUME IC": "Ion", "RANK": "1", "PUNCTAJ": 5}])
+        result = reset_institution(inst_path, os.path.join(tmp, "arhiva"), "Saint_Denis", "Politie")
+
+        report_queue = BackgroundReportQueue()
+        queue_reset_report(stub.url, "key", "weekly_reports", "Saint_Denis", "Politie", result,
+                           report_queue=report_queue)
+        assert report_queue.join(timeout=10)
+
+        reports = stub.rows("weekly_reports")
+        assert len(reports) == 1
+        assert reports[0]["report_data"]["action"] == "reset_punctaj"
+        assert stub.request_count("PATCH", "employees") == 1
+
+
+def main():
+    tests = [
+        test_reset_writes_one_snapshot_and_a_marker,
+        test_reset_without_punctaj_column_is_rejected,
+        test_report_is_sent_in_background,
+    ]
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ PASS: {test.__name__}")
+            passed += 1
+        except AssertionError as e:
+            print(f"❌ FAIL: {test.__name__} {e}")
+    print(f"\nTotal: {passed}/{len(tests)} tests passed")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,6 +4,7 @@ Test reset_punctaj logging - verify the fix works
 """
 
 import sys
+import tempfile
 from pathlib import Path
 
 # Add parent to path
@@ -12,6 +13,10 @@ sys.path.insert(0, str(Path(__file__).parent))
 from action_logger import ActionLogger
 
 # Create mock supabase_sync object
+# Logs go to a temp dir so the test never touches tracked files
+LOGS_DIR = tempfile.mkdtemp(prefix="punctaj_logs_")
+
+
 class MockSupabaseSync:
     def __init__(self):
         self.url = "https://test.supabase.co"
@@ -27,7 +32,7 @@ def test_log_custom_action():
     
     # Create action logger
     mock_supabase = MockSupabaseSync()
-    logger = ActionLogger(mock_supabase, logs_dir="logs")
+    logger = ActionLogger(mock_supabase, logs_dir=LOGS_DIR)
     
     # Test the reset_punctaj_all action
     print("Testing reset_punctaj_all action...")
@@ -59,7 +64,7 @@ def check_logs():
     print("🔍 CHECK: Log files created")
     print("="*60 + "\n")
     
-    log_file = Path("logs/Saint_Denis/Politie.json")
+    log_file = Path(LOGS_DIR) / "Saint_Denis" / "Politie.json"
     
     if log_file.exists():
         import json
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Test Revolut ingestion - a local HTTP stub stands in for /2.0/accounts and
+/2.0/accounts/{id}/transactions: paging past 100 rows, concurrent accounts,
+incremental sync from the ledger watermark, pending -> completed upsert, summaries
+"""
+
+import os
+import sys
+import json
+import tempfile
+import threading
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import urlparse, parse_qs
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from revolut_api import RevolutAPI
+
+
+def _when(minutes_ago):
+    moment = datetime.now(timezone.utc) - timedelta(minutes=minutes_ago)
+    return moment.strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    accounts = {}       # account_id -> list of transactions
+    requested = []
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status, payload):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        StubHandler.requested.append(self.path)
+        if self.headers.get("Authorization") != "Bearer test-token":
+            return self._send(401, {"message": "unauthorized"})
+        parts = url.path.strip("/").split("/")
+        if parts == ["2.0", "accounts"]:
+            return self._send(200, [{"id": a, "name": a.title(), "currency": "EUR"} for a in StubHandler.accounts])
+        if len(parts) == 4 and parts[:2] == ["2.0", "accounts"] and parts[3] == "transactions":
+            if parts[2] not in StubHandler.accounts:
+                return self._send(404, {"message": "account not found"})
+            query = {k: v[0] for k, v in parse_qs(url.query).items()}
+            limit = min(int(query.get("limit", 100)), 100)          # Revolut caps pages at 100
+            rows = [t for t in StubHandler.accounts[parts[2]]
+                    if query.get("from", "") <= t["created_at"] <= query.get("to", "~")]
+            rows.sort(key=lambda t: t["created_at"], reverse=True)
+            return self._send(200, rows[:limit])
+        self._send(404, {"message": "not found"})
+
+
+class RevolutStub:
+    def __init__(self, accounts):
+        StubHandler.accounts = accounts
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+        self.url = f"http://127.0.0.1:{self.server.server_port}"
+
+    def __enter__(self):
+        StubHandler.requested = []
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def _transactions(prefix, count, amount=lambda i: 10 if i % 3 else -4, state="completed"):
+    # Pairs share a timestamp so page boundaries fall inside equal created_at values
+    return [{"id": f"{prefix}-{i}", "created_at": _when(10 + i // 2), "amount": amount(i),
+             "currency": "EUR", "type": "card_payment", "state": state} for i in range(count)]
+
+
+def test_paging_and_summary():
+    accounts = {"main": _transactions("m", 257), "savings": _transactions("s", 3, amount=lambda i: 100)}
+    accounts["main"].append({"id": "old", "created_at": _when(60 * 24 * 40), "amount": 999})   # outside 30 days
+    with tempfile.TemporaryDirectory() as tmp, RevolutStub(accounts) as stub:
+        api = RevolutAPI("test-token", base_url=stub.url, ledger_path=os.path.join(tmp, "ledger.db"))
+        summary = api.get_all_transactions_summary(days=30)
+
+        by_id = {a["account_info"]["id"]: a for a in summary["accounts"]}
+        main = by_id["main"]["summary"]
+        income = sum(10 for i in range(257) if i % 3)
+        expenses = sum(4 for i in range(257) if not i % 3)
+        assert main == {"total_transactions": 257, "income": income, "expenses": expenses,
+                        "net": income - expenses}, main
+        assert by_id["savings"]["summary"]["income"] == 300
+        assert {t["id"] for t in by_id["main"]["transactions"][:2]} == {"m-0", "m-1"}     # newest first
+        assert len(by_id["main"]["transactions"]) == 10
+        assert api.ledger.count("main") == 257 and summary["sync_errors"] == {}
+
+        pages = [p for p in StubHandler.requested if "/main/transactions" in p]
+        assert len(pages) == 3, pages       # 100 + 100 + 57, no page past the end
+
+
+def test_incremental_sync_and_state_changes():
+    accounts = {"main": _transactions("m", 150, state="pending")}
+    with tempfile.TemporaryDirectory() as tmp, RevolutStub(accounts) as stub:
+        ledger_path = os.path.join(tmp, "ledger.db")
+        api = RevolutAPI("test-token", base_url=stub.url, ledger_path=ledger_path)
+        first = api.sync_transactions(days=30)
+        assert first["accounts"] == {"main": 150}
+
+        # Two new transactions, one old one settled (inside the overlap window)
+        accounts["main"][0]["state"] = "completed"
+        accounts["main"][0]["amount"] = 12
+        accounts["main"].extend([{"id": "new-1", "created_at": _when(1), "amount": 5},
+                                 {"id": "new-2", "created_at": _when(2), "amount": -3}])
+        StubHandler.requested = []
+        # Fresh client on the same ledger file (next app start) resumes from the watermark
+        api = RevolutAPI("test-token", base_url=stub.url, ledger_path=ledger_path)
+        watermark = api.ledger.watermark("main")
+        assert watermark == max(t["created_at"] for t in accounts["main"][:150])
+        api.sync_transactions(days=30)
+        assert api.ledger.count("main") == 152
+        assert api.ledger.watermark("main") > watermark
+        latest = {t["id"]: t for t in api.ledger.latest("main", _when(60 * 24), _when(-1), 200)}
+        assert latest["m-0"]["state"] == "completed" and latest["m-0"]["amount"] == 12
+
+        # The window starts at watermark - overlap, not 30 days back
+        query = parse_qs(urlparse([p for p in StubHandler.requested if "/transactions" in p][0]).query)
+        assert query["from"][0] > _when(60 * 24 * 4), query["from"]
+
+
+def test_errors_do_not_truncate():
+    accounts = {"main": _transactions("m", 20)}
+    with tempfile.TemporaryDirectory() as tmp, RevolutStub(accounts) as stub:
+        api = RevolutAPI("test-token", base_url=stub.url, ledger_path=os.path.join(tmp, "ledger.db"))
+        result = api.sync_transactions(days=30, accounts=[{"id": "main"}, {"id": "missing"}])
+        assert result["accounts"] == {"main": 20}
+        assert "missing" in result["errors"]
+        assert api.ledger.watermark("missing") is None      # nothing recorded as synced
+        assert api.get_transactions("missing") == []        # old API keeps returning [] on errors
+
+
+def main():
+    tests = [
+        test_paging_and_summary,
+        test_incremental_sync_and_state_changes,
+        test_errors_do_not_truncate,
+    ]
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ PASS: {test.__name__}")
+            passed += 1
+        except AssertionError as e:
+            print(f"❌ FAIL: {test.__name__} {e}")
+    print(f"\nTotal: {passed}/{len(tests)} tests passed")
+
+
+if __name__ == "__main__":
+    main()
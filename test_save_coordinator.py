@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Test save_coordinator - rapid edits merged into one write per institution, max wait,
+explicit flush, delta rows (fake clock / scheduler, no Tk needed)
+"""
+
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from save_coordinator import (DebouncedSaveCoordinator, changed_rows, resolve_debounce_ms, settle_pending,
+                              upload_rows)
+
+
+class FakeScheduler:
+    """root.after / after_cancel on a manual clock"""
+
+    def __init__(self):
+        self.now = 0.0
+        self.timers = {}
+        self.next_id = 0
+
+    def clock(self):
+        return self.now
+
+    def schedule(self, delay_ms, callback):
+        self.next_id += 1
+        self.timers[self.next_id] = (self.now + delay_ms / 1000, callback)
+        return self.next_id
+
+    def cancel(self, handle):
+        self.timers.pop(handle, None)
+
+    def advance(self, ms):
+        self.now += ms / 1000
+        for handle, (due, callback) in sorted(self.timers.items(), key=lambda t: t[1][0]):
+            if due <= self.now and self.timers.pop(handle, None):
+                callback()
+
+
+def _coordinator(delay_ms=400, max_delay_ms=2000):
+    scheduler = FakeScheduler()
+    writes = []
+    coordinator = DebouncedSaveCoordinator(
+        lambda key, pending: writes.append((key, pending)),
+        scheduler.schedule, scheduler.cancel,
+        delay_ms=delay_ms, max_delay_ms=max_delay_ms, clock=scheduler.clock)
+    return coordinator, scheduler, writes
+
+
+def test_rapid_edits_coalesce():
+    coordinator, scheduler, writes = _coordinator()
+    key = ("BlackWater", "Politie")
+    for n in range(5):
+        coordinator.request(key, "tree", update_timestamp=(n == 2), updated_items=[f"I{n % 3}"],
+                            skip_logging=True)
+        scheduler.advance(100)
+    coordinator.request(("BlackWater", "Medici"), "tree2")
+    assert writes == []
+
+    scheduler.advance(400)
+    assert len(writes) == 2
+    (first_key, merged), (second_key, other) = writes
+    assert first_key == key and merged.requests == 5
+    assert merged.update_timestamp is True and merged.skip_logging is True
+    assert merged.updated_items == ["I0", "I1", "I2"]
+    assert second_key == ("BlackWater", "Medici") and other.skip_logging is False
+    assert not coordinator.pending() and len(scheduler.timers) == 0
+
+    # A steady stream cannot postpone the write past max_delay_ms
+    for _ in range(30):
+        coordinator.request(key, "tree")
+        scheduler.advance(300)
+    assert len(writes) > 3 and all(p.requests <= 8 for _, p in writes[2:])
+
+
+def test_explicit_flush_and_discard():
+    coordinator, scheduler, writes = _coordinator()
+    coordinator.request(("A", "X"), "tree")
+    coordinator.request(("B", "Y"), "tree")
+    assert coordinator.flush(("A", "X")) == 1 and coordinator.pending(("B", "Y"))
+    assert coordinator.flush() == 1 and coordinator.flush() == 0
+    scheduler.advance(1000)
+    assert [key for key, _ in writes] == [("A", "X"), ("B", "Y")]
+
+    coordinator.request(("A", "X"), "tree")
+    assert coordinator.discard(("A", "X")) and not coordinator.pending()
+    scheduler.advance(1000)
+    assert len(writes) == 2
+
+    immediate, _, immediate_writes = _coordinator(delay_ms=0)
+    immediate.request(("A", "X"), "tree")
+    assert len(immediate_writes) == 1
+
+
+def test_changed_rows_and_window_config():
+    old = [{"NUME IC": "Ana", "DISCORD": "ana", "PUNCTAJ": 10},
+           {"NUME IC": "Bob", "DISCORD": "", "PUNCTAJ": "3"}]
+    new = [{"NUME IC": "Ana", "DISCORD": "ana", "PUNCTAJ": "10"},
+           {"NUME IC": "Bob", "DISCORD": "", "PUNCTAJ": "4"},
+           {"NUME IC": "Cris", "DISCORD": "cris", "PUNCTAJ": "0"}]
+    assert [row["NUME IC"] for row in changed_rows(old, new)] == ["Bob", "Cris"]
+
+    os.environ["PUNCTAJ_SAVE_DEBOUNCE_MS"] = "250"
+    try:
+        assert resolve_debounce_ms() == 250
+        os.environ["PUNCTAJ_SAVE_DEBOUNCE_MS"] = "soon"
+        assert resolve_debounce_ms() == 400
+    finally:
+        del os.environ["PUNCTAJ_SAVE_DEBOUNCE_MS"]
+
+
+def test_failed_upload_rows_are_retried():
+    rows = [{"NUME IC": "Ana", "DISCORD": "ana", "PUNCTAJ": "12"},
+            {"NUME IC": "Bob", "DISCORD": "", "PUNCTAJ": "4"},
+            {"NUME IC": "Cris", "DISCORD": "cris", "PUNCTAJ": "1"}]
+    # Upload of Ana + Bob failed: their keys stay in the file
+    pending = settle_pending([], [["discord", "ana"], ["name", "Bob"]], ok=False)
+    data = {"rows": rows, "pending_sync": True, "pending_sync_rows": pending}
+
+    # Next save changes only Cris: Ana and Bob go with it, with their current values
+    upload, full = upload_rows(data, [rows[2]])
+    assert not full and [row["NUME IC"] for row in upload] == ["Cris", "Ana", "Bob"]
+    assert upload[1]["PUNCTAJ"] == "12"
+    # Nothing changed, nothing pending: no upload
+    assert upload_rows({"rows": rows}, []) == ([], False)
+    # pending_sync without keys (older files, failed delete sync): the whole institution
+    assert upload_rows({"rows": rows, "pending_sync": True}, []) == (rows, True)
+
+    # A success clears only what it uploaded, a failure adds to the list
+    assert settle_pending(pending, [["discord", "ana"]], ok=True) == [["name", "Bob"]]
+    assert settle_pending(pending, [["discord", "cris"]], ok=False) == pending + [["discord", "cris"]]
+    assert settle_pending(pending, [], ok=True, full=True) == []
+
+
+def main():
+    tests = [
+        test_rapid_edits_coalesce,
+        test_explicit_flush_and_discard,
+        test_changed_rows_and_window_config,
+        test_failed_upload_rows_are_retried,
+    ]
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ PASS: {test.__name__}")
+            passed += 1
+        except AssertionError as e:
+            print(f"❌ FAIL: {test.__name__} {e}")
+    print(f"\nTotal: {passed}/{len(tests)} tests passed")
+
+
+if __name__ == "__main__":
+    main()
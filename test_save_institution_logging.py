@@ -7,6 +7,7 @@ import sys
 import os
 import json
 import configparser
+import tempfile
 from datetime import datetime
 
 print("="*70)
@@ -19,15 +20,17 @@ from supabase_sync import SupabaseSync
 from action_logger import ActionLogger
 
 supabase_sync = SupabaseSync('supabase_config.ini')
-action_logger = ActionLogger(supabase_sync, logs_dir="logs")
+# Logurile merg intr-un director temporar, nu in logs/ din repo
+LOGS_DIR = tempfile.mkdtemp(prefix="punctaj_logs_")
+action_logger = ActionLogger(supabase_sync, logs_dir=LOGS_DIR)
 print("   ✅ Setup complete")
 
 # Clear logs folder
 print("\n2️⃣ Clearing old logs...")
 import shutil
-if os.path.exists('logs'):
-    shutil.rmtree('logs')
-    os.makedirs('logs', exist_ok=True)
+if os.path.exists(LOGS_DIR):
+    shutil.rmtree(LOGS_DIR)
+    os.makedirs(LOGS_DIR, exist_ok=True)
 print("   ✅ Logs cleared")
 
 # Simulate saving institution data
@@ -63,7 +66,7 @@ except Exception as e:
 # Check results
 print("\n4️⃣ Checking results...")
 
-log_file = f"logs/{city}/Politie.json"
+log_file = os.path.join(LOGS_DIR, city, "Politie.json")
 if os.path.exists(log_file):
     with open(log_file, 'r', encoding='utf-8') as f:
         logs = json.load(f)
@@ -75,7 +78,7 @@ if os.path.exists(log_file):
 else:
     print(f"   ❌ Log file not created")
 
-summary_file = "logs/SUMMARY_global.json"
+summary_file = os.path.join(LOGS_DIR, "SUMMARY_global.json")
 if os.path.exists(summary_file):
     with open(summary_file, 'r', encoding='utf-8') as f:
         summary = json.load(f)
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Test search_index - tokens / prefixes / diacritics, ranking, per-institution
+incremental updates (save, points edit, realtime patch, sync)
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from search_index import EmployeeSearchIndex, tokenize
+
+COLUMNS = ["DISCORD", "NUME IC", "SERIE DE BULETIN", "RANK", "ROLE", "PUNCTAJ"]
+
+
+def _row(discord, name, serie="", rank="1", role="Agent", points=0):
+    return {"DISCORD": discord, "NUME IC": name, "SERIE DE BULETIN": serie, "RANK": rank,
+            "ROLE": role, "PUNCTAJ": points}
+
+
+def _index():
+    index = EmployeeSearchIndex()
+    index.index_institution("BlackWater", "Politie", [
+        _row("ion.popescu", "Ion Popescu", "AB123456", "3"),
+        _row("marius77", "Marius Ionescu", "CD000111", "1"),
+    ])
+    index.index_institution("Valentine", "Sherif", [
+        _row("stefan_m", "Ștefan Mărgărit", "EF999000", "7", "Sherif"),
+        # Legacy list rows (columns order) are indexed as well
+        ["ionel", "Ionel Dan", "GH555555", "2", "Agent", 4],
+    ], columns=COLUMNS)
+    return index
+
+
+def test_tokens_prefixes_and_ranking():
+    assert tokenize("Ștefan Ionescu-Mărgărit") == ["stefan", "ionescu", "margarit", "stefan ionescu-margarit"]
+    index = _index()
+    assert len(index) == 4
+
+    hits = index.search("ion")
+    # Exact token "ion" (name) beats prefixes ("ionescu", "ionel", "ion.popescu" discord)
+    assert hits[0].row["DISCORD"] == "ion.popescu" and hits[0].fields[:2] == ["DISCORD", "NUME IC"]
+    assert {h.row["DISCORD"] for h in hits} == {"ion.popescu", "marius77", "ionel"}
+
+    assert [h.city for h in index.search("margarit")] == ["Valentine"]      # without diacritics
+    assert [h.row["NUME IC"] for h in index.search("ștefan")] == ["Ștefan Mărgărit"]
+    assert [h.institution for h in index.search("ab1234")] == ["Politie"]   # SERIE prefix
+    assert [h.row["DISCORD"] for h in index.search("ion popescu")] == ["ion.popescu"]   # AND
+    assert index.search("ion sherif") == []
+    assert [h.row["DISCORD"] for h in index.search("sherif")] == ["stefan_m"]
+    assert [h.city for h in index.search("ion", cities={"Valentine"})] == ["Valentine"]
+    assert len(index.search("ion", limit=2)) == 2
+
+
+def test_incremental_updates():
+    index = _index()
+    # Points edit / realtime: one employee replaced, the rest of the institution untouched
+    index.update_rows("BlackWater", "Politie", [_row("marius77", "Marius Vasile", "CD000111", "2", points=50)])
+    assert [h.row["DISCORD"] for h in index.search("ion")] == ["ion.popescu", "ionel"]
+    assert index.search("vasile")[0].row["PUNCTAJ"] == 50
+    index.remove_rows("Valentine", "Sherif", [{"DISCORD": "ionel"}])
+    assert [h.row["DISCORD"] for h in index.search("ion")] == ["ion.popescu"]
+
+    # Sync: only institutions whose signature changed are loaded again
+    loads = []
+    store = {("BlackWater", "Politie"): {"rows": [_row("nou", "Angajat Nou")]},
+             ("Annesburg", "Medici"): {"rows": [_row("doc", "Doctor House", role="Medic")]}}
+    signatures = {("BlackWater", "Politie"): 1, ("Annesburg", "Medici"): 1}
+
+    def load(city, institution):
+        loads.append((city, institution))
+        return store[(city, institution)]
+
+    stats = index.sync_from(list(store), load, lambda c, i: signatures[(c, i)])
+    assert stats == {"indexed": 2, "unchanged": 0, "removed": 1}      # Valentine/Sherif no longer exists
+    assert index.search("popescu") == [] and index.search("medic")[0].city == "Annesburg"
+    assert index.search("stefan") == []
+
+    loads.clear()
+    signatures[("Annesburg", "Medici")] = 2
+    store[("Annesburg", "Medici")] = {"rows": [_row("doc", "Doctor Watson", role="Medic")]}
+    stats = index.sync_from(list(store), load, lambda c, i: signatures[(c, i)])
+    assert loads == [("Annesburg", "Medici")] and stats["unchanged"] == 1
+    assert index.search("watson")[0].row["DISCORD"] == "doc" and index.search("house") == []
+
+    index.remove_city("Annesburg")
+    index.remove_institution("BlackWater", "Politie")
+    assert len(index) == 0 and index._postings == {} and index._prefixes == {}
+
+    # Another server: clear() drops documents and signatures, the next sync loads everything
+    index.sync_from(list(store), load, lambda c, i: signatures[(c, i)])
+    index.clear()
+    assert len(index) == 0 and index.search("watson") == []
+    assert index.sync_from(list(store), load, lambda c, i: signatures[(c, i)])["indexed"] == 2
+
+
+def main():
+    tests = [
+        test_tokens_prefixes_and_ranking,
+        test_incremental_updates,
+    ]
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ PASS: {test.__name__}")
+            passed += 1
+        except AssertionError as e:
+            print(f"❌ FAIL: {test.__name__} {e}")
+    print(f"\nTotal: {passed}/{len(tests)} tests passed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Test SupabaseEmployeeManager embedded reads - get_full_structure in 1 + pages requests
+(institutions with employees embedded), one-request institution fetch, name -> id cache
+(against the local Supabase stub)
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from supabase_employee_manager import SupabaseEmployeeManager
+from supabase_stub import SupabaseStub
+
+
+def _manager(stub, tmp):
+    config_path = os.path.join(tmp, "supabase_config.ini")
+    with open(config_path, "w", encoding="utf-8") as f:
+        f.write(f"[supabase]\nurl = {stub.url}\nkey = test-key\n")
+    return SupabaseEmployeeManager(config_path)
+
+
+def _seed(stub, cities=6, institutions=12, employees=15):
+    stub.seed("cities", [{"id": c + 1, "name": f"City{c}"} for c in range(cities)])
+    stub.seed("institutions", [{"id": c * institutions + i + 1, "city_id": c + 1, "name": f"Inst{i}"}
+                               for c in range(cities) for i in range(institutions)])
+    stub.seed("employees", [{"institution_id": inst + 1, "employee_name": f"Emp {inst}-{e:02d}",
+                             "discord_username": f"u{inst}_{e}", "points": e}
+                            for inst in range(cities * institutions) for e in range(employees)])
+
+
+def _legacy_structure(manager):
+    """What the N+1 walk returned (one request per city and per institution)"""
+    return {city["name"]: {inst["name"]: manager.get_employees_by_institution(inst["id"])
+                           for inst in manager.get_institutions_by_city(city["id"])}
+            for city in manager.get_all_cities()}
+
+
+def test_full_structure_in_few_requests():
+    with SupabaseStub() as stub, tempfile.TemporaryDirectory() as tmp:
+        _seed(stub)
+        stub.seed("cities", [{"id": 99, "name": "Empty"}])
+        manager = _manager(stub, tmp)
+
+        stub.reset_counters()
+        expected = _legacy_structure(manager)
+        legacy_requests = stub.request_count()
+
+        stub.reset_counters()
+        structure = manager.get_full_structure(page_size=50)
+        assert structure == expected
+        assert structure["Empty"] == {} and len(structure["City3"]["Inst7"]) == 15
+        # 1 cities + 72 institutions in pages of 50 -> 3 requests instead of 1 + 7 + 72
+        assert stub.request_count() == 3 and legacy_requests == 80, (stub.request_count(), legacy_requests)
+
+        streamed = list(manager.iter_structure(page_size=1000))
+        assert len(streamed) == 72 and streamed[0][:2] == ("City0", "Inst0")
+
+
+def test_single_institution_and_id_cache():
+    with SupabaseStub() as stub, tempfile.TemporaryDirectory() as tmp:
+        _seed(stub, cities=2, institutions=3, employees=4)
+        manager = _manager(stub, tmp)
+
+        stub.reset_counters()
+        fetched = manager.get_institution_employees("City1", "Inst2")
+        assert stub.request_count() == 1
+        assert fetched["city_id"] == 2 and fetched["institution_id"] == 6
+        assert [e["employee_name"] for e in fetched["employees"]] == [f"Emp 5-{e:02d}" for e in range(4)]
+        assert manager.get_institution_employees("City1", "Missing") is None
+        assert manager.get_institution_employees("Nowhere", "Inst0") is None
+
+        # Ids seen by the fetch are cached; a miss loads the whole city at once
+        stub.reset_counters()
+        assert manager.resolve_city_id("City1") == 2 and manager.resolve_institution_id("City1", "Inst2") == 6
+        assert stub.request_count() == 0
+        assert manager.resolve_institution_id("City0", "Inst1") == 2
+        assert manager.resolve_institution_id("City0", "Inst0") == 1
+        assert stub.request_count() == 1
+
+        # Deletes drop cached ids, creates add them
+        assert manager.delete_institution(2)
+        assert manager.resolve_institution_id("City0", "Inst1") is None
+        created = manager.add_institution(1, "Inst1")
+        stub.reset_counters()
+        assert manager.resolve_institution_id("City0", "Inst1") == created["id"]
+        assert stub.request_count() == 0
+        assert manager.delete_city(1) and manager.resolve_city_id("City0") is None
+
+        stub.reset_counters()
+        assert manager.prime_id_cache() == 3 and stub.request_count() == 1
+
+
+def main():
+    tests = [
+        test_full_structure_in_few_requests,
+        test_single_institution_and_id_cache,
+    ]
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ PASS: {test.__name__}")
+            passed += 1
+        except AssertionError as e:
+            print(f"❌ FAIL: {test.__name__} {e}")
+    print(f"\nTotal: {passed}/{len(tests)} tests passed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Test theme_registry - option database entries set once, iterative subtree theming that
+does not reconfigure widgets already themed (plain widget-like objects, no display needed)
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from theme_registry import ThemeRegistry, RDR_THEME_COLORS
+
+
+class Node:
+    """winfo_class / winfo_children / configure - what the walk uses of a Tk widget"""
+
+    def __init__(self, widget_class, children=()):
+        self.widget_class = widget_class
+        self.children = list(children)
+        self.configured = 0
+
+    def winfo_class(self):
+        return self.widget_class
+
+    def winfo_children(self):
+        return self.children
+
+    def configure(self, **options):
+        self.configured += 1
+
+
+class OptionRoot:
+    def __init__(self):
+        self.options = {}
+
+    def option_add(self, pattern, value):
+        self.options[pattern] = value
+
+
+def _tree(depth):
+    """A chain deeper than the recursion limit, one Label + Button per level"""
+    node = Node("Label")
+    for _ in range(depth):
+        node = Node("Frame", [Node("Label"), Node("Button"), node])
+    return node
+
+
+def test_option_database_entries():
+    root = OptionRoot()
+    registry = ThemeRegistry(RDR_THEME_COLORS)
+    assert registry.install(root) == len(root.options)
+    assert root.options["*Button.background"] == RDR_THEME_COLORS["button_bg"]
+    assert root.options["*Entry.insertBackground"] == RDR_THEME_COLORS["accent_red"]
+    assert root.options["*Toplevel.background"] == RDR_THEME_COLORS["bg_dark"]
+    assert root.options["*Label.font"] == ("Segoe UI", 10, "bold")
+
+    registry.set_colors(dict(RDR_THEME_COLORS, bg_dark="#101010"), root)
+    assert root.options["*Frame.background"] == "#101010"
+
+
+def test_subtree_is_iterative_and_cached():
+    registry = ThemeRegistry(RDR_THEME_COLORS)
+    tree = _tree(sys.getrecursionlimit() + 100)
+    total = 3 * (sys.getrecursionlimit() + 100) + 1
+
+    stats = registry.theme_subtree(tree)
+    assert stats["visited"] == total and stats["themed"] == total
+
+    # Nothing new: walked, not reconfigured
+    stats = registry.theme_subtree(tree)
+    assert stats["themed"] == 0 and tree.configured == 1
+
+    # A new tab: only its widgets are themed
+    tab = Node("Frame", [Node("Label"), Node("Entry"), Node("Canvas"), Node("Checkbutton")])
+    tree.children.append(tab)
+    assert registry.theme_subtree(tree)["themed"] == 4
+    assert registry.theme_subtree(tab, force=True)["themed"] == 4
+
+    # New palette -> next pass reconfigures everything
+    registry.set_colors(dict(RDR_THEME_COLORS))
+    assert registry.theme_subtree(tree)["themed"] == total + 4
+
+
+def main():
+    tests = [
+        test_option_database_entries,
+        test_subtree_is_iterative_and_cached,
+    ]
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ PASS: {test.__name__}")
+            passed += 1
+        except AssertionError as e:
+            print(f"❌ FAIL: {test.__name__} {e}")
+    print(f"\nTotal: {passed}/{len(tests)} tests passed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Test diff-based users_permissions.json sync against the local Supabase stub
+Verifies: incremental download, dirty-only bulk upsert, local permissions preserved
+"""
+
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from supabase_stub import SupabaseStub
+from users_permissions_json_manager import UsersPermissionsJsonManager
+
+
+def _seed_users(stub, count, stamp="2026-01-01T00:00:00"):
+    stub.seed("discord_users", [
+        {
+            "discord_id": 100000 + i,
+            "username": f"user{i}",
+            "is_superuser": False,
+            "is_admin": i % 10 == 0,
+            "created_at": stamp,
+            "updated_at": stamp,
+        }
+        for i in range(count)
+    ])
+
+
+def test_initial_sync_is_one_download_and_no_upload():
+    """First sync downloads everything and uploads nothing"""
+    with SupabaseStub(unique={"discord_users": ["discord_id"]}) as stub, tempfile.TemporaryDirectory() as tmp:
+        _seed_users(stub, 50)
+        manager = UsersPermissionsJsonManager(stub.url, "test-key", tmp)
+        manager.ensure_json_exists()
+
+        assert manager.sync_bidirectional()
+        assert len(manager.list_users()) == 50
+        assert stub.request_count("GET") == 1
+        assert stub.request_count("POST") == 0
+        assert stub.request_count("PATCH") == 0
+
+
+def test_only_dirty_users_are_upserted_in_one_request():
+    """Local edits go up in a single upsert, untouched users are not sent"""
+    with SupabaseStub(unique={"discord_users": ["discord_id"]}) as stub, tempfile.TemporaryDirectory() as tmp:
+        _seed_users(stub, 50)
+        manager = UsersPermissionsJsonManager(stub.url, "test-key", tmp)
+        manager.sync_bidirectional()
+
+        for i in range(3):
+            manager.set_user_permissions(str(100000 + i), {"cloud": {"upload": True}})
+        stub.reset_counters()
+
+        assert manager.upload_to_cloud()
+        assert stub.request_count("POST", "discord_users") == 1
+        assert stub.request_count("PATCH") == 0
+
+        # Nothing dirty anymore
+        stub.reset_counters()
+        assert manager.upload_to_cloud()
+        assert stub.request_count("POST") == 0
+
+        # Local permissions are kept after the echo comes back from the cloud
+        assert manager.download_from_cloud()
+        assert manager.get_user_permissions("100000") == {"cloud": {"upload": True}}
+
+
+def test_download_is_incremental_from_watermark():
+    """Only rows updated after last_sync_watermark are applied"""
+    with SupabaseStub(unique={"discord_users": ["discord_id"]}) as stub, tempfile.TemporaryDirectory() as tmp:
+        _seed_users(stub, 20)
+        manager = UsersPermissionsJsonManager(stub.url, "test-key", tmp)
+        manager.download_from_cloud()
+
+        for row in stub.tables["discord_users"]:
+            if row["discord_id"] == 100005:
+                row["username"] = "renamed"
+                row["updated_at"] = "2026-02-01T00:00:00"
+
+        assert manager.download_from_cloud()
+        data = json.loads(Path(tmp, "users_permissions.json").read_text(encoding="utf-8"))
+        assert data["users"]["100005"]["username"] == "renamed"
+        assert data["last_sync_watermark"] == "2026-02-01T00:00:00"
+        assert not list(Path(tmp).glob("*.tmp"))
+
+
+def test_legacy_file_without_hash_takes_cloud_values():
+    """users_permissions.json from before diff sync: cloud wins, nothing stale is uploaded"""
+    with SupabaseStub(unique={"discord_users": ["discord_id"]}) as stub, tempfile.TemporaryDirectory() as tmp:
+        _seed_users(stub, 5, stamp="2026-03-01T00:00:00")
+        legacy = {"users": {str(100000 + i): {
+            "discord_id": 100000 + i, "username": f"old{i}", "is_admin": True,
+            "permissions": {"cloud": {"upload": True}}, "updated_at": "2025-01-01T00:00:00",
+        } for i in range(5)}, "last_sync_watermark": "2026-01-01T00:00:00"}
+        Path(tmp, "users_permissions.json").write_text(json.dumps(legacy), encoding="utf-8")
+        manager = UsersPermissionsJsonManager(stub.url, "test-key", tmp)
+
+        assert manager.sync_bidirectional()
+        assert stub.request_count("POST") == 0
+        assert [row["username"] for row in stub.rows("discord_users")][:2] == ["user0", "user1"]
+        data = json.loads(Path(tmp, "users_permissions.json").read_text(encoding="utf-8"))
+        user = data["users"]["100001"]
+        assert user["username"] == "user1" and user["is_admin"] is False and user["sync_hash"]
+        assert user["permissions"] == {"cloud": {"upload": True}}
+
+        # A user added locally is still uploaded; the watermark stays a server value
+        manager.add_user(200000, "nou")
+        stub.reset_counters()
+        assert manager.sync_bidirectional()
+        assert stub.request_count("POST", "discord_users") == 1
+        sent = [row for row in stub.rows("discord_users") if row["discord_id"] == 200000][0]
+        assert "updated_at" not in sent or sent["updated_at"] is None
+        data = json.loads(Path(tmp, "users_permissions.json").read_text(encoding="utf-8"))
+        assert data["last_sync_watermark"] == "2026-03-01T00:00:00"
+
+
+def main():
+    tests = [
+        test_initial_sync_is_one_download_and_no_upload,
+        test_only_dirty_users_are_upserted_in_one_request,
+        test_download_is_incremental_from_watermark,
+        test_legacy_file_without_hash_takes_cloud_values,
+    ]
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ PASS: {test.__name__}")
+            passed += 1
+        except AssertionError as e:
+            print(f"❌ FAIL: {test.__name__} {e}")
+    print(f"\nTotal: {passed}/{len(tests)} tests passed")
+
+
+if __name__ == "__main__":
+    main()
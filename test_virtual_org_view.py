@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Test virtual_org_view.OrgLayout - y offsets without per-employee objects, visible range
+and hit test, collapsible city / institution groups (no display needed)
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from virtual_org_view import (OrgLayout, employee_fields, CITY_HEIGHT, INSTITUTION_HEIGHT, ROW_HEIGHT,
+                              EMPTY_HEIGHT)
+
+
+def _structure(employees=1000):
+    return {
+        "Valentine": {"Politie": [{"NUME IC": f"V{n}", "PUNCTAJ": n} for n in range(employees)], "Medici": []},
+        "BlackWater": {"Politie": [{"NUME IC": f"B{n}", "RANK": "2"} for n in range(3)]},
+    }
+
+
+def test_offsets_and_visible_range():
+    layout = OrgLayout(_structure())
+    # BlackWater first (sorted): city + institution + 3 rows, then Valentine: city + Medici (empty) + Politie
+    head = CITY_HEIGHT + INSTITUTION_HEIGHT + 3 * ROW_HEIGHT
+    rows_start = head + CITY_HEIGHT + INSTITUTION_HEIGHT + EMPTY_HEIGHT + INSTITUTION_HEIGHT
+    assert layout.total_height == rows_start + 1000 * ROW_HEIGHT
+    assert len(layout._segments) == 8      # 2 cities, 3 institutions, 3 blocks
+
+    kinds = [e.kind for e in layout.visible(0, rows_start + ROW_HEIGHT)]
+    assert kinds == ["city", "institution", "employee", "employee", "employee", "city", "institution",
+                     "empty", "institution", "employee"], kinds
+
+    # Middle of the big block: only what the viewport covers, by arithmetic
+    window = layout.visible(rows_start + 500 * ROW_HEIGHT + 10, rows_start + 510 * ROW_HEIGHT)
+    assert [e.employee["NUME IC"] for e in window] == [f"V{n}" for n in range(500, 510)]
+    assert window[0].y == rows_start + 500 * ROW_HEIGHT and window[0].index == 500
+    assert layout.visible(layout.total_height, layout.total_height + 500) == []
+
+    hit = layout.hit(CITY_HEIGHT + 1)
+    assert hit.kind == "institution" and hit.group == ("BlackWater", "Politie") and hit.count == 3
+    assert layout.hit(0).count == 3 and layout.hit(head).count == 1000
+
+
+def test_collapse_and_flat_list():
+    layout = OrgLayout(_structure())
+    full = layout.total_height
+    assert layout.toggle(("Valentine", "Politie")) is True
+    assert layout.total_height == full - 1000 * ROW_HEIGHT
+    assert layout.toggle(("BlackWater",)) is True
+    assert [e.kind for e in layout.visible(0, 10_000)] == ["city", "city", "institution", "empty", "institution"]
+    assert layout.toggle(("Valentine", "Politie")) is False
+    assert layout.total_height == 2 * CITY_HEIGHT + 2 * INSTITUTION_HEIGHT + EMPTY_HEIGHT + 1000 * ROW_HEIGHT
+
+    # EmployeeGroupFrame: one institution, rows only
+    flat = OrgLayout({"BlackWater": {"Politie": _structure()["BlackWater"]["Politie"]}}, show_headers=False)
+    assert flat.total_height == 3 * ROW_HEIGHT and flat.hit(0).group is None
+
+    assert employee_fields({"NUME IC": "Ana", "RANK": "2", "PUNCTAJ": "abc"}, {"2": "Caporal"}) == \
+        ("Ana", "", "Rank 2: Caporal", 0)
+    assert employee_fields({"employee_name": "Bob", "discord_username": "bob", "rank": 3, "points": 7.0})[1:] == \
+        ("bob", "Rank 3: ", 7)
+
+
+def main():
+    tests = [
+        test_offsets_and_visible_range,
+        test_collapse_and_flat_list,
+    ]
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ PASS: {test.__name__}")
+            passed += 1
+        except AssertionError as e:
+            print(f"❌ FAIL: {test.__name__} {e}")
+    print(f"\nTotal: {passed}/{len(tests)} tests passed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Test monthly_report_scheduler - parallel CSV stage, columnar export,
+single bulk weekly_reports upload (against the local Supabase stub)
+"""
+
+import gzip
+import json
+import os
+import sys
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from monthly_report_scheduler import WeeklyReportScheduler, PARQUET_AVAILABLE
+from supabase_stub import SupabaseStub
+
+REPORT_DAY = datetime(2026, 10, 19, 0, 0, 0)
+
+
+def _make_tree(root, cities=3, institutions=5, employees=4):
+    data_dir = os.path.join(root, "data")
+    for c in range(cities):
+        city_dir = os.path.join(data_dir, f"City{c}")
+        os.makedirs(city_dir)
+        for i in range(institutions):
+            rows = [{"DISCORD": str(n), "NUME IC": f"Emp{n}", "RANK": "1", "ROLE": "Agent", "PUNCTAJ": n}
+                    for n in range(employees)]
+            with open(os.path.join(city_dir, f"Inst{i}.json"), "w", encoding="utf-8") as f:
+                json.dump({"columns": ["DISCORD", "NUME IC", "RANK", "ROLE", "PUNCTAJ"], "rows": rows}, f)
+    return data_dir
+
+
+def test_reports_are_uploaded_in_one_request():
+    with SupabaseStub() as stub, tempfile.TemporaryDirectory() as tmp:
+        data_dir = _make_tree(tmp)
+        sync = SimpleNamespace(url=stub.url, key="key", enabled=True, table_weekly_reports="weekly_reports")
+        scheduler = WeeklyReportScheduler(data_dir, os.path.join(tmp, "arhiva"), supabase_sync=sync, max_workers=4)
+
+        summary = scheduler.generate_weekly_report(REPORT_DAY)
+
+        assert summary["files"] == 15
+        assert summary["rows"] == 60
+        assert summary["uploaded"] == 15
+        assert stub.request_count("POST", "weekly_reports") == 1
+        reports = stub.rows("weekly_reports")
+        assert {(r["city"], r["institution"]) for r in reports} == {
+            (f"City{c}", f"Inst{i}") for c in range(3) for i in range(5)}
+        assert reports[0]["week_start"] == "2026-10-19"
+        assert set(summary["timings_ms"]) == {"discover", "render_csv", "columnar", "upload"}
+
+        csv_path = os.path.join(summary["weekly_dir"], "City1", "Inst3.csv")
+        with open(csv_path, encoding="utf-8") as f:
+            lines = f.read().strip().splitlines()
+        assert lines[2].startswith("DISCORD,NUME IC")
+        assert len(lines) == 3 + 4
+
+
+def test_columnar_export_without_supabase():
+    with tempfile.TemporaryDirectory() as tmp:
+        data_dir = _make_tree(tmp, cities=2, institutions=2, employees=3)
+        scheduler = WeeklyReportScheduler(data_dir, os.path.join(tmp, "arhiva"),
+                                          supabase_sync=SimpleNamespace(enabled=False))
+
+        summary = scheduler.generate_weekly_report(REPORT_DAY)
+
+        assert summary["uploaded"] == 0
+        path = summary["columnar_path"]
+        if PARQUET_AVAILABLE:
+            import pyarrow.parquet
+            columns = pyarrow.parquet.read_table(path).to_pydict()
+        else:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                columns = json.load(f)["columns"]
+        assert len(columns["DISCORD"]) == 12
+        assert sum(columns["PUNCTAJ"]) == 4 * (0 + 1 + 2)
+        assert set(columns["city"]) == {"City0", "City1"}
+
+
+def main():
+    tests = [
+        test_reports_are_uploaded_in_one_request,
+        test_columnar_export_without_supabase,
+    ]
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ PASS: {test.__name__}")
+            passed += 1
+        except AssertionError as e:
+            print(f"❌ FAIL: {test.__name__} {e}")
+    print(f"\nTotal: {passed}/{len(tests)} tests passed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Theme registry - RDR (black / orange) theme for classic Tk widgets
+
+    option db -> install(root): one option_add per class / option, set once at startup;
+                 every Button / Label / Entry / Frame / ... created afterwards is born themed
+    subtree   -> theme_subtree(widget): iterative walk that configures widgets which exist
+                 already; widgets themed by an earlier walk are not reconfigured (generation mark)
+    refresh   -> set_colors() bumps the generation, so the next walk reconfigures everything
+
+Replaces the recursive apply_theme_to_children pass (whole tree on every call, errors
+swallowed by bare excepts)
+"""
+
+import time
+import tkinter as tk
+from typing import Any, Dict, Optional
+
+RDR_THEME_COLORS = {
+    "bg_dark": "#000000",              # Negru profund (ca în design)
+    "bg_dark_secondary": "#0a0604",    # Negru foarte închis
+    "bg_frame": "#050302",             # Frame background negru
+    "fg_light": "#ff8844",             # Text portocaliu (ca în design)
+    "fg_secondary": "#cc6633",         # Text gri portocaliu
+    "accent_red": "#ff3000",           # Portocaliu intens glow
+    "accent_orange": "#ff6b47",        # Portocaliu CSS din design
+    "accent_orange_bright": "#ff8844", # Portocaliu mai deschis
+    "accent_orange_soft": "#ffb37e",   # Portocaliu CSS deschis
+    "button_bg": "#0a0604",            # Button background negru
+    "button_border": "#ff6b47",        # Button border portocaliu (vizibil)
+    "frame_bg": "#000000",             # Frame background negru profund
+    "input_bg": "#1a0f08",             # Input background negru profund
+    "tree_bg": "#000000",              # Treeview background negru profund
+    "tree_fg": "#ff8844",              # Treeview text portocaliu
+}
+
+# configure() option -> option database resource name
+RESOURCE_NAMES = {
+    "bg": "background",
+    "fg": "foreground",
+    "bd": "borderWidth",
+    "activebackground": "activeBackground",
+    "activeforeground": "activeForeground",
+    "highlightbackground": "highlightBackground",
+    "highlightcolor": "highlightColor",
+    "highlightthickness": "highlightThickness",
+    "insertbackground": "insertBackground",
+    "selectcolor": "selectColor",
+    "troughcolor": "troughColor",
+    "padx": "padX",
+    "pady": "padY",
+}
+
+
+def widget_options(colors: Dict[str, str]) -> Dict[str, Dict[str, Any]]:
+    """Tk class -> configure() options of the themed look"""
+    return {
+        "Button": {
+            "bg": colors["button_bg"],
+            "fg": colors["fg_light"],
+            "activebackground": colors["accent_orange"],
+            "activeforeground": colors["fg_light"],
+            "relief": "solid",
+            "bd": 3,
+            "highlightbackground": colors["button_border"],
+            "highlightcolor": colors["accent_red"],
+            "highlightthickness": 2,
+            "font": ("Segoe UI", 10, "bold"),
+            "padx": 12,
+            "pady": 8,
+        },
+        "Label": {"bg": colors["bg_dark"], "fg": colors["fg_light"], "font": ("Segoe UI", 10, "bold")},
+        "Entry": {
+            "bg": colors["input_bg"],
+            "fg": colors["fg_light"],
+            "insertbackground": colors["accent_red"],
+            "relief": "solid",
+            "bd": 2,
+            "font": ("Segoe UI", 10),
+        },
+        "Checkbutton": {
+            "bg": colors["bg_dark"],
+            "fg": colors["fg_light"],
+            "activebackground": colors["bg_dark_secondary"],
+            "activeforeground": colors["fg_light"],
+            "selectcolor": colors["input_bg"],
+            "font": ("Segoe UI", 10),
+            "highlightthickness": 0,
+            "bd": 0,
+        },
+        "Scrollbar": {
+            "bg": colors["button_bg"],
+            "activebackground": colors["accent_orange"],
+            "troughcolor": colors["bg_dark_secondary"],
+            "relief": "flat",
+            "bd": 0,
+        },
+        "Text": {"bg": colors["input_bg"], "fg": colors["fg_light"], "insertbackground": colors["accent_red"]},
+        "Frame": {"bg": colors["bg_dark"]},
+        "Canvas": {"bg": colors["bg_dark"]},
+        "Toplevel": {"bg": colors["bg_dark"]},
+    }
+
+
+# Classes the subtree walk reconfigures (same set the recursive pass touched)
+SUBTREE_CLASSES = ("Button", "Label", "Entry", "Text", "Frame", "Canvas")
+
+
+class ThemeRegistry:
+    """Option database entries + cached subtree theming for one Tk root"""
+
+    def __init__(self, colors: Dict[str, str], subtree_classes=SUBTREE_CLASSES):
+        self.colors = colors
+        self.options = widget_options(colors)
+        self.subtree_classes = set(subtree_classes)
+        self.generation = 1
+        self.last_stats: Dict[str, float] = {}
+
+    def set_colors(self, colors: Dict[str, str], root: Optional[tk.Misc] = None):
+        """New palette: option database rewritten, next theme_subtree() reconfigures every widget"""
+        self.colors = colors
+        self.options = widget_options(colors)
+        self.generation += 1
+        if root is not None:
+            self.install(root)
+
+    def install(self, root: tk.Misc) -> int:
+        """option_add for every class / option - widgets created afterwards get the theme at creation"""
+        count = 0
+        for widget_class, options in self.options.items():
+            for option, value in options.items():
+                root.option_add(f"*{widget_class}.{RESOURCE_NAMES.get(option, option)}", value)
+                count += 1
+        return count
+
+    def apply(self, widget: tk.Misc, widget_class: Optional[str] = None) -> bool:
+        """Theme one widget by its Tk class; False if the class has no theme or Tk refused"""
+        options = self.options.get(widget_class or widget.winfo_class())
+        if not options:
+            return False
+        try:
+            widget.configure(**options)
+        except tk.TclError:
+            return False
+        return True
+
+    def theme_subtree(self, widget: tk.Misc, force: bool = False) -> Dict[str, float]:
+        """
+        Configure widget and its descendants (iterative, no recursion limit)
+        Widgets already themed in this generation are only walked through, not reconfigured,
+        so calling it again on a parent costs the new widgets only (plus the walk)
+        """
+        start = time.perf_counter()
+        visited = themed = 0
+        stack = [widget]
+        while stack:
+            current = stack.pop()
+            visited += 1
+            try:
+                children = current.winfo_children()
+                if force or getattr(current, "_theme_generation", 0) != self.generation:
+                    widget_class = current.winfo_class()
+                    if widget_class in self.subtree_classes and self.apply(current, widget_class):
+                        themed += 1
+                    current._theme_generation = self.generation
+            except tk.TclError:     # destroyed meanwhile
+                continue
+            stack.extend(children)
+        self.last_stats = {"visited": visited, "themed": themed,
+                           "ms": (time.perf_counter() - start) * 1000}
+        return self.last_stats
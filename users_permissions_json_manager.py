@@ -172,64 +172,218 @@ class UsersPermissionsJsonManager:
         return {"users": {}, "last_sync": None}
     
     def _write_json(self, data: Dict[str, Any]):
-        """Write JSON file"""
+        """Write JSON file atomically (temp file + rename)"""
         self.json_file.parent.mkdir(parents=True, exist_ok=True)
-        with open(self.json_file, 'w', encoding='utf-8') as f:
+        tmp_file = self.json_file.with_name(self.json_file.name + ".tmp")
+        with open(tmp_file, 'w', encoding='utf-8') as f:
             json.dump(data, f, indent=2, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, self.json_file)
     
-    def download_from_cloud(self) -> bool:
+    # ==================== DIFF-BASED SYNC HELPERS ====================
+    
+    # Fields that define a user's synced state; a change in any of them marks the user dirty
+    SYNCED_FIELDS = ("discord_id", "username", "is_superuser", "is_admin", "permissions")
+    DOWNLOAD_PAGE_SIZE = 1000
+    UPSERT_BATCH_SIZE = 5000
+    
+    def _user_hash(self, user: Dict[str, Any]) -> str:
+        """Stable hash of the synced fields of a user"""
+        payload = {field: user.get(field) for field in self.SYNCED_FIELDS}
+        payload["discord_id"] = str(payload["discord_id"])
+        raw = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+    
+    def _is_dirty(self, user: Dict[str, Any]) -> bool:
         """
-        Download users and permissions from Supabase
-        Syncs discord_users table → local JSON
+        User changed locally since the last successful sync
+        No sync_hash key at all = file written before diff sync: the cloud is authoritative
+        (the merge seeds the hash); add_user() marks new local users with sync_hash None
         """
-        print(f"\n📥 Downloading users from Supabase...")
+        if "sync_hash" not in user:
+            return False
+        return user.get("sync_hash") != self._user_hash(user)
+    
+    def _fetch_cloud_users(self, since: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Fetch discord_users rows, page by page
+        If `since` is given, only rows with updated_at >= since are returned
+        (>=: rows stamped in the same instant as the watermark are not missed; re-applying
+        an already merged row changes nothing)
+        """
+        url = f"{self.supabase_url}/rest/v1/discord_users"
+        users_data = []
+        offset = 0
         
-        try:
-            # Fetch all users (permissions are kept locally in JSON)
-            url = f"{self.supabase_url}/rest/v1/discord_users"
+        while True:
             params = {
                 "select": "discord_id,username,is_superuser,is_admin,created_at,updated_at",
+                "order": "updated_at.asc",
+                "limit": str(self.DOWNLOAD_PAGE_SIZE),
+                "offset": str(offset),
             }
+            if since:
+                params["updated_at"] = f"gte.{since}"
             
             response = requests.get(url, headers=self.headers, params=params, timeout=10)
             response.raise_for_status()
+            page = response.json()
             
-            users_data = response.json()
-            print(f"   Found {len(users_data)} users")
+            if not isinstance(page, list):
+                raise ValueError("Unexpected response format")
             
-            if not isinstance(users_data, list):
-                print(f"   ⚠️  Unexpected response format")
-                return False
+            users_data.extend(page)
+            if len(page) < self.DOWNLOAD_PAGE_SIZE:
+                return users_data
+            offset += self.DOWNLOAD_PAGE_SIZE
+    
+    def _merge_cloud_users(self, json_data: Dict[str, Any], users_data: List[Dict[str, Any]], full: bool) -> int:
+        """
+        Apply cloud rows to the in-memory JSON
+        Local permissions are preserved; users with unsynced local edits keep their local fields
+        The watermark only ever comes from the server's updated_at values (never this clock)
+        Returns number of users changed locally
+        """
+        json_users = json_data.setdefault('users', {})
+        watermark = json_data.get('last_sync_watermark')
+        changed = 0
+        seen = set()
+        
+        for user in users_data:
+            discord_id = user.get('discord_id')
+            if not discord_id:
+                continue
             
-            # Process users
-            json_users = {}
-            for user in users_data:
-                discord_id = user.get('discord_id')
-                if not discord_id:
-                    continue
-                
-                perms = {}
-                
-                json_users[str(discord_id)] = {
-                    "discord_id": discord_id,
-                    "username": user.get('username', 'Unknown'),
-                    "is_superuser": user.get('is_superuser', False),
-                    "is_admin": user.get('is_admin', False),
-                    "permissions": perms if isinstance(perms, dict) else {},
-                    "created_at": user.get('created_at'),
-                    "updated_at": user.get('updated_at'),
-                }
+            key = str(discord_id)
+            seen.add(key)
+            updated_at = user.get('updated_at')
+            if updated_at and (not watermark or str(updated_at) > str(watermark)):
+                watermark = updated_at
             
-            # Write to JSON
-            json_data = {
-                "users": json_users,
-                "last_sync": datetime.now().isoformat(),
-                "sync_status": "cloud_downloaded",
-                "user_count": len(json_users),
+            local = json_users.get(key)
+            if local is not None and self._is_dirty(local):
+                # Local edit pending upload - don't overwrite it
+                continue
+            
+            permissions = local.get('permissions', {}) if local else {}
+            merged = {
+                "discord_id": discord_id,
+                "username": user.get('username', 'Unknown'),
+                "is_superuser": user.get('is_superuser', False),
+                "is_admin": user.get('is_admin', False),
+                "permissions": permissions if isinstance(permissions, dict) else {},
+                "created_at": user.get('created_at'),
+                "updated_at": updated_at,
             }
+            merged["sync_hash"] = self._user_hash(merged)
+            
+            if local is None or any(local.get(k) != merged[k] for k in merged):
+                json_users[key] = merged
+                changed += 1
+        
+        if full:
+            # A full download is authoritative: drop users removed in the cloud (unless dirty)
+            for key in [k for k, u in json_users.items() if k not in seen and not self._is_dirty(u)]:
+                del json_users[key]
+                changed += 1
+        
+        json_data['last_sync_watermark'] = watermark
+        json_data['user_count'] = len(json_users)
+        return changed
+    
+    def _upload_dirty_users(self, json_data: Dict[str, Any]) -> tuple:
+        """
+        Upsert all dirty users in one request per UPSERT_BATCH_SIZE users
+        Returns (uploaded, failed)
+        """
+        json_users = json_data.get('users', {})
+        dirty = []
+        for discord_id_str, user_data in json_users.items():
+            if not self._is_dirty(user_data):
+                continue
+            try:
+                int(discord_id_str)
+            except (TypeError, ValueError):
+                print(f"   ⚠️  Skipping invalid discord_id: {discord_id_str}")
+                continue
+            dirty.append((discord_id_str, user_data))
+        
+        if not dirty:
+            return 0, 0
+        
+        url = f"{self.supabase_url}/rest/v1/discord_users"
+        headers = dict(self.headers)
+        # updated_at is stamped by the server (ADD_DISCORD_USERS_UPDATED_AT_TRIGGER.sql) and read
+        # back: a device with a wrong clock cannot write a timestamp behind other devices' watermark
+        headers["Prefer"] = "resolution=merge-duplicates,return=representation"
+        uploaded = 0
+        failed = 0
+        
+        for start in range(0, len(dirty), self.UPSERT_BATCH_SIZE):
+            batch = dirty[start:start + self.UPSERT_BATCH_SIZE]
+            payload = [
+                {
+                    "discord_id": int(discord_id_str),
+                    "username": user_data.get('username', 'Unknown'),
+                    "is_admin": bool(user_data.get('is_admin', False)),
+                }
+                for discord_id_str, user_data in batch
+            ]
+            
+            try:
+                response = requests.post(
+                    url,
+                    headers=headers,
+                    params={"on_conflict": "discord_id"},
+                    json=payload,
+                    timeout=30
+                )
+            except Exception as e:
+                failed += len(batch)
+                print(f"   ⚠️  Error uploading batch of {len(batch)} users: {e}")
+                continue
+            
+            if response.status_code in [200, 201, 204]:
+                try:
+                    returned = response.json() if response.content else []
+                except ValueError:
+                    returned = []
+                server_stamps = {str(row.get('discord_id')): row.get('updated_at')
+                                 for row in returned if isinstance(row, dict)}
+                for discord_id_str, user_data in batch:
+                    if server_stamps.get(discord_id_str):
+                        user_data['updated_at'] = server_stamps[discord_id_str]
+                    user_data['sync_hash'] = self._user_hash(user_data)
+                uploaded += len(batch)
+            else:
+                failed += len(batch)
+                print(f"   ⚠️  Batch upsert failed ({response.status_code}): {response.text[:200]}")
+        
+        return uploaded, failed
+    
+    def download_from_cloud(self, full: bool = False) -> bool:
+        """
+        Download users and permissions from Supabase
+        Syncs discord_users table → local JSON
+        Only rows changed since the last watermark are fetched, unless full=True
+        (or no watermark exists yet)
+        """
+        print(f"\n📥 Downloading users from Supabase...")
+        
+        try:
+            json_data = self._read_json()
+            since = None if full else json_data.get('last_sync_watermark')
+            
+            users_data = self._fetch_cloud_users(since)
+            print(f"   Found {len(users_data)} {'changed ' if since else ''}users")
+            
+            changed = self._merge_cloud_users(json_data, users_data, full=since is None)
+            json_data["last_sync"] = datetime.now().isoformat()
+            json_data["sync_status"] = "cloud_downloaded"
             
             self._write_json(json_data)
-            print(f"   ✅ Downloaded {len(json_users)} users to JSON")
+            print(f"   ✅ Applied {changed} user changes to JSON")
             return True
             
         except Exception as e:
@@ -240,50 +394,18 @@ class UsersPermissionsJsonManager:
         """
         Upload users and permissions from JSON to Supabase
         Syncs local JSON → discord_users table
+        Only users changed since the last sync are sent, in a single bulk upsert
         """
         print(f"\n📤 Uploading users to Supabase...")
         
         try:
             json_data = self._read_json()
-            json_users = json_data.get('users', {})
             
-            if not json_users:
+            if not json_data.get('users'):
                 print(f"   ℹ️  No users in JSON to upload")
                 return True
             
-            uploaded = 0
-            failed = 0
-            
-            for discord_id_str, user_data in json_users.items():
-                try:
-                    discord_id = int(discord_id_str)
-                    permissions = user_data.get('permissions', {})
-                    
-                    # Update user in Supabase
-                    url = f"{self.supabase_url}/rest/v1/discord_users"
-                    params = {"discord_id": f"eq.{discord_id}"}
-                    
-                    update_data = {
-                        "updated_at": datetime.now().isoformat(),
-                    }
-                    
-                    response = requests.patch(
-                        url,
-                        headers=self.headers,
-                        params=params,
-                        json=update_data,
-                        timeout=10
-                    )
-                    
-                    if response.status_code == 200:
-                        uploaded += 1
-                    else:
-                        failed += 1
-                        print(f"   ⚠️  Failed to update {discord_id}: {response.text}")
-                
-                except Exception as e:
-                    failed += 1
-                    print(f"   ⚠️  Error uploading user {discord_id_str}: {e}")
+            uploaded, failed = self._upload_dirty_users(json_data)
             
             # Update sync status
             json_data["last_sync"] = datetime.now().isoformat()
@@ -334,6 +456,7 @@ class UsersPermissionsJsonManager:
             "permissions": self.default_permissions_template.copy(),
             "created_at": datetime.now().isoformat(),
             "updated_at": datetime.now().isoformat(),
+            "sync_hash": None,      # never synced -> dirty, uploaded by the next sync
         }
         
         self._write_json(json_data)
@@ -478,22 +601,38 @@ class UsersPermissionsJsonManager:
             "sync_status": json_data.get('sync_status'),
         }
     
-    def sync_bidirectional(self) -> bool:
+    def sync_bidirectional(self, full: bool = False) -> bool:
         """
         Sync in both directions:
-        1. Download from cloud
-        2. Merge with local changes
-        3. Upload to cloud
+        1. Download cloud rows changed since the last watermark
+        2. Merge with local changes (unsynced local edits win)
+        3. Upload only dirty users in one bulk upsert
+        4. Write users_permissions.json once, atomically
         """
         print(f"\n🔄 Bidirectional sync...")
         
-        # Download fresh data from cloud
-        if not self.download_from_cloud():
-            print(f"   ⚠️  Download failed")
+        try:
+            json_data = self._read_json()
+            since = None if full else json_data.get('last_sync_watermark')
+            users_data = self._fetch_cloud_users(since)
+        except Exception as e:
+            print(f"   ⚠️  Download failed: {e}")
+            return False
+        
+        changed = self._merge_cloud_users(json_data, users_data, full=since is None)
+        uploaded, failed = self._upload_dirty_users(json_data)
+        
+        json_data["last_sync"] = datetime.now().isoformat()
+        json_data["sync_status"] = "synced" if failed == 0 else "partial"
+        
+        try:
+            self._write_json(json_data)
+        except Exception as e:
+            print(f"   ❌ Error writing JSON: {e}")
             return False
         
-        # Upload local changes
-        if not self.upload_to_cloud():
+        print(f"   ⬇️  {changed} changed from cloud, ⬆️  {uploaded} uploaded, {failed} failed")
+        if failed:
             print(f"   ⚠️  Upload failed")
             return False
         
@@ -0,0 +1,328 @@
+#!/usr/bin/env python3
+"""
+Virtual organization view - City -> Institution -> Employees drawn on one Canvas
+
+    layout   -> OrgLayout: y offsets per group (city header, institution header, row block),
+                O(groups) to build, bisect + arithmetic to find what a y range shows
+    render   -> only the entries inside the viewport (+ overscan) are drawn; the canvas
+                items of a fixed slot pool are moved / re-texted on scroll, never recreated
+    groups   -> clicking a city / institution header collapses or expands it
+    rows     -> hover highlight and on_employee_click through the same hit test
+
+Build time and canvas item count depend on the viewport height, not on the number of
+employees (a Frame + Labels per employee used to take seconds at a few thousand)
+"""
+
+import bisect
+import tkinter as tk
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+CITY_HEIGHT = 60
+INSTITUTION_HEIGHT = 46
+ROW_HEIGHT = 50
+EMPTY_HEIGHT = 36
+OVERSCAN = 2 * ROW_HEIGHT
+
+COLORS = {
+    "bg": "#f5f5f5",
+    "city": "#1565c0",
+    "institution": "#0d47a1",
+    "row": "#ffffff",
+    "row_alt": "#f9f9f9",
+    "hover": "#e3f2fd",
+    "name": "#1565c0",
+    "muted": "#666",
+    "rank": "#f57c00",
+    "zero": "#c62828",
+    "positive": "#2e7d32",
+}
+
+
+def employee_fields(emp: Dict[str, Any], ranks_map: Optional[Dict[str, str]] = None) -> Tuple[str, str, str, int]:
+    """(name, discord, "Rank r: role", points) - accepts app rows and Supabase employee rows"""
+    name = emp.get("NUME IC") or emp.get("employee_name", "Unknown")
+    discord = emp.get("DISCORD") or emp.get("discord_username", "")
+    rank = str(emp.get("RANK") or emp.get("rank", "?"))
+    role = emp.get("ROLE") or emp.get("role", "")
+    if ranks_map and rank in ranks_map:
+        role = ranks_map[rank]
+    try:
+        points = int(float(emp.get("PUNCTAJ") or emp.get("points", 0) or 0))
+    except (TypeError, ValueError):
+        points = 0
+    return name, discord, f"Rank {rank}: {role}", points
+
+
+class Entry:
+    """One visible line: kind = city | institution | employee | empty"""
+
+    __slots__ = ("kind", "y", "height", "city", "institution", "index", "employee", "count")
+
+    def __init__(self, kind, y, height, city, institution=None, index=0, employee=None, count=0):
+        self.kind = kind
+        self.y = y
+        self.height = height
+        self.city = city
+        self.institution = institution
+        self.index = index
+        self.employee = employee
+        self.count = count
+
+    @property
+    def group(self) -> Optional[Tuple]:
+        """Collapse key of a header entry"""
+        if self.kind == "city":
+            return (self.city,)
+        if self.kind == "institution":
+            return (self.city, self.institution)
+        return None
+
+
+class OrgLayout:
+    """
+    Vertical layout of {city: {institution: [employees]}} as segments
+    (segment = header or a block of equal-height rows); no per-employee objects
+    """
+
+    def __init__(self, structure: Dict[str, Dict[str, List[Dict]]], show_headers: bool = True):
+        self.structure = structure
+        self.show_headers = show_headers
+        self.collapsed = set()
+        self._starts: List[int] = []
+        self._segments: List[Tuple] = []
+        self.total_height = 0
+        self.rebuild()
+
+    def set_structure(self, structure: Dict[str, Dict[str, List[Dict]]]):
+        self.structure = structure
+        self.rebuild()
+
+    def rebuild(self):
+        starts, segments, y = [], [], 0
+
+        def add(kind, height, count, city, institution=None, employees=None):
+            nonlocal y
+            starts.append(y)
+            segments.append((kind, height, count, city, institution, employees))
+            y += height * count
+
+        for city in sorted(self.structure):
+            institutions = self.structure[city]
+            if self.show_headers:
+                add("city", CITY_HEIGHT, 1, city, employees=sum(len(e) for e in institutions.values()))
+                if (city,) in self.collapsed:
+                    continue
+            for institution in sorted(institutions):
+                employees = institutions[institution]
+                if self.show_headers:
+                    add("institution", INSTITUTION_HEIGHT, 1, city, institution, employees)
+                    if (city, institution) in self.collapsed:
+                        continue
+                if employees:
+                    add("employee", ROW_HEIGHT, len(employees), city, institution, employees)
+                else:
+                    add("empty", EMPTY_HEIGHT, 1, city, institution)
+        self._starts, self._segments, self.total_height = starts, segments, y
+
+    def toggle(self, group: Tuple) -> bool:
+        """Collapse / expand a city (city,) or institution (city, institution); True = now collapsed"""
+        if group in self.collapsed:
+            self.collapsed.discard(group)
+        else:
+            self.collapsed.add(group)
+        self.rebuild()
+        return group in self.collapsed
+
+    def _entry(self, segment_index: int, offset: int) -> Entry:
+        kind, height, count, city, institution, payload = self._segments[segment_index]
+        y = self._starts[segment_index] + offset * height
+        if kind == "employee":
+            return Entry(kind, y, height, city, institution, offset, payload[offset])
+        if kind == "city":
+            return Entry(kind, y, height, city, count=payload)
+        return Entry(kind, y, height, city, institution, count=len(payload or ()))
+
+    def visible(self, top: float, bottom: float) -> List[Entry]:
+        """Entries intersecting [top, bottom)"""
+        entries = []
+        if not self._segments or bottom <= top:
+            return entries
+        i = max(0, bisect.bisect_right(self._starts, max(top, 0)) - 1)
+        while i < len(self._segments) and self._starts[i] < bottom:
+            height, count = self._segments[i][1], self._segments[i][2]
+            first = max(0, int((top - self._starts[i]) // height))
+            last = min(count, int((bottom - self._starts[i] + height - 1) // height))
+            entries.extend(self._entry(i, offset) for offset in range(first, last))
+            i += 1
+        return entries
+
+    def hit(self, y: float) -> Optional[Entry]:
+        found = self.visible(y, y + 1)
+        return found[0] if found else None
+
+
+class VirtualOrgView(tk.Frame):
+    """Canvas + scrollbar; a pool of canvas item slots reused while scrolling"""
+
+    def __init__(self, parent, structure, ranks_map=None, on_employee_click: Optional[Callable] = None,
+                 show_headers: bool = True, **kwargs):
+        kwargs.setdefault("bg", COLORS["bg"])
+        super().__init__(parent, **kwargs)
+        self.layout = OrgLayout(structure, show_headers)
+        self.ranks_map = ranks_map or {}
+        self.on_employee_click = on_employee_click
+        self._slots: List[Dict[str, int]] = []
+        self._shown: List[Entry] = []
+        self._hover: Optional[int] = None
+        self._render_pending = False
+
+        self.canvas = tk.Canvas(self, bg=COLORS["bg"], highlightthickness=0, yscrollincrement=ROW_HEIGHT // 2)
+        self.scrollbar = tk.Scrollbar(self, orient="vertical", command=self.canvas.yview)
+        self.canvas.configure(yscrollcommand=self._on_scroll)
+        self.canvas.pack(side="left", fill="both", expand=True)
+        self.scrollbar.pack(side="right", fill="y")
+
+        self.canvas.bind("<Configure>", lambda e: self.render())
+        self.canvas.bind("<Button-1>", self._on_click)
+        self.canvas.bind("<Motion>", self._on_motion)
+        self.canvas.bind("<Leave>", lambda e: self._set_hover(None))
+        self.canvas.bind("<MouseWheel>", self._on_wheel)
+        self.canvas.bind("<Button-4>", lambda e: self.canvas.yview_scroll(-3, "units"))
+        self.canvas.bind("<Button-5>", lambda e: self.canvas.yview_scroll(3, "units"))
+        self._update_scrollregion()
+
+    # ==================== DATA ====================
+
+    def set_structure(self, structure):
+        self.layout.set_structure(structure)
+        self._update_scrollregion()
+        self.render()
+
+    def toggle(self, group: Tuple):
+        self.layout.toggle(group)
+        self._update_scrollregion()
+        self.render()
+
+    def _update_scrollregion(self):
+        self.canvas.configure(scrollregion=(0, 0, 1, max(self.layout.total_height, 1)))
+
+    # ==================== RENDER ====================
+
+    def _on_scroll(self, first, last):
+        self.scrollbar.set(first, last)
+        if not self._render_pending:
+            self._render_pending = True
+            self.after_idle(self.render)
+
+    def _on_wheel(self, event):
+        self.canvas.yview_scroll(int(-event.delta / 120) * 3, "units")
+
+    def _new_slot(self) -> Dict[str, int]:
+        c = self.canvas
+        slot = {
+            "rect": c.create_rectangle(0, 0, 0, 0, width=0),
+            "title": c.create_text(0, 0, anchor="w"),
+            "subtitle": c.create_text(0, 0, anchor="w", font=("Segoe UI", 8), fill=COLORS["muted"]),
+            "rank": c.create_text(0, 0, anchor="w", font=("Segoe UI", 9), fill=COLORS["rank"]),
+            "points": c.create_text(0, 0, anchor="e", font=("Segoe UI", 10, "bold")),
+        }
+        self._slots.append(slot)
+        return slot
+
+    def _fill(self, entry: Entry) -> str:
+        if entry.kind == "employee":
+            return COLORS["row"] if entry.index % 2 == 0 else COLORS["row_alt"]
+        if entry.kind == "empty":
+            return COLORS["row"]
+        return COLORS[entry.kind]
+
+    def render(self):
+        """Draw the viewport - the slot pool only grows to the largest viewport seen"""
+        self._render_pending = False
+        c = self.canvas
+        top = c.canvasy(0)
+        width = max(c.winfo_width(), 200)
+        entries = self.layout.visible(top - OVERSCAN, top + max(c.winfo_height(), 1) + OVERSCAN)
+        while len(self._slots) < len(entries):
+            self._new_slot()
+
+        for entry, slot in zip(entries, self._slots):
+            y0, y1 = entry.y, entry.y + entry.height
+            mid = (y0 + y1) / 2
+            left = 5 if entry.kind == "city" else 30
+            texts = {"title": "", "subtitle": "", "rank": "", "points": ""}
+            if entry.kind == "city":
+                y0 += 5
+                y1 -= 5
+                arrow = "▸" if entry.group in self.layout.collapsed else "▾"
+                texts["title"] = f"{arrow} 📍 {entry.city.upper()}   ({entry.count} employees)"
+                c.itemconfigure(slot["title"], font=("Segoe UI", 14, "bold"), fill="white")
+            elif entry.kind == "institution":
+                y0 += 6
+                arrow = "▸" if entry.group in self.layout.collapsed else "▾"
+                texts["title"] = f"{arrow} 🏢 {entry.institution}   ({entry.count} employees)"
+                c.itemconfigure(slot["title"], font=("Segoe UI", 11, "bold"), fill="#e3f2fd")
+            elif entry.kind == "empty":
+                texts["title"] = "(No employees)"
+                c.itemconfigure(slot["title"], font=("Segoe UI", 9, "italic"), fill="#999")
+            else:
+                name, discord, rank_text, points = employee_fields(entry.employee, self.ranks_map)
+                texts["title"] = f"👤 {name}"
+                texts["subtitle"] = f"Discord: {discord}" if discord else ""
+                texts["rank"] = rank_text
+                texts["points"] = f"⭐ {points}"
+                c.itemconfigure(slot["title"], font=("Segoe UI", 10, "bold"), fill=COLORS["name"])
+                c.itemconfigure(slot["points"], fill=COLORS["zero"] if points == 0 else COLORS["positive"])
+
+            c.coords(slot["rect"], left, y0, width - 5, y1)
+            c.itemconfigure(slot["rect"], fill=self._fill(entry), state="normal")
+            title_y = mid - 8 if texts["subtitle"] else mid
+            c.coords(slot["title"], left + 15, title_y)
+            c.coords(slot["subtitle"], left + 15, mid + 10)
+            c.coords(slot["rank"], left + int((width - left) * 0.5), mid)
+            c.coords(slot["points"], width - 20, mid)
+            for key, text in texts.items():
+                c.itemconfigure(slot[key], text=text, state="normal" if text else "hidden")
+
+        for slot in self._slots[len(entries):]:
+            for item in slot.values():
+                c.itemconfigure(item, state="hidden")
+        self._shown = entries
+        self._hover = None
+
+    # ==================== INTERACTION ====================
+
+    def _slot_at(self, event) -> Tuple[Optional[int], Optional[Entry]]:
+        y = self.canvas.canvasy(event.y)
+        for i, entry in enumerate(self._shown):
+            if entry.y <= y < entry.y + entry.height:
+                return i, entry
+        return None, None
+
+    def _set_hover(self, index: Optional[int]):
+        if index == self._hover:
+            return
+        if self._hover is not None and self._hover < len(self._shown):
+            previous = self._shown[self._hover]
+            self.canvas.itemconfigure(self._slots[self._hover]["rect"], fill=self._fill(previous))
+        self._hover = index
+        if index is not None:
+            self.canvas.itemconfigure(self._slots[index]["rect"], fill=COLORS["hover"])
+
+    def _on_motion(self, event):
+        index, entry = self._slot_at(event)
+        if entry is not None and entry.kind == "employee":
+            self._set_hover(index)
+            self.canvas.configure(cursor="hand2" if self.on_employee_click else "")
+        else:
+            self._set_hover(None)
+            self.canvas.configure(cursor="hand2" if entry is not None and entry.group else "")
+
+    def _on_click(self, event):
+        _, entry = self._slot_at(event)
+        if entry is None:
+            return
+        if entry.group:
+            self.toggle(entry.group)
+        elif entry.kind == "employee" and self.on_employee_click:
+            self.on_employee_click(entry.employee)